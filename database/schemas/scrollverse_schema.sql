@@ -98,18 +98,20 @@ CREATE INDEX idx_soul_token_id ON scroll_souls(soul_token_id);
 CREATE INDEX idx_soul_owner ON scroll_souls(owner_address);
 CREATE INDEX idx_soul_evolution ON scroll_souls(evolution_stage);
 
--- Resonance Data Table (Time-series data)
+-- Resonance Data Table (Time-series data, range partitioned by timestamp)
+-- Partitions are created ahead of time and retired by scripts/database/partitions.py
 CREATE TABLE IF NOT EXISTS resonance_data (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     nft_id INTEGER REFERENCES nft_metadata(id) ON DELETE CASCADE,
     frequency INTEGER NOT NULL,
     resonance_level DECIMAL(5,2) NOT NULL,
     etheric_density DECIMAL(5,2),
     akashic_layer INTEGER,
     dimensional_access INTEGER,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    measurement_data JSONB
-);
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    measurement_data JSONB,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 -- Indexes for Resonance Data
 CREATE INDEX idx_res_nft_id ON resonance_data(nft_id);
@@ -130,25 +132,117 @@ CREATE TABLE IF NOT EXISTS nft_evolution_history (
 );
 
 -- Indexes for Evolution History
-CREATE INDEX idx_evol_nft_id ON nft_evolution_history(nft_id);
+-- idx_evol_nft_timeline orders each NFT's events for replay and also serves nft_id lookups
+CREATE INDEX idx_evol_nft_timeline ON nft_evolution_history(nft_id, evolution_timestamp, id);
 CREATE INDEX idx_evol_timestamp ON nft_evolution_history(evolution_timestamp DESC);
 
--- User Interaction Table
+-- NFT State Snapshots (replayed nft_evolution_history state, every N events per NFT)
+-- Written by scripts/database/evolution.py; events = 0 is the state before the first evolution
+CREATE TABLE IF NOT EXISTS nft_state_snapshots (
+    nft_id INTEGER NOT NULL REFERENCES nft_metadata(id) ON DELETE CASCADE,
+    events INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    as_of TIMESTAMP,
+    stage VARCHAR(50),
+    frequency INTEGER,
+    resonance_level NUMERIC,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (nft_id, events)
+);
+
+-- Function: Drop snapshots that a changed event falls before
+-- Appends land after every snapshot and drop nothing. Back-dated, edited or
+-- deleted events drop the snapshots from their position on, and the next
+-- refresh replays them again. Events without a timestamp are never replayed
+CREATE OR REPLACE FUNCTION invalidate_nft_state_snapshots()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.evolution_timestamp IS NOT NULL THEN
+            DELETE FROM nft_state_snapshots s
+            WHERE s.nft_id = OLD.nft_id AND s.events > 0
+                AND (s.as_of, s.event_id) >= (OLD.evolution_timestamp, OLD.id);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.evolution_timestamp IS NOT NULL THEN
+            DELETE FROM nft_state_snapshots s
+            WHERE s.nft_id = NEW.nft_id
+                AND (s.as_of, s.event_id) > (NEW.evolution_timestamp, NEW.id);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER invalidate_nft_evolution_snapshots
+AFTER INSERT OR UPDATE OR DELETE ON nft_evolution_history
+FOR EACH ROW
+EXECUTE FUNCTION invalidate_nft_state_snapshots();
+
+-- User Interaction Table (range partitioned by timestamp)
 CREATE TABLE IF NOT EXISTS user_interactions (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     user_address VARCHAR(42) NOT NULL,
     nft_id INTEGER REFERENCES nft_metadata(id) ON DELETE CASCADE,
     interaction_type VARCHAR(50),
     frequency_resonance INTEGER,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    interaction_data JSONB
-);
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    interaction_data JSONB,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 -- Indexes for User Interactions
 CREATE INDEX idx_ui_user ON user_interactions(user_address);
 CREATE INDEX idx_ui_nft ON user_interactions(nft_id);
 CREATE INDEX idx_ui_timestamp ON user_interactions(timestamp DESC);
 
+-- Initial monthly partitions: the current month and three ahead, plus a DEFAULT
+-- partition that keeps rows outside every range instead of rejecting them.
+-- manage_partitions() splits such rows out into monthly partitions on its next run
+-- Indexes created on the parent tables above are built on every partition
+DO $$
+DECLARE
+    v_table TEXT;
+    v_month TIMESTAMP;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY['resonance_data', 'user_interactions'] LOOP
+        FOR v_month IN
+            SELECT generate_series(date_trunc('month', LOCALTIMESTAMP), date_trunc('month', LOCALTIMESTAMP) + INTERVAL '3 months', INTERVAL '1 month')
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                v_table || '_p' || to_char(v_month, 'YYYY_MM'), v_table, v_month, v_month + INTERVAL '1 month'
+            );
+        END LOOP;
+        EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT', v_table || '_default', v_table);
+    END LOOP;
+END;
+$$;
+
+-- Resonance Rollups (minute, hour and day aggregates of resonance_data)
+CREATE TABLE IF NOT EXISTS resonance_rollups (
+    resolution VARCHAR(10) NOT NULL CHECK (resolution IN ('minute', 'hour', 'day')),
+    bucket TIMESTAMP NOT NULL,
+    nft_id INTEGER NOT NULL REFERENCES nft_metadata(id) ON DELETE CASCADE,
+    frequency INTEGER NOT NULL,
+    sample_count BIGINT NOT NULL,
+    resonance_sum NUMERIC NOT NULL,
+    resonance_min DECIMAL(5,2) NOT NULL,
+    resonance_max DECIMAL(5,2) NOT NULL,
+    PRIMARY KEY (resolution, nft_id, bucket, frequency)
+);
+
+-- Highest resonance_data id already folded into resonance_rollups
+CREATE TABLE IF NOT EXISTS resonance_rollup_watermark (
+    name VARCHAR(50) PRIMARY KEY,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP
+);
+
+INSERT INTO resonance_rollup_watermark (name) VALUES ('resonance_data')
+ON CONFLICT (name) DO NOTHING;
+
 -- Create views for common queries
 
 -- View: NFT with Frequency Layers
@@ -202,6 +296,136 @@ BEFORE UPDATE ON nft_metadata
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at();
 
+-- Function: Publish committed table changes for client result cache invalidation
+-- Notifications are delivered when the writing transaction commits
+CREATE OR REPLACE FUNCTION notify_table_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('scrollverse_table_changes', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers: Notify cache listeners when cached tables change
+CREATE TRIGGER notify_nft_metadata_change
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON nft_metadata
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER notify_akashic_frequencies_change
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON akashic_frequencies
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_table_change();
+
+CREATE TRIGGER notify_frequency_layers_change
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON frequency_layers
+FOR EACH STATEMENT
+EXECUTE FUNCTION notify_table_change();
+
+-- Materialized nft_with_frequencies, kept current one NFT at a time
+CREATE TABLE IF NOT EXISTS nft_with_frequencies_mat (
+    id INTEGER PRIMARY KEY REFERENCES nft_metadata(id) ON DELETE CASCADE,
+    token_id VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    primary_frequency INTEGER,
+    evolution_stage VARCHAR(50),
+    resonance_level DECIMAL(5,2),
+    frequency_layers JSON,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE UNIQUE INDEX idx_nwf_mat_token_id ON nft_with_frequencies_mat(token_id);
+
+-- NFTs whose nft_with_frequencies_mat row is out of date
+CREATE TABLE IF NOT EXISTS nft_frequencies_dirty (
+    nft_id INTEGER PRIMARY KEY,
+    queued_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Function: Queue the NFTs a row change affects for refresh
+-- DO UPDATE (rather than DO NOTHING) locks an already queued row, so a refresh
+-- cannot claim it until this transaction commits and its change is visible
+CREATE OR REPLACE FUNCTION queue_nft_frequencies_refresh()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids INTEGER[];
+BEGIN
+    IF TG_TABLE_NAME = 'nft_metadata' THEN
+        v_ids := ARRAY[NEW.id];
+    ELSIF TG_TABLE_NAME = 'frequency_layers' THEN
+        v_ids := ARRAY[OLD.nft_id, NEW.nft_id];
+    ELSE
+        SELECT array_agg(fl.nft_id) INTO v_ids
+        FROM frequency_layers fl
+        WHERE fl.frequency_id = NEW.id;
+    END IF;
+
+    INSERT INTO nft_frequencies_dirty AS d (nft_id)
+    SELECT DISTINCT u.nft_id FROM unnest(v_ids) AS u(nft_id) WHERE u.nft_id IS NOT NULL
+    ON CONFLICT (nft_id) DO UPDATE SET queued_at = LEAST(d.queued_at, EXCLUDED.queued_at);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers: Track changes to the columns nft_with_frequencies reads
+-- Deleted NFTs leave nft_with_frequencies_mat through its foreign key
+CREATE TRIGGER queue_nft_metadata_frequencies
+AFTER INSERT OR UPDATE OF id, token_id, name, frequency, evolution_stage, resonance_level ON nft_metadata
+FOR EACH ROW
+EXECUTE FUNCTION queue_nft_frequencies_refresh();
+
+CREATE TRIGGER queue_frequency_layers_frequencies
+AFTER INSERT OR UPDATE OR DELETE ON frequency_layers
+FOR EACH ROW
+EXECUTE FUNCTION queue_nft_frequencies_refresh();
+
+CREATE TRIGGER queue_akashic_frequencies_frequencies
+AFTER UPDATE OF frequency, type, resonance, sacred_geometry ON akashic_frequencies
+FOR EACH ROW
+EXECUTE FUNCTION queue_nft_frequencies_refresh();
+
+-- Function: Recompute nft_with_frequencies_mat for queued NFTs
+-- Claims at most p_limit queued ids (all when NULL). SKIP LOCKED lets several
+-- refreshers share the queue and leaves ids still being written for the next run
+CREATE OR REPLACE FUNCTION refresh_nft_with_frequencies(p_limit INTEGER DEFAULT NULL)
+RETURNS TABLE (
+    nfts_refreshed INTEGER,
+    nfts_pending BIGINT
+) AS $$
+DECLARE
+    v_ids INTEGER[];
+BEGIN
+    WITH claimed AS (
+        DELETE FROM nft_frequencies_dirty d
+        WHERE d.nft_id IN (
+            SELECT q.nft_id FROM nft_frequencies_dirty q
+            ORDER BY q.queued_at
+            LIMIT p_limit
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING d.nft_id
+    )
+    SELECT array_agg(c.nft_id) INTO v_ids FROM claimed c;
+
+    INSERT INTO nft_with_frequencies_mat
+        (id, token_id, name, primary_frequency, evolution_stage, resonance_level, frequency_layers, refreshed_at)
+    SELECT v.id, v.token_id, v.name, v.primary_frequency, v.evolution_stage, v.resonance_level,
+           v.frequency_layers, CURRENT_TIMESTAMP
+    FROM nft_with_frequencies v
+    WHERE v.id = ANY(v_ids)
+    ON CONFLICT (id) DO UPDATE SET
+        token_id = EXCLUDED.token_id,
+        name = EXCLUDED.name,
+        primary_frequency = EXCLUDED.primary_frequency,
+        evolution_stage = EXCLUDED.evolution_stage,
+        resonance_level = EXCLUDED.resonance_level,
+        frequency_layers = EXCLUDED.frequency_layers,
+        refreshed_at = EXCLUDED.refreshed_at;
+
+    RETURN QUERY SELECT COALESCE(cardinality(v_ids), 0), (SELECT COUNT(*) FROM nft_frequencies_dirty);
+END;
+$$ LANGUAGE plpgsql;
+
 -- Function: Calculate NFT resonance score
 CREATE OR REPLACE FUNCTION calculate_resonance_score(p_nft_id INTEGER)
 RETURNS DECIMAL AS $$
@@ -229,12 +453,107 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function: Calculate resonance scores for many NFTs in one set-based pass
+CREATE OR REPLACE FUNCTION calculate_resonance_scores(p_nft_ids INTEGER[])
+RETURNS TABLE (
+    nft_id INTEGER,
+    token_id VARCHAR(255),
+    layer_count INTEGER,
+    avg_layer_resonance DECIMAL,
+    resonance_score DECIMAL
+) AS $$
+    SELECT
+        nm.id,
+        nm.token_id,
+        COUNT(af.id)::INTEGER,
+        AVG(af.resonance),
+        ROUND(nm.resonance_level * (1 + (COUNT(af.id) * 0.1)) * COALESCE(AVG(af.resonance), 1.0), 2)
+    FROM nft_metadata nm
+    LEFT JOIN (frequency_layers fl
+        JOIN akashic_frequencies af ON fl.frequency_id = af.id) ON nm.id = fl.nft_id
+    WHERE nm.id = ANY(p_nft_ids)
+    GROUP BY nm.id, nm.token_id, nm.resonance_level;
+$$ LANGUAGE sql STABLE;
+
+-- Function: Highest resonance_data id that is safe to roll up
+-- SHARE mode waits for in-flight inserts to commit, so no lower id can appear
+-- after this returns. Call it in its own short transaction
+CREATE OR REPLACE FUNCTION resonance_rollup_bound()
+RETURNS BIGINT AS $$
+BEGIN
+    LOCK TABLE resonance_data IN SHARE MODE;
+    RETURN (SELECT COALESCE(MAX(id), 0) FROM resonance_data);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Function: Fold resonance_data rows past the watermark into resonance_rollups
+-- Only rows with last_id < id <= p_upper_id are read (at most p_max_ids ids per
+-- call), so each refresh costs the new rows rather than a full rebuild
+CREATE OR REPLACE FUNCTION refresh_resonance_rollups(p_upper_id BIGINT, p_max_ids BIGINT DEFAULT NULL)
+RETURNS TABLE (
+    rows_rolled_up BIGINT,
+    buckets_updated BIGINT,
+    watermark BIGINT
+) AS $$
+DECLARE
+    v_from BIGINT;
+    v_to BIGINT;
+    v_rows BIGINT;
+    v_buckets BIGINT;
+BEGIN
+    SELECT w.last_id INTO v_from
+    FROM resonance_rollup_watermark w
+    WHERE w.name = 'resonance_data'
+    FOR UPDATE;
+
+    v_to := LEAST(p_upper_id, v_from + COALESCE(p_max_ids, p_upper_id));
+    IF v_to <= v_from THEN
+        RETURN QUERY SELECT 0::BIGINT, 0::BIGINT, v_from;
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*) INTO v_rows
+    FROM resonance_data rd
+    WHERE rd.id > v_from AND rd.id <= v_to AND rd.nft_id IS NOT NULL AND rd.timestamp IS NOT NULL;
+
+    INSERT INTO resonance_rollups AS r
+        (resolution, bucket, nft_id, frequency, sample_count, resonance_sum, resonance_min, resonance_max)
+    SELECT
+        res.resolution,
+        date_trunc(res.resolution, rd.timestamp),
+        rd.nft_id,
+        rd.frequency,
+        COUNT(*),
+        SUM(rd.resonance_level),
+        MIN(rd.resonance_level),
+        MAX(rd.resonance_level)
+    FROM resonance_data rd
+    CROSS JOIN (VALUES ('minute'), ('hour'), ('day')) AS res(resolution)
+    WHERE rd.id > v_from AND rd.id <= v_to AND rd.nft_id IS NOT NULL AND rd.timestamp IS NOT NULL
+    GROUP BY res.resolution, date_trunc(res.resolution, rd.timestamp), rd.nft_id, rd.frequency
+    ON CONFLICT (resolution, nft_id, bucket, frequency) DO UPDATE SET
+        sample_count = r.sample_count + EXCLUDED.sample_count,
+        resonance_sum = r.resonance_sum + EXCLUDED.resonance_sum,
+        resonance_min = LEAST(r.resonance_min, EXCLUDED.resonance_min),
+        resonance_max = GREATEST(r.resonance_max, EXCLUDED.resonance_max);
+    GET DIAGNOSTICS v_buckets = ROW_COUNT;
+
+    UPDATE resonance_rollup_watermark
+    SET last_id = v_to, refreshed_at = CURRENT_TIMESTAMP
+    WHERE name = 'resonance_data';
+
+    RETURN QUERY SELECT v_rows, v_buckets, v_to;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Comments for documentation
 COMMENT ON TABLE nft_metadata IS 'NFT metadata storage with 528Hz resonance alignment';
 COMMENT ON TABLE akashic_frequencies IS 'Sacred frequencies with healing and spiritual properties';
 COMMENT ON TABLE frequency_layers IS 'Multi-dimensional frequency layers for NFT resonance';
 COMMENT ON TABLE scroll_souls IS 'Soul Bound Tokens with sovereignty tracking';
 COMMENT ON TABLE resonance_data IS 'Time-series resonance measurements';
+COMMENT ON TABLE nft_with_frequencies_mat IS 'Incrementally refreshed nft_with_frequencies rows';
+COMMENT ON TABLE resonance_rollups IS 'Minute, hour and day resonance aggregates per NFT and frequency';
 
 -- Sample data for testing
 INSERT INTO nft_metadata (token_id, name, frequency, description, evolution_stage, resonance_level) VALUES
@@ -243,6 +562,11 @@ INSERT INTO nft_metadata (token_id, name, frequency, description, evolution_stag
     ('NFT-003', 'Eternal Anchor', 963, 'Divine connection anchor', 'Sovereign', 1.5)
 ON CONFLICT (token_id) DO NOTHING;
 
+-- Queue every NFT once so nft_with_frequencies_mat starts complete
+INSERT INTO nft_frequencies_dirty (nft_id)
+SELECT id FROM nft_metadata
+ON CONFLICT (nft_id) DO NOTHING;
+
 -- Grant permissions (adjust as needed for your deployment)
 -- GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO scrollverse_user;
 -- GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA public TO scrollverse_user;
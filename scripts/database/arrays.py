@@ -0,0 +1,180 @@
+"""
+Columnar Fetching for ScrollVerse
+Binary COPY decoding of numeric result sets into typed NumPy arrays with null masks
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+
+# PostgreSQL type OID: (SQL type selected, big-endian wire dtype, NumPy result dtype).
+# numeric is cast to float8 server-side; its base-10000 digit format cannot be decoded in bulk
+ARRAY_TYPES: Dict[int, Tuple[str, str, str]] = {
+    16: ('boolean', '?', 'bool'),
+    21: ('smallint', '>i2', 'int16'),
+    23: ('integer', '>i4', 'int32'),
+    20: ('bigint', '>i8', 'int64'),
+    700: ('real', '>f4', 'float32'),
+    701: ('double precision', '>f8', 'float64'),
+    1700: ('double precision', '>f8', 'float64'),
+    1082: ('date', '>i4', 'datetime64[D]'),
+    1114: ('timestamp', '>i8', 'datetime64[us]'),
+    1184: ('timestamptz', '>i8', 'datetime64[us]')
+}
+
+# COALESCE targets that decode as the NumPy zero of the result dtype: 0, False or
+# 1970-01-01, which is what arrays_from_rows puts in NULL slots too
+_ZEROS = {
+    'boolean': 'false',
+    'date': "'1970-01-01'::date",
+    'timestamp': "'1970-01-01'::timestamp",
+    'timestamptz': "'1970-01-01 00:00:00+00'::timestamptz"
+}
+
+# PostgreSQL counts dates and timestamps from 2000-01-01, NumPy from 1970-01-01
+PG_EPOCH_DAYS = 10957
+PG_EPOCH_MICROSECONDS = PG_EPOCH_DAYS * 86400 * 1000000
+
+
+def import_numpy():
+    """NumPy, which fetch_arrays needs and the rest of the client does not"""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("fetch_arrays requires NumPy (pip install numpy)") from None
+    return numpy
+
+
+def probe_query(query: str) -> str:
+    """Zero-row wrapper that reports the result columns and their type OIDs"""
+    return f"SELECT * FROM ({query.strip().rstrip(';')}) AS q LIMIT 0"
+
+
+def copy_query(query: str, type_oids: Sequence[int], names: Sequence[str]) -> str:
+    """
+    Binary COPY of the query with every column as a non-NULL value plus an
+    IS NULL flag, which gives every row the same width on the wire
+    """
+    unsupported = [f"{name} (oid {oid})" for name, oid in zip(names, type_oids) if oid not in ARRAY_TYPES]
+    if unsupported:
+        raise ValueError(
+            f"fetch_arrays decodes numeric, boolean, date and timestamp columns; cast or drop {', '.join(unsupported)}"
+        )
+
+    selected = []
+    for index, oid in enumerate(type_oids):
+        sql_type = ARRAY_TYPES[oid][0]
+        selected.append(f"COALESCE(q.c{index}::{sql_type}, {_ZEROS.get(sql_type, '0')})")
+        selected.append(f"q.c{index} IS NULL")
+    aliases = ', '.join(f"c{index}" for index in range(len(type_oids)))
+    return (
+        f"COPY (SELECT {', '.join(selected)} FROM ({query.strip().rstrip(';')}) AS q({aliases})) "
+        f"TO STDOUT WITH (FORMAT binary)"
+    )
+
+
+def row_dtype(type_oids: Sequence[int]):
+    """Structured dtype of one binary COPY tuple as copy_query lays it out"""
+    np = import_numpy()
+    fields = [('fields', '>i2')]
+    for index, oid in enumerate(type_oids):
+        fields += [
+            (f'length{index}', '>i4'),
+            (f'value{index}', ARRAY_TYPES[oid][1]),
+            (f'null_length{index}', '>i4'),
+            (f'null{index}', '?')
+        ]
+    return np.dtype(fields)
+
+
+def _to_result(np, values, oid: int):
+    """Convert decoded wire values to the native result dtype"""
+    result_dtype = ARRAY_TYPES[oid][2]
+    if result_dtype == 'datetime64[D]':
+        return (values.astype('int64') + PG_EPOCH_DAYS).astype(result_dtype)
+    if result_dtype == 'datetime64[us]':
+        return (values.astype('int64') + PG_EPOCH_MICROSECONDS).astype(result_dtype)
+    return values.astype(result_dtype)
+
+
+def decode_copy(buffer, names: Sequence[str], type_oids: Sequence[int]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Decode copy_query output into ({name: array}, {name: null mask})
+    The tuples are read in place with one structured view over the buffer;
+    each column then costs a single vectorized byte-swapping copy
+    """
+    np = import_numpy()
+    data = memoryview(buffer)
+    if bytes(data[:len(COPY_SIGNATURE)]) != COPY_SIGNATURE:
+        raise ValueError("Not PostgreSQL binary COPY output")
+    extension = int.from_bytes(data[15:19], 'big')
+    offset = 19 + extension
+    if bytes(data[-2:]) != b'\xff\xff':
+        raise ValueError("Binary COPY output is truncated")
+
+    dtype = row_dtype(type_oids)
+    body = len(data) - offset - 2
+    if body % dtype.itemsize:
+        raise ValueError("Binary COPY tuples do not match the probed column types")
+    tuples = np.frombuffer(data, dtype=dtype, count=body // dtype.itemsize, offset=offset)
+    if len(tuples) and not (tuples['fields'] == 2 * len(type_oids)).all():
+        raise ValueError("Binary COPY tuples do not match the probed column types")
+
+    arrays, nulls = {}, {}
+    for index, (name, oid) in enumerate(zip(names, type_oids)):
+        arrays[name] = _to_result(np, tuples[f'value{index}'], oid)
+        nulls[name] = tuples[f'null{index}'].copy()
+    return arrays, nulls
+
+
+def _result_dtype(values: Sequence[Any]) -> str:
+    """NumPy dtype for a column of Python values, judged by its first non-NULL value"""
+    sample = next((v for v in values if v is not None), None)
+    if isinstance(sample, bool):
+        return 'bool'
+    if isinstance(sample, int):
+        return 'int64'
+    if isinstance(sample, datetime):
+        return 'datetime64[us]'
+    if isinstance(sample, date):
+        return 'datetime64[D]'
+    if sample is None or isinstance(sample, (float, Decimal)):
+        return 'float64'
+    raise ValueError(f"fetch_arrays cannot decode {type(sample).__name__} values into an array")
+
+
+def _plain(value: Any) -> Any:
+    """Value NumPy converts without per-element warnings: aware datetimes as naive UTC"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def arrays_from_rows(
+    names: Sequence[str],
+    rows: List[tuple],
+    type_oids: Optional[Sequence[Optional[int]]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Row-at-a-time fallback for drivers without binary COPY, with the same result shape
+    Columns whose type OID the driver reports get the same dtype as decode_copy;
+    the rest are typed by their values
+    """
+    np = import_numpy()
+    arrays, nulls = {}, {}
+    for index, name in enumerate(names):
+        values = [row[index] for row in rows]
+        oid = type_oids[index] if type_oids else None
+        dtype = ARRAY_TYPES[oid][2] if oid in ARRAY_TYPES else _result_dtype(values)
+        zero = np.zeros(1, dtype=dtype)[0]
+        mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        if dtype in ('float32', 'float64'):
+            values = [zero if v is None else float(v) for v in values]
+        else:
+            values = [zero if v is None else _plain(v) for v in values]
+        arrays[name] = np.array(values, dtype=dtype)
+        nulls[name] = mask
+    return arrays, nulls
@@ -0,0 +1,312 @@
+"""
+Async PostgreSQL Client for ScrollVerse
+asyncio-native database interaction with concurrent query fan-out
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Dict, List, Optional
+
+try:
+    from .connection_pool import AsyncConnectionPool
+    from .drivers import AsyncDriver, get_async_driver
+    from .instrumentation import QueryInstrumentation
+    from .maintenance import (
+        MAINTENANCE_CANDIDATES_QUERY,
+        RELATION_SIZES_QUERY,
+        MaintenancePlanner,
+        MaintenanceTask,
+        build_report,
+        sizes_by_table
+    )
+    from .rollups import RESONANCE_WINDOW_QUERY, choose_resolution, shape_window, window_params
+    from .postgresql_client import (
+        AUTOVACUUM_SETTINGS_QUERY,
+        FREQUENCIES_BY_RESONANCE_QUERY,
+        FREQUENCY_BY_VALUE_QUERY,
+        LIST_TABLES_QUERY,
+        NFT_BY_TOKEN_QUERY,
+        NFT_RESONANCE_BATCH_QUERY,
+        NFT_RESONANCE_QUERY,
+        RECENT_NFTS_QUERY,
+        TABLE_BLOAT_QUERY,
+        config_from_argv,
+        load_env_config,
+        rows_as_dicts,
+        shape_autovacuum_settings,
+        shape_resonance_batch,
+        shape_resonance_validation,
+        shape_table_bloat,
+        shape_tables
+    )
+except ImportError:
+    from connection_pool import AsyncConnectionPool
+    from drivers import AsyncDriver, get_async_driver
+    from instrumentation import QueryInstrumentation
+    from maintenance import (
+        MAINTENANCE_CANDIDATES_QUERY,
+        RELATION_SIZES_QUERY,
+        MaintenancePlanner,
+        MaintenanceTask,
+        build_report,
+        sizes_by_table
+    )
+    from rollups import RESONANCE_WINDOW_QUERY, choose_resolution, shape_window, window_params
+    from postgresql_client import (
+        AUTOVACUUM_SETTINGS_QUERY,
+        FREQUENCIES_BY_RESONANCE_QUERY,
+        FREQUENCY_BY_VALUE_QUERY,
+        LIST_TABLES_QUERY,
+        NFT_BY_TOKEN_QUERY,
+        NFT_RESONANCE_BATCH_QUERY,
+        NFT_RESONANCE_QUERY,
+        RECENT_NFTS_QUERY,
+        TABLE_BLOAT_QUERY,
+        config_from_argv,
+        load_env_config,
+        rows_as_dicts,
+        shape_autovacuum_settings,
+        shape_resonance_batch,
+        shape_resonance_validation,
+        shape_table_bloat,
+        shape_tables
+    )
+
+
+class AsyncPostgreSQLClient:
+    """
+    asyncio PostgreSQL Client for ScrollVerse operations
+    Mirrors PostgreSQLClient's method surface on an async connection pool
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, driver: Optional[AsyncDriver] = None):
+        """Initialize async PostgreSQL client with configuration"""
+        self.config = config or load_env_config()
+        self.frequency = self.config.get('frequency', 528)
+        self.driver = driver or get_async_driver(
+            'fake' if self.config.get('driver', 'psycopg2') == 'fake' else 'asyncpg'
+        )
+        self.pool: Optional[AsyncConnectionPool] = None
+        self.resonance_field = 'active'
+        self.instrumentation = QueryInstrumentation.from_config(self.config)
+
+    async def __aenter__(self) -> 'AsyncPostgreSQLClient':
+        """Connect when entering an async with block"""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the pool when leaving an async with block"""
+        await self.close()
+
+    async def connect(self) -> bool:
+        """Open the async connection pool to PostgreSQL"""
+        print(f"🔮 Connecting to PostgreSQL at {self.config['host']}:{self.config['port']} (async)...")
+
+        self.pool = AsyncConnectionPool.from_config(self.config, self.driver)
+        await self.pool.open()
+
+        print(f"✓ Connected to {self.config['database']} at {self.frequency}Hz "
+              f"(async pool {self.pool.min_size}-{self.pool.max_size}, driver: {self.driver.name})")
+        return True
+
+    async def execute_query(self, query: str, params: Optional[tuple] = None) -> Dict[str, Any]:
+        """Execute SQL query with parameters on a pooled connection"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+
+        executed_at = datetime.now()
+        started = time.perf_counter()
+        pool_wait, rowcount, error = 0.0, 0, None
+        try:
+            async with self.pool.connection() as conn:
+                pool_wait = time.perf_counter() - started
+                columns, rows, rowcount = await self.driver.execute(conn, query, params)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.instrumentation.record(query, elapsed - pool_wait, rowcount, pool_wait, error)
+
+        return {
+            'query': query,
+            'status': 'success',
+            'columns': columns,
+            'rows': rows,
+            'rowcount': rowcount,
+            'executed_at': executed_at.isoformat(),
+            'duration_ms': round((elapsed - pool_wait) * 1000.0, 3),
+            'resonance_frequency': f"{self.frequency}Hz"
+        }
+
+    async def gather(self, *aws: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+        """Run independent queries concurrently, each on its own pooled connection"""
+        return list(await asyncio.gather(*aws, return_exceptions=return_exceptions))
+
+    async def list_tables(self, schema: str = 'public') -> List[Dict[str, Any]]:
+        """List all tables in specified schema"""
+        return shape_tables(await self.execute_query(LIST_TABLES_QUERY, (schema,)))
+
+    async def analyze_table_bloat(self) -> List[Dict[str, Any]]:
+        """Analyze table bloat for optimization"""
+        return shape_table_bloat(await self.execute_query(TABLE_BLOAT_QUERY))
+
+    async def get_autovacuum_settings(self) -> Dict[str, Any]:
+        """Get current autovacuum configuration"""
+        return shape_autovacuum_settings(await self.execute_query(AUTOVACUUM_SETTINGS_QUERY))
+
+    async def query_nft_metadata(self, token_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Query NFT metadata with frequency alignment"""
+        if token_id:
+            return rows_as_dicts(await self.execute_query(NFT_BY_TOKEN_QUERY, (token_id,)))
+        return rows_as_dicts(await self.execute_query(RECENT_NFTS_QUERY))
+
+    async def query_akashic_frequencies(self, frequency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Query Akashic frequency data"""
+        if frequency:
+            return rows_as_dicts(await self.execute_query(FREQUENCY_BY_VALUE_QUERY, (frequency,)))
+        return rows_as_dicts(await self.execute_query(FREQUENCIES_BY_RESONANCE_QUERY))
+
+    async def validate_nft_resonance(self, token_id: str) -> Dict[str, Any]:
+        """Validate NFT resonance alignment with Akashic frequencies"""
+        return shape_resonance_validation(token_id, await self.execute_query(NFT_RESONANCE_QUERY, (token_id,)))
+
+    async def validate_nft_resonance_batch(self, token_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Validate many NFTs with one set-based join, scoring them client-side in bulk"""
+        token_ids = list(token_ids)
+        return shape_resonance_batch(token_ids, await self.execute_query(NFT_RESONANCE_BATCH_QUERY, (token_ids,)))
+
+    async def query_resonance_window(
+        self,
+        nft_id: int,
+        start: datetime,
+        end: datetime,
+        max_points: int = 500,
+        frequency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Resonance over [start, end) at the finest rollup resolution that fits in max_points"""
+        resolution, _ = choose_resolution(start, end, max_points)
+        result = await self.execute_query(RESONANCE_WINDOW_QUERY, window_params(nft_id, start, end, resolution, frequency))
+        return shape_window(nft_id, start, end, max_points, frequency, resolution, result)
+
+    async def dashboard(self) -> Dict[str, Any]:
+        """Fetch the main() dashboard reads concurrently in a single round trip of latency"""
+        tables, bloat, nfts, frequencies, autovacuum = await self.gather(
+            self.list_tables(),
+            self.analyze_table_bloat(),
+            self.query_nft_metadata(),
+            self.query_akashic_frequencies(),
+            self.get_autovacuum_settings()
+        )
+        return {
+            'tables': tables,
+            'bloat': bloat,
+            'nfts': nfts,
+            'frequencies': frequencies,
+            'autovacuum': autovacuum
+        }
+
+    async def _run_maintenance_chain(self, chain: List[MaintenanceTask], deadline: float) -> List[Dict[str, Any]]:
+        """Run one table's tasks in order, skipping what the budget no longer allows"""
+        results = []
+        for task in chain:
+            result = task.as_dict()
+            if time.monotonic() >= deadline:
+                result.update(status='skipped', error='time budget exhausted')
+            elif results and results[-1]['status'] != 'success':
+                result.update(status='skipped', error=f"previous {results[-1]['action']} did not succeed")
+            else:
+                started = time.monotonic()
+                try:
+                    # asyncpg runs statements outside a transaction block unless asked otherwise
+                    await self.execute_query(task.sql)
+                    result['status'] = 'success'
+                except Exception as e:
+                    result.update(status='failed', error=str(e))
+                result['seconds'] = round(time.monotonic() - started, 3)
+            results.append(result)
+        return results
+
+    async def optimize_database(
+        self,
+        concurrency: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        schema: str = 'public'
+    ) -> Dict[str, Any]:
+        """Run bloat-driven maintenance concurrently within a time budget (seconds)"""
+        print("⚙️  Running database optimization...")
+
+        started = time.monotonic()
+        concurrency = min(concurrency or self.config.get('maintenance_concurrency', 2), self.pool.max_size)
+        time_budget = time_budget if time_budget is not None else self.config.get('maintenance_time_budget', 600000) / 1000.0
+
+        candidates = rows_as_dicts(await self.execute_query(MAINTENANCE_CANDIDATES_QUERY, (schema,)))
+        chains = MaintenancePlanner.from_config(self.config).plan(candidates)
+        tables = [chain[0].table for chain in chains]
+        before = sizes_by_table(rows_as_dicts(await self.execute_query(RELATION_SIZES_QUERY, (schema, tables))))
+
+        deadline = started + time_budget
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_chain(chain):
+            async with semaphore:
+                return await self._run_maintenance_chain(chain, deadline)
+
+        chain_results = await self.gather(*(run_chain(chain) for chain in chains))
+        after = sizes_by_table(rows_as_dicts(await self.execute_query(RELATION_SIZES_QUERY, (schema, tables))))
+
+        results = [result for chain in chain_results for result in chain]
+        report = build_report(results, before, after, time.monotonic() - started, concurrency, time_budget)
+        report['resonance_frequency'] = f"{self.frequency}Hz"
+
+        summary = report['summary']
+        print(f"✓ Optimization complete ({summary['succeeded']}/{summary['planned']} tasks, "
+              f"{summary['elapsed_seconds']:.2f}s, {summary['bytes_reclaimed']} bytes reclaimed)")
+        return report
+
+    def get_query_stats(self) -> Dict[str, Any]:
+        """Get per-statement latency histograms, error counts and the slow-query log"""
+        return self.instrumentation.snapshot()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get async connection pool occupancy and wait-time statistics"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        return self.pool.stats()
+
+    async def close(self):
+        """Close the async connection pool"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+            print("🔌 PostgreSQL async connection pool closed")
+
+
+async def main():
+    """Main entry point for the async PostgreSQL client"""
+    print("=" * 60)
+    print("ScrollVerse Async PostgreSQL Client - 528Hz Resonance")
+    print("=" * 60)
+
+    async with AsyncPostgreSQLClient(config_from_argv(sys.argv)) as client:
+        started = time.perf_counter()
+        dashboard = await client.dashboard()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        print(f"\n📊 Dashboard fetched concurrently in {elapsed:.2f}ms:")
+        print(f"  - {len(dashboard['tables'])} tables")
+        print(f"  - {len(dashboard['bloat'])} bloated tables")
+        print(f"  - {len(dashboard['nfts'])} NFTs")
+        print(f"  - {len(dashboard['frequencies'])} Akashic frequencies")
+
+        print("\n⚙️  Database Optimization:")
+        await client.optimize_database()
+
+    print("\n✨ ScrollVerse async PostgreSQL operations complete")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
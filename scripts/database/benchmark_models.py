@@ -0,0 +1,179 @@
+"""
+Model Benchmark for ScrollVerse
+Compares generated @dataclass, __slots__ and columnar batch models and their codecs on resonance_data rows
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+try:
+    from .dataclass_generator import DataclassGenerator
+except ImportError:
+    from dataclass_generator import DataclassGenerator
+
+RESONANCE_DATA_SCHEMA = {
+    'columns': [
+        {'name': 'id', 'type': 'serial', 'primary_key': True},
+        {'name': 'nft_id', 'type': 'integer'},
+        {'name': 'frequency', 'type': 'integer'},
+        {'name': 'resonance_level', 'type': 'decimal(5,2)'},
+        {'name': 'etheric_density', 'type': 'decimal(5,2)'},
+        {'name': 'akashic_layer', 'type': 'integer'},
+        {'name': 'dimensional_access', 'type': 'integer'},
+        {'name': 'timestamp', 'type': 'timestamp'},
+        {'name': 'measurement_data', 'type': 'jsonb'}
+    ]
+}
+
+
+def load_module(generator: DataclassGenerator, table_name: str, schema: Dict[str, Any]):
+    """Generate a model module and import it"""
+    filepath = generator.generate_and_save(table_name, schema, filename=f"{table_name}_{'slots' if generator.slots else 'dataclass'}.py")
+    spec = importlib.util.spec_from_file_location(f"benchmark_{id(generator)}", filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sample_rows(count: int) -> List[tuple]:
+    """resonance_data rows as a DB-API driver returns them"""
+    started = datetime(2025, 12, 7, 13, 0, 0)
+    return [
+        (i, i % 3 + 1, 528, Decimal('0.95'), Decimal('1.10'), i % 7, 3,
+         started + timedelta(seconds=i), {'source': 'sensor'})
+        for i in range(1, count + 1)
+    ]
+
+
+def measure(label: str, build: Callable[[], List[Any]]) -> Dict[str, Any]:
+    """Time a build and measure the memory its result retains"""
+    gc.collect()
+    started = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - started
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(result)
+    del result
+
+    return {
+        'label': label,
+        'seconds': seconds,
+        'rows_per_second': count / seconds if seconds else 0.0,
+        'bytes_per_row': retained / count if count else 0.0
+    }
+
+
+def time_call(label: str, call: Callable[[], Any]) -> Dict[str, Any]:
+    """Time a warmed-up call, for aggregations that return a scalar"""
+    call()
+    started = time.perf_counter()
+    value = call()
+    return {'label': label, 'seconds': time.perf_counter() - started, 'value': value}
+
+
+def column_mean(batch, name: str) -> float:
+    """Mean of a batch column, unscaled, with or without NumPy"""
+    values = batch.column(name, copy=False)
+    total = values.sum() if hasattr(values, 'sum') else sum(values)
+    return total / len(values) / 10 ** batch.SCALES.get(name, 0)
+
+
+def codec_results(models: List[Any]) -> List[Dict[str, Any]]:
+    """Time each serialization path over the same models"""
+    Model = type(models[0])
+    texts = [model.to_json() for model in models]
+    message = Model.encode_many(models)
+    results = [
+        # The previous generated to_json()
+        time_call('json.dumps(to_dict(), default=str)', lambda: [json.dumps(m.to_dict(), default=str) for m in models]),
+        time_call('to_json()', lambda: [m.to_json() for m in models]),
+        time_call('from_json()', lambda: [Model.from_json(text) for text in texts]),
+        time_call('encode_many()', lambda: Model.encode_many(models)),
+        time_call('decode_many()', lambda: Model.decode_many(message))
+    ]
+    for result in results:
+        result['rows_per_second'] = len(models) / result['seconds'] if result['seconds'] else 0.0
+    results[1]['bytes_per_row'] = sum(len(text) for text in texts) / len(models)
+    results[3]['bytes_per_row'] = len(message) / len(models)
+    return results
+
+
+def run_benchmark(rows: int = 200000) -> Dict[str, List[Dict[str, Any]]]:
+    """Compare load, write and aggregation paths for each generation mode"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        Dataclass = load_module(DataclassGenerator(output_dir), 'resonance_data', RESONANCE_DATA_SCHEMA).ResonanceData
+        module = load_module(DataclassGenerator(output_dir, slots=True, batches=True), 'resonance_data', RESONANCE_DATA_SCHEMA)
+        Slots, Batch = module.ResonanceData, module.ResonanceDataBatch
+
+    data = sample_rows(rows)
+    columns = Slots.COLUMNS
+    dataclass_models = [Dataclass.from_dict(dict(zip(columns, row))) for row in data]
+    slots_models = [Slots.from_row(row) for row in data]
+    batch = Batch.from_rows(data)
+
+    return {
+        'rows': [
+            # The current path: rows_as_dicts() followed by from_dict()
+            measure('dataclass from_dict(dict(zip(...)))', lambda: [Dataclass.from_dict(dict(zip(columns, row))) for row in data]),
+            measure('slots from_row(row)', lambda: [Slots.from_row(row) for row in data]),
+            measure('batch from_rows(rows)', lambda: Batch.from_rows(data)),
+            measure('dataclass to_dict()', lambda: [model.to_dict() for model in dataclass_models]),
+            measure('slots to_tuple()', lambda: [model.to_tuple() for model in slots_models])
+        ],
+        'codecs': codec_results(slots_models),
+        'aggregations': [
+            time_call('mean resonance_level over objects', lambda: sum(m.resonance_level for m in slots_models) / len(slots_models)),
+            time_call('mean resonance_level over batch column', lambda: column_mean(batch, 'resonance_level'))
+        ]
+    }
+
+
+def main():
+    """Main entry point for the model benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark generated ScrollVerse models')
+    parser.add_argument('--rows', type=int, default=200000, help='resonance_data rows to load')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ScrollVerse Model Benchmark - 528Hz")
+    print("=" * 60)
+
+    results = run_benchmark(args.rows)
+
+    print(f"\n📊 {args.rows} resonance_data rows:")
+    print(f"  {'path':<40} {'seconds':>9} {'rows/s':>12} {'bytes/row':>10}")
+    for result in results['rows']:
+        print(f"  {result['label']:<40} {result['seconds']:>9.3f} {result['rows_per_second']:>12,.0f} "
+              f"{result['bytes_per_row']:>10.0f}")
+
+    print("\n📦 Serialization:")
+    for result in results['codecs']:
+        size = f"{result['bytes_per_row']:>10.0f}" if 'bytes_per_row' in result else ''
+        print(f"  {result['label']:<40} {result['seconds']:>9.3f} {result['rows_per_second']:>12,.0f} {size}")
+
+    print("\n📈 Aggregation:")
+    for result in results['aggregations']:
+        print(f"  {result['label']:<40} {result['seconds']:>9.4f}s")
+
+    load, fast = results['rows'][0], results['rows'][1]
+    print(f"\n✨ from_row is {load['seconds'] / fast['seconds']:.1f}x faster and uses "
+          f"{load['bytes_per_row'] / fast['bytes_per_row']:.1f}x less memory per row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Benchmark Suite for ScrollVerse
+Throughput, latency percentiles and peak memory of the client's hot paths and generated models, against a stored baseline
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .benchmark_models import RESONANCE_DATA_SCHEMA, load_module, sample_rows
+    from .dataclass_generator import DataclassGenerator
+    from .postgresql_client import PostgreSQLClient, load_env_config
+except ImportError:
+    from benchmark_models import RESONANCE_DATA_SCHEMA, load_module, sample_rows
+    from dataclass_generator import DataclassGenerator
+    from postgresql_client import PostgreSQLClient, load_env_config
+
+# Bump when cases or measurements change meaning; older baselines are then ignored
+BASELINE_VERSION = 1
+
+# Rows written by the suite, so a run against a real database can remove them afterwards
+BENCHMARK_TAG = {'source': 'benchmark'}
+# A real database only takes benchmark writes when its name marks it as disposable
+DEDICATED_DATABASE_MARKERS = ('bench', 'test')
+RECENT_RESONANCE_QUERY = "SELECT * FROM resonance_data ORDER BY id DESC LIMIT %s"
+CLEANUP_QUERY = "DELETE FROM resonance_data WHERE measurement_data->>'source' = %s"
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sample"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def measure(name: str, unit: str, items: int, call: Callable[[], Any], iterations: int, warmup: int = 3) -> Dict[str, Any]:
+    """
+    Time iterations calls after a warmup, then trace one more call for its peak memory
+    Memory is traced separately because tracemalloc slows every allocation
+    """
+    for _ in range(warmup):
+        call()
+    gc.collect()
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        'name': name,
+        'unit': unit,
+        'items_per_call': items,
+        'iterations': iterations,
+        'throughput': round(items * iterations / total, 1) if total else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 4),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+        'max_ms': round(latencies[-1] * 1000, 4),
+        'peak_bytes': peak
+    }
+
+
+def is_dedicated_database(database: str) -> bool:
+    """Whether a database name marks it as a benchmark or test database that may take benchmark writes"""
+    return any(marker in database.lower() for marker in DEDICATED_DATABASE_MARKERS)
+
+
+def connect_client(driver: str = 'fake') -> PostgreSQLClient:
+    """Connect to the in-process fake backend, or with psycopg2 to the PostgreSQL configured by POSTGRES_*"""
+    client = PostgreSQLClient(dict(load_env_config(), driver=driver))
+    try:
+        client.connect()
+    except Exception:
+        client.close()
+        raise
+    return client
+
+
+class BenchmarkSuite:
+    """
+    Reproducible benchmarks of the client and generated models
+    Every case runs a fixed workload with a warmup and reports throughput,
+    p50/p95/p99 latency per call and the peak memory of one call. Results are
+    compared with a JSON baseline recorded under the same driver, Python and
+    workload, and a case regresses when it gets regression_ratio times worse
+    """
+
+    def __init__(
+        self,
+        client: PostgreSQLClient,
+        lookups: int = 1000,
+        batches: int = 10,
+        rows: int = 10000,
+        baseline_path: Optional[str] = './benchmark_baseline.json',
+        regression_ratio: float = 1.5,
+        min_regression_ms: float = 0.5,
+        min_regression_bytes: int = 64 * 1024,
+        writes: bool = True
+    ):
+        """Initialize the suite; lookups and batches are the iterations of per-row and bulk cases"""
+        self.client = client
+        self.writes = writes
+        self.lookups = lookups
+        self.batches = batches
+        self.rows = rows
+        self.baseline_path = baseline_path
+        self.regression_ratio = regression_ratio
+        self.min_regression_ms = min_regression_ms
+        self.min_regression_bytes = min_regression_bytes
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Conditions a baseline must share to be comparable"""
+        return {
+            'driver': self.client.driver.name,
+            'python': f"{platform.python_implementation()} {platform.python_version()}",
+            'machine': platform.machine(),
+            'lookups': self.lookups,
+            'batches': self.batches,
+            'rows': self.rows
+        }
+
+    def client_cases(self) -> List[Dict[str, Any]]:
+        """Token lookups, resonance validation and bulk resonance_data reads and writes"""
+        client = self.client
+        nfts = client.query_nft_metadata()
+        tokens = [nft['token_id'] for nft in nfts]
+        if not tokens:
+            raise Exception("Benchmarks need at least one row in nft_metadata")
+        nft_ids = [nft['id'] for nft in nfts]
+        position = {'lookup': 0}
+
+        def next_token() -> str:
+            position['lookup'] += 1
+            return tokens[position['lookup'] % len(tokens)]
+
+        def validate_uncached():
+            if client.result_cache is not None:
+                client.result_cache.clear()
+            client.validate_nft_resonance(next_token())
+
+        # Fixed offsets from the current hour, so rows land in existing time partitions
+        base = datetime.now().replace(minute=0, second=0, microsecond=0)
+        measurements = [
+            (nft_ids[i % len(nft_ids)], 528, Decimal('0.95'), Decimal('1.10'), i % 7, 3,
+             base + timedelta(milliseconds=i), BENCHMARK_TAG)
+            for i in range(self.rows)
+        ]
+
+        def write_batch():
+            with client.resonance_writer(batch_size=min(self.rows, 5000)) as writer:
+                writer.add_many(measurements)
+
+        def read_batch():
+            for _ in client.iter_query(RECENT_RESONANCE_QUERY, (self.rows,), batch_size=1000, read_only=True):
+                pass
+
+        cases = [
+            {'name': 'query_nft_metadata(token_id)', 'unit': 'lookups', 'items': 1,
+             'call': lambda: client.query_nft_metadata(next_token()), 'iterations': self.lookups},
+            {'name': 'validate_nft_resonance', 'unit': 'validations', 'items': 1,
+             'call': lambda: client.validate_nft_resonance(next_token()), 'iterations': self.lookups},
+            {'name': 'validate_nft_resonance (uncached)', 'unit': 'validations', 'items': 1,
+             'call': validate_uncached, 'iterations': self.lookups}
+        ]
+        if self.writes:
+            cases.append({'name': 'resonance_data bulk write (COPY)', 'unit': 'rows', 'items': self.rows,
+                          'call': write_batch, 'iterations': self.batches})
+        cases.append({'name': 'resonance_data bulk read', 'unit': 'rows', 'items': self.rows,
+                      'call': read_batch, 'iterations': self.batches})
+        return cases
+
+    def model_cases(self, output_dir: str) -> List[Dict[str, Any]]:
+        """from_dict/to_json round trips on generated models and full generate_batch runs"""
+        schemas = self.client.introspect_schema()
+        generator = DataclassGenerator(output_dir)
+        cases = []
+
+        # resonance_data uses a fixed schema and rows, so the case does not depend on the backend
+        ResonanceData = load_module(generator, 'resonance_data', RESONANCE_DATA_SCHEMA).ResonanceData
+        columns = [col['name'] for col in RESONANCE_DATA_SCHEMA['columns']]
+        readings = [dict(zip(columns, row)) for row in sample_rows(self.rows)]
+        cases.append({
+            'name': 'ResonanceData from_dict/to_json/from_json', 'unit': 'rows', 'items': len(readings),
+            'call': lambda: [ResonanceData.from_json(ResonanceData.from_dict(data).to_json()) for data in readings],
+            'iterations': self.batches
+        })
+
+        if 'nft_metadata' in schemas:
+            NftMetadata = load_module(generator, 'nft_metadata', schemas['nft_metadata']).NftMetadata
+            sample = self.client.query_nft_metadata()
+            nfts = [sample[i % len(sample)] for i in range(self.rows)]
+            cases.append({
+                'name': 'NftMetadata from_dict/to_json/from_json', 'unit': 'rows', 'items': len(nfts),
+                'call': lambda: [NftMetadata.from_json(NftMetadata.from_dict(data).to_json()) for data in nfts],
+                'iterations': self.batches
+            })
+
+        batch_dir = os.path.join(output_dir, 'batch')
+        cases.append({
+            'name': 'DataclassGenerator.generate_batch', 'unit': 'tables', 'items': len(schemas),
+            'call': lambda: DataclassGenerator(batch_dir).generate_batch(schemas),
+            'iterations': self.batches
+        })
+        return cases
+
+    def load_baseline(self) -> Optional[Dict[str, Any]]:
+        """Saved results, or None when there is no baseline of this version"""
+        if not self.baseline_path or not os.path.exists(self.baseline_path):
+            return None
+        with open(self.baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        return baseline if baseline.get('version') == BASELINE_VERSION else None
+
+    def save_baseline(self, cases: List[Dict[str, Any]]):
+        """Write the baseline atomically, so an interrupted run leaves the previous one intact"""
+        directory = os.path.dirname(os.path.abspath(self.baseline_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.baseline_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': BASELINE_VERSION,
+                'captured_at': datetime.now().isoformat(),
+                'fingerprint': self.fingerprint(),
+                'cases': {case['name']: case for case in cases}
+            }, f, indent=2, sort_keys=True)
+        os.replace(temporary, self.baseline_path)
+
+    def compare(self, result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Regression of one case against its baseline, or None"""
+        if not baseline:
+            return None
+        ratio = self.regression_ratio
+        reasons = []
+        if result['throughput'] * ratio <= baseline['throughput']:
+            reasons.append(f"throughput {baseline['throughput']:,.0f} -> {result['throughput']:,.0f} {result['unit']}/s")
+        if (result['p95_ms'] >= ratio * baseline['p95_ms']
+                and result['p95_ms'] - baseline['p95_ms'] >= self.min_regression_ms):
+            reasons.append(f"p95 {baseline['p95_ms']:.3f} ms -> {result['p95_ms']:.3f} ms")
+        if (result['peak_bytes'] >= ratio * baseline['peak_bytes']
+                and result['peak_bytes'] - baseline['peak_bytes'] >= self.min_regression_bytes):
+            reasons.append(f"peak memory {baseline['peak_bytes']:,} -> {result['peak_bytes']:,} bytes")
+        if not reasons:
+            return None
+        return {'name': result['name'], 'reasons': reasons}
+
+    def run(self, save_baseline: bool = False) -> Dict[str, Any]:
+        """Run every case, compare with the baseline and optionally record this run as the new baseline"""
+        started = time.monotonic()
+        results = []
+        # The client reports every call on stdout; keep it out of the timings' terminal I/O
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink), \
+                tempfile.TemporaryDirectory() as output_dir:
+            try:
+                for case in self.client_cases() + self.model_cases(output_dir):
+                    results.append(measure(case['name'], case['unit'], case['items'], case['call'], case['iterations']))
+            finally:
+                if self.writes and self.client.driver.name != 'fake':
+                    self.client.execute_query(CLEANUP_QUERY, (BENCHMARK_TAG['source'],))
+
+        baseline = self.load_baseline()
+        comparable = baseline is not None and baseline.get('fingerprint') == self.fingerprint()
+        saved = comparable and baseline.get('cases') or {}
+        regressions = [r for r in (self.compare(result, saved.get(result['name'])) for result in results) if r]
+        if save_baseline and self.baseline_path:
+            self.save_baseline(results)
+
+        return {
+            'cases': results,
+            'regressions': regressions,
+            'summary': {
+                'cases': len(results),
+                'regressions': len(regressions),
+                'baseline': self.baseline_path if comparable else None,
+                'baseline_saved': bool(save_baseline and self.baseline_path),
+                'fingerprint': self.fingerprint(),
+                'elapsed_seconds': round(time.monotonic() - started, 3)
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+def main():
+    """Main entry point for the benchmark suite"""
+    parser = argparse.ArgumentParser(description='Benchmark the ScrollVerse database client and generated models')
+    parser.add_argument('--driver', choices=('fake', 'psycopg2'), default='fake',
+                        help='fake runs in process; psycopg2 uses the PostgreSQL configured by POSTGRES_*')
+    parser.add_argument('--allow-writes', action='store_true',
+                        help='with psycopg2, run the bulk write case; the database name must contain '
+                             + ' or '.join(DEDICATED_DATABASE_MARKERS))
+    parser.add_argument('--lookups', type=int, default=1000, help='calls per lookup case')
+    parser.add_argument('--batches', type=int, default=10, help='calls per bulk and model case')
+    parser.add_argument('--rows', type=int, default=10000, help='rows per bulk and model call')
+    parser.add_argument('--baseline', default='./benchmark_baseline.json', help='baseline file to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='record this run as the new baseline')
+    parser.add_argument('--regression-ratio', type=float, default=1.5, help='how much worse counts as a regression')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    # Benchmark rows reach triggers and rollups before the cleanup DELETE, so never write to a shared database
+    database = load_env_config()['database']
+    if args.driver != 'fake' and args.allow_writes and not is_dedicated_database(database):
+        parser.error(f"refusing to write benchmark rows to {database!r}; "
+                     f"point POSTGRES_DATABASE at a dedicated database whose name contains "
+                     f"{' or '.join(DEDICATED_DATABASE_MARKERS)}")
+    writes = args.driver == 'fake' or args.allow_writes
+
+    # With --json, connection messages go to stderr so stdout stays parseable
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        client = connect_client(args.driver)
+        try:
+            suite = BenchmarkSuite(client, args.lookups, args.batches, args.rows, args.baseline, args.regression_ratio,
+                                   writes=writes)
+            report = suite.run(save_baseline=args.save_baseline)
+        finally:
+            client.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report['regressions'] else 0)
+
+    print("=" * 60)
+    print("ScrollVerse Benchmark Suite - 528Hz")
+    print("=" * 60)
+    fingerprint = report['summary']['fingerprint']
+    print(f"\n📊 {fingerprint['driver']} driver, {fingerprint['python']}, {fingerprint['machine']}:")
+    print(f"  {'case':<44} {'throughput':>22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9}")
+    for result in report['cases']:
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s"
+        print(f"  {result['name']:<44} {throughput:>22} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} "
+              f"{result['p99_ms']:>9.3f} {result['peak_bytes'] / 1024:>9.0f}")
+
+    if not writes:
+        print("\nℹ️  Skipped the bulk write case; pass --allow-writes against a dedicated benchmark database to run it")
+    if report['summary']['baseline'] is None and not report['summary']['baseline_saved']:
+        print(f"\nℹ️  No comparable baseline at {args.baseline}; run with --save-baseline to record one")
+    elif report['summary']['baseline'] is None:
+        print()
+    elif report['regressions']:
+        print(f"\n⚠️  {len(report['regressions'])} regressions against {args.baseline}:")
+        for regression in report['regressions']:
+            print(f"  - {regression['name']}: {'; '.join(regression['reasons'])}")
+    else:
+        print(f"\n✓ No regressions against {args.baseline}")
+    if report['summary']['baseline_saved']:
+        print(f"💾 Saved baseline to {args.baseline}")
+
+    print(f"\n✨ {len(report['cases'])} cases in {report['summary']['elapsed_seconds']:.1f}s")
+    sys.exit(1 if report['regressions'] else 0)
+
+
+if __name__ == "__main__":
+    main()
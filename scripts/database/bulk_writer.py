@@ -0,0 +1,283 @@
+"""
+Bulk Writer for ScrollVerse
+COPY-based batched ingest for the resonance_data time-series table
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+
+class BulkWriterError(Exception):
+    """
+    Raised when a background COPY flush fails
+    batches holds the COPY text lines of every batch that was not written, in
+    the order they failed, and errors the exception each one raised
+    """
+
+    def __init__(
+        self,
+        message: str,
+        batches: Optional[List[List[str]]] = None,
+        errors: Optional[List[BaseException]] = None
+    ):
+        """Keep the unwritten batches so the caller can retry or store them"""
+        super().__init__(message)
+        self.batches = batches or []
+        self.errors = errors or []
+
+
+class BackpressureTimeout(BulkWriterError):
+    """Raised when the writer stays full for longer than put_timeout"""
+
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+_encode_json = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str).encode
+
+
+def encode_copy_value(value: Any) -> str:
+    """Encode one value in COPY text format"""
+    kind = type(value)
+    if value is None:
+        return '\\N'
+    if kind is int or kind is float or kind is Decimal:
+        return str(value)
+    if kind is str:
+        return value.translate(_ESCAPES)
+    if kind is bool:
+        return 't' if value else 'f'
+    if kind is datetime or kind is date:
+        return value.isoformat()
+    if kind is dict or kind is list:
+        # Compact JSON with one escape pass; JSON never contains raw tabs or newlines
+        return _encode_json(value).replace('\\', '\\\\')
+    if kind is bytes:
+        return '\\\\x' + value.hex()
+    return str(value).translate(_ESCAPES)
+
+
+class ResonanceBulkWriter:
+    """
+    Buffered COPY writer for resonance_data
+    Rows are encoded on add(), handed to a background flusher in batches of
+    batch_size or every flush_interval seconds, and loaded with COPY FROM STDIN
+    """
+
+    COLUMNS = (
+        'nft_id',
+        'frequency',
+        'resonance_level',
+        'etheric_density',
+        'akashic_layer',
+        'dimensional_access',
+        'timestamp',
+        'measurement_data'
+    )
+
+    def __init__(
+        self,
+        client,
+        batch_size: int = 5000,
+        flush_interval: float = 1.0,
+        max_pending_batches: int = 4,
+        put_timeout: Optional[float] = None,
+        table: str = 'resonance_data',
+        columns: Sequence[str] = COLUMNS
+    ):
+        """Initialize the writer; call start() before adding rows"""
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.table = table
+        self.columns = list(columns)
+        self._timestamp_index = self.columns.index('timestamp') if 'timestamp' in self.columns else None
+
+        self._buffer: List[str] = []
+        self._buffer_started = time.monotonic()
+        self._lock = threading.Lock()
+        self._copy_lock = threading.Lock()
+        self._pending: 'queue.Queue[Optional[List[str]]]' = queue.Queue(maxsize=max_pending_batches)
+        self._flusher: Optional[threading.Thread] = None
+        self._failed: List[Tuple[List[str], BaseException]] = []
+        self._started_at: Optional[float] = None
+        self._stats = {
+            'rows_written': 0,
+            'rows_failed': 0,
+            'batches': 0,
+            'bytes': 0,
+            'copy_seconds': 0.0,
+            'backpressure_waits': 0,
+            'backpressure_seconds': 0.0
+        }
+
+    def __enter__(self) -> 'ResonanceBulkWriter':
+        """Start the writer when entering a with block"""
+        return self.start() if self._flusher is None else self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Drain and stop the writer when leaving a with block"""
+        self.close()
+
+    def start(self) -> 'ResonanceBulkWriter':
+        """Start the background flusher thread"""
+        self._started_at = time.monotonic()
+        self._flusher = threading.Thread(target=self._flush_loop, name='scrollverse-resonance-writer', daemon=True)
+        self._flusher.start()
+        return self
+
+    def _raise_error(self):
+        """Surface background flush failures to the producer, handing back the unwritten batches"""
+        with self._lock:
+            failed, self._failed = self._failed, []
+        if failed:
+            batches = [batch for batch, _ in failed]
+            errors = [error for _, error in failed]
+            raise BulkWriterError(
+                f"COPY into {self.table} failed for {len(batches)} batches "
+                f"({sum(len(batch) for batch in batches)} rows): {errors[0]}",
+                batches=batches,
+                errors=errors
+            ) from errors[0]
+
+    def _encode(self, measurement: Union[Dict[str, Any], Sequence[Any]]) -> str:
+        """Encode one measurement as a COPY text-format line, stamped now if it has no timestamp"""
+        if isinstance(measurement, dict):
+            values = [measurement.get(column) for column in self.columns]
+        else:
+            values = measurement
+        index = self._timestamp_index
+        # COPY writes \N rather than the column default, and resonance_data is partitioned on timestamp
+        if index is not None and values[index] is None:
+            values = list(values)
+            values[index] = datetime.now()
+        return '\t'.join([encode_copy_value(value) for value in values])
+
+    def add(self, measurement: Union[Dict[str, Any], Sequence[Any]]):
+        """Buffer one measurement, blocking while the writer is full"""
+        self._raise_error()
+        line = self._encode(measurement)
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(line)
+            batch = self._take_batch() if len(self._buffer) >= self.batch_size else None
+        if batch:
+            self._submit(batch)
+
+    def add_many(self, measurements: Iterable[Union[Dict[str, Any], Sequence[Any]]]):
+        """Buffer many measurements"""
+        for measurement in measurements:
+            self.add(measurement)
+
+    def _take_batch(self) -> List[str]:
+        """Swap out the current buffer; caller holds the lock"""
+        batch, self._buffer = self._buffer, []
+        return batch
+
+    def _submit(self, batch: List[str]):
+        """Queue a batch for the flusher, applying backpressure when the queue is full"""
+        try:
+            self._pending.put_nowait(batch)
+            return
+        except queue.Full:
+            pass
+
+        waited = time.monotonic()
+        try:
+            self._pending.put(batch, timeout=self.put_timeout)
+        except queue.Full:
+            raise BackpressureTimeout(
+                f"Writer for {self.table} stayed full for {self.put_timeout}s "
+                f"({self._pending.maxsize} batches pending)"
+            )
+        finally:
+            with self._lock:
+                self._stats['backpressure_waits'] += 1
+                self._stats['backpressure_seconds'] += time.monotonic() - waited
+
+    def _flush_loop(self):
+        """Copy pending batches and flush partial buffers older than flush_interval"""
+        while True:
+            try:
+                batch = self._pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # Hold the copy lock from take to finish so flush() can wait on it
+                with self._copy_lock:
+                    with self._lock:
+                        due = self._buffer and time.monotonic() - self._buffer_started >= self.flush_interval
+                        batch = self._take_batch() if due else None
+                    if batch:
+                        self._copy(batch)
+                continue
+
+            try:
+                if batch is None:
+                    return
+                self._copy(batch)
+            finally:
+                self._pending.task_done()
+
+    def _copy(self, batch: List[str]):
+        """Load one batch with COPY FROM STDIN"""
+        data = '\n'.join(batch) + '\n'
+        started = time.monotonic()
+        try:
+            self.client.copy_from_stdin(self.table, self.columns, data)
+        except Exception as e:
+            with self._lock:
+                self._stats['rows_failed'] += len(batch)
+                self._failed.append((batch, e))
+            return
+        self._stats['copy_seconds'] += time.monotonic() - started
+        self._stats['rows_written'] += len(batch)
+        self._stats['batches'] += 1
+        self._stats['bytes'] += len(data)
+
+    def flush(self):
+        """Hand the partial buffer to the flusher and wait until everything is copied"""
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._submit(batch)
+        self._pending.join()
+        with self._copy_lock:
+            pass
+        self._raise_error()
+
+    def retry(self, error: BulkWriterError):
+        """Queue the batches a BulkWriterError handed back for another COPY"""
+        for batch in error.batches:
+            self._submit(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput and backlog statistics"""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        copy_seconds = self._stats['copy_seconds']
+        return {
+            **self._stats,
+            'buffered': len(self._buffer),
+            'pending_batches': self._pending.qsize(),
+            'rows_per_second': self._stats['rows_written'] / copy_seconds if copy_seconds else 0.0,
+            'ingest_rows_per_second': self._stats['rows_written'] / elapsed if elapsed else 0.0
+        }
+
+    def close(self):
+        """Flush remaining rows and stop the flusher thread"""
+        if self._flusher is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._pending.put(None)
+            self._flusher.join()
+            self._flusher = None
+
+        stats = self.stats()
+        print(f"✓ Wrote {stats['rows_written']} rows to {self.table} in {stats['batches']} COPY batches "
+              f"({stats['rows_per_second']:.0f} rows/s)")
@@ -0,0 +1,463 @@
+"""
+Connection Pool for ScrollVerse
+Bounded thread-safe and asyncio pools of PostgreSQL connections with liveness checks
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    from .drivers import AsyncDriver, Driver
+except ImportError:
+    from drivers import AsyncDriver, Driver
+
+
+class PoolError(Exception):
+    """Base error for connection pool failures"""
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class PoolClosedError(PoolError):
+    """Raised when using a pool after close()"""
+
+
+class _PoolEntry:
+    """Bookkeeping for one pooled connection"""
+
+    __slots__ = ('connection', 'created_at', 'last_used', 'state')
+
+    def __init__(self, connection):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+        self.state: Dict[str, Any] = {}
+
+
+class _BasePool:
+    """Settings, bounds validation and statistics shared by the sync and async pools"""
+
+    def __init__(
+        self,
+        driver,
+        config: Dict[str, Any],
+        min_size: int = 1,
+        max_size: int = 10,
+        checkout_timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        ping_interval: float = 1.0,
+        reap_interval: Optional[float] = None
+    ):
+        """Initialize pool settings without opening connections"""
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds: min_size={min_size}, max_size={max_size}")
+
+        self.driver = driver
+        self.config = config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.reap_interval = reap_interval
+
+        self._idle = deque()
+        self._checked_out: Dict[int, _PoolEntry] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'reaped': 0,
+            'liveness_failures': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], driver):
+        """Build a pool from the POSTGRES_* settings loaded by PostgreSQLClient"""
+        return cls(
+            driver=driver,
+            config=config,
+            min_size=config.get('min_connections', 1),
+            max_size=config.get('max_connections', 10),
+            checkout_timeout=config.get('checkout_timeout', 30000) / 1000.0,
+            idle_timeout=config.get('idle_timeout', 30000) / 1000.0,
+            ping_interval=config.get('ping_interval', 1000) / 1000.0,
+            reap_interval=config.get('reap_interval', 10000) / 1000.0
+        )
+
+    def _timeout_error(self, timeout: float) -> PoolTimeoutError:
+        """Count a checkout timeout and build its error"""
+        self._stats['timeouts'] += 1
+        return PoolTimeoutError(
+            f"No connection available within {timeout:.3f}s "
+            f"({self._size}/{self.max_size} in use)"
+        )
+
+    def _record_checkout(self, entry: _PoolEntry, waited: float):
+        """Track a successful checkout and its wait time"""
+        self._checked_out[id(entry.connection)] = entry
+        self._stats['checkouts'] += 1
+        self._stats['wait_time_total'] += waited
+        self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+
+    def _expired_idle(self) -> List[_PoolEntry]:
+        """Pop idle entries past idle_timeout while staying at or above min_size"""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        # Oldest entries sit at the left of the deque; checkout pops from the right
+        while self._idle and self._idle[0].last_used < cutoff and self._size - len(expired) > self.min_size:
+            expired.append(self._idle.popleft())
+        self._stats['reaped'] += len(expired)
+        return expired
+
+    def connection_state(self, connection) -> Dict[str, Any]:
+        """Per-connection scratch state that lives as long as the pooled connection"""
+        entry = self._checked_out.get(id(connection))
+        if entry is None:
+            raise PoolError("Connection is not checked out from this pool")
+        return entry.state
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Build the stats() payload"""
+        checkouts = self._stats['checkouts']
+        return {
+            'size': self._size,
+            'idle': len(self._idle),
+            'in_use': len(self._checked_out),
+            'waiting': self._waiting,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+            **self._stats,
+            'wait_time_avg': self._stats['wait_time_total'] / checkouts if checkouts else 0.0
+        }
+
+
+class ConnectionPool(_BasePool):
+    """
+    Bounded pool of driver connections
+    Hands out at most max_size connections, keeps min_size warm, reaps idle
+    connections and validates liveness on checkout
+    """
+
+    def __init__(self, driver: Driver, config: Dict[str, Any], **settings):
+        """Initialize pool settings without opening connections"""
+        super().__init__(driver, config, **settings)
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def open(self):
+        """Open min_size connections and start the idle reaper"""
+        for _ in range(self.min_size):
+            with self._cond:
+                if self._size >= self.min_size:
+                    break
+                self._size += 1
+            entry = self._create()
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+        if self.reap_interval and self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_loop, name='scrollverse-pool-reaper', daemon=True)
+            self._reaper.start()
+
+    def _create(self) -> _PoolEntry:
+        """Open a connection for a slot that has already been reserved"""
+        try:
+            connection = self.driver.connect(self.config)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return _PoolEntry(connection)
+
+    def _discard(self, entry: _PoolEntry):
+        """Close a connection and free its slot"""
+        self.driver.close(entry.connection)
+        with self._cond:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._cond.notify()
+
+    def _reserve(self, deadline: float, timeout: float):
+        """Take an idle entry or a creation slot, waiting until the deadline"""
+        with self._cond:
+            counted = False
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Connection pool is closed")
+                    if self._idle:
+                        return self._idle.pop()
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timeout_error(timeout)
+                    if not counted:
+                        self._waiting += 1
+                        counted = True
+                    self._cond.wait(remaining)
+            finally:
+                if counted:
+                    self._waiting -= 1
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a live connection, blocking up to timeout seconds"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            entry = self._reserve(deadline, timeout)
+            if entry is None:
+                entry = self._create()
+            elif time.monotonic() - entry.last_used >= self.ping_interval and not self.driver.ping(entry.connection):
+                with self._cond:
+                    self._stats['liveness_failures'] += 1
+                self._discard(entry)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._record_checkout(entry, waited)
+            return entry.connection
+
+    def release(self, connection, discard: bool = False):
+        """Return a checked-out connection to the pool"""
+        with self._cond:
+            entry = self._checked_out.pop(id(connection), None)
+        if entry is None:
+            raise PoolError("Connection does not belong to this pool")
+
+        if not discard and not self._closed:
+            try:
+                self.driver.reset(connection)
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if not discard and not self._closed:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+        self._discard(entry)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager that checks a connection out and always returns it"""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            # release() rolls back and discards connections that fail to reset
+            self.release(connection)
+
+    def reap_idle(self) -> int:
+        """Close connections idle longer than idle_timeout, keeping min_size open"""
+        with self._cond:
+            expired = self._expired_idle()
+        for entry in expired:
+            self._discard(entry)
+        return len(expired)
+
+    def _reap_loop(self):
+        """Background loop that reaps idle connections until close()"""
+        while not self._stop.wait(self.reap_interval):
+            self.reap_idle()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and checkout wait times"""
+        with self._cond:
+            return self._snapshot()
+
+    def close(self):
+        """Close idle connections and refuse new checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        self._stop.set()
+        for entry in idle:
+            self._discard(entry)
+        if self._reaper is not None:
+            self._reaper.join(timeout=1.0)
+            self._reaper = None
+
+
+class AsyncConnectionPool(_BasePool):
+    """
+    Bounded asyncio pool of async driver connections
+    Same sizing, timeout, reaping and liveness rules as ConnectionPool, for
+    use from a single event loop
+    """
+
+    def __init__(self, driver: AsyncDriver, config: Dict[str, Any], **settings):
+        """Initialize pool settings without opening connections"""
+        super().__init__(driver, config, **settings)
+        self._cond: Optional[asyncio.Condition] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def open(self):
+        """Open min_size connections and start the idle reaper task"""
+        self._cond = asyncio.Condition()
+        self._size += self.min_size
+        results = await asyncio.gather(*(self._create() for _ in range(self.min_size)), return_exceptions=True)
+        entries = [r for r in results if isinstance(r, _PoolEntry)]
+        async with self._cond:
+            self._idle.extend(entries)
+            self._cond.notify(len(entries))
+        failures = [r for r in results if not isinstance(r, _PoolEntry)]
+        if failures:
+            raise failures[0]
+
+        if self.reap_interval and self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    async def _create(self) -> _PoolEntry:
+        """Open a connection for a slot that has already been reserved"""
+        try:
+            connection = await self.driver.connect(self.config)
+        except Exception:
+            async with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._stats['created'] += 1
+        return _PoolEntry(connection)
+
+    async def _discard(self, entry: _PoolEntry):
+        """Close a connection and free its slot"""
+        await self.driver.close(entry.connection)
+        async with self._cond:
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._cond.notify()
+
+    async def _reserve(self, deadline: float, timeout: float):
+        """Take an idle entry or a creation slot, waiting until the deadline"""
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout_error(timeout)
+                self._waiting += 1
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._waiting -= 1
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """Check out a live connection, waiting up to timeout seconds"""
+        if self._cond is None:
+            raise PoolClosedError("Connection pool has not been opened")
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            entry = await self._reserve(deadline, timeout)
+            if entry is None:
+                entry = await self._create()
+            elif time.monotonic() - entry.last_used >= self.ping_interval and not await self.driver.ping(entry.connection):
+                self._stats['liveness_failures'] += 1
+                await self._discard(entry)
+                continue
+
+            self._record_checkout(entry, time.monotonic() - started)
+            return entry.connection
+
+    async def release(self, connection, discard: bool = False):
+        """Return a checked-out connection to the pool"""
+        entry = self._checked_out.pop(id(connection), None)
+        if entry is None:
+            raise PoolError("Connection does not belong to this pool")
+
+        if not discard and not self._closed:
+            try:
+                await self.driver.reset(connection)
+            except Exception:
+                discard = True
+
+        if not discard and not self._closed:
+            async with self._cond:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                self._cond.notify()
+            return
+        await self._discard(entry)
+
+    @asynccontextmanager
+    async def connection(self, timeout: Optional[float] = None):
+        """Async context manager that checks a connection out and always returns it"""
+        connection = await self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            # release() rolls back and discards connections that fail to reset
+            await self.release(connection)
+
+    async def reap_idle(self) -> int:
+        """Close connections idle longer than idle_timeout, keeping min_size open"""
+        async with self._cond:
+            expired = self._expired_idle()
+        for entry in expired:
+            await self._discard(entry)
+        return len(expired)
+
+    async def _reap_loop(self):
+        """Background task that reaps idle connections until close()"""
+        while not self._closed:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap_idle()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool occupancy and checkout wait times"""
+        return self._snapshot()
+
+    async def close(self):
+        """Close idle connections and refuse new checkouts"""
+        if self._cond is None:
+            return
+        async with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for entry in idle:
+            await self._discard(entry)
@@ -4,10 +4,22 @@ Generates Python dataclasses from PostgreSQL table schemas
 Frequency: 528Hz | Akashic Schema Alignment
 """
 
+import hashlib
+import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from .postgresql_client import PostgreSQLClient, config_from_argv
+    from .schema_introspection import schema_hash
+except ImportError:
+    from postgresql_client import PostgreSQLClient, config_from_argv
+    from schema_introspection import schema_hash
 
 
 class DataclassGenerator:
@@ -40,10 +52,74 @@ class DataclassGenerator:
         'bytea': 'bytes'
     }
     
-    def __init__(self, output_dir: str = './generated/dataclasses'):
-        """Initialize dataclass generator"""
+    # Columnar storage per base type: (kind, array typecode)
+    BATCH_STORAGE = {
+        'integer': ('int', 'q'),
+        'bigint': ('int', 'q'),
+        'smallint': ('int', 'q'),
+        'serial': ('int', 'q'),
+        'bigserial': ('int', 'q'),
+        'real': ('float', 'd'),
+        'double': ('float', 'd'),
+        'double precision': ('float', 'd'),
+        'boolean': ('bool', 'b'),
+        'decimal': ('decimal', 'q'),
+        'numeric': ('decimal', 'q'),
+        'timestamp': ('timestamp', 'q'),
+        'timestamptz': ('timestamptz', 'q'),
+        'timestamp with time zone': ('timestamptz', 'q'),
+        'date': ('date', 'q')
+    }
+    
+    # Codec handling per base type; anything unlisted is encoded as JSON
+    CODEC_KINDS = {
+        'integer': 'int',
+        'bigint': 'int',
+        'smallint': 'int',
+        'serial': 'int',
+        'bigserial': 'int',
+        'real': 'float',
+        'double': 'float',
+        'double precision': 'float',
+        'boolean': 'bool',
+        'varchar': 'str',
+        'char': 'str',
+        'text': 'str',
+        'decimal': 'decimal',
+        'numeric': 'decimal',
+        'timestamp': 'timestamp',
+        'timestamptz': 'timestamptz',
+        'timestamp with time zone': 'timestamptz',
+        'date': 'date',
+        'time': 'time',
+        'uuid': 'uuid',
+        'bytea': 'bytes'
+    }
+    
+    # Integer column ranges enforced by the generated validators
+    INTEGER_RANGES = {
+        'smallint': (-2 ** 15, 2 ** 15 - 1),
+        'integer': (-2 ** 31, 2 ** 31 - 1),
+        'serial': (-2 ** 31, 2 ** 31 - 1),
+        'bigint': (-2 ** 63, 2 ** 63 - 1),
+        'bigserial': (-2 ** 63, 2 ** 63 - 1)
+    }
+    
+    # Version of the binary record layout; bump when the encoding changes
+    CODEC_VERSION = 1
+    
+    # Scale for DECIMAL/NUMERIC columns declared without one
+    DEFAULT_DECIMAL_SCALE = 6
+    
+    # Per-table schema hashes of the last incremental generation, kept in output_dir
+    MANIFEST_FILENAME = '.schema_hashes.json'
+    
+    def __init__(self, output_dir: str = './generated/dataclasses', slots: bool = False, batches: bool = False):
+        """Initialize dataclass generator; slots=True emits compact row models, batches=True columnar containers"""
         self.output_dir = output_dir
         self.frequency = 528
+        self.slots = slots
+        self.batches = batches
         os.makedirs(output_dir, exist_ok=True)
         
     def generate_from_schema(self, table_name: str, schema: Dict[str, Any]) -> str:
@@ -83,25 +159,28 @@ class DataclassGenerator:
     def _build_imports(self, columns: List[Dict[str, Any]]) -> List[str]:
         """Build import statements based on column types"""
         imports = [
+            'import json',
+            'import struct',
             'from dataclasses import dataclass, field',
-            'from typing import Optional, Dict, Any'
+            'from operator import attrgetter',
+            'from typing import ClassVar, Optional, Dict, Any, Iterable, Iterator, List, Tuple, Union' if self.slots
+            else 'from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple, Union'
         ]
         
-        type_imports = set()
-        for col in columns:
-            base_type = col['type'].split('(')[0].lower()
-            python_type = self.TYPE_MAPPING.get(base_type, 'Any')
-            
-            if 'datetime' in python_type:
-                type_imports.add('from datetime import datetime')
-            elif 'date' in python_type and 'datetime' not in python_type:
-                type_imports.add('from datetime import date')
-            elif 'time' in python_type and 'datetime' not in python_type:
-                type_imports.add('from datetime import time')
-            elif 'Decimal' in python_type:
-                type_imports.add('from decimal import Decimal')
-            elif 'UUID' in python_type:
-                type_imports.add('from uuid import UUID')
+        # The codecs and batches convert timestamps and decimals, so these are always needed
+        kinds = {self._codec_column(col)['kind'] for col in columns}
+        datetime_names = {'date', 'datetime', 'timedelta', 'timezone'} | ({'time'} & kinds)
+        type_imports = {'from decimal import Decimal', f"from datetime import {', '.join(sorted(datetime_names))}"}
+        if 'uuid' in kinds:
+            type_imports.add('from uuid import UUID')
+        if 'bytes' in kinds:
+            imports.insert(0, 'import base64')
+        if 'float' in kinds:
+            imports.insert(imports.index('import json') + 1, 'import math')
+        
+        if self.batches:
+            imports[-1] = 'from typing import ClassVar, Optional, Dict, Any, Iterable, Iterator, List, Sequence, Tuple, Union'
+            imports.insert(0, 'from array import array')
         
         imports.extend(sorted(type_imports))
         return imports
@@ -110,14 +189,21 @@ class DataclassGenerator:
         """Build dataclass fields from columns"""
         fields = []
         
+        if self.slots:
+            # Column order for from_row/to_tuple; select these instead of * so positions line up
+            fields.append(f"    COLUMNS: ClassVar[Tuple[str, ...]] = {tuple(col['name'] for col in columns)!r}")
+        
+        defaulted = False
         for col in columns:
             base_type = col['type'].split('(')[0].lower()
             python_type = self.TYPE_MAPPING.get(base_type, 'Any')
             
-            # Make field optional if nullable (assume all non-PK are nullable)
-            if not col.get('primary_key', False):
+            # Make field optional if nullable (assume all non-PK are nullable); key
+            # columns after the first defaulted field need a default too
+            if not col.get('primary_key', False) or defaulted:
                 python_type = f"Optional[{python_type}]"
                 default = " = None"
+                defaulted = True
             else:
                 default = ""
             
@@ -149,22 +235,378 @@ class DataclassGenerator:
         return cls(**{{k: v for k, v in data.items() if k in valid_fields}})"""
         methods.append(from_dict)
         
-        # to_json method
-        to_json = f"""    def to_json(self) -> str:
-        \"\"\"Convert dataclass to JSON string\"\"\"
-        import json
-        return json.dumps(self.to_dict(), default=str)"""
-        methods.append(to_json)
-        
-        # validate method
-        validate = f"""    def validate(self) -> bool:
-        \"\"\"Validate dataclass fields against ScrollVerse constraints\"\"\"
-        # Add custom validation logic here
-        return True"""
-        methods.append(validate)
+        if self.slots:
+            # from_row classmethod: positional, no per-row dict
+            from_row = f"""    @classmethod
+    def from_row(cls, row: Tuple[Any, ...]) -> '{class_name}':
+        \"\"\"Create dataclass instance from a row tuple in COLUMNS order\"\"\"
+        return cls(*row)"""
+            methods.append(from_row)
+            
+            # to_tuple method
+            to_tuple = f"""    def to_tuple(self) -> Tuple[Any, ...]:
+        \"\"\"Convert dataclass to a row tuple in COLUMNS order for writes\"\"\"
+        return ({', '.join(f"self.{name}" for name in col_names)}{',' if len(col_names) == 1 else ''})"""
+            methods.append(to_tuple)
+        
+        # JSON and binary codecs
+        methods.extend(self._build_codec_methods(class_name, columns))
+        
+        # Schema-derived validators
+        methods.extend(self._build_validators(columns))
         
         return methods
     
+    def _constraint_checks(self, columns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Per-column checks derived from the schema: a condition on {v} that flags a violation"""
+        checks = []
+        for i, col in enumerate(columns):
+            base_type = col['type'].split('(')[0].lower()
+            modifiers = [part.strip() for part in col['type'][len(base_type):].strip('() ').split(',') if part.strip()]
+            
+            # NOT NULL without a default; defaulted columns are filled in by the database
+            nullable = col.get('nullable', not col.get('primary_key', False))
+            if not nullable and col.get('default') is None and base_type not in ('serial', 'bigserial'):
+                checks.append({'index': i, 'name': col['name'], 'test': '{v} is None',
+                               'message': 'null value violates not-null constraint'})
+            
+            # Trailing spaces past the limit are truncated rather than rejected
+            if base_type in ('varchar', 'char') and modifiers:
+                length = int(modifiers[0])
+                checks.append({'index': i, 'name': col['name'],
+                               'test': f"{{v}} is not None and len({{v}}) > {length} and {{v}}[{length}:].strip(' ')",
+                               'message': f"value too long for {col['type']}"})
+            
+            # decimal(p,s) rounds to s places, then needs fewer than p - s integer digits
+            elif base_type in ('decimal', 'numeric') and modifiers:
+                precision = int(modifiers[0])
+                scale = int(modifiers[1]) if len(modifiers) > 1 else 0
+                limit = Decimal(10) ** (precision - scale) - Decimal(5).scaleb(-scale - 1)
+                checks.append({'index': i, 'name': col['name'],
+                               'test': f"{{v}} is not None and abs({{v}}) >= _{col['name'].upper()}_LIMIT",
+                               'message': f"numeric field overflow for {col['type']}",
+                               'constant': (f"_{col['name'].upper()}_LIMIT", f"Decimal('{limit}')")})
+            
+            elif base_type in self.INTEGER_RANGES:
+                low, high = self.INTEGER_RANGES[base_type]
+                checks.append({'index': i, 'name': col['name'],
+                               'test': f"{{v}} is not None and not {low} <= {{v}} <= {high}",
+                               'message': f"value out of range for {base_type}"})
+        return checks
+    
+    def _unique_keys(self, columns: List[Dict[str, Any]]) -> List[Tuple[int, ...]]:
+        """Column positions of the primary key and of each unique column"""
+        keys = []
+        primary = tuple(i for i, col in enumerate(columns) if col.get('primary_key'))
+        if primary:
+            keys.append(primary)
+        for i, col in enumerate(columns):
+            if col.get('unique') and (i,) not in keys:
+                keys.append((i,))
+        return keys
+    
+    def _build_validators(self, columns: List[Dict[str, Any]]) -> List[str]:
+        """Build validate(), violations() for one row and validate_many() for a batch"""
+        checks = self._constraint_checks(columns)
+        names = tuple(col['name'] for col in columns)
+        
+        # violations: straight-line checks over the instance's fields
+        row_lines = []
+        for i in sorted({check['index'] for check in checks}):
+            row_lines.append(f"        v{i} = self.{names[i]}")
+        for check in checks:
+            row_lines.append(f"        if {check['test'].format(v='v' + str(check['index']))}:")
+            row_lines.append(f"            errors.append(({check['name']!r}, {check['message']!r}))")
+        violations = f"""    def violations(self) -> List[Tuple[str, str]]:
+        \"\"\"Schema constraints this row breaks as (column, message); uniqueness needs validate_many\"\"\"
+        errors: List[Tuple[str, str]] = []
+{chr(10).join(row_lines)}
+        return errors"""
+        
+        validate = """    def validate(self) -> bool:
+        \"\"\"Check the row against the column constraints of its table\"\"\"
+        return not self.violations()"""
+        
+        # validate_many: one comprehension per check over a whole column, then duplicate keys
+        batch_lines = [f"        {', '.join(f'c{i}' for i in range(len(names)))}{',' if len(names) == 1 else ''} = "
+                       f"_columns_of(rows, {names!r})"]
+        for check in checks:
+            batch_lines.append(
+                f"        for i in [i for i, v in enumerate(c{check['index']}) if {check['test'].format(v='v')}]:"
+            )
+            batch_lines.append(f"            violations.setdefault(i, []).append(({check['name']!r}, {check['message']!r}))")
+        for key in self._unique_keys(columns):
+            if len(key) == 1:
+                values, present = f'c{key[0]}', 'v is not None'
+            else:
+                values, present = f"zip({', '.join(f'c{i}' for i in key)})", 'None not in v'
+            label = ', '.join(names[i] for i in key)
+            batch_lines.extend([
+                "        seen = {}",
+                f"        for i, v in enumerate({values}):",
+                f"            if {present} and (first := seen.setdefault(v, i)) != i:",
+                f"                violations.setdefault(i, []).append(({label!r}, f'duplicate key, first at row {{first}}'))"
+            ])
+        validate_many = f"""    @classmethod
+    def validate_many(cls, rows: Any) -> Dict[int, List[Tuple[str, str]]]:
+        \"\"\"
+        Check many rows at once, column by column, including duplicate keys within the batch
+        rows may be instances, tuples in column order, a batch, or a mapping of
+        column name to values (missing columns count as NULL). Returns
+        (column, message) pairs by row index; an empty dict means every row passed
+        \"\"\"
+        violations: Dict[int, List[Tuple[str, str]]] = {{}}
+{chr(10).join(batch_lines)}
+        return dict(sorted(violations.items()))"""
+        
+        return [violations, validate, validate_many]
+    
+    def _codec_column(self, col: Dict[str, Any]) -> Dict[str, Any]:
+        """Encoding plan for one column in the JSON and binary codecs"""
+        base_type = col['type'].split('(')[0].lower()
+        kind = self.CODEC_KINDS.get(base_type, 'json')
+        quoted = "'\"' + {} + '\"'"
+        
+        # JSON text for a value {v}, and the conversion back from its parsed form (None: as parsed)
+        json_encode, json_decode = {
+            'int': ('str({v})', None),
+            'float': ('_json_float({v})', 'float({v})'),
+            'bool': ("('true' if {v} else 'false')", None),
+            'str': ('_json_str({v})', None),
+            'decimal': (quoted.format('str({v})'), 'Decimal({v})'),
+            'timestamp': (quoted.format('{v}.isoformat()'), 'datetime.fromisoformat({v})'),
+            'timestamptz': (quoted.format('{v}.isoformat()'), 'datetime.fromisoformat({v})'),
+            'date': (quoted.format('{v}.isoformat()'), 'date.fromisoformat({v})'),
+            'time': (quoted.format('{v}.isoformat()'), 'time.fromisoformat({v})'),
+            'uuid': (quoted.format('str({v})'), 'UUID({v})'),
+            'bytes': (quoted.format("base64.b64encode({v}).decode('ascii')"), 'base64.b64decode({v})'),
+            'json': ('_json_dumps({v})', None)
+        }[kind]
+        
+        # Binary form: fixed-width struct fields, or length-prefixed bytes for everything else
+        struct_format, pack, unpack = {
+            'int': ('q', '{v}', '{v}'),
+            'float': ('d', '{v}', '{v}'),
+            'bool': ('?', '{v}', '{v}'),
+            'timestamp': ('q', '_epoch_us({v})', '_EPOCH + timedelta(microseconds={v})'),
+            'timestamptz': ('q', '_epoch_us({v})', '_EPOCH_UTC + timedelta(microseconds={v})'),
+            'date': ('i', '{v}.toordinal() - _EPOCH_ORDINAL', 'date.fromordinal({v} + _EPOCH_ORDINAL)'),
+            'uuid': ('16s', '{v}.bytes', 'UUID(bytes={v})'),
+            'str': (None, "{v}.encode('utf-8')", "{v}.decode('utf-8')"),
+            'decimal': (None, "str({v}).encode('ascii')", "Decimal({v}.decode('ascii'))"),
+            'time': (None, "{v}.isoformat().encode('ascii')", "time.fromisoformat({v}.decode('ascii'))"),
+            'bytes': (None, 'bytes({v})', '{v}'),
+            'json': (None, "_json_dumps({v}).encode('utf-8')", "json.loads({v})")
+        }[kind]
+        
+        return {
+            'name': col['name'],
+            'kind': kind,
+            'format': struct_format,
+            'empty': "b''" if struct_format == '16s' else '0',
+            'json_encode': json_encode,
+            'json_decode': json_decode,
+            'pack': pack,
+            'unpack': unpack
+        }
+    
+    def _codec_layout(self, columns: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Binary record layout: null bitmap, fixed-width fields, then variable-length lengths"""
+        plans = [self._codec_column(col) for col in columns]
+        fixed = [i for i, plan in enumerate(plans) if plan['format']]
+        variable = [i for i, plan in enumerate(plans) if not plan['format']]
+        bitmap_bytes = (len(plans) + 7) // 8
+        bitmap = {1: 'B', 2: 'H', 3: 'I', 4: 'I'}.get(bitmap_bytes, 'Q' if bitmap_bytes <= 8 else f'{bitmap_bytes}s')
+        return {
+            'plans': plans,
+            'fixed': fixed,
+            'variable': variable,
+            'bitmap': bitmap,
+            'bitmap_bytes': bitmap_bytes,
+            'format': '<' + bitmap + ''.join(plans[i]['format'] for i in fixed) + 'I' * len(variable),
+            # Changes only when a column is added, removed, renamed or changes encoding
+            'schema_id': int(schema_hash({'columns': [[plan['name'], plan['kind']] for plan in plans]})[:8], 16)
+        }
+    
+    def _build_codec_methods(self, class_name: str, columns: List[Dict[str, Any]]) -> List[str]:
+        """Build specialized JSON and binary encoders and decoders"""
+        layout = self._codec_layout(columns)
+        plans, record = layout['plans'], f'_{class_name}Record'
+        locals_ = '\n'.join(f"        v{i} = self.{plan['name']}" for i, plan in enumerate(plans))
+        
+        # to_json: write each field directly, no intermediate dict
+        json_parts = []
+        for i, plan in enumerate(plans):
+            key = json.dumps(plan['name']) + ':'
+            json_parts.append(repr(('{' if i == 0 else ',') + key))
+            json_parts.append(f"'null' if v{i} is None else {plan['json_encode'].format(v=f'v{i}')}")
+        json_parts.append("'}'")
+        to_json = f"""    def to_json(self) -> str:
+        \"\"\"Encode as compact JSON; decimals, timestamps and UUIDs keep full precision as strings\"\"\"
+{locals_}
+        return ''.join((
+            {(','+chr(10)+'            ').join(json_parts)}
+        ))"""
+        
+        json_args = []
+        for plan in plans:
+            getter = f"data.get('{plan['name']}')"
+            json_args.append(
+                getter if plan['json_decode'] is None
+                else f"None if (v := {getter}) is None else {plan['json_decode'].format(v='v')}"
+            )
+        from_json = f"""    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> '{class_name}':
+        \"\"\"Create dataclass instance from to_json() output, restoring field types\"\"\"
+        data = json.loads(text)
+        return cls(
+            {(','+chr(10)+'            ').join(json_args)}
+        )"""
+        
+        # _pack: one struct.pack for the bitmap and fixed fields, then the variable-length bytes
+        nulls = ' | '.join(f"(v{i} is None) << {i}" if i else "(v0 is None)" for i in range(len(plans)))
+        if layout['bitmap'].endswith('s'):
+            nulls = f"({nulls}).to_bytes({layout['bitmap_bytes']}, 'little')"
+        buffer_lines = [
+            f"        b{i} = b'' if v{i} is None else {plans[i]['pack'].format(v=f'v{i}')}"
+            for i in layout['variable']
+        ]
+        pack_args = [nulls] + [
+            f"{plans[i]['empty']} if v{i} is None else {plans[i]['pack'].format(v=f'v{i}')}" for i in layout['fixed']
+        ] + [f"len(b{i})" for i in layout['variable']]
+        packed = f"{record}.pack(\n                {(','+chr(10)+'                ').join(pack_args)}\n            )"
+        if layout['variable']:
+            body = '\n'.join(buffer_lines) + f"\n        return b''.join((\n            {packed},\n            " + \
+                ', '.join(f'b{i}' for i in layout['variable']) + "\n        ))"
+        else:
+            body = f"        return {packed}"
+        pack = f"""    def _pack(self) -> bytes:
+        \"\"\"Binary record without the codec header\"\"\"
+{locals_}
+{body}"""
+        
+        # _unpack_from: slice variable-length fields in column order after the struct
+        unpacked = ['nulls'] + [f'f{i}' for i in layout['fixed']] + [f'n{i}' for i in layout['variable']]
+        unpack_lines = [f"        {', '.join(unpacked)} = {record}.unpack_from(data, offset)"]
+        if layout['bitmap'].endswith('s'):
+            unpack_lines.append("        nulls = int.from_bytes(nulls, 'little')")
+        position = 'p'
+        unpack_lines.append(f"        p = offset + {record}.size")
+        args = {}
+        for i in layout['fixed']:
+            args[i] = f"None if nulls & {1 << i} else {plans[i]['unpack'].format(v=f'f{i}')}"
+        for i in layout['variable']:
+            unpack_lines.append(f"        e{i} = {position} + n{i}")
+            args[i] = f"None if nulls & {1 << i} else {plans[i]['unpack'].format(v=f'data[{position}:e{i}]')}"
+            position = f'e{i}'
+        unpack_from = f"""    @classmethod
+    def _unpack_from(cls, data: bytes, offset: int) -> Tuple['{class_name}', int]:
+        \"\"\"Decode one binary record at offset, returning the instance and the next offset\"\"\"
+{chr(10).join(unpack_lines)}
+        return cls(
+            {(','+chr(10)+'            ').join(args[i] for i in range(len(plans)))}
+        ), {position}"""
+        
+        codec = f"""    def encode(self) -> bytes:
+        \"\"\"Encode as a binary record tagged with CODEC_VERSION and SCHEMA_ID\"\"\"
+        return _CODEC_HEADER.pack(self.CODEC_VERSION, self.SCHEMA_ID) + self._pack()
+    
+    @classmethod
+    def decode(cls, data: bytes) -> '{class_name}':
+        \"\"\"Create dataclass instance from encode() output\"\"\"
+        data = _check_codec_header(data, cls.CODEC_VERSION, cls.SCHEMA_ID, cls.__name__)
+        return cls._unpack_from(data, _CODEC_HEADER.size)[0]
+    
+    @classmethod
+    def encode_many(cls, items: Iterable['{class_name}']) -> bytes:
+        \"\"\"Encode many instances into one binary message\"\"\"
+        records = [item._pack() for item in items]
+        return b''.join((_CODEC_HEADER.pack(cls.CODEC_VERSION, cls.SCHEMA_ID), _CODEC_COUNT.pack(len(records)), *records))
+    
+    @classmethod
+    def decode_many(cls, data: bytes) -> List['{class_name}']:
+        \"\"\"Create dataclass instances from encode_many() output\"\"\"
+        data = _check_codec_header(data, cls.CODEC_VERSION, cls.SCHEMA_ID, cls.__name__)
+        count, = _CODEC_COUNT.unpack_from(data, _CODEC_HEADER.size)
+        offset = _CODEC_HEADER.size + _CODEC_COUNT.size
+        unpack_from = cls._unpack_from
+        items = []
+        for _ in range(count):
+            item, offset = unpack_from(data, offset)
+            items.append(item)
+        return items"""
+        
+        return [to_json, from_json, codec, pack, unpack_from]
+    
+    def _build_helpers(self, class_name: str, columns: List[Dict[str, Any]]) -> str:
+        """Build module-level helpers shared by the codecs and batch containers"""
+        layout = self._codec_layout(columns)
+        return f'''_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_MICROSECOND = timedelta(microseconds=1)
+_CODEC_HEADER = struct.Struct('<BI')
+_CODEC_COUNT = struct.Struct('<I')
+_json_str = json.encoder.encode_basestring_ascii
+# Built once: json.dumps() with non-default options constructs an encoder per call
+_json_dumps = json.JSONEncoder(separators=(',', ':'), default=str).encode
+
+# Null bitmap, fixed-width fields, then lengths of the variable-length fields
+_{class_name}Record = struct.Struct({layout['format']!r})
+
+
+def _epoch_us(value: datetime) -> int:
+    """Datetime as int64 microseconds since the Unix epoch"""
+    return (value - (_EPOCH_UTC if value.tzinfo else _EPOCH)) // _MICROSECOND
+{self._build_float_helper(columns)}
+
+def _check_codec_header(data: bytes, version: int, schema_id: int, name: str) -> bytes:
+    """Reject records written by another codec version or table schema"""
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    found_version, found_schema = _CODEC_HEADER.unpack_from(data)
+    if (found_version, found_schema) != (version, schema_id):
+        raise ValueError(
+            f"{{name}} record has codec version {{found_version}} schema {{found_schema:08x}}, "
+            f"expected version {{version}} schema {{schema_id:08x}}"
+        )
+    return data
+
+
+def _columns_of(rows: Any, names: Tuple[str, ...]) -> List[Any]:
+    """Values per column from a column mapping, row tuples or model instances"""
+    if hasattr(rows, 'keys'):
+        count = max((len(values) for values in rows.values()), default=0)
+        return [rows[name] if name in rows else (None,) * count for name in names]
+    fields = attrgetter(*names) if len(names) > 1 else lambda row: (getattr(row, names[0]),)
+    tuples = [row if isinstance(row, tuple) else fields(row) for row in rows]
+    return list(zip(*tuples)) if tuples else [()] * len(names)
+{self._build_limits(columns)}
+
+'''
+    
+    def _build_float_helper(self, columns: List[Dict[str, Any]]) -> str:
+        """JSON encoder for float columns; NaN and infinities are not JSON numbers"""
+        if 'float' not in {self._codec_column(col)['kind'] for col in columns}:
+            return ''
+        return '''
+
+def _json_float(value: float) -> str:
+    """Float as a JSON number, or NaN and the infinities as PostgreSQL's quoted spellings"""
+    if math.isfinite(value):
+        return repr(value)
+    return '"NaN"' if math.isnan(value) else '"Infinity"' if value > 0 else '"-Infinity"'
+'''
+    
+    def _build_limits(self, columns: List[Dict[str, Any]]) -> str:
+        """Module constants the validators compare against"""
+        constants = [check['constant'] for check in self._constraint_checks(columns) if 'constant' in check]
+        if not constants:
+            return ''
+        return '\n\n# Smallest magnitudes that overflow each decimal(p,s) column once rounded to s places\n' + '\n'.join(
+            f"{name} = {value}" for name, value in constants
+        ) + '\n'
+    
     def _assemble_dataclass(
         self,
         class_name: str,
@@ -188,10 +630,10 @@ Generated at: {datetime.now().isoformat()}
 '''
         
         # Build imports section
-        imports_section = '\n'.join(imports) + '\n\n'
+        imports_section = '\n'.join(imports) + '\n\n\n' + self._build_helpers(class_name, schema['columns'])
         
         # Build dataclass
-        dataclass_section = f'''@dataclass
+        dataclass_section = f'''{'@dataclass(slots=True)' if self.slots else '@dataclass'}
 class {class_name}:
     """
     Data model for {table_name} table
@@ -199,72 +641,420 @@ class {class_name}:
     ScrollVerse PostgreSQL Integration
     Resonance Frequency: 528Hz
     """
+    CODEC_VERSION = {self.CODEC_VERSION}
+    SCHEMA_ID = 0x{self._codec_layout(schema['columns'])['schema_id']:08x}
+    
 {chr(10).join(fields)}
 
 {chr(10).join(methods)}
 '''
         
-        # Add query helper if relationships exist
-        if schema.get('relationships'):
-            query_helper = self._build_query_helper(class_name, table_name, schema['relationships'])
-            dataclass_section += '\n' + query_helper
+        # Add columnar batch container
+        if self.batches:
+            dataclass_section += '\n' + self._build_batch(class_name, table_name, schema['columns'])
+        
+        # Add query helpers when rows can be addressed by key or relationship
+        if schema.get('relationships') or any(col.get('primary_key') for col in schema['columns']):
+            query_helper = self._build_query_helper(
+                class_name, table_name, schema['columns'], schema.get('relationships', [])
+            )
+            dataclass_section += query_helper
         
         # Assemble final code
         code = header + imports_section + dataclass_section
         
         return code
     
+    def _batch_column(self, col: Dict[str, Any]) -> Dict[str, Any]:
+        """Storage plan for one column of a columnar batch"""
+        base_type = col['type'].split('(')[0].lower()
+        kind, typecode = self.BATCH_STORAGE.get(base_type, ('object', None))
+        scale = 0
+        if kind == 'decimal':
+            precision = col['type'][len(base_type):].strip('() ').split(',')
+            scale = int(precision[1]) if len(precision) > 1 else self.DEFAULT_DECIMAL_SCALE
+        
+        # Expressions that move one value {v} between Python and its stored form
+        encode, decode = {
+            'int': ('{v}', '{v}'),
+            'float': ('{v}', '{v}'),
+            'bool': ('{v}', 'bool({v})'),
+            'decimal': (f'round({{v}} * {10 ** scale})', f'Decimal({{v}}).scaleb(-{scale})'),
+            'timestamp': ('_epoch_us({v})', '_EPOCH + timedelta(microseconds={v})'),
+            'timestamptz': ('_epoch_us({v})', '_EPOCH_UTC + timedelta(microseconds={v})'),
+            'date': ('{v}.toordinal() - _EPOCH_ORDINAL', 'date.fromordinal({v} + _EPOCH_ORDINAL)'),
+            'object': ('{v}', '{v}')
+        }[kind]
+        
+        return {
+            'name': col['name'],
+            'kind': kind,
+            'typecode': typecode,
+            'scale': scale,
+            'nullable': typecode is not None and col.get('nullable', not col.get('primary_key', False)),
+            'encode': encode,
+            'decode': decode
+        }
+    
+    def _build_batch(self, class_name: str, table_name: str, columns: List[Dict[str, Any]]) -> str:
+        """Build a struct-of-arrays container with one typed array per column"""
+        plans = [self._batch_column(col) for col in columns]
+        names = tuple(plan['name'] for plan in plans)
+        typecodes = {plan['name']: plan['typecode'] for plan in plans}
+        scales = {plan['name']: plan['scale'] for plan in plans if plan['kind'] == 'decimal'}
+        nullable = [plan['name'] for plan in plans if plan['nullable']]
+        row_vars = ', '.join(f'c{i}' for i in range(len(plans)))
+        
+        init_lines, from_rows_lines, append_lines, row_lines = [], [], [], []
+        for i, plan in enumerate(plans):
+            name, typecode, var = plan['name'], plan['typecode'], f'c{i}'
+            encoded = plan['encode'].format(v='v')
+            if typecode is None:
+                init_lines.append(f"        self.{name}: List[Any] = []")
+                from_rows_lines.append(f"        batch.{name} = list({var})")
+                append_lines.append(f"        self.{name}.append({var})")
+                row_lines.append(f"            self.{name}[index]")
+                continue
+            
+            init_lines.append(f"        self.{name} = array('{typecode}')")
+            decoded = plan['decode'].format(v=f'self.{name}[index]')
+            if plan['nullable']:
+                from_rows_lines.append(f"        batch._nulls['{name}'] = bytearray(v is None for v in {var})")
+                from_rows_lines.append(f"        batch.{name} = array('{typecode}', [0 if v is None else {encoded} for v in {var}])")
+                append_lines.append(f"        self._nulls['{name}'].append({var} is None)")
+                append_lines.append(f"        self.{name}.append(0 if {var} is None else {plan['encode'].format(v=var)})")
+                row_lines.append(f"            None if self._nulls['{name}'][index] else {decoded}")
+            else:
+                from_rows_lines.append(
+                    f"        batch.{name} = array('{typecode}', {var})" if encoded == 'v'
+                    else f"        batch.{name} = array('{typecode}', [{encoded} for v in {var}])"
+                )
+                append_lines.append(f"        self.{name}.append({plan['encode'].format(v=var)})")
+                row_lines.append(f"            {decoded}")
+        
+        nulls_init = '{' + ', '.join(f"'{name}': bytearray()" for name in nullable) + '}'
+        unpack = f"{row_vars}," if len(plans) == 1 else row_vars
+        
+        return f'''
+_NUMPY_DTYPES = {{'q': 'int64', 'd': 'float64', 'b': 'int8'}}
+
+
+class {class_name}Batch:
+    """
+    Columnar batch of {table_name} rows
+    One typed array per column: integers, timestamps (epoch microseconds) and
+    dates (epoch days) as int64, decimals as int64 scaled by 10**SCALES[name],
+    floats as float64; other types as lists. NULLs are tracked in _nulls
+    """
+    
+    __slots__ = {names + ('_nulls',)!r}
+    
+    COLUMNS: ClassVar[Tuple[str, ...]] = {names!r}
+    TYPECODES: ClassVar[Dict[str, Optional[str]]] = {typecodes!r}
+    SCALES: ClassVar[Dict[str, int]] = {scales!r}
+    
+    def __init__(self):
+        """Create an empty batch"""
+{chr(10).join(init_lines)}
+        self._nulls: Dict[str, bytearray] = {nulls_init}
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Any, ...]]) -> '{class_name}Batch':
+        """Build a batch from row tuples in COLUMNS order, converting a column at a time"""
+        batch = cls()
+        columns = list(zip(*rows))
+        if not columns:
+            return batch
+        {unpack} = columns
+{chr(10).join(from_rows_lines)}
+        return batch
+    
+    def append(self, row: Tuple[Any, ...]):
+        """Append one row tuple in COLUMNS order"""
+        {unpack} = row
+{chr(10).join(append_lines)}
+    
+    def extend(self, rows: Iterable[Tuple[Any, ...]]):
+        """Append many row tuples"""
+        for row in rows:
+            self.append(row)
+    
+    def __len__(self) -> int:
+        """Number of rows in the batch"""
+        return len(self.{names[0]})
+    
+    def row(self, index: int) -> Tuple[Any, ...]:
+        """Decode one row back to Python values"""
+        return (
+{(','+chr(10)).join(row_lines)}{',' if len(plans) == 1 else ''}
+        )
+    
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over decoded row tuples"""
+        for index in range(len(self)):
+            yield self.row(index)
+    
+    def __iter__(self) -> Iterator[{class_name}]:
+        """Iterate over rows as {class_name} instances"""
+        for index in range(len(self)):
+            yield {class_name}(*self.row(index))
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[{class_name}, '{class_name}Batch']:
+        """A {class_name} for an integer index, a new batch for a slice"""
+        if not isinstance(index, slice):
+            return {class_name}(*self.row(index))
+        batch = type(self)()
+        for name in self.COLUMNS:
+            setattr(batch, name, getattr(self, name)[index])
+        batch._nulls = {{name: mask[index] for name, mask in self._nulls.items()}}
+        return batch
+    
+    def take(self, indices: Sequence[int]) -> '{class_name}Batch':
+        """New batch holding the rows at the given positions"""
+        batch = type(self)()
+        for name in self.COLUMNS:
+            values = getattr(self, name)
+            picked = [values[i] for i in indices]
+            setattr(batch, name, array(values.typecode, picked) if isinstance(values, array) else picked)
+        batch._nulls = {{name: bytearray(mask[i] for i in indices) for name, mask in self._nulls.items()}}
+        return batch
+    
+    def filter(self, mask: Any) -> '{class_name}Batch':
+        """New batch of the rows where mask is true; mask may be a NumPy boolean array"""
+        if hasattr(mask, 'nonzero'):
+            return self.take(mask.nonzero()[0].tolist())
+        return self.take([i for i, keep in enumerate(mask) if keep])
+    
+    def column(self, name: str, copy: bool = True) -> Any:
+        """
+        Column as a NumPy array (masked where NULL) for vectorized aggregation
+        Decimals stay scaled by 10**SCALES[name]. Without NumPy the raw array is
+        returned. copy=False shares memory, and the batch cannot grow while
+        that view is alive
+        """
+        values = getattr(self, name)
+        try:
+            import numpy as np
+        except ImportError:
+            return values
+        if not isinstance(values, array):
+            return np.array(values, dtype=object)
+        data = np.frombuffer(values, dtype=_NUMPY_DTYPES[values.typecode]) if len(values) else np.array([], dtype=_NUMPY_DTYPES[values.typecode])
+        if copy:
+            data = data.copy()
+        nulls = self._nulls.get(name)
+        if nulls and 1 in nulls:
+            return np.ma.masked_array(data, mask=np.frombuffer(nulls, dtype=np.bool_).copy())
+        return data
+'''
+    
+    def _quote(self, identifier: str) -> str:
+        """Quote a SQL identifier"""
+        return '"' + identifier.replace('"', '""') + '"'
+    
     def _build_query_helper(
         self,
         class_name: str,
         table_name: str,
+        columns: List[Dict[str, Any]],
         relationships: List[Dict[str, Any]]
     ) -> str:
-        """Build query helper methods for relationships"""
+        """Build query helpers with keyset pagination and batched relationship loaders"""
+        q = self._quote
+        keys = [col for col in columns if col.get('primary_key')]
+        key_names = [col['name'] for col in keys]
+        key_types = [self.TYPE_MAPPING.get(col['type'].split('(')[0].lower(), 'Any') for col in keys]
+        select = f"SELECT {', '.join(q(col['name']) for col in columns)} FROM {q(table_name)}"
         
         helper = f'''
+
+def _fetch(conn, query: str, params: Tuple[Any, ...]) -> Tuple[List[str], List[tuple]]:
+    """Run a query on a PostgreSQLClient or any DB-API connection"""
+    if hasattr(conn, 'execute_query'):
+        result = conn.execute_query(query, params)
+        return result['columns'], result['rows']
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        if not cursor.description:
+            return [], []
+        return [desc[0] for desc in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+
+
 class {class_name}Query:
-    """Query helper for {class_name} with relationship support"""
+    """Query helper for {class_name} with keyset pagination and batched relationship loading"""
+    
+    # Columns in field order, so rows build instances positionally
+    SELECT = {select!r}
+'''
+        
+        if len(keys) == 1:
+            key, key_type = key_names[0], key_types[0]
+            helper += f'''
+    @staticmethod
+    def get_by_id(conn, id: {key_type}) -> Optional[{class_name}]:
+        """Fetch {class_name} by primary key"""
+        _, rows = _fetch(conn, {class_name}Query.SELECT + {f' WHERE {q(key)} = %s'!r}, (id,))
+        return {class_name}(*rows[0]) if rows else None
+    
+    @staticmethod
+    def get_many(conn, ids: Iterable[{key_type}]) -> Dict[{key_type}, {class_name}]:
+        """Fetch many {class_name} records by primary key in one query"""
+        keys = list(dict.fromkeys(ids))
+        if not keys:
+            return {{}}
+        _, rows = _fetch(conn, {class_name}Query.SELECT + {f' WHERE {q(key)} = ANY(%s)'!r}, (keys,))
+        return {{row[{[col['name'] for col in columns].index(key)}]: {class_name}(*row) for row in rows}}
+    
+    @staticmethod
+    def get_all(conn, limit: int = 100, after: Optional[{key_type}] = None) -> List[{class_name}]:
+        """Fetch one page of {class_name} records ordered by primary key, starting after the given key"""
+        if after is None:
+            _, rows = _fetch(conn, {class_name}Query.SELECT + {f' ORDER BY {q(key)} LIMIT %s'!r}, (limit,))
+        else:
+            _, rows = _fetch(conn, {class_name}Query.SELECT + {f' WHERE {q(key)} > %s ORDER BY {q(key)} LIMIT %s'!r}, (after, limit))
+        return [{class_name}(*row) for row in rows]
     
     @staticmethod
-    def get_by_id(conn, id: int) -> Optional[{class_name}]:
-        """Fetch {class_name} by ID"""
-        query = f"SELECT * FROM {table_name} WHERE id = %s"
-        # Execute query with connection
-        # result = conn.execute(query, (id,))
-        # return {class_name}.from_dict(result) if result else None
-        pass
+    def iter_all(conn, page_size: int = 1000) -> Iterator[{class_name}]:
+        """Iterate over every {class_name} record, one keyset page at a time"""
+        after = None
+        while True:
+            page = {class_name}Query.get_all(conn, page_size, after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1].{key}
+'''
+        elif keys:
+            key_tuple = f"Tuple[{', '.join(key_types)}]"
+            key_list = ', '.join(q(name) for name in key_names)
+            placeholders = ', '.join(['%s'] * len(keys))
+            helper += f'''
+    @staticmethod
+    def get_by_id(conn, key: {key_tuple}) -> Optional[{class_name}]:
+        """Fetch {class_name} by its composite primary key"""
+        _, rows = _fetch(conn, {class_name}Query.SELECT + {' WHERE ' + ' AND '.join(f'{q(name)} = %s' for name in key_names)!r}, tuple(key))
+        return {class_name}(*rows[0]) if rows else None
     
     @staticmethod
-    def get_all(conn, limit: int = 100) -> List[{class_name}]:
-        """Fetch all {class_name} records"""
-        query = f"SELECT * FROM {table_name} LIMIT %s"
-        # Execute query with connection
-        # results = conn.execute(query, (limit,))
-        # return [{class_name}.from_dict(row) for row in results]
-        pass
+    def get_all(conn, limit: int = 100, after: Optional[{key_tuple}] = None) -> List[{class_name}]:
+        """Fetch one page of {class_name} records ordered by primary key, starting after the given key"""
+        if after is None:
+            _, rows = _fetch(conn, {class_name}Query.SELECT + {f' ORDER BY {key_list} LIMIT %s'!r}, (limit,))
+        else:
+            _, rows = _fetch(conn, {class_name}Query.SELECT + {f' WHERE ({key_list}) > ({placeholders}) ORDER BY {key_list} LIMIT %s'!r}, (*after, limit))
+        return [{class_name}(*row) for row in rows]
+    
+    @staticmethod
+    def iter_all(conn, page_size: int = 1000) -> Iterator[{class_name}]:
+        """Iterate over every {class_name} record, one keyset page at a time"""
+        after = None
+        while True:
+            page = {class_name}Query.get_all(conn, page_size, after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = ({', '.join(f'page[-1].{name}' for name in key_names)})
 '''
         
-        # Add relationship queries
+        # One loader per relationship; disambiguate by foreign key when a table is related twice
+        tables = [rel['table'] for rel in relationships]
+        references = {col['name']: col.get('references', {}).get('column', 'id') for col in columns}
         for rel in relationships:
+            rel_table, rel_fk = rel['table'], rel['foreign_key']
+            name = f"load_{rel_table}" if tables.count(rel_table) == 1 else f"load_{rel_table}_by_{rel_fk}"
             if rel['type'] == 'hasMany':
-                rel_table = rel['table']
-                rel_fk = rel['foreign_key']
-                helper += f'''
+                match_column, doc = rel_fk, f"Fetch {rel_table} rows for many {class_name} ids in one query, grouped by {rel_fk}"
+                returns, empty = 'Dict[Any, List[Any]]', '{key: [] for key in keys}'
+                collect = f"""        for row in rows:
+            grouped[row[index]].append(convert(row))
+        return grouped"""
+            elif rel['type'] == 'belongsTo':
+                match_column = references.get(rel_fk, 'id')
+                doc = f"Fetch the {rel_table} rows referenced by many {rel_fk} values in one query"
+                returns, empty = 'Dict[Any, Any]', '{}'
+                collect = """        for row in rows:
+            grouped[row[index]] = convert(row)
+        return grouped"""
+            else:
+                continue
+            helper += f'''
     @staticmethod
-    def get_with_{rel_table}(conn, id: int):
-        """Fetch {class_name} with related {rel_table}"""
-        query = f"""
-            SELECT * FROM {table_name} t
-            JOIN {rel_table} r ON t.id = r.{rel_fk}
-            WHERE t.id = %s
-        """
-        # Execute query with connection
-        pass
+    def {name}(conn, ids: Iterable[Any], model: Optional[type] = None) -> {returns}:
+        """{doc}; rows are dicts unless a model is given"""
+        keys = list(dict.fromkeys(key for key in ids if key is not None))
+        grouped = {empty}
+        if not keys:
+            return grouped
+        columns, rows = _fetch(conn, {f'SELECT * FROM {q(rel_table)} WHERE {q(match_column)} = ANY(%s)'!r}, (keys,))
+        index = columns.index({match_column!r})
+        if model is None:
+            convert = lambda row: dict(zip(columns, row))
+        else:
+            convert = lambda row: model.from_dict(dict(zip(columns, row)))
+{collect}
 '''
         
         return helper
     
+    def query_helper_statements(self, table_name: str, schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        SQL the generated {Model}Query helpers send, keyed by helper name, built
+        from the same clauses as _build_query_helper. Each statement lists its
+        parameters as ('column', name) for a value from one row of the table,
+        ('array', name) for a one-element list of it, or ('value', v)
+        """
+        q = self._quote
+        columns = schema['columns']
+        keys = [col['name'] for col in columns if col.get('primary_key')]
+        select = f"SELECT {', '.join(q(col['name']) for col in columns)} FROM {q(table_name)}"
+        statements: Dict[str, Dict[str, Any]] = {}
+        
+        if len(keys) == 1:
+            key = keys[0]
+            statements['get_by_id'] = {'sql': select + f' WHERE {q(key)} = %s', 'params': [('column', key)]}
+            statements['get_many'] = {'sql': select + f' WHERE {q(key)} = ANY(%s)', 'params': [('array', key)]}
+            statements['get_all'] = {'sql': select + f' ORDER BY {q(key)} LIMIT %s', 'params': [('value', 100)]}
+            statements['get_all_after'] = {
+                'sql': select + f' WHERE {q(key)} > %s ORDER BY {q(key)} LIMIT %s',
+                'params': [('column', key), ('value', 100)]
+            }
+        elif keys:
+            key_list = ', '.join(q(name) for name in keys)
+            placeholders = ', '.join(['%s'] * len(keys))
+            statements['get_by_id'] = {
+                'sql': select + ' WHERE ' + ' AND '.join(f'{q(name)} = %s' for name in keys),
+                'params': [('column', name) for name in keys]
+            }
+            statements['get_all'] = {'sql': select + f' ORDER BY {key_list} LIMIT %s', 'params': [('value', 100)]}
+            statements['get_all_after'] = {
+                'sql': select + f' WHERE ({key_list}) > ({placeholders}) ORDER BY {key_list} LIMIT %s',
+                'params': [('column', name) for name in keys] + [('value', 100)]
+            }
+        
+        relationships = schema.get('relationships', [])
+        tables = [rel['table'] for rel in relationships]
+        references = {col['name']: col.get('references', {}).get('column', 'id') for col in columns}
+        for rel in relationships:
+            rel_table, rel_fk = rel['table'], rel['foreign_key']
+            name = f"load_{rel_table}" if tables.count(rel_table) == 1 else f"load_{rel_table}_by_{rel_fk}"
+            if rel['type'] == 'hasMany':
+                # Children are looked up by the parent's key; the schema's foreign keys all reference id
+                match_column, source = rel_fk, keys[0] if len(keys) == 1 else 'id'
+            elif rel['type'] == 'belongsTo':
+                match_column, source = references.get(rel_fk, 'id'), rel_fk
+            else:
+                continue
+            statements[name] = {
+                'sql': f'SELECT * FROM {q(rel_table)} WHERE {q(match_column)} = ANY(%s)',
+                'params': [('array', source)]
+            }
+        
+        return statements
+    
     def generate_and_save(
         self,
         table_name: str,
@@ -282,9 +1072,11 @@ class {class_name}Query:
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Save to file
-        with open(filepath, 'w') as f:
+        # Save to file; replace atomically so importers never see a partial model
+        temp_path = f"{filepath}.tmp{os.getpid()}"
+        with open(temp_path, 'w') as f:
             f.write(code)
+        os.replace(temp_path, filepath)
         
         print(f"✓ Generated dataclass for {table_name}: {filepath}")
         
@@ -306,6 +1098,105 @@ class {class_name}Query:
         print(f"✨ Generated {len(filepaths)}/{len(schemas)} dataclasses")
         
         return filepaths
+    
+    def _generator_fingerprint(self) -> str:
+        """Digest of this generator's templates and options, so template changes regenerate everything"""
+        with open(__file__, 'rb') as f:
+            source = f.read()
+        options = f"slots={self.slots};batches={self.batches}".encode('utf-8')
+        return hashlib.sha256(source + options).hexdigest()
+    
+    def _manifest_path(self) -> str:
+        """Location of the schema hash manifest"""
+        return os.path.join(self.output_dir, self.MANIFEST_FILENAME)
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Read the manifest of the last incremental generation"""
+        try:
+            with open(self._manifest_path()) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {'generator': None, 'tables': {}}
+        manifest.setdefault('tables', {})
+        return manifest
+    
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        """Write the manifest atomically"""
+        temp_path = f"{self._manifest_path()}.tmp{os.getpid()}"
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self._manifest_path())
+    
+    def generate_incremental(
+        self,
+        schemas: Dict[str, Dict[str, Any]],
+        workers: int = 4,
+        force: bool = False,
+        prune: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Regenerate only the models whose table schema changed since the last run
+        Each table is keyed on a hash of its schema dict; changed tables are
+        rendered and written in parallel, and models of dropped tables are removed
+        """
+        started = time.perf_counter()
+        manifest = self._load_manifest()
+        fingerprint = self._generator_fingerprint()
+        if manifest.get('generator') != fingerprint:
+            force = True
+        
+        previous = manifest['tables']
+        hashes = {table_name: schema_hash(schema) for table_name, schema in schemas.items()}
+        changed = [
+            table_name for table_name, digest in hashes.items()
+            if force
+            or previous.get(table_name, {}).get('hash') != digest
+            or not os.path.exists(os.path.join(self.output_dir, previous[table_name]['file']))
+        ]
+        unchanged = [table_name for table_name in schemas if table_name not in changed]
+        
+        print(f"🔮 {len(changed)} of {len(schemas)} models changed at {self.frequency}Hz...")
+        
+        def render(table_name: str) -> str:
+            return self.generate_and_save(table_name, schemas[table_name])
+        
+        generated, failed = [], {}
+        if changed:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(changed)))) as executor:
+                futures = {table_name: executor.submit(render, table_name) for table_name in changed}
+            for table_name, future in futures.items():
+                try:
+                    filepath = future.result()
+                    previous[table_name] = {'hash': hashes[table_name], 'file': os.path.basename(filepath)}
+                    generated.append(filepath)
+                except Exception as e:
+                    # Forget the old hash so the next run retries this table
+                    previous.pop(table_name, None)
+                    failed[table_name] = str(e)
+                    print(f"✗ Failed to generate {table_name}: {e}")
+        
+        removed = []
+        if prune:
+            for table_name in [name for name in previous if name not in schemas]:
+                filepath = os.path.join(self.output_dir, previous.pop(table_name)['file'])
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                removed.append(filepath)
+        
+        if generated or removed or failed or manifest.get('generator') != fingerprint:
+            self._save_manifest({'generator': fingerprint, 'tables': previous})
+        
+        elapsed = time.perf_counter() - started
+        print(f"✨ Generated {len(generated)}, unchanged {len(unchanged)}, removed {len(removed)} "
+              f"in {elapsed * 1000:.1f}ms")
+        
+        return {
+            'generated': generated,
+            'unchanged': unchanged,
+            'removed': removed,
+            'failed': failed,
+            'elapsed_seconds': round(elapsed, 4)
+        }
 
 
 def main():
@@ -314,55 +1205,29 @@ def main():
     print("ScrollVerse PostgreSQL Dataclass Generator - 528Hz")
     print("=" * 60)
     
-    # Example schemas for ScrollVerse tables
-    schemas = {
-        'nft_metadata': {
-            'columns': [
-                {'name': 'id', 'type': 'integer', 'primary_key': True},
-                {'name': 'token_id', 'type': 'varchar(255)', 'unique': True},
-                {'name': 'name', 'type': 'varchar(255)'},
-                {'name': 'frequency', 'type': 'integer'},
-                {'name': 'metadata_uri', 'type': 'text'},
-                {'name': 'created_at', 'type': 'timestamp'}
-            ],
-            'relationships': [
-                {'type': 'hasMany', 'table': 'frequency_layers', 'foreign_key': 'nft_id'}
-            ]
-        },
-        'akashic_frequencies': {
-            'columns': [
-                {'name': 'id', 'type': 'integer', 'primary_key': True},
-                {'name': 'frequency', 'type': 'integer'},
-                {'name': 'type', 'type': 'varchar(100)'},
-                {'name': 'resonance', 'type': 'decimal(5,2)'},
-                {'name': 'description', 'type': 'text'}
-            ],
-            'relationships': [
-                {'type': 'hasMany', 'table': 'frequency_layers', 'foreign_key': 'frequency_id'}
-            ]
-        },
-        'frequency_layers': {
-            'columns': [
-                {'name': 'id', 'type': 'integer', 'primary_key': True},
-                {'name': 'nft_id', 'type': 'integer'},
-                {'name': 'frequency_id', 'type': 'integer'},
-                {'name': 'layer_depth', 'type': 'integer'},
-                {'name': 'resonance_data', 'type': 'jsonb'}
-            ],
-            'relationships': [
-                {'type': 'belongsTo', 'table': 'nft_metadata', 'foreign_key': 'nft_id'},
-                {'type': 'belongsTo', 'table': 'akashic_frequencies', 'foreign_key': 'frequency_id'}
-            ]
-        }
-    }
+    # Read the live schema so models never drift from the database
+    client = PostgreSQLClient(config_from_argv(sys.argv))
+    try:
+        client.connect()
+        schemas = client.introspect_schema(os.getenv('POSTGRES_SCHEMA', 'public'))
+    finally:
+        client.close()
     
-    # Generate dataclasses
-    generator = DataclassGenerator('./generated/dataclasses')
-    filepaths = generator.generate_batch(schemas)
+    # Regenerate only changed models (--slots emits __slots__ models with
+    # from_row/to_tuple, --batches adds columnar {Model}Batch containers,
+    # --force ignores the stored schema hashes)
+    generator = DataclassGenerator(
+        './generated/dataclasses',
+        slots='--slots' in sys.argv,
+        batches='--batches' in sys.argv
+    )
+    report = generator.generate_incremental(schemas, force='--force' in sys.argv)
     
     print("\n📚 Generated Files:")
-    for filepath in filepaths:
+    for filepath in report['generated']:
         print(f"  - {filepath}")
+    if not report['generated']:
+        print("  (all models up to date)")
     
     print("\n✨ Dataclass generation complete!")
 
@@ -0,0 +1,787 @@
+"""
+Database Drivers for ScrollVerse
+Pluggable connection layer behind the PostgreSQL client and connection pool
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import asyncio
+import copy
+import operator
+import re
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Driver:
+    """
+    Base driver interface
+    A driver opens raw DB-API connections and knows how to check and reset them
+    """
+
+    name = 'base'
+    # Whether cursors support mogrify() and COPY ... TO STDOUT (FORMAT binary) through copy_expert()
+    binary_copy = False
+
+    def connect(self, config: Dict[str, Any]):
+        """Open a new raw connection"""
+        raise NotImplementedError
+
+    def ping(self, connection) -> bool:
+        """Return True if the connection can still serve queries"""
+        raise NotImplementedError
+
+    def reset(self, connection):
+        """Return a connection to a clean state before it goes back to the pool"""
+        connection.rollback()
+
+    def close(self, connection):
+        """Close a raw connection, ignoring errors from dead sockets"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class Psycopg2Driver(Driver):
+    """Driver backed by psycopg2 for live PostgreSQL servers"""
+
+    name = 'psycopg2'
+    binary_copy = True
+
+    def connect(self, config: Dict[str, Any]):
+        """Open a psycopg2 connection using the client configuration"""
+        import psycopg2
+
+        return psycopg2.connect(
+            host=config['host'],
+            port=config['port'],
+            dbname=config['database'],
+            user=config['user'],
+            password=config['password'],
+            sslmode='require' if config.get('ssl') else 'prefer',
+            application_name=config.get('application_name', 'scrollverse')
+        )
+
+    def ping(self, connection) -> bool:
+        """Check liveness with a SELECT 1 round trip"""
+        if connection.closed:
+            return False
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+
+class FakeError(Exception):
+    """Error raised by the in-process fake backend, with a SQLSTATE in pgcode as psycopg2 reports it"""
+
+    def __init__(self, message: str = '', pgcode: Optional[str] = None):
+        """Keep the message and SQLSTATE"""
+        super().__init__(message)
+        self.pgcode = pgcode
+
+
+class FakeOperationalError(FakeError):
+    """Connection-level failure raised by the fake backend"""
+
+
+Handler = Callable[[Optional[tuple]], Tuple[List[str], List[tuple]]]
+
+
+class FakeBackend:
+    """
+    In-process stand-in for a PostgreSQL server
+    Holds tables as lists of dicts, answers simple single-table SELECTs and
+    lets tests register handlers for anything more involved
+    """
+
+    _SELECT_RE = re.compile(
+        r'^select\s+(?P<columns>.+?)\s+from\s+(?:\w+\.)?(?P<table>\w+)'
+        r'(?:\s+where\s+(?P<where>.+?))?'
+        r'(?:\s+order\s+by\s+(?P<order>\w+(?:\s*,\s*\w+)*)(?:\s+(?P<direction>asc|desc))?)?'
+        r'(?:\s+limit\s+(?P<limit>%s|\d+))?\s*;?$',
+        re.IGNORECASE | re.DOTALL
+    )
+    _CONDITION_RE = re.compile(
+        r'^(?P<column>\w+)\s*(?P<op>=|<>|!=|>=|<=|>|<)\s*(?P<value>any\s*\(\s*%s\s*\)|%s|\'[^\']*\'|-?\d+(?:\.\d+)?)$',
+        re.IGNORECASE
+    )
+    # Row comparison, as keyset pagination over a composite key sends it
+    _ROW_CONDITION_RE = re.compile(
+        r'^\((?P<columns>\w+(?:\s*,\s*\w+)*)\)\s*(?P<op>=|<>|!=|>=|<=|>|<)\s*\((?P<values>%s(?:\s*,\s*%s)*)\)$'
+    )
+    _OPERATORS = {
+        '=': operator.eq,
+        '<>': operator.ne,
+        '!=': operator.ne,
+        '>': operator.gt,
+        '<': operator.lt,
+        '>=': operator.ge,
+        '<=': operator.le
+    }
+
+    _COPY_RE = re.compile(
+        r'^copy\s+(?P<table>\w+)\s*\((?P<columns>[^)]*)\)\s+from\s+stdin',
+        re.IGNORECASE
+    )
+
+    _PREPARE_RE = re.compile(r'^prepare\s+(?P<name>\w+)\s+as\s+(?P<body>.+)$', re.IGNORECASE | re.DOTALL)
+    _EXECUTE_RE = re.compile(r'^execute\s+(?P<name>\w+)\b', re.IGNORECASE)
+    _DEALLOCATE_RE = re.compile(r'^deallocate\s+(?:prepare\s+)?(?P<name>\w+)\s*;?$', re.IGNORECASE)
+    # A parameter whose type nothing in the statement fixes, as a bare select item or an IS NULL operand
+    _UNTYPED_PARAMETER_RE = re.compile(
+        r'^select\s+(?P<bare>\$\d+)\s*(?:,|$|as\b|from\b)|(?P<null>\$\d+)\s+is\s+(?:not\s+)?null\b',
+        re.IGNORECASE
+    )
+    _NO_TRANSACTION_RE = re.compile(r'^(?P<command>vacuum|reindex\s+\w+\s+concurrently|create\s+index\s+concurrently)\b', re.IGNORECASE)
+    # Statements that advance the simulated WAL, and that a replica refuses
+    _WAL_WRITE_RE = re.compile(r'^(?P<command>insert|update|delete|create|alter|drop|truncate)\b', re.IGNORECASE)
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        max_connections: Optional[int] = None,
+        history_size: int = 1000,
+        plan_latency: float = 0.0
+    ):
+        """Initialize an empty fake server"""
+        self.latency = latency
+        self.plan_latency = plan_latency
+        self.max_connections = max_connections
+        self.alive = True
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self.rules: List[Tuple[Any, Handler]] = []
+        # pg_stat_user_tables-style counters per table, used by maintenance rules
+        self.table_stats: Dict[str, Dict[str, Any]] = {}
+        # pg_catalog-style column definitions per table, used by introspection rules
+        self.catalog: Dict[str, List[tuple]] = {}
+        self.executed = deque(maxlen=history_size)
+        self.stats = {'queries': 0, 'prepares': 0, 'connections_opened': 0, 'connections_closed': 0}
+        # Simulated WAL: one position per write, with the wall-clock time it was written
+        self.wal_lsn = 0
+        self.wal = deque(maxlen=history_size)
+        # Set on replicas: the primary they stream from and how far they have replayed
+        self.upstream: Optional['FakeBackend'] = None
+        self.replay_lsn = 0
+        self._connections: List['FakeConnection'] = []
+        self._lock = threading.Lock()
+        self.on(r'pg_current_wal_lsn\(\)', self._current_wal_lsn)
+        self.on(r'pg_last_wal_replay_lsn\(\)', self._replay_status)
+        self.on(r'pg_export_snapshot\(\)', self._export_snapshot)
+
+    def add_table(self, name: str, columns: List[str], rows: Optional[List[Dict[str, Any]]] = None):
+        """Create or replace a table with the given column order and rows"""
+        rows = list(rows or [])
+        last_id = max((r['id'] for r in rows if isinstance(r.get('id'), int)), default=0)
+        self.tables[name] = {'columns': list(columns), 'rows': rows, 'last_id': last_id}
+
+    def on(
+        self,
+        pattern: str,
+        handler: Optional[Handler] = None,
+        rows: Optional[List[tuple]] = None,
+        columns: Optional[List[str]] = None
+    ):
+        """Answer statements matching a regex with a handler or canned rows; named groups are passed as keywords"""
+        if handler is None:
+            canned_rows, canned_columns = list(rows or []), list(columns or [])
+            handler = lambda params: (canned_columns, canned_rows)
+        self.rules.insert(0, (re.compile(pattern, re.IGNORECASE | re.DOTALL), handler))
+
+    def connect(self) -> 'FakeConnection':
+        """Open a connection, enforcing the server-side connection limit"""
+        with self._lock:
+            if not self.alive:
+                raise FakeOperationalError('server is not accepting connections')
+            open_count = sum(1 for c in self._connections if not c.closed)
+            if self.max_connections is not None and open_count >= self.max_connections:
+                raise FakeOperationalError('sorry, too many clients already')
+            connection = FakeConnection(self)
+            self._connections = [c for c in self._connections if not c.closed]
+            self._connections.append(connection)
+            self.stats['connections_opened'] += 1
+        return connection
+
+    def _current_wal_lsn(self, params):
+        """pg_current_wal_lsn() as text"""
+        return ['lsn'], [(f"0/{self.wal_lsn:X}",)]
+
+    def _replay_status(self, params):
+        """Replay position and lag of a replica; a node without upstream reports itself caught up"""
+        primary = self.upstream
+        if primary is None:
+            return ['replay_lsn', 'lag_seconds'], [(f"0/{self.wal_lsn:X}", 0)]
+        lag = 0.0
+        if primary.wal_lsn > self.replay_lsn:
+            behind = [at for lsn, at in primary.wal if lsn > self.replay_lsn]
+            lag = time.time() - (behind[0] if behind else primary.wal[0][1])
+        return ['replay_lsn', 'lag_seconds'], [(f"0/{self.replay_lsn:X}", lag)]
+
+    def _export_snapshot(self, params):
+        """pg_export_snapshot() identifier; the fake has no MVCC, so it only names the WAL position"""
+        return ['pg_export_snapshot'], [(f"00000003-{self.wal_lsn:08X}-1",)]
+
+    def _log_write(self, statement: str, command: Optional[str] = None):
+        """Advance the WAL for a write, or refuse it on a replica"""
+        match = self._WAL_WRITE_RE.match(statement)
+        if match:
+            command = match.group('command')
+        if not command:
+            return
+        if self.upstream is not None:
+            raise FakeError(f"cannot execute {command.upper()} in a read-only transaction")
+        with self._lock:
+            self.wal_lsn += 1
+            self.wal.append((self.wal_lsn, time.time()))
+
+    def replicate(self):
+        """Catch a replica up: copy the upstream's tables and WAL position"""
+        primary = self.upstream
+        with primary._lock:
+            tables, lsn = copy.deepcopy(primary.tables), primary.wal_lsn
+        self.tables.clear()
+        self.tables.update(tables)
+        self.replay_lsn = lsn
+
+    def kill_connections(self):
+        """Break every open connection, as a server restart would"""
+        with self._lock:
+            for connection in self._connections:
+                connection.broken = True
+
+    @property
+    def open_connections(self) -> int:
+        """Number of connections currently open against the fake server"""
+        with self._lock:
+            return sum(1 for c in self._connections if not c.closed)
+
+    def delay_for(self, sql: str) -> float:
+        """Resolve the simulated latency for a statement"""
+        return self.latency(sql) if callable(self.latency) else self.latency
+
+    def execute(
+        self,
+        sql: str,
+        params: Optional[tuple] = None,
+        planned: bool = False
+    ) -> Tuple[List[str], List[tuple], int]:
+        """Run a statement after the simulated latency and return (columns, rows, rowcount)"""
+        delay = self.delay_for(sql) + (0.0 if planned else self.plan_latency)
+        if delay:
+            time.sleep(delay)
+        return self.evaluate(sql, params)
+
+    def execute_on(
+        self,
+        connection: 'FakeConnection',
+        sql: str,
+        params: Optional[tuple] = None
+    ) -> Tuple[List[str], List[tuple], int]:
+        """Run a statement on a connection, handling per-connection prepared statements"""
+        statement = sql.strip()
+        match = self._PREPARE_RE.match(statement)
+        if match:
+            name = match.group('name').lower()
+            if name in connection.prepared:
+                raise FakeError(f'prepared statement "{name}" already exists', pgcode='42P05')
+            untyped = self._UNTYPED_PARAMETER_RE.search(match.group('body').strip())
+            if untyped:
+                raise FakeError(
+                    f"could not determine data type of parameter {untyped.group('bare') or untyped.group('null')}",
+                    pgcode='42P18'
+                )
+            if self.plan_latency:
+                time.sleep(self.plan_latency)
+            connection.prepared[name] = re.sub(r'\$\d+', '%s', match.group('body'))
+            with self._lock:
+                self.stats['prepares'] += 1
+            return [], [], 0
+
+        match = self._EXECUTE_RE.match(statement)
+        if match:
+            name = match.group('name').lower()
+            if name not in connection.prepared:
+                raise FakeError(f'prepared statement "{name}" does not exist')
+            return self.execute(connection.prepared[name], params, planned=True)
+
+        match = self._DEALLOCATE_RE.match(statement)
+        if match:
+            name = match.group('name').lower()
+            if name == 'all':
+                connection.prepared.clear()
+            elif connection.prepared.pop(name, None) is None:
+                raise FakeError(f'prepared statement "{name}" does not exist')
+            return [], [], 0
+
+        match = self._NO_TRANSACTION_RE.match(statement)
+        if match and not connection.autocommit:
+            command = ' '.join(match.group('command').split()).upper()
+            raise FakeError(f'{command} cannot run inside a transaction block')
+
+        return self.execute(sql, params)
+
+    def evaluate(self, sql: str, params: Optional[tuple] = None) -> Tuple[List[str], List[tuple], int]:
+        """Run a statement immediately and return (columns, rows, rowcount)"""
+        normalized = ' '.join(sql.split())
+        with self._lock:
+            self.stats['queries'] += 1
+            self.executed.append((normalized, params))
+        self._log_write(normalized)
+
+        for pattern, handler in self.rules:
+            match = pattern.search(normalized)
+            if match:
+                columns, rows = handler(params, **match.groupdict())
+                return list(columns), list(rows), len(rows)
+
+        if normalized.lower().startswith('select'):
+            columns, rows = self._select(normalized, params)
+            return columns, rows, len(rows)
+
+        # DDL, maintenance and writes without a registered handler are accepted as no-ops
+        return [], [], 0
+
+    def copy_from(self, sql: str, data: str) -> int:
+        """Load COPY ... FROM STDIN text-format data into a stored table"""
+        delay = self.delay_for(sql)
+        if delay:
+            time.sleep(delay)
+
+        normalized = ' '.join(sql.split())
+        match = self._COPY_RE.match(normalized)
+        if not match or match.group('table') not in self.tables:
+            raise FakeError(f'fake backend cannot evaluate: {normalized}')
+        self._log_write(normalized, 'copy')
+
+        columns = [c.strip() for c in match.group('columns').split(',')]
+        rows = [
+            dict(zip(columns, (None if v == '\\N' else _unescape_copy(v) for v in line.split('\t'))))
+            for line in data.splitlines() if line
+        ]
+        with self._lock:
+            self.stats['queries'] += 1
+            self.executed.append((normalized, None))
+            table = self.tables[match.group('table')]
+            if 'id' in table['columns'] and 'id' not in columns:
+                # The id column is SERIAL; COPY leaves it to the sequence
+                for row in rows:
+                    table['last_id'] += 1
+                    row['id'] = table['last_id']
+            table['rows'].extend(rows)
+        return len(rows)
+
+    def _select(self, sql: str, params: Optional[tuple]) -> Tuple[List[str], List[tuple]]:
+        """Evaluate a single-table SELECT against the stored rows"""
+        # Generated queries quote every identifier; the stored tables use plain names
+        sql = re.sub(r'"(\w+)"', r'\1', sql)
+        match = self._SELECT_RE.match(sql)
+        if not match or match.group('table') not in self.tables:
+            raise FakeError(f'fake backend cannot evaluate: {sql}')
+
+        table = self.tables[match.group('table')]
+        values = list(params or ())
+        rows = table['rows']
+
+        if match.group('where'):
+            for condition in re.split(r'\s+and\s+', match.group('where'), flags=re.IGNORECASE):
+                rows = self._filter(rows, condition.strip(), values)
+
+        if match.group('order'):
+            order = [c.strip() for c in match.group('order').split(',')]
+            descending = (match.group('direction') or '').lower() == 'desc'
+            present = [r for r in rows if all(r.get(c) is not None for c in order)]
+            missing = [r for r in rows if any(r.get(c) is None for c in order)]
+            present = sorted(present, key=lambda r: tuple(r[c] for c in order), reverse=descending)
+            # PostgreSQL sorts NULLs last ascending and first descending
+            rows = missing + present if descending else present + missing
+
+        limit = match.group('limit')
+        if limit:
+            rows = rows[:int(values.pop(0) if limit == '%s' else limit)]
+
+        requested = match.group('columns').strip()
+        columns = table['columns'] if requested == '*' else [c.strip() for c in requested.split(',')]
+        return columns, [tuple(row.get(c) for c in columns) for row in rows]
+
+    def _filter(self, rows: List[Dict[str, Any]], condition: str, values: List[Any]) -> List[Dict[str, Any]]:
+        """Apply one WHERE condition, consuming positional parameters"""
+        match = self._ROW_CONDITION_RE.match(condition)
+        if match:
+            columns = [c.strip() for c in match.group('columns').split(',')]
+            value = tuple(values.pop(0) for _ in columns)
+            compare = self._OPERATORS[match.group('op')]
+            return [
+                r for r in rows
+                if all(r.get(c) is not None for c in columns) and compare(tuple(r[c] for c in columns), value)
+            ]
+
+        match = self._CONDITION_RE.match(condition)
+        if not match:
+            raise FakeError(f'fake backend cannot evaluate condition: {condition}')
+
+        column, op, raw = match.group('column'), match.group('op'), match.group('value')
+        if raw.lower().startswith('any'):
+            wanted = set(values.pop(0))
+            return [r for r in rows if r.get(column) in wanted]
+        if raw == '%s':
+            value = values.pop(0)
+        elif raw.startswith("'"):
+            value = raw[1:-1]
+        else:
+            value = Decimal(raw) if '.' in raw else int(raw)
+
+        compare = self._OPERATORS[op]
+        return [r for r in rows if r.get(column) is not None and compare(r[column], value)]
+
+
+_COPY_ESCAPES = {'\\\\': '\\', '\\t': '\t', '\\n': '\n', '\\r': '\r'}
+
+
+def _unescape_copy(value: str) -> str:
+    """Undo COPY text-format backslash escaping"""
+    if '\\' not in value:
+        return value
+    return re.sub(r'\\[\\tnr]', lambda m: _COPY_ESCAPES[m.group(0)], value)
+
+
+class FakeConnection:
+    """DB-API style connection to a FakeBackend"""
+
+    def __init__(self, backend: FakeBackend):
+        """Bind the connection to its backend"""
+        self.backend = backend
+        self.closed = 0
+        self.broken = False
+        self.autocommit = False
+        self.in_transaction = False
+        self.prepared: Dict[str, str] = {}
+
+    def _check(self):
+        """Raise if the connection can no longer be used"""
+        if self.closed:
+            raise FakeOperationalError('connection already closed')
+        if self.broken or not self.backend.alive:
+            raise FakeOperationalError('server closed the connection unexpectedly')
+
+    def cursor(self, name: Optional[str] = None) -> 'FakeCursor':
+        """Open a cursor on this connection"""
+        self._check()
+        return FakeCursor(self, name=name)
+
+    def ping(self) -> bool:
+        """Report whether the connection is still usable"""
+        return not self.closed and not self.broken and self.backend.alive
+
+    def commit(self):
+        """Commit the current transaction"""
+        self._check()
+        self.in_transaction = False
+
+    def rollback(self):
+        """Roll back the current transaction"""
+        self._check()
+        self.in_transaction = False
+
+    def close(self):
+        """Close the connection"""
+        if not self.closed:
+            self.closed = 1
+            with self.backend._lock:
+                self.backend.stats['connections_closed'] += 1
+
+
+class FakeCursor:
+    """DB-API style cursor returned by FakeConnection"""
+
+    def __init__(self, connection: FakeConnection, name: Optional[str] = None):
+        """Initialize an empty cursor"""
+        self.connection = connection
+        self.name = name
+        self.arraysize = 1
+        self.description = None
+        self.rowcount = -1
+        self._rows: List[tuple] = []
+        self._position = 0
+
+    def execute(self, query: str, params: Optional[tuple] = None):
+        """Execute a statement on the backend"""
+        self.connection._check()
+        if not self.connection.autocommit:
+            self.connection.in_transaction = True
+        columns, rows, rowcount = self.connection.backend.execute_on(self.connection, query, params)
+        self.description = [(c, None, None, None, None, None, None) for c in columns] if columns else None
+        self.rowcount = rowcount
+        self._rows = rows
+        self._position = 0
+
+    def copy_expert(self, sql: str, file, size: int = 8192):
+        """Run COPY ... FROM STDIN with text-format data read from a file object"""
+        self.connection._check()
+        if not self.connection.autocommit:
+            self.connection.in_transaction = True
+        self.description = None
+        self.rowcount = self.connection.backend.copy_from(sql, file.read())
+
+    def fetchone(self) -> Optional[tuple]:
+        """Fetch the next row"""
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[tuple]:
+        """Fetch the next batch of rows"""
+        size = size or self.arraysize
+        batch = self._rows[self._position:self._position + size]
+        self._position += len(batch)
+        return batch
+
+    def fetchall(self) -> List[tuple]:
+        """Fetch all remaining rows"""
+        batch = self._rows[self._position:]
+        self._position = len(self._rows)
+        return batch
+
+    def __iter__(self):
+        """Iterate over remaining rows"""
+        row = self.fetchone()
+        while row is not None:
+            yield row
+            row = self.fetchone()
+
+    def close(self):
+        """Release the cursor's buffered rows"""
+        self._rows = []
+
+
+def _sample_backend() -> FakeBackend:
+    """A fresh backend seeded with the ScrollVerse sample data"""
+    # Imported here: the fakes modules build on FakeBackend from this module
+    try:
+        from .fakes import scrollverse_sample_backend
+    except ImportError:
+        from fakes import scrollverse_sample_backend
+    return scrollverse_sample_backend()
+
+
+class FakeCluster:
+    """
+    A fake primary with streaming replicas, addressed by host
+    Replicas answer reads from their last replicate() snapshot, report replay
+    lag against the primary's writes, and refuse writes like a hot standby
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[str] = ('replica1', 'replica2'),
+        factory: Optional[Callable[[], FakeBackend]] = None
+    ):
+        """Build the primary and one caught-up replica per host from the same factory"""
+        factory = factory or _sample_backend
+        self.primary = factory()
+        self.replicas: Dict[str, FakeBackend] = {}
+        for host in replicas:
+            node = factory()
+            node.upstream = self.primary
+            node.replicate()
+            self.replicas[host] = node
+
+    def node(self, host: Optional[str]) -> FakeBackend:
+        """The replica for a host, or the primary for any other host"""
+        return self.replicas.get(host, self.primary)
+
+    def replicate(self, host: Optional[str] = None):
+        """Catch up one replica, or all of them"""
+        for name, node in self.replicas.items():
+            if host is None or name == host:
+                node.replicate()
+
+
+class FakeDriver(Driver):
+    """Driver that connects to an in-process FakeBackend"""
+
+    name = 'fake'
+
+    def __init__(self, backend: Optional[FakeBackend] = None, cluster: Optional[FakeCluster] = None):
+        """Use the given backend or cluster, or a fresh backend seeded with sample data"""
+        self.cluster = cluster
+        self.backend = cluster.primary if cluster else backend or _sample_backend()
+
+    def connect(self, config: Dict[str, Any]) -> FakeConnection:
+        """Open a connection to the fake backend, or to the cluster node named by config['host']"""
+        backend = self.cluster.node(config.get('host')) if self.cluster else self.backend
+        return backend.connect()
+
+    def ping(self, connection: FakeConnection) -> bool:
+        """Check liveness without a round trip"""
+        return connection.ping()
+
+
+class AsyncDriver:
+    """
+    Base asyncio driver interface
+    Async drivers own statement execution because asyncio client libraries do
+    not share the DB-API cursor model
+    """
+
+    name = 'base'
+
+    async def connect(self, config: Dict[str, Any]):
+        """Open a new raw connection"""
+        raise NotImplementedError
+
+    async def ping(self, connection) -> bool:
+        """Return True if the connection can still serve queries"""
+        raise NotImplementedError
+
+    async def execute(self, connection, query: str, params: Optional[tuple] = None) -> Tuple[List[str], List[tuple], int]:
+        """Run a statement and return (columns, rows, rowcount)"""
+        raise NotImplementedError
+
+    async def reset(self, connection):
+        """Return a connection to a clean state before it goes back to the pool"""
+
+    async def close(self, connection):
+        """Close a raw connection"""
+        raise NotImplementedError
+
+
+def to_numbered_placeholders(query: str) -> str:
+    """Rewrite DB-API %s placeholders as PostgreSQL $1, $2, ... placeholders"""
+    parts = query.replace('%%', '\0').split('%s')
+    numbered = parts[0]
+    for index, part in enumerate(parts[1:], start=1):
+        numbered += f'${index}{part}'
+    return numbered.replace('\0', '%')
+
+
+class AsyncpgDriver(AsyncDriver):
+    """Async driver backed by asyncpg for live PostgreSQL servers"""
+
+    name = 'asyncpg'
+
+    _ROW_STATEMENTS = ('select', 'with', 'values', 'show', 'explain', 'table')
+
+    async def connect(self, config: Dict[str, Any]):
+        """Open an asyncpg connection using the client configuration"""
+        import asyncpg
+
+        return await asyncpg.connect(
+            host=config['host'],
+            port=config['port'],
+            database=config['database'],
+            user=config['user'],
+            password=config['password'],
+            ssl='require' if config.get('ssl') else None,
+            statement_cache_size=config.get('statement_cache_size', 100),
+            server_settings={'application_name': config.get('application_name', 'scrollverse')}
+        )
+
+    async def ping(self, connection) -> bool:
+        """Check liveness with a SELECT 1 round trip"""
+        if connection.is_closed():
+            return False
+        try:
+            await connection.fetchval('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    async def execute(self, connection, query: str, params: Optional[tuple] = None) -> Tuple[List[str], List[tuple], int]:
+        """Run a statement, fetching rows only for row-returning statements"""
+        args = tuple(params or ())
+        if query.lstrip().lower().startswith(self._ROW_STATEMENTS):
+            # fetch() goes through asyncpg's per-connection LRU of prepared statements
+            records = await connection.fetch(to_numbered_placeholders(query), *args)
+            columns = list(records[0].keys()) if records else []
+            return columns, [tuple(record) for record in records], len(records)
+
+        # Utility statements such as VACUUM must use the simple query protocol
+        status = await connection.execute(to_numbered_placeholders(query), *args)
+        last = status.rsplit(' ', 1)[-1]
+        return [], [], int(last) if last.isdigit() else -1
+
+    async def reset(self, connection):
+        """Roll back a transaction left open by the caller"""
+        if connection.is_in_transaction():
+            await connection.execute('ROLLBACK')
+
+    async def close(self, connection):
+        """Close the connection, ignoring errors from dead sockets"""
+        try:
+            await connection.close(timeout=5)
+        except Exception:
+            connection.terminate()
+
+
+class AsyncFakeDriver(AsyncDriver):
+    """Async driver that connects to an in-process FakeBackend"""
+
+    name = 'fake'
+
+    def __init__(self, backend: Optional[FakeBackend] = None):
+        """Use the given backend or a fresh one seeded with sample data"""
+        self.backend = backend or _sample_backend()
+
+    async def connect(self, config: Dict[str, Any]) -> FakeConnection:
+        """Open a connection to the fake backend"""
+        return self.backend.connect()
+
+    async def ping(self, connection: FakeConnection) -> bool:
+        """Check liveness without a round trip"""
+        return connection.ping()
+
+    async def execute(self, connection: FakeConnection, query: str, params: Optional[tuple] = None) -> Tuple[List[str], List[tuple], int]:
+        """Run a statement, yielding to the event loop for the simulated latency"""
+        connection._check()
+        delay = self.backend.delay_for(query)
+        if delay:
+            await asyncio.sleep(delay)
+        return self.backend.evaluate(query, params)
+
+    async def reset(self, connection: FakeConnection):
+        """Roll back any open transaction"""
+        connection.rollback()
+
+    async def close(self, connection: FakeConnection):
+        """Close the connection"""
+        connection.close()
+
+
+DRIVERS = {
+    'psycopg2': Psycopg2Driver,
+    'fake': FakeDriver
+}
+
+
+def get_driver(name: str, **kwargs) -> Driver:
+    """Instantiate a registered driver by name"""
+    try:
+        return DRIVERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown database driver '{name}' (available: {', '.join(sorted(DRIVERS))})")
+
+
+ASYNC_DRIVERS = {
+    'asyncpg': AsyncpgDriver,
+    'fake': AsyncFakeDriver
+}
+
+
+def get_async_driver(name: str, **kwargs) -> AsyncDriver:
+    """Instantiate a registered asyncio driver by name"""
+    try:
+        return ASYNC_DRIVERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown async database driver '{name}' (available: {', '.join(sorted(ASYNC_DRIVERS))})")
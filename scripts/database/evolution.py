@@ -0,0 +1,280 @@
+"""
+Evolution Replay for ScrollVerse
+Point-in-time NFT state from nft_evolution_history, accelerated by periodic per-NFT snapshots
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    from .bulk_writer import encode_copy_value
+except ImportError:
+    from bulk_writer import encode_copy_value
+
+SNAPSHOT_TABLE = 'nft_state_snapshots'
+SNAPSHOT_COLUMNS = ['nft_id', 'events', 'event_id', 'as_of', 'stage', 'frequency', 'resonance_level']
+
+# Events replay in (evolution_timestamp, id) order; events without a timestamp are not replayed.
+# A snapshot sits after the event (as_of, event_id), so "later" is a row comparison with it
+
+# Latest snapshot at or before the requested moment (all of them when NULL) for each NFT
+SNAPSHOTS_AT_QUERY = """
+    SELECT DISTINCT ON (s.nft_id)
+        s.nft_id, s.events, s.event_id, s.as_of, s.stage, s.frequency, s.resonance_level
+    FROM nft_state_snapshots s
+    WHERE s.nft_id = ANY(%s) AND (%s::timestamp IS NULL OR s.as_of IS NULL OR s.as_of <= %s)
+    ORDER BY s.nft_id, s.events DESC
+"""
+
+# State before the first evolution: the current metadata with every replayed shift undone
+GENESIS_QUERY = """
+    SELECT
+        nm.id AS nft_id,
+        0 AS events,
+        0 AS event_id,
+        LEAST(nm.created_at, MIN(h.evolution_timestamp)) AS as_of,
+        COALESCE(
+            (SELECT f.from_stage FROM nft_evolution_history f
+             WHERE f.nft_id = nm.id AND f.evolution_timestamp IS NOT NULL
+             ORDER BY f.evolution_timestamp, f.id
+             LIMIT 1),
+            nm.evolution_stage
+        ) AS stage,
+        nm.frequency - COALESCE(SUM(h.frequency_shift), 0) AS frequency,
+        nm.resonance_level - COALESCE(SUM(h.resonance_change), 0) AS resonance_level
+    FROM nft_metadata nm
+    LEFT JOIN nft_evolution_history h ON h.nft_id = nm.id AND h.evolution_timestamp IS NOT NULL
+    WHERE nm.id = ANY(%s)
+    GROUP BY nm.id
+"""
+
+# Every NFT's events after its starting snapshot, up to the requested moment, folded into one row.
+# Replay is a sum of shifts plus the last stage, so the whole batch reduces in one grouped pass
+EVENTS_SINCE_QUERY = """
+    SELECT
+        s.nft_id,
+        COUNT(*) AS events,
+        (array_agg(h.id ORDER BY h.evolution_timestamp DESC, h.id DESC))[1] AS event_id,
+        MAX(h.evolution_timestamp) AS as_of,
+        (array_agg(h.to_stage ORDER BY h.evolution_timestamp DESC, h.id DESC)
+            FILTER (WHERE h.to_stage IS NOT NULL))[1] AS stage,
+        COALESCE(SUM(h.frequency_shift), 0) AS frequency_shift,
+        COALESCE(SUM(h.resonance_change), 0) AS resonance_change
+    FROM unnest(%s::integer[], %s::timestamp[], %s::integer[]) AS s(nft_id, as_of, event_id)
+    JOIN nft_evolution_history h ON h.nft_id = s.nft_id
+    WHERE h.evolution_timestamp IS NOT NULL
+        AND (s.as_of IS NULL OR (h.evolution_timestamp, h.id) > (s.as_of, s.event_id))
+        AND (%s::timestamp IS NULL OR h.evolution_timestamp <= %s)
+    GROUP BY s.nft_id
+"""
+
+# Each NFT's latest snapshot and how many events have been recorded after it
+SNAPSHOT_BACKLOG_QUERY = """
+    SELECT
+        nm.id AS nft_id,
+        s.events, s.event_id, s.as_of, s.stage, s.frequency, s.resonance_level,
+        (
+            SELECT COUNT(*) FROM nft_evolution_history h
+            WHERE h.nft_id = nm.id AND h.evolution_timestamp IS NOT NULL
+                AND (s.as_of IS NULL OR (h.evolution_timestamp, h.id) > (s.as_of, s.event_id))
+        ) AS pending
+    FROM nft_metadata nm
+    LEFT JOIN LATERAL (
+        SELECT x.events, x.event_id, x.as_of, x.stage, x.frequency, x.resonance_level
+        FROM nft_state_snapshots x
+        WHERE x.nft_id = nm.id
+        ORDER BY x.events DESC
+        LIMIT 1
+    ) s ON true
+    WHERE (%s::integer[] IS NULL OR nm.id = ANY(%s))
+"""
+
+# The events after each NFT's latest snapshot, one at a time in replay order
+EVENTS_AFTER_QUERY = """
+    SELECT h.nft_id, h.id, h.evolution_timestamp, h.to_stage, h.frequency_shift, h.resonance_change
+    FROM unnest(%s::integer[], %s::timestamp[], %s::integer[]) AS s(nft_id, as_of, event_id)
+    JOIN nft_evolution_history h ON h.nft_id = s.nft_id
+    WHERE h.evolution_timestamp IS NOT NULL
+        AND (s.as_of IS NULL OR (h.evolution_timestamp, h.id) > (s.as_of, s.event_id))
+    ORDER BY h.nft_id, h.evolution_timestamp, h.id
+"""
+
+
+def _shifted(value: Any, shift: Any) -> Any:
+    """value + shift, where a NULL base stays NULL and a NULL shift counts as zero"""
+    if value is None:
+        return None
+    return value + (shift or 0)
+
+
+class NftState:
+    """An NFT's stage, frequency and resonance after its first events evolutions"""
+
+    __slots__ = ('nft_id', 'events', 'event_id', 'as_of', 'stage', 'frequency', 'resonance_level')
+
+    def __init__(
+        self,
+        nft_id: int,
+        events: int,
+        event_id: int,
+        as_of: Optional[datetime],
+        stage: Optional[str],
+        frequency: Optional[int],
+        resonance_level: Optional[Decimal]
+    ):
+        """State after the event (as_of, event_id); events = 0 is the state before any evolution"""
+        self.nft_id = nft_id
+        self.events = events
+        self.event_id = event_id
+        self.as_of = as_of
+        self.stage = stage
+        self.frequency = frequency
+        self.resonance_level = resonance_level
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'NftState':
+        """State from a row in SNAPSHOT_COLUMNS order"""
+        return cls(*row[:7])
+
+    def apply(self, event_id: int, as_of: datetime, to_stage: Optional[str], frequency_shift: Any, resonance_change: Any):
+        """Replay one evolution"""
+        self.advance(1, event_id, as_of, to_stage, frequency_shift, resonance_change)
+
+    def advance(self, events: int, event_id: int, as_of: datetime, stage: Optional[str], frequency_shift: Any, resonance_change: Any):
+        """Replay a run of evolutions folded into its count, last event, last stage and summed shifts"""
+        self.events += events
+        self.event_id = event_id
+        self.as_of = as_of
+        if stage is not None:
+            self.stage = stage
+        self.frequency = _shifted(self.frequency, frequency_shift)
+        self.resonance_level = _shifted(self.resonance_level, resonance_change)
+
+    def copy_line(self) -> str:
+        """The state as one COPY text-format nft_state_snapshots row"""
+        return '\t'.join(encode_copy_value(getattr(self, column)) for column in SNAPSHOT_COLUMNS) + '\n'
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view of the state"""
+        return {
+            'nft_id': self.nft_id,
+            'evolution_stage': self.stage,
+            'frequency': self.frequency,
+            'resonance_level': float(self.resonance_level) if self.resonance_level is not None else None,
+            'evolutions': self.events,
+            'last_event_id': self.event_id or None,
+            'as_of': self.as_of.isoformat() if self.as_of else None
+        }
+
+
+class EvolutionReplayer:
+    """
+    Reconstructs NFT state at any moment from nft_evolution_history
+    Every snapshot_interval events, refresh_snapshots() stores an NFT's replayed
+    state in nft_state_snapshots. A point-in-time read starts from the latest
+    snapshot at or before the moment and applies only the events after it, for
+    any number of NFTs in three round trips. NFTs without snapshots replay
+    from their genesis state, computed on the fly
+    """
+
+    def __init__(self, client, snapshot_interval: int = 100, write_batch_size: int = 5000):
+        """Initialize against a connected PostgreSQLClient"""
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be at least 1")
+        self.client = client
+        self.snapshot_interval = snapshot_interval
+        self.write_batch_size = write_batch_size
+
+    @classmethod
+    def from_config(cls, client, config: Dict[str, Any]) -> 'EvolutionReplayer':
+        """Build a replayer from client config"""
+        return cls(client, snapshot_interval=config.get('evolution_snapshot_interval', 100))
+
+    def _states(self, query: str, params: tuple) -> List[NftState]:
+        """Run a query whose rows are in SNAPSHOT_COLUMNS order"""
+        return [NftState.from_row(row) for row in self.client.execute_query(query, params, read_only=True)['rows']]
+
+    @staticmethod
+    def _starts(states: Iterable[NftState]) -> tuple:
+        """Parallel (nft_ids, as_of, event_ids) arrays for the unnest() in the replay queries"""
+        states = list(states)
+        return [s.nft_id for s in states], [s.as_of for s in states], [s.event_id for s in states]
+
+    def states_at(self, nft_ids: Sequence[int], at: Optional[datetime] = None) -> Dict[int, NftState]:
+        """State of each NFT as of at (now when None); NFTs that did not exist yet are left out"""
+        nft_ids = list(dict.fromkeys(nft_ids))
+        if not nft_ids:
+            return {}
+
+        states = {s.nft_id: s for s in self._states(SNAPSHOTS_AT_QUERY, (nft_ids, at, at))}
+        missing = [nft_id for nft_id in nft_ids if nft_id not in states]
+        if missing:
+            for state in self._states(GENESIS_QUERY, (missing,)):
+                if at is None or state.as_of is None or state.as_of <= at:
+                    states[state.nft_id] = state
+        if not states:
+            return {}
+
+        ids, moments, event_ids = self._starts(states.values())
+        result = self.client.execute_query(EVENTS_SINCE_QUERY, (ids, moments, event_ids, at, at), read_only=True)
+        for nft_id, events, event_id, as_of, stage, frequency_shift, resonance_change in result['rows']:
+            states[nft_id].advance(events, event_id, as_of, stage, frequency_shift, resonance_change)
+        return {nft_id: states[nft_id] for nft_id in nft_ids if nft_id in states}
+
+    def state_at(self, nft_id: int, at: Optional[datetime] = None) -> Optional[NftState]:
+        """State of one NFT as of at, or None if it did not exist yet"""
+        return self.states_at([nft_id], at).get(nft_id)
+
+    def refresh_snapshots(self, nft_ids: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """
+        Store genesis snapshots for new NFTs and a snapshot every snapshot_interval
+        events for NFTs that have that many since their latest one. Run one refresh
+        at a time; a concurrent one fails on the primary key and can be rerun
+        """
+        started = time.monotonic()
+        ids = list(nft_ids) if nft_ids is not None else None
+        backlog = self.client.execute_query(SNAPSHOT_BACKLOG_QUERY, (ids, ids))['rows']
+
+        latest, new_nfts, pending = {}, [], {}
+        for nft_id, events, event_id, as_of, stage, frequency, resonance_level, count in backlog:
+            pending[nft_id] = count
+            if events is None:
+                new_nfts.append(nft_id)
+            else:
+                latest[nft_id] = NftState(nft_id, events, event_id, as_of, stage, frequency, resonance_level)
+
+        lines: List[str] = []
+        genesis = self._states(GENESIS_QUERY, (new_nfts,)) if new_nfts else []
+        for state in genesis:
+            lines.append(state.copy_line())
+            latest[state.nft_id] = state
+
+        due = {nft_id: state for nft_id, state in latest.items() if pending[nft_id] >= self.snapshot_interval}
+        replayed = created = 0
+        if due:
+            ids, moments, event_ids = self._starts(due.values())
+            for nft_id, event_id, as_of, to_stage, frequency_shift, resonance_change in self.client.iter_query(
+                    EVENTS_AFTER_QUERY, (ids, moments, event_ids), batch_size=self.write_batch_size):
+                state = due[nft_id]
+                state.apply(event_id, as_of, to_stage, frequency_shift, resonance_change)
+                replayed += 1
+                if state.events % self.snapshot_interval == 0:
+                    lines.append(state.copy_line())
+                    created += 1
+                if len(lines) >= self.write_batch_size:
+                    self.client.copy_from_stdin(SNAPSHOT_TABLE, SNAPSHOT_COLUMNS, ''.join(lines))
+                    lines = []
+        if lines:
+            self.client.copy_from_stdin(SNAPSHOT_TABLE, SNAPSHOT_COLUMNS, ''.join(lines))
+
+        return {
+            'nfts_checked': len(backlog),
+            'genesis_snapshots': len(genesis),
+            'snapshots_created': created,
+            'events_replayed': replayed,
+            'snapshot_interval': self.snapshot_interval,
+            'elapsed_seconds': round(time.monotonic() - started, 3)
+        }
@@ -0,0 +1,604 @@
+"""
+Sharded Export for ScrollVerse
+Parallel, resumable export of NFT tables to compressed column-oriented shard files
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import io
+import json
+import lzma
+import math
+import multiprocessing
+import os
+import re
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .bulk_writer import encode_copy_value
+    from .drivers import get_driver
+    from .maintenance import quote_ident
+    from .schema_introspection import SCHEMA_INTROSPECTION_QUERY, shape_schema
+except ImportError:
+    from bulk_writer import encode_copy_value
+    from drivers import get_driver
+    from maintenance import quote_ident
+    from schema_introspection import SCHEMA_INTROSPECTION_QUERY, shape_schema
+
+# Tables exported by default and the NOT NULL column each is sharded on.
+# resonance_data is partitioned by timestamp, so timestamp shards prune to one partition
+EXPORT_TABLES = {
+    'nft_metadata': 'id',
+    'frequency_layers': 'id',
+    'resonance_data': 'timestamp',
+    'nft_evolution_history': 'id'
+}
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+SHARD_MAGIC = b'SVCOLS1\n'
+SHARD_EXTENSION = '.svcols'
+SHARD_VERSION = 1
+
+COMPRESSIONS = ('zlib', 'lzma', 'none')
+
+INTEGER_TYPES = ('smallint', 'integer', 'bigint', 'serial', 'bigserial', 'smallserial')
+TIMESTAMP_TYPES = ('timestamp', 'timestamptz', 'date')
+
+# Planner statistics for a table and, when it is partitioned, its partitions
+ROW_ESTIMATE_QUERY = """
+    SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint AS estimate
+    FROM pg_class c
+    WHERE c.oid = %s::regclass
+       OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)
+"""
+
+_COPY_UNESCAPES = {'\\\\': '\\', '\\t': '\t', '\\n': '\n', '\\r': '\r', '\\b': '\b', '\\f': '\f', '\\v': '\v'}
+_COPY_ESCAPE_RE = re.compile(r'\\[\\tnrbfv]')
+
+# Rows split and compressed per column at a time while a shard streams in
+_BLOCK_ROWS = 10000
+
+
+def decode_copy_text(value: str) -> Optional[str]:
+    """One COPY text-format field as a string, or None for NULL"""
+    if value == '\\N':
+        return None
+    if '\\' not in value:
+        return value
+    return _COPY_ESCAPE_RE.sub(lambda m: _COPY_UNESCAPES[m.group(0)], value)
+
+
+def key_kind(column_type: str) -> str:
+    """'integer' or 'timestamp' for a shard key column type"""
+    base = column_type.split('(')[0].strip()
+    if base in INTEGER_TYPES:
+        return 'integer'
+    if base in TIMESTAMP_TYPES:
+        return 'timestamp'
+    raise ValueError(f"Cannot shard on a {column_type} column; use an integer or timestamp key")
+
+
+def split_range(lower: Any, upper: Any, count: int) -> List[Tuple[Any, Any]]:
+    """
+    count consecutive [lower, upper) ranges covering lower..upper inclusive
+    The first range is open below and the last open above, so rows outside
+    the planned bounds still land in a shard
+    """
+    if isinstance(lower, int):
+        count = max(1, min(count, upper - lower + 1))
+        step = math.ceil((upper - lower + 1) / count)
+        bounds = [lower + step * i for i in range(1, count)]
+    else:
+        count = max(1, count) if upper > lower else 1
+        step = (upper - lower) / count
+        bounds = [lower + step * i for i in range(1, count)]
+    edges = [None] + bounds + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def shard_query(schema: str, table: str, columns: Sequence[str], key: str, lower: Any, upper: Any) -> Tuple[str, tuple]:
+    """SELECT for one shard's key range in key order"""
+    quoted_key = quote_ident(key)
+    conditions, params = [], []
+    if lower is not None:
+        conditions.append(f"{quoted_key} >= %s")
+        params.append(lower)
+    if upper is not None:
+        conditions.append(f"{quoted_key} < %s")
+        params.append(upper)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    selected = ', '.join(quote_ident(c) for c in columns)
+    return (
+        f"SELECT {selected} FROM {quote_ident(schema)}.{quote_ident(table)}{where} ORDER BY {quoted_key}",
+        tuple(params)
+    )
+
+
+def _bound_to_json(value: Any) -> Any:
+    """Shard bound as stored in the manifest"""
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _bound_from_json(value: Any, kind: str) -> Any:
+    """Shard bound read back from the manifest"""
+    if value is None or kind != 'timestamp':
+        return value
+    return datetime.fromisoformat(value)
+
+
+class _Codec:
+    """Streaming compressor for one column block"""
+
+    def __init__(self, compression: str, level: Optional[int]):
+        """Start an empty compressed block"""
+        if compression == 'zlib':
+            self._compressor = zlib.compressobj(6 if level is None else level)
+        elif compression == 'lzma':
+            self._compressor = lzma.LZMACompressor(preset=6 if level is None else level)
+        else:
+            self._compressor = None
+        self.buffer = io.BytesIO()
+        self.raw_bytes = 0
+
+    def add(self, data: bytes):
+        """Compress and append raw bytes"""
+        self.raw_bytes += len(data)
+        self.buffer.write(self._compressor.compress(data) if self._compressor else data)
+
+    def finish(self) -> bytes:
+        """The complete compressed block"""
+        if self._compressor:
+            self.buffer.write(self._compressor.flush())
+        return self.buffer.getvalue()
+
+
+def _decompress(block: bytes, compression: str) -> bytes:
+    """Raw bytes of one column block"""
+    if compression == 'zlib':
+        return zlib.decompress(block)
+    if compression == 'lzma':
+        return lzma.decompress(block)
+    return block
+
+
+class ColumnShardWriter:
+    """
+    Column-oriented shard file builder fed with COPY text
+    Rows arrive as COPY TO STDOUT output through write(), or as already
+    encoded fields through add_row(). Every column is compressed into its own
+    block of newline-terminated COPY text fields, so a reader can load one
+    column without touching the others. The file is a magic line, a
+    length-prefixed JSON header and the column blocks
+    """
+
+    def __init__(self, columns: Sequence[Dict[str, str]], compression: str = 'zlib', level: Optional[int] = None):
+        """Start an empty shard for columns given as {'name', 'type'} dicts"""
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (available: {', '.join(COMPRESSIONS)})")
+        self.columns = [dict(c) for c in columns]
+        self.compression = compression
+        self.rows = 0
+        self._codecs = [_Codec(compression, level) for _ in self.columns]
+        self._nulls = [0] * len(self.columns)
+        self._pending = b''
+        self._block: List[List[bytes]] = []
+
+    def write(self, data):
+        """Accept a chunk of COPY text output; rows may span chunks"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        lines = (self._pending + data).split(b'\n')
+        self._pending = lines.pop()
+        self._block.extend(line.split(b'\t') for line in lines)
+        if len(self._block) >= _BLOCK_ROWS:
+            self._flush_block()
+        return len(data)
+
+    def add_row(self, fields: Sequence[str]):
+        """Accept one row of COPY text fields"""
+        self._block.append([field.encode('utf-8') for field in fields])
+        if len(self._block) >= _BLOCK_ROWS:
+            self._flush_block()
+
+    def _flush_block(self):
+        """Split buffered rows into columns and compress each"""
+        if not self._block:
+            return
+        width = len(self.columns)
+        if any(len(fields) != width for fields in self._block):
+            raise ValueError(f"COPY rows do not have {width} columns")
+        for index, values in enumerate(zip(*self._block)):
+            self._nulls[index] += values.count(b'\\N')
+            self._codecs[index].add(b'\n'.join(values) + b'\n')
+        self.rows += len(self._block)
+        self._block = []
+
+    def save(self, path: str, **header: Any) -> int:
+        """Write the shard atomically to path with extra header fields; returns the file size"""
+        if self._pending:
+            raise ValueError("COPY output ended in the middle of a row")
+        self._flush_block()
+
+        blocks, columns, offset = [], [], 0
+        for column, codec, nulls in zip(self.columns, self._codecs, self._nulls):
+            block = codec.finish()
+            columns.append({**column, 'offset': offset, 'length': len(block), 'raw_bytes': codec.raw_bytes, 'nulls': nulls})
+            blocks.append(block)
+            offset += len(block)
+        encoded = json.dumps({
+            **header,
+            'version': SHARD_VERSION,
+            'compression': self.compression,
+            'rows': self.rows,
+            'columns': columns
+        }, sort_keys=True, default=str).encode('utf-8')
+
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(SHARD_MAGIC)
+            f.write(struct.pack('>I', len(encoded)))
+            f.write(encoded)
+            for block in blocks:
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        return len(SHARD_MAGIC) + 4 + len(encoded) + offset
+
+
+def read_shard_header(path: str) -> Dict[str, Any]:
+    """Header of a shard file: table, bounds, row count and per-column blocks"""
+    with open(path, 'rb') as f:
+        header, _ = _read_header(f, path)
+    return header
+
+
+def _read_header(f, path: str) -> Tuple[Dict[str, Any], int]:
+    """Parse the header and return it with the offset where column blocks start"""
+    if f.read(len(SHARD_MAGIC)) != SHARD_MAGIC:
+        raise ValueError(f"{path} is not a ScrollVerse column shard")
+    size = struct.unpack('>I', f.read(4))[0]
+    return json.loads(f.read(size).decode('utf-8')), len(SHARD_MAGIC) + 4 + size
+
+
+def read_shard(path: str, columns: Optional[Sequence[str]] = None, raw: bool = False) -> Dict[str, List[Any]]:
+    """
+    Load columns of a shard as {name: values}
+    Values are strings with None for NULL, or the COPY text fields themselves
+    when raw is set
+    """
+    with open(path, 'rb') as f:
+        header, start = _read_header(f, path)
+        stored = {c['name']: c for c in header['columns']}
+        wanted = list(columns) if columns is not None else [c['name'] for c in header['columns']]
+        unknown = [name for name in wanted if name not in stored]
+        if unknown:
+            raise KeyError(f"{path} has no column {', '.join(unknown)}")
+
+        result = {}
+        for name in wanted:
+            f.seek(start + stored[name]['offset'])
+            text = _decompress(f.read(stored[name]['length']), header['compression']).decode('utf-8')
+            fields = text.split('\n')[:-1] if text else []
+            result[name] = fields if raw else [decode_copy_text(field) for field in fields]
+    return result
+
+
+def shard_copy_data(path: str) -> Tuple[List[str], str]:
+    """(columns, COPY text) of a shard, ready for PostgreSQLClient.copy_from_stdin"""
+    fields = read_shard(path, raw=True)
+    names = list(fields)
+    lines = ('\t'.join(row) + '\n' for row in zip(*fields.values()))
+    return names, ''.join(lines)
+
+
+def export_shard(driver, config: Dict[str, Any], task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Export one shard on its own connection; runs in a pool worker
+    driver is a Driver, or a registered driver name when the worker is a
+    separate process. With a snapshot, the shard reads the coordinator's
+    exported snapshot, so every shard sees the same database state
+    """
+    started = time.monotonic()
+    if isinstance(driver, str):
+        driver = get_driver(driver)
+    lower = _bound_from_json(task['lower'], task['key_kind'])
+    upper = _bound_from_json(task['upper'], task['key_kind'])
+    names = [c['name'] for c in task['columns']]
+    query, params = shard_query(task['schema'], task['table'], names, task['key'], lower, upper)
+    writer = ColumnShardWriter(task['columns'], task['compression'], task.get('level'))
+
+    conn = driver.connect(config)
+    try:
+        if task.get('snapshot'):
+            setup = conn.cursor()
+            try:
+                setup.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                setup.execute("SET TRANSACTION SNAPSHOT %s", (task['snapshot'],))
+            finally:
+                setup.close()
+
+        if driver.binary_copy:
+            cursor = conn.cursor()
+            try:
+                bound = cursor.mogrify(query, params).decode('utf-8')
+                cursor.copy_expert(f"COPY ({bound}) TO STDOUT", writer)
+            finally:
+                cursor.close()
+        else:
+            cursor = conn.cursor(name=f"scrollverse_export_{task['table']}_{task['index']}")
+            batch_size = task.get('batch_size', 10000)
+            try:
+                cursor.execute(query, params)
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    for row in batch:
+                        writer.add_row([encode_copy_value(value) for value in row])
+            finally:
+                cursor.close()
+        conn.rollback()
+    finally:
+        driver.close(conn)
+
+    size = writer.save(
+        task['path'],
+        table=task['table'],
+        key=task['key'],
+        lower=task['lower'],
+        upper=task['upper'],
+        snapshot=task.get('snapshot')
+    )
+    return {'rows': writer.rows, 'bytes': size, 'seconds': round(time.monotonic() - started, 3)}
+
+
+class ShardExporter:
+    """
+    Exports tables as key-range shards streamed concurrently into column files
+    A coordinator transaction plans each table's shards from its key bounds
+    and row estimate and exports a snapshot. Pool workers then stream one
+    shard each over their own connection within that snapshot, through COPY
+    TO STDOUT where the driver supports it. manifest.json records the plan
+    and every finished shard, so a rerun skips shards already on disk
+    """
+
+    def __init__(
+        self,
+        client,
+        output_dir: str,
+        tables: Optional[Dict[str, str]] = None,
+        schema: str = 'public',
+        workers: Optional[int] = None,
+        shard_rows: int = 1000000,
+        compression: str = 'zlib',
+        level: Optional[int] = None,
+        batch_size: int = 10000,
+        processes: Optional[bool] = None
+    ):
+        """
+        Export tables ({table: shard key}) into output_dir
+        processes defaults to a process pool, or to threads for the in-process fake driver
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (available: {', '.join(COMPRESSIONS)})")
+        self.client = client
+        self.output_dir = output_dir
+        self.tables = dict(tables or EXPORT_TABLES)
+        self.schema = schema
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_rows = shard_rows
+        self.compression = compression
+        self.level = level
+        self.batch_size = batch_size
+        self.processes = client.driver.name != 'fake' if processes is None else processes
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    @classmethod
+    def from_config(
+        cls,
+        client,
+        config: Dict[str, Any],
+        output_dir: Optional[str] = None,
+        tables: Optional[Dict[str, str]] = None,
+        schema: str = 'public'
+    ) -> 'ShardExporter':
+        """Build an exporter from client config"""
+        return cls(
+            client,
+            output_dir or config.get('export_dir', './exports'),
+            tables=tables,
+            schema=schema,
+            workers=config.get('export_workers', 0) or None,
+            shard_rows=config.get('export_shard_rows', 1000000),
+            compression=config.get('export_compression', 'zlib')
+        )
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        """The manifest of an earlier run into output_dir, if any"""
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"{self.manifest_path} has manifest version {manifest.get('version')}, "
+                             f"expected {MANIFEST_VERSION}")
+        return manifest
+
+    def save_manifest(self, manifest: Dict[str, Any]):
+        """Atomically replace the manifest"""
+        temporary = f"{self.manifest_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True, default=str)
+        os.replace(temporary, self.manifest_path)
+
+    def _fetch(self, cursor, query: str, params: Optional[tuple] = None) -> Tuple[List[str], List[tuple]]:
+        """Run a coordinator query and return (columns, rows)"""
+        cursor.execute(query, params)
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        return columns, cursor.fetchall()
+
+    def plan_table(self, cursor, table: str, key: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Split one table into shards of about shard_rows rows by key range"""
+        columns = [{'name': c['name'], 'type': c['type']} for c in schema['columns']]
+        types = {c['name']: c['type'] for c in columns}
+        if key not in types:
+            raise ValueError(f"{table} has no column {key} to shard on")
+        kind = key_kind(types[key])
+
+        qualified = f"{quote_ident(self.schema)}.{quote_ident(table)}"
+        quoted_key = quote_ident(key)
+        _, rows = self._fetch(cursor, f"SELECT MIN({quoted_key}) AS lower, MAX({quoted_key}) AS upper FROM {qualified}")
+        lower, upper = rows[0]
+        if lower is None:
+            ranges = [(None, None)]
+        else:
+            _, rows = self._fetch(cursor, ROW_ESTIMATE_QUERY, (qualified, qualified))
+            estimate = rows[0][0]
+            if not estimate:
+                # Never analyzed: count once rather than export in one shard
+                _, rows = self._fetch(cursor, f"SELECT COUNT(*) AS estimate FROM {qualified}")
+                estimate = rows[0][0]
+            ranges = split_range(lower, upper, math.ceil(estimate / self.shard_rows))
+
+        os.makedirs(os.path.join(self.output_dir, table), exist_ok=True)
+        return {
+            'key': key,
+            'key_kind': kind,
+            'columns': columns,
+            'shards': [
+                {
+                    'index': index,
+                    'lower': _bound_to_json(shard_lower),
+                    'upper': _bound_to_json(shard_upper),
+                    'file': f"{table}/part-{index:05d}{SHARD_EXTENSION}",
+                    'status': 'pending'
+                }
+                for index, (shard_lower, shard_upper) in enumerate(ranges)
+            ]
+        }
+
+    def _executor(self):
+        """Process pool for real drivers; threads share the in-process fake backend"""
+        if self.processes:
+            # spawn: forking a client with pool and monitor threads is unsafe
+            return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scrollverse-export')
+
+    def run(self, resume: bool = True) -> Dict[str, Any]:
+        """Plan, export every pending shard in parallel and report per table"""
+        if not self.client.pool:
+            raise Exception("Not connected to database")
+        started = time.monotonic()
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self.load_manifest() if resume else None
+        if manifest is None:
+            manifest = {'version': MANIFEST_VERSION, 'schema': self.schema, 'tables': {}}
+        manifest.update(compression=self.compression, started_at=datetime.now().isoformat(), completed_at=None)
+
+        # The coordinator transaction stays open until the last shard finishes; its snapshot lives as long
+        with self.client.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                _, rows = self._fetch(cursor, "SELECT pg_export_snapshot()")
+                snapshot = rows[0][0]
+                manifest['snapshot'] = snapshot
+
+                columns, rows = self._fetch(cursor, SCHEMA_INTROSPECTION_QUERY, (self.schema,))
+                schemas = shape_schema({'columns': columns, 'rows': rows})
+                for table, key in self.tables.items():
+                    if table not in schemas:
+                        raise ValueError(f"Table {self.schema}.{table} does not exist")
+                    planned = manifest['tables'].get(table)
+                    current = [{'name': c['name'], 'type': c['type']} for c in schemas[table]['columns']]
+                    if planned is not None and (planned['columns'] != current or planned['key'] != key):
+                        raise ValueError(f"{table} changed since {self.manifest_path} was written; "
+                                         f"export into a new directory or pass resume=False")
+                    if planned is None:
+                        manifest['tables'][table] = self.plan_table(cursor, table, key, schemas[table])
+                self.save_manifest(manifest)
+
+                tasks, resumed = [], 0
+                for table in self.tables:
+                    plan = manifest['tables'][table]
+                    for shard in plan['shards']:
+                        path = os.path.join(self.output_dir, shard['file'])
+                        if shard['status'] == 'complete' and os.path.exists(path):
+                            resumed += 1
+                            continue
+                        tasks.append((shard, {
+                            'table': table,
+                            'schema': self.schema,
+                            'key': plan['key'],
+                            'key_kind': plan['key_kind'],
+                            'columns': plan['columns'],
+                            'index': shard['index'],
+                            'lower': shard['lower'],
+                            'upper': shard['upper'],
+                            'path': path,
+                            'snapshot': snapshot,
+                            'compression': self.compression,
+                            'level': self.level,
+                            'batch_size': self.batch_size
+                        }))
+
+                driver = self.client.driver.name if self.processes else self.client.driver
+                config = {**self.client.config, 'application_name': 'scrollverse-export'}
+                failed = 0
+                with self._executor() as executor:
+                    futures = {executor.submit(export_shard, driver, config, task): shard for shard, task in tasks}
+                    for future in as_completed(futures):
+                        shard = futures[future]
+                        try:
+                            shard.update(future.result(), status='complete')
+                            shard.pop('error', None)
+                        except Exception as e:
+                            shard.update(status='failed', error=f"{type(e).__name__}: {e}")
+                            failed += 1
+                        self.save_manifest(manifest)
+            finally:
+                cursor.close()
+            conn.rollback()
+
+        if not failed:
+            manifest['completed_at'] = datetime.now().isoformat()
+            self.save_manifest(manifest)
+
+        tables = {}
+        for table in self.tables:
+            shards = manifest['tables'][table]['shards']
+            tables[table] = {
+                'key': manifest['tables'][table]['key'],
+                'shards': len(shards),
+                'complete': sum(1 for s in shards if s['status'] == 'complete'),
+                'rows': sum(s.get('rows', 0) for s in shards if s['status'] == 'complete'),
+                'bytes': sum(s.get('bytes', 0) for s in shards if s['status'] == 'complete')
+            }
+        return {
+            'output_dir': self.output_dir,
+            'manifest': self.manifest_path,
+            'tables': tables,
+            'failures': [
+                {'table': table, 'index': s['index'], 'error': s['error']}
+                for table in self.tables for s in manifest['tables'][table]['shards'] if s['status'] == 'failed'
+            ],
+            'summary': {
+                'tables': len(tables),
+                'shards': sum(t['shards'] for t in tables.values()),
+                'exported': len(tasks) - failed,
+                'resumed': resumed,
+                'failed': failed,
+                'rows': sum(t['rows'] for t in tables.values()),
+                'bytes': sum(t['bytes'] for t in tables.values()),
+                'workers': self.workers,
+                'elapsed_seconds': round(time.monotonic() - started, 3)
+            },
+            'timestamp': datetime.now().isoformat()
+        }
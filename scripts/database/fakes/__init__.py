@@ -0,0 +1,26 @@
+"""
+Fake ScrollVerse Server
+The sample database behind FakeDriver, one module per feature of the schema
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+try:
+    from ..drivers import FakeBackend
+    from . import (catalog, evolution, interactions, maintenance, materialized, partitions, plans,
+                   resonance, rollups, tables)
+except ImportError:
+    from drivers import FakeBackend
+    from fakes import (catalog, evolution, interactions, maintenance, materialized, partitions, plans,
+                       resonance, rollups, tables)
+
+# Later rules take precedence in FakeBackend, so the install order is part of the behaviour
+FEATURES = [tables, catalog, resonance, materialized, partitions, rollups, interactions, maintenance, plans, evolution]
+
+
+def scrollverse_sample_backend(latency: float = 0.0) -> FakeBackend:
+    """Build a fake backend seeded with the sample rows from scrollverse_schema.sql"""
+    backend = FakeBackend(latency=latency)
+    for feature in FEATURES:
+        feature.install(backend)
+    return backend
+
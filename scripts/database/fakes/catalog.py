@@ -0,0 +1,157 @@
+"""
+Fake Column Catalog for ScrollVerse
+pg_catalog-style column definitions for schema introspection
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+# column_default of SERIAL columns, formatted with the table name
+SERIAL_DEFAULT = "nextval('{}_id_seq'::regclass)"
+_NOW = 'CURRENT_TIMESTAMP'
+_NFT_FK = ('nft_metadata', 'id')
+
+# Columns as in scrollverse_schema.sql: (name, format_type, NOT NULL, default, key, references)
+CATALOG = {
+    'nft_metadata': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('token_id', 'character varying(255)', True, None, 'u', None),
+        ('name', 'character varying(255)', True, None, None, None),
+        ('frequency', 'integer', False, '528', None, None),
+        ('metadata_uri', 'text', False, None, None, None),
+        ('description', 'text', False, None, None, None),
+        ('image_uri', 'text', False, None, None, None),
+        ('attributes', 'jsonb', False, None, None, None),
+        ('created_at', 'timestamp without time zone', False, _NOW, None, None),
+        ('updated_at', 'timestamp without time zone', False, _NOW, None, None),
+        ('creator_address', 'character varying(42)', False, None, None, None),
+        ('owner_address', 'character varying(42)', False, None, None, None),
+        ('evolution_stage', 'character varying(50)', False, "'Genesis'::character varying", None, None),
+        ('resonance_level', 'numeric(5,2)', False, '1.0', None, None)
+    ],
+    'akashic_frequencies': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('frequency', 'integer', True, None, 'u', None),
+        ('type', 'character varying(100)', True, None, None, None),
+        ('resonance', 'numeric(5,2)', True, None, None, None),
+        ('description', 'text', False, None, None, None),
+        ('sacred_geometry', 'character varying(100)', False, None, None, None),
+        ('chakra_alignment', 'character varying(50)', False, None, None, None),
+        ('healing_properties', 'text', False, None, None, None),
+        ('metadata', 'jsonb', False, None, None, None),
+        ('created_at', 'timestamp without time zone', False, _NOW, None, None)
+    ],
+    'frequency_layers': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('nft_id', 'integer', False, None, None, _NFT_FK),
+        ('frequency_id', 'integer', False, None, None, ('akashic_frequencies', 'id')),
+        ('layer_depth', 'integer', True, None, None, None),
+        ('resonance_data', 'jsonb', False, None, None, None),
+        ('activation_timestamp', 'timestamp without time zone', False, _NOW, None, None)
+    ],
+    'scroll_souls': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('soul_token_id', 'character varying(255)', True, None, 'u', None),
+        ('owner_address', 'character varying(42)', True, None, None, None),
+        ('evolution_stage', 'character varying(50)', False, "'Genesis'::character varying", None, None),
+        ('sovereignty_points', 'integer', False, '0', None, None),
+        ('frequency_alignment', 'integer', False, '528', None, None),
+        ('sacred_geometry', 'character varying(100)', False, None, None, None),
+        ('soul_bound', 'boolean', False, 'true', None, None),
+        ('created_at', 'timestamp without time zone', False, _NOW, None, None),
+        ('last_evolution', 'timestamp without time zone', False, None, None, None),
+        ('metadata', 'jsonb', False, None, None, None)
+    ],
+    'resonance_data': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('nft_id', 'integer', False, None, None, _NFT_FK),
+        ('frequency', 'integer', True, None, None, None),
+        ('resonance_level', 'numeric(5,2)', True, None, None, None),
+        ('etheric_density', 'numeric(5,2)', False, None, None, None),
+        ('akashic_layer', 'integer', False, None, None, None),
+        ('dimensional_access', 'integer', False, None, None, None),
+        ('timestamp', 'timestamp without time zone', True, _NOW, 'p', None),
+        ('measurement_data', 'jsonb', False, None, None, None)
+    ],
+    'nft_evolution_history': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('nft_id', 'integer', False, None, None, _NFT_FK),
+        ('from_stage', 'character varying(50)', False, None, None, None),
+        ('to_stage', 'character varying(50)', False, None, None, None),
+        ('frequency_shift', 'integer', False, None, None, None),
+        ('resonance_change', 'numeric(5,2)', False, None, None, None),
+        ('evolution_timestamp', 'timestamp without time zone', False, _NOW, None, None),
+        ('trigger_event', 'character varying(255)', False, None, None, None),
+        ('metadata', 'jsonb', False, None, None, None)
+    ],
+    'user_interactions': [
+        ('id', 'integer', True, SERIAL_DEFAULT, 'p', None),
+        ('user_address', 'character varying(42)', True, None, None, None),
+        ('nft_id', 'integer', False, None, None, _NFT_FK),
+        ('interaction_type', 'character varying(50)', False, None, None, None),
+        ('frequency_resonance', 'integer', False, None, None, None),
+        ('timestamp', 'timestamp without time zone', True, _NOW, 'p', None),
+        ('interaction_data', 'jsonb', False, None, None, None)
+    ],
+    'nft_state_snapshots': [
+        ('nft_id', 'integer', True, None, 'p', _NFT_FK),
+        ('events', 'integer', True, None, 'p', None),
+        ('event_id', 'integer', True, None, None, None),
+        ('as_of', 'timestamp without time zone', False, None, None, None),
+        ('stage', 'character varying(50)', False, None, None, None),
+        ('frequency', 'integer', False, None, None, None),
+        ('resonance_level', 'numeric', False, None, None, None),
+        ('created_at', 'timestamp without time zone', True, _NOW, None, None)
+    ],
+    'resonance_rollups': [
+        ('resolution', 'character varying(10)', True, None, 'p', None),
+        ('bucket', 'timestamp without time zone', True, None, 'p', None),
+        ('nft_id', 'integer', True, None, 'p', _NFT_FK),
+        ('frequency', 'integer', True, None, 'p', None),
+        ('sample_count', 'bigint', True, None, None, None),
+        ('resonance_sum', 'numeric', True, None, None, None),
+        ('resonance_min', 'numeric(5,2)', True, None, None, None),
+        ('resonance_max', 'numeric(5,2)', True, None, None, None)
+    ],
+    'resonance_rollup_watermark': [
+        ('name', 'character varying(50)', True, None, 'p', None),
+        ('last_id', 'bigint', True, '0', None, None),
+        ('refreshed_at', 'timestamp without time zone', False, None, None, None)
+    ],
+    'nft_with_frequencies_mat': [
+        ('id', 'integer', True, None, 'p', _NFT_FK),
+        ('token_id', 'character varying(255)', True, None, None, None),
+        ('name', 'character varying(255)', True, None, None, None),
+        ('primary_frequency', 'integer', False, None, None, None),
+        ('evolution_stage', 'character varying(50)', False, None, None, None),
+        ('resonance_level', 'numeric(5,2)', False, None, None, None),
+        ('frequency_layers', 'json', False, None, None, None),
+        ('refreshed_at', 'timestamp without time zone', True, _NOW, None, None)
+    ],
+    'nft_frequencies_dirty': [
+        ('nft_id', 'integer', True, None, 'p', None),
+        ('queued_at', 'timestamp without time zone', True, _NOW, None, None)
+    ]
+}
+
+
+def install(backend: FakeBackend):
+    """Load the column catalog and answer the schema introspection query"""
+    backend.catalog = {table: list(columns) for table, columns in CATALOG.items()}
+
+    def schema_catalog(params):
+        rows = []
+        for table in sorted(backend.catalog):
+            for name, data_type, not_null, default, key, references in backend.catalog[table]:
+                foreign_table, foreign_column = references or (None, None)
+                rows.append((
+                    table, name, data_type, not not_null, default and default.format(table),
+                    key == 'p', key == 'u', foreign_table, foreign_column, None
+                ))
+        return ['table_name', 'column_name', 'data_type', 'nullable', 'column_default', 'primary_key',
+                'is_unique', 'foreign_table', 'foreign_column', 'description'], rows
+
+    backend.on(r'from pg_class c join pg_namespace n', schema_catalog)
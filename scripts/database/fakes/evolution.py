@@ -0,0 +1,103 @@
+"""
+Fake Evolution Replay for ScrollVerse
+Evolution events and state snapshots for the replayer
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from decimal import Decimal
+
+try:
+    from ..drivers import FakeBackend
+    from .tables import moment_of
+except ImportError:
+    from drivers import FakeBackend
+    from fakes.tables import moment_of
+
+
+def install(backend: FakeBackend):
+    """Answer the snapshot and event queries of the evolution replayer"""
+    # Evolution replay: events in (evolution_timestamp, id) order, snapshots after (as_of, event_id)
+    def timeline(nft_id):
+        events = [
+            dict(e, evolution_timestamp=moment_of(e['evolution_timestamp']))
+            for e in backend.tables['nft_evolution_history']['rows']
+            if e.get('nft_id') == nft_id and e.get('evolution_timestamp') is not None
+        ]
+        return sorted(events, key=lambda e: (e['evolution_timestamp'], e['id']))
+
+    def after(event, as_of, event_id):
+        return as_of is None or (event['evolution_timestamp'], event['id']) > (as_of, event_id)
+
+    snapshot_columns = ['nft_id', 'events', 'event_id', 'as_of', 'stage', 'frequency', 'resonance_level']
+
+    def snapshot(row):
+        # COPY loads text; give the stored snapshot its column types back
+        convert = {'nft_id': int, 'events': int, 'event_id': int, 'frequency': int,
+                   'resonance_level': Decimal, 'as_of': moment_of}
+        return tuple(None if row.get(c) is None else convert.get(c, str)(row[c]) for c in snapshot_columns)
+
+    def latest_snapshot(nft_id, at=None):
+        stored = [snapshot(r) for r in backend.tables['nft_state_snapshots']['rows'] if int(r['nft_id']) == nft_id]
+        stored = [s for s in stored if at is None or s[3] is None or s[3] <= at]
+        return max(stored, key=lambda s: s[1], default=None)
+
+    def snapshots_at(params):
+        found = [latest_snapshot(nft_id, params[1]) for nft_id in sorted(set(params[0]))]
+        return snapshot_columns, [s for s in found if s]
+
+    def genesis(params):
+        rows = []
+        for nft in backend.tables['nft_metadata']['rows']:
+            if nft['id'] not in set(params[0]):
+                continue
+            events = timeline(nft['id'])
+            moments = [m for m in [moment_of(nft.get('created_at'))] + [e['evolution_timestamp'] for e in events[:1]] if m]
+            frequency = nft.get('frequency')
+            resonance = nft.get('resonance_level')
+            rows.append((
+                nft['id'], 0, 0, min(moments, default=None),
+                events[0].get('from_stage') if events and events[0].get('from_stage') is not None else nft.get('evolution_stage'),
+                None if frequency is None else frequency - sum(e.get('frequency_shift') or 0 for e in events),
+                None if resonance is None else resonance - sum(e.get('resonance_change') or 0 for e in events)
+            ))
+        return snapshot_columns, rows
+
+    def events_since(params):
+        ids, moments, event_ids, at = params[0], params[1], params[2], params[3]
+        rows = []
+        for nft_id, as_of, event_id in zip(ids, moments, event_ids):
+            events = [e for e in timeline(nft_id) if after(e, as_of, event_id) and (at is None or e['evolution_timestamp'] <= at)]
+            if not events:
+                continue
+            stages = [e['to_stage'] for e in events if e.get('to_stage') is not None]
+            rows.append((
+                nft_id, len(events), events[-1]['id'], events[-1]['evolution_timestamp'], stages[-1] if stages else None,
+                sum(e.get('frequency_shift') or 0 for e in events), sum(e.get('resonance_change') or 0 for e in events)
+            ))
+        return ['nft_id', 'events', 'event_id', 'as_of', 'stage', 'frequency_shift', 'resonance_change'], rows
+
+    def events_after(params):
+        rows = []
+        for nft_id, as_of, event_id in sorted(zip(params[0], params[1], params[2]), key=lambda start: start[0]):
+            rows.extend(
+                (nft_id, e['id'], e['evolution_timestamp'], e.get('to_stage'), e.get('frequency_shift'), e.get('resonance_change'))
+                for e in timeline(nft_id) if after(e, as_of, event_id)
+            )
+        return ['nft_id', 'id', 'evolution_timestamp', 'to_stage', 'frequency_shift', 'resonance_change'], rows
+
+    def snapshot_backlog(params):
+        rows = []
+        for nft in backend.tables['nft_metadata']['rows']:
+            if params[0] is not None and nft['id'] not in set(params[0]):
+                continue
+            latest = latest_snapshot(nft['id'])
+            start = (latest[3], latest[2]) if latest else (None, 0)
+            pending = sum(1 for e in timeline(nft['id']) if after(e, *start))
+            rows.append((nft['id'],) + (latest[1:] if latest else (None,) * 6) + (pending,))
+        return snapshot_columns + ['pending'], rows
+
+    backend.on(r'from nft_state_snapshots s where s\.nft_id = any', snapshots_at)
+    backend.on(r'- coalesce\(sum\(h\.frequency_shift\), 0\) as frequency', genesis)
+    backend.on(r'as s\(nft_id, as_of, event_id\) join nft_evolution_history h .* group by s\.nft_id', events_since)
+    backend.on(r'as s\(nft_id, as_of, event_id\) join nft_evolution_history h .* order by h\.nft_id, h\.evolution_timestamp, h\.id$', events_after)
+    backend.on(r'from nft_state_snapshots x', snapshot_backlog)
@@ -0,0 +1,26 @@
+"""
+Fake Interaction Writes for ScrollVerse
+Multi-row user_interactions inserts from the write-behind buffer
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+
+def install(backend: FakeBackend):
+    """Append multi-row user_interactions inserts to the table"""
+
+    def insert_interactions(params, columns):
+        # Write-behind batches: one multi-row VALUES list, params flattened row by row
+        names = [c.strip() for c in columns.split(',')]
+        values = list(params or ())
+        table = backend.tables['user_interactions']
+        for start in range(0, len(values), len(names)):
+            table['last_id'] += 1
+            table['rows'].append({'id': table['last_id'], **dict(zip(names, values[start:start + len(names)]))})
+        return [], []
+
+    backend.on(r'^insert into user_interactions \((?P<columns>[^)]*)\) values \(', insert_interactions)
@@ -0,0 +1,113 @@
+"""
+Fake Table Maintenance for ScrollVerse
+pg_stat_user_tables counters, bloat and VACUUM, ANALYZE and REINDEX
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+
+def _size_pretty(size: int) -> str:
+    """Format a byte count the way pg_size_pretty does"""
+    for unit in ('bytes', 'kB', 'MB', 'GB'):
+        if abs(size) < 10 * 1024 or unit == 'GB':
+            return f"{size} {unit}"
+        size = round(size / 1024)
+    return f"{size} TB"
+
+
+def install(backend: FakeBackend):
+    """Seed table statistics and answer the maintenance queries and commands"""
+    mb = 1024 * 1024
+    table_stats = [
+        # table, live, dead, modified since analyze, total bytes, index bytes, index bloat
+        ('nft_metadata', 2656, 1250, 1400, int(2.5 * mb), 1 * mb, 0.35),
+        ('akashic_frequencies', 8, 0, 0, 48 * 1024, 32 * 1024, 0.0),
+        ('frequency_layers', 6, 2, 2, 24 * 1024, 16 * 1024, 0.0),
+        ('scroll_souls', 500, 20, 40, 160 * 1024, 64 * 1024, 0.0),
+        ('resonance_data', 1200000, 96000, 250000, 440 * mb, 120 * mb, 0.05),
+        ('user_interactions', 480000, 160000, 170000, 180 * mb, 60 * mb, 0.2),
+        ('nft_evolution_history', 12000, 5500, 6000, 4 * mb, int(1.5 * mb), 0.3)
+    ]
+    for name, live, dead, modified, total, index, index_bloat in table_stats:
+        backend.table_stats[name] = {
+            'n_live_tup': live, 'n_dead_tup': dead, 'n_mod_since_analyze': modified,
+            'total_bytes': total, 'index_bytes': index, 'index_bloat': index_bloat,
+            'last_vacuum': None, 'last_analyze': None
+        }
+
+    def table_bloat(params):
+        bloated = sorted(
+            ((name, t) for name, t in backend.table_stats.items() if t['n_dead_tup'] > 0),
+            key=lambda item: item[1]['n_dead_tup'], reverse=True
+        )[:10]
+        return ['schemaname', 'tablename', 'size', 'n_dead_tup', 'n_live_tup', 'bloat_percent'], [
+            ('public', name, _size_pretty(t['total_bytes']), t['n_dead_tup'], t['n_live_tup'],
+             (Decimal(100 * t['n_dead_tup']) / (t['n_live_tup'] + t['n_dead_tup'])).quantize(
+                 Decimal('0.01'), rounding=ROUND_HALF_UP))
+            for name, t in bloated
+        ]
+
+    def maintenance_candidates(params):
+        return ['schemaname', 'tablename', 'n_live_tup', 'n_dead_tup', 'n_mod_since_analyze',
+                'total_bytes', 'index_bytes', 'last_vacuum', 'last_analyze'], [
+            (params[0], name, t['n_live_tup'], t['n_dead_tup'], t['n_mod_since_analyze'],
+             t['total_bytes'], t['index_bytes'], t['last_vacuum'], t['last_analyze'])
+            for name, t in backend.table_stats.items()
+        ]
+
+    def relation_sizes(params):
+        return ['tablename', 'total_bytes', 'n_dead_tup'], [
+            (name, t['total_bytes'], t['n_dead_tup'])
+            for name, t in backend.table_stats.items() if name in set(params[1])
+        ]
+
+    def vacuum(name):
+        def handler(params):
+            t = backend.table_stats[name]
+            heap = t['total_bytes'] - t['index_bytes']
+            dead_ratio = t['n_dead_tup'] / max(t['n_live_tup'] + t['n_dead_tup'], 1)
+            # Plain VACUUM only returns the empty pages at the end of the heap to the OS
+            t['total_bytes'] -= int(heap * dead_ratio * 0.25)
+            t.update(n_dead_tup=0, n_mod_since_analyze=0, last_vacuum=datetime.now(), last_analyze=datetime.now())
+            return [], []
+        return handler
+
+    def analyze(name):
+        def handler(params):
+            backend.table_stats[name].update(n_mod_since_analyze=0, last_analyze=datetime.now())
+            return [], []
+        return handler
+
+    def reindex(name):
+        def handler(params):
+            t = backend.table_stats[name]
+            reclaimed = int(t['index_bytes'] * t['index_bloat'])
+            t.update(total_bytes=t['total_bytes'] - reclaimed, index_bytes=t['index_bytes'] - reclaimed, index_bloat=0.0)
+            return [], []
+        return handler
+
+    backend.on(r'from pg_stat_user_tables', table_bloat)
+    backend.on(r'pg_indexes_size\(s\.relid\)', maintenance_candidates)
+    backend.on(r'from pg_stat_user_tables s where s\.schemaname = %s and s\.relname = any', relation_sizes)
+    for name in backend.table_stats:
+        backend.on(rf'^vacuum\b.*\b{name}\b', vacuum(name))
+        backend.on(rf'^analyze\b.*\b{name}\b', analyze(name))
+        backend.on(rf'^reindex table concurrently\b.*\b{name}\b', reindex(name))
+
+    backend.on(
+        r'from pg_settings',
+        columns=['name', 'setting', 'unit', 'category'],
+        rows=[
+            ('autovacuum', 'on', None, 'Autovacuum'),
+            ('autovacuum_analyze_threshold', '50', None, 'Autovacuum'),
+            ('autovacuum_naptime', '60', 's', 'Autovacuum'),
+            ('autovacuum_vacuum_threshold', '50', None, 'Autovacuum')
+        ]
+    )
@@ -0,0 +1,52 @@
+"""
+Fake Materialized NFT View for ScrollVerse
+refresh_nft_with_frequencies() and the dirty queue behind it
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+
+def install(backend: FakeBackend):
+    """Answer the nft_with_frequencies_mat refresh and its lag"""
+
+    def nft_with_frequencies(nft):
+        freqs = {r['id']: r for r in backend.tables['akashic_frequencies']['rows']}
+        layers = [
+            {'layer_depth': l['layer_depth'], 'frequency': freqs[l['frequency_id']]['frequency'],
+             'type': freqs[l['frequency_id']]['type'], 'resonance': float(freqs[l['frequency_id']]['resonance']),
+             'sacred_geometry': freqs[l['frequency_id']]['sacred_geometry']}
+            for l in backend.tables['frequency_layers']['rows']
+            if l['nft_id'] == nft['id'] and l['frequency_id'] in freqs
+        ]
+        return {'id': nft['id'], 'token_id': nft['token_id'], 'name': nft['name'],
+                'primary_frequency': nft['frequency'], 'evolution_stage': nft.get('evolution_stage'),
+                'resonance_level': nft.get('resonance_level'), 'frequency_layers': layers or None,
+                'refreshed_at': datetime.now()}
+
+    def refresh_nft_frequencies(params):
+        queue = sorted(backend.tables['nft_frequencies_dirty']['rows'], key=lambda r: r['queued_at'])
+        count = len(queue) if params[0] is None else params[0]
+        claimed = {r['nft_id'] for r in queue[:count]}
+        backend.tables['nft_frequencies_dirty']['rows'] = queue[count:]
+
+        nfts = {r['id']: r for r in backend.tables['nft_metadata']['rows']}
+        materialized = {r['id']: r for r in backend.tables['nft_with_frequencies_mat']['rows'] if r['id'] in nfts}
+        materialized.update((nft_id, nft_with_frequencies(nfts[nft_id])) for nft_id in claimed if nft_id in nfts)
+        backend.tables['nft_with_frequencies_mat']['rows'] = sorted(materialized.values(), key=lambda r: r['id'])
+        return ['nfts_refreshed', 'nfts_pending'], [(len(claimed), len(queue) - count)]
+
+    def nft_frequencies_lag(params):
+        queued = [r['queued_at'] for r in backend.tables['nft_frequencies_dirty']['rows']]
+        oldest = min(queued, default=None)
+        lag = Decimal(str(round((datetime.now() - oldest).total_seconds(), 6))) if oldest else Decimal(0)
+        return ['pending', 'oldest_queued_at', 'lag_seconds'], [(len(queued), oldest, lag)]
+
+    backend.on(r'from refresh_nft_with_frequencies\(', refresh_nft_frequencies)
+    backend.on(r'from nft_frequencies_dirty', nft_frequencies_lag)
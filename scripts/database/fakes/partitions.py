@@ -0,0 +1,176 @@
+"""
+Fake Table Partitioning for ScrollVerse
+Monthly range partitions, their catalog queries and DDL
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import re
+from datetime import datetime
+from typing import Dict
+
+try:
+    from ..drivers import FakeBackend, FakeError
+    from .catalog import SERIAL_DEFAULT
+    from .tables import moment_of, relation
+except ImportError:
+    from drivers import FakeBackend, FakeError
+    from fakes.catalog import SERIAL_DEFAULT
+    from fakes.tables import moment_of, relation
+
+
+def install(backend: FakeBackend):
+    """Partition resonance_data and user_interactions by month and answer the partition manager"""
+    # resonance_data and user_interactions are range partitioned by month, as the schema creates them;
+    # a DEFAULT partition has no bounds and holds the rows no range covers
+    partitions: Dict[str, Dict[str, list]] = {}
+    detached: Dict[str, list] = {}
+    backend.partitions, backend.detached = partitions, detached
+    for table in ('resonance_data', 'user_interactions'):
+        partitions[table] = {}
+        month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(4):
+            upper = month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+            partitions[table][f"{table}_p{month:%Y_%m}"] = [month, upper, False]
+            month = upper
+        partitions[table][f"{table}_default"] = [None, None, False]
+
+    def default_of(table):
+        return next((name for name, (start, _, _) in partitions[table].items() if start is None), None)
+
+    def defaulted(table, column='timestamp'):
+        # Every row is stored on the parent; the DEFAULT partition holds those outside every range
+        ranges = [(start, end) for start, end, _ in partitions[table].values() if start is not None]
+        return [
+            r for r in backend.tables[table]['rows']
+            if not any(start <= moment_of(r[column]) < end for start, end in ranges)
+        ]
+
+    def table_kinds(params):
+        return ['table_name', 'kind'], [
+            (name, 'p' if name in partitions else 'r') for name in params[1] if name in backend.tables
+        ]
+
+    def partition_bounds(params):
+        return ['table_name', 'partition_name', 'bound', 'detach_pending', 'total_bytes'], [
+            (table, name, 'DEFAULT' if start is None else f"FOR VALUES FROM ('{start}') TO ('{end}')", pending, 8192)
+            for table in params[1] if table in partitions
+            for name, (start, end, pending) in sorted(partitions[table].items())
+        ]
+
+    def table_indexes(params):
+        table = relation(params[0])
+        key = [c[0] for c in backend.catalog.get(table, []) if c[4] == 'p']
+        return ['index_name', 'is_primary', 'definition', 'columns'], [
+            (f"{table}_pkey", True, f"CREATE UNIQUE INDEX {table}_pkey ON public.{table} USING btree ({', '.join(key)})", key)
+        ] if key else []
+
+    def table_foreign_keys(params):
+        table = relation(params[0])
+        return ['constraint_name', 'definition'], [
+            (f"{table}_{c[0]}_fkey", f"FOREIGN KEY ({c[0]}) REFERENCES {c[5][0]}({c[5][1]}) ON DELETE CASCADE")
+            for c in backend.catalog.get(table, []) if c[5]
+        ]
+
+    def table_sequences(params):
+        table = relation(params[0])
+        return ['column_name', 'sequence_name'], [
+            (c[0], f"public.{table}_{c[0]}_seq") for c in backend.catalog.get(table, []) if c[3] == SERIAL_DEFAULT
+        ]
+
+    def time_range(params, table, column):
+        moments = [moment_of(r.get(column)) for r in backend.tables[table]['rows']]
+        present = [m for m in moments if m is not None]
+        return ['oldest', 'newest', 'missing'], [
+            (min(present, default=None), max(present, default=None), len(moments) - len(present))
+        ]
+
+    def convert_table(params, table, script):
+        partitions[table] = {
+            name: [datetime.fromisoformat(start), datetime.fromisoformat(end), False]
+            for name, start, end in re.findall(
+                r'create table "\w+"\."(\w+)" partition of \S+ for values from \(\'([^\']+)\'\) to \(\'([^\']+)\'\)',
+                script, re.IGNORECASE
+            )
+        }
+        partitions[table].update(
+            (name, [None, None, False])
+            for name in re.findall(r'create table "\w+"\."(\w+)" partition of \S+ default', script, re.IGNORECASE)
+        )
+        return [], []
+
+    def attach_partition(params, script, table, name, start, end):
+        if name in partitions[table]:
+            raise FakeError(f'relation "{name}" already exists')
+        lower, upper = datetime.fromisoformat(start), datetime.fromisoformat(end)
+        default = default_of(table)
+        # Attaching checks the DEFAULT partition holds no rows of the new range, unless this script moved them
+        moved = default and re.search(rf'delete from "\w+"\."{default}" where', script, re.IGNORECASE)
+        if default and not moved and any(lower <= moment_of(r['timestamp']) < upper for r in defaulted(table)):
+            raise FakeError(f'updated partition constraint for default partition "{default}" would be violated')
+        partitions[table][name] = [lower, upper, False]
+        return [], []
+
+    def attach_default(params, table, name):
+        if default_of(table):
+            raise FakeError(f'partition "{name}" conflicts with existing default partition "{default_of(table)}"')
+        partitions[table][name] = [None, None, False]
+        return [], []
+
+    def default_ranges(params, column, name):
+        table = next(table for table in partitions if name in partitions[table])
+        truncate = {'month': {'day': 1}, 'day': {}}[params[0]]
+        starts = {
+            moment_of(r[column]).replace(hour=0, minute=0, second=0, microsecond=0, **truncate)
+            for r in defaulted(table, column)
+        }
+        return ['start'], [(start,) for start in sorted(starts)]
+
+    def detach_partition(params, table, name):
+        rows = backend.tables[table]['rows']
+        if partitions[table][name][0] is None:
+            held = defaulted(table)
+        else:
+            start, end, _ = partitions[table][name]
+            held = [r for r in rows if start <= moment_of(r['timestamp']) < end]
+        del partitions[table][name]
+        detached[name] = held
+        backend.tables[table]['rows'] = [r for r in rows if not any(r is h for h in held)]
+        return [], []
+
+    def drop_partition(params, name):
+        if detached.pop(name, None) is None:
+            raise FakeError(f'table "{name}" does not exist')
+        return [], []
+
+    backend.on(r'c\.relkind as kind', table_kinds)
+    backend.on(r'from pg_inherits', partition_bounds)
+    backend.on(r'pg_get_indexdef\(', table_indexes)
+    backend.on(r'pg_get_constraintdef\(', table_foreign_keys)
+    backend.on(r'pg_get_serial_sequence\(', table_sequences)
+    backend.on(r'^select min\("(?P<column>\w+)"\).* from "\w+"\."(?P<table>\w+)"$', time_range)
+    backend.on(r'^lock table "\w+"\."(?P<table>\w+)" in exclusive mode;(?P<script>.*)$', convert_table)
+    backend.on(
+        r'^create table (?P<script>.*)alter table "\w+"\."(?P<table>\w+)" attach partition "\w+"\."(?P<name>\w+)" '
+        r"for values from \('(?P<start>[^']+)'\) to \('(?P<end>[^']+)'\)$",
+        attach_partition
+    )
+    backend.on(r'^alter table "\w+"\."(?P<table>\w+)" detach partition "\w+"\."(?P<name>\w+)"', detach_partition)
+    backend.on(r'^drop table "\w+"\."(?P<name>\w+)"$', drop_partition)
+    backend.on(
+        r'^create table .*alter table "\w+"\."(?P<table>\w+)" attach partition "\w+"\."(?P<name>\w+)" default$',
+        attach_default
+    )
+    backend.on(
+        r'^select distinct date_trunc\(%s, "(?P<column>\w+)"\) as start from "\w+"\."(?P<name>\w+)" order by start$',
+        default_ranges
+    )
+
+    def key_bounds(params, table, column):
+        present = [r[column] for r in backend.tables[table]['rows'] if r.get(column) is not None]
+        return ['lower', 'upper'], [(min(present, default=None), max(present, default=None))]
+
+    def row_estimate(params):
+        return ['estimate'], [(len(backend.tables.get(relation(params[0]), {'rows': []})['rows']),)]
+
+    backend.on(r'^select min\("(?P<column>\w+)"\) as lower, max\("\w+"\) as upper from "\w+"\."(?P<table>\w+)"$', key_bounds)
+    backend.on(r'sum\(greatest\(c\.reltuples, 0\)\)', row_estimate)
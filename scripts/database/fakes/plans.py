@@ -0,0 +1,204 @@
+"""
+Fake Query Plans for ScrollVerse
+Index catalog, pg_stat_statements and a rule-of-thumb EXPLAIN
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import re
+from typing import Dict
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+
+def install(backend: FakeBackend):
+    """Load the schema indexes and answer the index advisor queries"""
+    # Index catalog as created by scrollverse_schema.sql: (name, table, keys, unique, primary, scans)
+    index_specs = [
+        ('nft_metadata_pkey', 'nft_metadata', ['id'], True, True, 9200),
+        ('nft_metadata_token_id_key', 'nft_metadata', ['token_id'], True, False, 4100),
+        ('idx_nft_token_id', 'nft_metadata', ['token_id'], False, False, 0),
+        ('idx_nft_frequency', 'nft_metadata', ['frequency'], False, False, 35),
+        ('idx_nft_evolution_stage', 'nft_metadata', ['evolution_stage'], False, False, 0),
+        ('idx_nft_creator', 'nft_metadata', ['creator_address'], False, False, 12),
+        ('idx_nft_owner', 'nft_metadata', ['owner_address'], False, False, 640),
+        ('akashic_frequencies_pkey', 'akashic_frequencies', ['id'], True, True, 5300),
+        ('akashic_frequencies_frequency_key', 'akashic_frequencies', ['frequency'], True, False, 880),
+        ('idx_frequency', 'akashic_frequencies', ['frequency'], False, False, 0),
+        ('idx_resonance', 'akashic_frequencies', ['resonance DESC'], False, False, 0),
+        ('idx_chakra', 'akashic_frequencies', ['chakra_alignment'], False, False, 0),
+        ('frequency_layers_pkey', 'frequency_layers', ['id'], True, True, 0),
+        ('frequency_layers_nft_id_frequency_id_layer_depth_key', 'frequency_layers',
+         ['nft_id', 'frequency_id', 'layer_depth'], True, False, 3100),
+        ('idx_fl_nft_id', 'frequency_layers', ['nft_id'], False, False, 2600),
+        ('idx_fl_frequency_id', 'frequency_layers', ['frequency_id'], False, False, 4),
+        ('idx_fl_layer_depth', 'frequency_layers', ['layer_depth'], False, False, 0),
+        ('scroll_souls_pkey', 'scroll_souls', ['id'], True, True, 40),
+        ('scroll_souls_soul_token_id_key', 'scroll_souls', ['soul_token_id'], True, False, 10),
+        ('idx_soul_token_id', 'scroll_souls', ['soul_token_id'], False, False, 0),
+        ('idx_soul_owner', 'scroll_souls', ['owner_address'], False, False, 0),
+        ('idx_soul_evolution', 'scroll_souls', ['evolution_stage'], False, False, 0),
+        ('resonance_data_pkey', 'resonance_data', ['id', 'timestamp'], True, True, 0),
+        ('idx_res_nft_id', 'resonance_data', ['nft_id'], False, False, 51000),
+        ('idx_res_frequency', 'resonance_data', ['frequency'], False, False, 0),
+        ('idx_res_timestamp', 'resonance_data', ['timestamp DESC'], False, False, 730),
+        ('nft_evolution_history_pkey', 'nft_evolution_history', ['id'], True, True, 15),
+        ('idx_evol_nft_timeline', 'nft_evolution_history', ['nft_id', 'evolution_timestamp', 'id'], False, False, 300),
+        ('idx_evol_timestamp', 'nft_evolution_history', ['evolution_timestamp DESC'], False, False, 0),
+        ('user_interactions_pkey', 'user_interactions', ['id', 'timestamp'], True, True, 0),
+        ('idx_ui_user', 'user_interactions', ['user_address'], False, False, 19000),
+        ('idx_ui_nft', 'user_interactions', ['nft_id'], False, False, 0),
+        ('idx_ui_timestamp', 'user_interactions', ['timestamp DESC'], False, False, 210),
+        ('nft_with_frequencies_mat_pkey', 'nft_with_frequencies_mat', ['id'], True, True, 700),
+        ('idx_nwf_mat_token_id', 'nft_with_frequencies_mat', ['token_id'], True, False, 2200),
+        ('nft_frequencies_dirty_pkey', 'nft_frequencies_dirty', ['nft_id'], True, True, 90),
+        ('nft_state_snapshots_pkey', 'nft_state_snapshots', ['nft_id', 'events'], True, True, 0)
+    ]
+    backend.indexes = {}
+
+    def add_index(name, table, keys, unique=False, primary=False, scans=0):
+        stats = backend.table_stats.get(table, {})
+        backend.indexes[name] = {
+            'table': table, 'columns': [k.split()[0] for k in keys], 'descending': [k.endswith(' DESC') for k in keys],
+            'unique': unique, 'primary': primary, 'scans': scans,
+            'bytes': stats.get('index_bytes', 16 * 1024) // 4 if not primary else stats.get('index_bytes', 16 * 1024) // 3
+        }
+
+    for spec in index_specs:
+        add_index(*spec)
+
+    def index_catalog(params):
+        return ['tablename', 'indexname', 'is_unique', 'is_primary', 'method', 'columns', 'descending',
+                'is_partial', 'index_bytes', 'idx_scan', 'definition'], [
+            (i['table'], name, i['unique'], i['primary'], 'btree', list(i['columns']), list(i['descending']),
+             False, i['bytes'], i['scans'],
+             f"CREATE {'UNIQUE ' if i['unique'] else ''}INDEX {name} ON public.{i['table']} USING btree "
+             f"({', '.join(c + (' DESC' if d else '') for c, d in zip(i['columns'], i['descending']))})")
+            for name, i in sorted(backend.indexes.items(), key=lambda item: (item[1]['table'], item[0]))
+        ]
+
+    def create_index(params, unique, name, table, keys):
+        add_index(name, table, [' '.join(k.replace('"', '').split()) for k in keys.split(',')], bool(unique))
+        return [], []
+
+    def drop_index(params, name):
+        backend.indexes.pop(name, None)
+        return [], []
+
+    def partition_parents(params):
+        return ['partition_name', 'table_name'], [
+            (name, table) for table, partitions in backend.partitions.items() for name in sorted(partitions)
+        ]
+
+    def statement_stats(params):
+        # pg_stat_statements over the statement history; the fake spends no time executing
+        calls: Dict[str, int] = {}
+        for statement, _ in backend.executed:
+            if not statement.lower().startswith(('explain', 'prepare', 'execute', 'deallocate')):
+                calls[statement] = calls.get(statement, 0) + 1
+        top = sorted(calls.items(), key=lambda item: item[1], reverse=True)[:params[0]]
+        return ['query', 'calls', 'total_exec_time', 'mean_exec_time', 'rows', 'shared_blks_hit', 'shared_blks_read'], [
+            (statement, count, 0.1 * count, 0.1, count, 4 * count, 0) for statement, count in top
+        ]
+
+    def explain(params, statement):
+        # A rule-of-thumb planner: an index whose leading key matches an equality
+        # condition is scanned, anything else is a filtered Seq Scan, and an
+        # ORDER BY the chosen index does not provide becomes a Sort
+        statement = re.sub(r'"(\w+)"', r'\1', statement)
+        where = re.search(r'\bwhere\s+(.*?)(?:\s+order\s+by\s+|\s+limit\s+|\)\s*$|$)', statement, re.IGNORECASE)
+        order = re.search(r'\border\s+by\s+(.*?)(?:\s+limit\s+|$)', statement, re.IGNORECASE)
+        relations = re.findall(
+            r'\b(?:from|join)\s+\(?(\w+)(?:\s+(?:as\s+)?(?!on\b|where\b|join\b|left\b|order\b|limit\b)(\w+))?',
+            statement, re.IGNORECASE
+        )
+        scans = []
+        for table, alias in relations:
+            if table not in backend.tables:
+                continue
+            alias = alias or table
+            columns = backend.tables[table]['columns']
+            total = backend.table_stats.get(table, {}).get('n_live_tup', len(backend.tables[table]['rows']))
+
+            def own(qualifier, column):
+                return column in columns and (qualifier in (None, '', alias, table) or len(relations) == 1)
+
+            conditions = [
+                (column, op) for qualifier, column, op in re.findall(
+                    r'(?:(\w+)\.)?(\w+)\s*(=|<=|>=|<|>)\s*(?:%s|any|\d|\'|\()',
+                    where.group(1) if where else '', re.IGNORECASE
+                ) if own(qualifier, column)
+            ]
+            equality = [column for column, op in conditions if op == '=']
+            sort_keys = []
+            for key in (order.group(1).split(',') if order else []):
+                key_match = re.match(r'\s*(?:(\w+)\.)?(\w+)(\s+desc)?', key, re.IGNORECASE)
+                if key_match and own(key_match.group(1), key_match.group(2)):
+                    sort_keys.append((key_match.group(2), bool(key_match.group(3))))
+
+            def serves_order(index):
+                rest = [column for column in index['columns'] if column not in equality]
+                return rest[:len(sort_keys)] == [column for column, _ in sort_keys]
+
+            usable = [
+                (name, index) for name, index in sorted(backend.indexes.items())
+                if index['table'] == table and index['columns'][0] in equality
+            ]
+            chosen = max(usable, key=lambda item: (bool(sort_keys) and serves_order(item[1]), item[1]['unique']),
+                         default=None)
+            matched = total if not conditions else max(1, total // 100) if not chosen or not chosen[1]['unique'] else 1
+            condition_text = ' AND '.join(f"({alias}.{column} {op} $1)" for column, op in conditions)
+            node = {
+                'Node Type': 'Index Scan' if chosen else 'Seq Scan', 'Relation Name': table, 'Alias': alias,
+                'Startup Cost': 0.0, 'Total Cost': round((4 + matched * 0.1) if chosen else total * 0.012, 2),
+                'Actual Rows': matched, 'Actual Loops': 1,
+                'Output': [f"{alias}.{column}" for column in columns],
+                'Shared Hit Blocks': 3 + matched // 40 if chosen else max(1, total // 40), 'Shared Read Blocks': 0
+            }
+            if chosen:
+                node['Index Name'] = chosen[0]
+                node['Index Cond'] = condition_text
+            elif conditions:
+                node['Filter'] = condition_text
+                node['Rows Removed by Filter'] = total - matched
+            provided = chosen and [
+                (column, desc) for column, desc in zip(chosen[1]['columns'], chosen[1]['descending'])
+                if column not in equality
+            ][:len(sort_keys)]
+            if sort_keys and not (provided and [c for c, _ in provided] == [c for c, _ in sort_keys]):
+                node = {
+                    'Node Type': 'Sort', 'Startup Cost': node['Total Cost'], 'Total Cost': round(node['Total Cost'] * 1.5 + matched * 0.02, 2),
+                    'Actual Rows': matched, 'Actual Loops': 1, 'Output': node['Output'],
+                    'Sort Key': [f"{alias}.{column}" + (' DESC' if desc else '') for column, desc in sort_keys],
+                    'Shared Hit Blocks': node['Shared Hit Blocks'], 'Shared Read Blocks': 0, 'Plans': [node]
+                }
+            scans.append(node)
+        if not scans:
+            scans = [{'Node Type': 'Result', 'Total Cost': 0.01, 'Actual Rows': 1, 'Actual Loops': 1,
+                      'Shared Hit Blocks': 0, 'Shared Read Blocks': 0}]
+
+        plan = scans[0]
+        for inner in scans[1:]:
+            plan = {
+                'Node Type': 'Nested Loop', 'Join Type': 'Inner', 'Total Cost': round(plan['Total Cost'] + inner['Total Cost'], 2),
+                'Actual Rows': max(plan['Actual Rows'], inner['Actual Rows']), 'Actual Loops': 1,
+                'Shared Hit Blocks': plan['Shared Hit Blocks'] + inner['Shared Hit Blocks'], 'Shared Read Blocks': 0,
+                'Plans': [plan, inner]
+            }
+        return ['QUERY PLAN'], [([{
+            'Plan': plan, 'Planning Time': 0.05,
+            'Execution Time': round(sum(n['Total Cost'] for n in scans) * 0.01, 3)
+        }],)]
+
+    backend.on(r'from pg_index ix', index_catalog)
+    backend.on(r'as partition_name, p\.relname as table_name', partition_parents)
+    backend.on(r"^select count\(\*\) from pg_extension where extname = 'pg_stat_statements'", rows=[(1,)], columns=['count'])
+    backend.on(r'from pg_stat_statements', statement_stats)
+    backend.on(
+        r'^create (?P<unique>unique )?index (?:concurrently )?(?:if not exists )?"?(?P<name>\w+)"? on (?:only )?"?(?P<table>\w+)"? \((?P<keys>[^)]*)\)',
+        create_index
+    )
+    backend.on(r'^drop index (?:concurrently )?(?:if exists )?(?:"?\w+"?\.)?"?(?P<name>\w+)"?', drop_index)
+    backend.on(r'^explain \([^)]*\) (?P<statement>.*)$', explain)
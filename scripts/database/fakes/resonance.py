@@ -0,0 +1,94 @@
+"""
+Fake Resonance Queries for ScrollVerse
+Layer joins and calculate_resonance_scores() over the sample tables
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal, localcontext
+from typing import Optional, Tuple
+
+try:
+    from ..drivers import FakeBackend
+    from .tables import layers_by_nft
+except ImportError:
+    from drivers import FakeBackend
+    from fakes.tables import layers_by_nft
+
+# NUMERIC_MIN_SIG_DIGITS and NUMERIC_MAX_DISPLAY_SCALE in PostgreSQL's numeric.c
+_MIN_SIG_DIGITS = 16
+_MAX_DISPLAY_SCALE = 1000
+
+
+def _leading_group(value: Decimal) -> Tuple[int, int]:
+    """Weight and value of the first non-zero base-10000 digit, (0, 0) for zero"""
+    if not value:
+        return 0, 0
+    weight = value.adjusted() // 4
+    return weight, int(abs(value).scaleb(-4 * weight))
+
+
+def sql_avg(total: Decimal, count: int) -> Optional[Decimal]:
+    """AVG(numeric) from its running sum and count: sum / count at select_div_scale()'s scale"""
+    if not count:
+        return None
+    total_weight, total_first = _leading_group(total)
+    count_weight, count_first = _leading_group(Decimal(count))
+    weight = total_weight - count_weight - (1 if total_first <= count_first else 0)
+    scale = min(max(_MIN_SIG_DIGITS - 4 * weight, -total.as_tuple().exponent, 0), _MAX_DISPLAY_SCALE)
+    with localcontext() as context:
+        # Truncate far past the result scale so the final half-up rounding sees the exact digits
+        context.prec = _MAX_DISPLAY_SCALE + 100
+        context.rounding = ROUND_DOWN
+        return (total / count).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+
+
+def sql_resonance_score(base: Optional[Decimal], count: int, average: Optional[Decimal]) -> Optional[Decimal]:
+    """ROUND(base * (1 + count * 0.1) * COALESCE(average, 1.0), 2); numeric products are exact"""
+    if base is None:
+        return None
+    with localcontext() as context:
+        context.prec = 2 * _MAX_DISPLAY_SCALE
+        product = base * (1 + count * Decimal('0.1')) * (Decimal('1.0') if average is None else average)
+        return product.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def install(backend: FakeBackend):
+    """Answer the resonance joins and calculate_resonance_scores()"""
+
+    def resonance_join(params):
+        nfts = {r['id']: r for r in backend.tables['nft_metadata']['rows'] if r['token_id'] == params[0]}
+        freqs = {r['id']: r for r in backend.tables['akashic_frequencies']['rows']}
+        rows = [
+            (nfts[l['nft_id']]['token_id'], nfts[l['nft_id']]['name'], nfts[l['nft_id']]['frequency'],
+             freqs[l['frequency_id']]['frequency'], freqs[l['frequency_id']]['resonance'], l['layer_depth'])
+            for l in backend.tables['frequency_layers']['rows']
+            if l['nft_id'] in nfts and l['frequency_id'] in freqs
+        ]
+        return ['token_id', 'name', 'nft_frequency', 'akashic_frequency', 'resonance', 'layer_depth'], rows
+
+    def resonance_batch_join(params):
+        nfts = [r for r in backend.tables['nft_metadata']['rows'] if r['token_id'] in set(params[0])]
+        layers = layers_by_nft(backend, [n['id'] for n in nfts])
+        rows = []
+        for n in nfts:
+            base = (n['token_id'], n['frequency'], n.get('resonance_level'))
+            rows.extend(base + (f['frequency'], f['resonance']) for f in layers[n['id']])
+            if not layers[n['id']]:
+                rows.append(base + (None, None))
+        return ['token_id', 'nft_frequency', 'base_resonance', 'akashic_frequency', 'resonance'], rows
+
+    def resonance_scores(params):
+        # calculate_resonance_scores() in scrollverse_schema.sql, evaluated the way the server does
+        nfts = [r for r in backend.tables['nft_metadata']['rows'] if r['token_id'] in set(params[0])]
+        layers = layers_by_nft(backend, [n['id'] for n in nfts])
+        rows = []
+        for n in nfts:
+            count = len(layers[n['id']])
+            average = sql_avg(sum((f['resonance'] for f in layers[n['id']]), Decimal('0.00')), count)
+            rows.append((n['id'], n['token_id'], count, average,
+                         sql_resonance_score(n.get('resonance_level'), count, average)))
+        return ['nft_id', 'token_id', 'layer_count', 'avg_layer_resonance', 'resonance_score'], rows
+
+    backend.on(r'from nft_metadata nm join frequency_layers fl', resonance_join)
+    backend.on(r'from nft_metadata nm left join \(frequency_layers fl', resonance_batch_join)
+    backend.on(r'from calculate_resonance_scores\(', resonance_scores)
@@ -0,0 +1,84 @@
+"""
+Fake Resonance Rollups for ScrollVerse
+Minute, hour and day buckets over resonance_data behind a watermark
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+
+def install(backend: FakeBackend):
+    """Answer the rollup refresh and the windowed rollup query"""
+    rollups: Dict[tuple, list] = {}
+    rollup_watermark = {'last_id': 0}
+    truncations = {
+        'minute': {'second': 0, 'microsecond': 0},
+        'hour': {'minute': 0, 'second': 0, 'microsecond': 0},
+        'day': {'hour': 0, 'minute': 0, 'second': 0, 'microsecond': 0}
+    }
+
+    def resonance_samples(low_id, high_id=None):
+        # Rows loaded with COPY hold their text-format values
+        for r in backend.tables['resonance_data']['rows']:
+            if r['id'] > low_id and (high_id is None or r['id'] <= high_id) \
+                    and r.get('nft_id') is not None and r.get('timestamp') is not None:
+                moment = r['timestamp']
+                yield (int(r['nft_id']), int(r['frequency']), Decimal(str(r['resonance_level'])),
+                       moment if isinstance(moment, datetime) else datetime.fromisoformat(moment))
+
+    def rollup_bound(params):
+        return ['upper_id'], [(backend.tables['resonance_data']['last_id'],)]
+
+    def refresh_rollups(params):
+        upper_id, max_ids = params
+        low_id = rollup_watermark['last_id']
+        high_id = min(upper_id, low_id + (max_ids or upper_id))
+        if high_id <= low_id:
+            return ['rows_rolled_up', 'buckets_updated', 'watermark'], [(0, 0, low_id)]
+
+        rows, touched = 0, set()
+        for nft_id, frequency, level, moment in resonance_samples(low_id, high_id):
+            rows += 1
+            for resolution, fields in truncations.items():
+                key = (resolution, nft_id, moment.replace(**fields), frequency)
+                touched.add(key)
+                bucket = rollups.get(key)
+                if bucket is None:
+                    rollups[key] = [1, level, level, level]
+                else:
+                    bucket[0] += 1
+                    bucket[1] += level
+                    bucket[2] = min(bucket[2], level)
+                    bucket[3] = max(bucket[3], level)
+        rollup_watermark['last_id'] = high_id
+        return ['rows_rolled_up', 'buckets_updated', 'watermark'], [(rows, len(touched), high_id)]
+
+    def resonance_window(params):
+        resolution, nft_id, start, end, frequency = params[:5]
+        buckets: Dict[datetime, list] = {}
+        samples = [
+            ((resolution, n, moment.replace(**truncations[resolution]), f), [1, level, level, level])
+            for n, f, level, moment in resonance_samples(rollup_watermark['last_id'])
+        ]
+        for (res, n, bucket, f), (count, total, low, high) in list(rollups.items()) + samples:
+            if res != resolution or n != nft_id or not start <= bucket < end or frequency not in (None, f):
+                continue
+            merged = buckets.setdefault(bucket, [0, Decimal(0), low, high])
+            merged[0] += count
+            merged[1] += total
+            merged[2] = min(merged[2], low)
+            merged[3] = max(merged[3], high)
+        return ['bucket', 'sample_count', 'resonance_sum', 'resonance_min', 'resonance_max'], [
+            (bucket,) + tuple(values) for bucket, values in sorted(buckets.items())
+        ]
+
+    backend.on(r'resonance_rollup_bound\(\)', rollup_bound)
+    backend.on(r'from refresh_resonance_rollups\(', refresh_rollups)
+    backend.on(r'from resonance_rollups r', resonance_window)
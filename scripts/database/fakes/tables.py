@@ -0,0 +1,130 @@
+"""
+Fake Sample Tables for ScrollVerse
+The sample rows from scrollverse_schema.sql and the table listing
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List
+
+try:
+    from ..drivers import FakeBackend
+except ImportError:
+    from drivers import FakeBackend
+
+CREATED_AT = datetime(2025, 12, 7, 13, 0, 0)
+
+FREQUENCIES = [
+    (528, 'Miracle Tone', '1.00', 'DNA Repair & Transformation - Love Frequency', 'Flower of Life', 'Solar Plexus'),
+    (432, 'Natural Harmony', '0.88', 'Universal Frequency - Natural Pitch', 'Platonic Solids', 'Heart'),
+    (396, 'Liberation', '0.85', 'Liberating Guilt and Fear', 'Seed of Life', 'Root'),
+    (417, 'Change', '0.86', 'Undoing Situations and Facilitating Change', 'Vesica Piscis', 'Sacral'),
+    (639, 'Connection', '0.90', 'Connecting and Relationships', 'Sri Yantra', 'Throat'),
+    (741, 'Expression', '0.92', 'Awakening Intuition and Expression', "Metatron's Cube", 'Third Eye'),
+    (852, 'Intuition', '0.93', 'Returning to Spiritual Order', 'Torus Field', 'Crown'),
+    (963, 'Divine Connection', '0.95', 'Pineal Gland Activation - Connection to Divine', 'Golden Spiral', 'Crown')
+]
+
+# (nft_id, frequency_id, layer_depth)
+LAYERS = [(1, 1, 1), (1, 8, 2), (1, 2, 3), (2, 1, 1), (2, 6, 2), (3, 8, 1)]
+
+
+def moment_of(value: Any) -> Any:
+    """A timestamp column value as a datetime; rows loaded with COPY hold ISO text"""
+    return value if value is None or isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def relation(regclass: str) -> str:
+    """Table name from a quoted, schema-qualified regclass parameter"""
+    return regclass.split('.')[-1].strip('"')
+
+
+def layers_by_nft(backend: FakeBackend, nft_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """The akashic_frequencies rows layered on each NFT, in frequency_layers order"""
+    freqs = {r['id']: r for r in backend.tables['akashic_frequencies']['rows']}
+    layers = {nft_id: [] for nft_id in nft_ids}
+    for layer in backend.tables['frequency_layers']['rows']:
+        if layer['nft_id'] in layers and layer['frequency_id'] in freqs:
+            layers[layer['nft_id']].append(freqs[layer['frequency_id']])
+    return layers
+
+
+def install(backend: FakeBackend):
+    """Create every schema table with the sample rows, and answer list_tables()"""
+    created = CREATED_AT
+    backend.add_table(
+        'nft_metadata',
+        ['id', 'token_id', 'name', 'frequency', 'metadata_uri', 'description', 'image_uri',
+         'attributes', 'created_at', 'updated_at', 'creator_address', 'owner_address',
+         'evolution_stage', 'resonance_level'],
+        [
+            {'id': 1, 'token_id': 'NFT-001', 'name': 'Sovereign Genesis', 'frequency': 528,
+             'metadata_uri': 'ipfs://QmExample1', 'description': 'First of the Sovereign collection',
+             'created_at': created, 'updated_at': created, 'evolution_stage': 'Genesis',
+             'resonance_level': Decimal('1.00')},
+            {'id': 2, 'token_id': 'NFT-002', 'name': 'Akashic Scroll', 'frequency': 528,
+             'metadata_uri': 'ipfs://QmExample2', 'description': 'Bearer of ancient wisdom',
+             'created_at': created, 'updated_at': created, 'evolution_stage': 'Awakened',
+             'resonance_level': Decimal('1.20')},
+            {'id': 3, 'token_id': 'NFT-003', 'name': 'Eternal Anchor', 'frequency': 963,
+             'metadata_uri': 'ipfs://QmExample3', 'description': 'Divine connection anchor',
+             'created_at': created, 'updated_at': created, 'evolution_stage': 'Sovereign',
+             'resonance_level': Decimal('1.50')}
+        ]
+    )
+    backend.add_table(
+        'akashic_frequencies',
+        ['id', 'frequency', 'type', 'resonance', 'description', 'sacred_geometry',
+         'chakra_alignment', 'healing_properties', 'metadata', 'created_at'],
+        [
+            {'id': i, 'frequency': f, 'type': t, 'resonance': Decimal(r), 'description': d,
+             'sacred_geometry': g, 'chakra_alignment': c, 'created_at': created}
+            for i, (f, t, r, d, g, c) in enumerate(FREQUENCIES, start=1)
+        ]
+    )
+    backend.add_table(
+        'frequency_layers',
+        ['id', 'nft_id', 'frequency_id', 'layer_depth', 'resonance_data', 'activation_timestamp'],
+        [
+            {'id': i, 'nft_id': n, 'frequency_id': f, 'layer_depth': d, 'activation_timestamp': created}
+            for i, (n, f, d) in enumerate(LAYERS, start=1)
+        ]
+    )
+
+    for name, columns in {
+        'scroll_souls': ['id', 'soul_token_id', 'owner_address', 'evolution_stage', 'sovereignty_points',
+                         'frequency_alignment', 'sacred_geometry', 'soul_bound', 'created_at',
+                         'last_evolution', 'metadata'],
+        'resonance_data': ['id', 'nft_id', 'frequency', 'resonance_level', 'etheric_density',
+                           'akashic_layer', 'dimensional_access', 'timestamp', 'measurement_data'],
+        'nft_evolution_history': ['id', 'nft_id', 'from_stage', 'to_stage', 'frequency_shift',
+                                  'resonance_change', 'evolution_timestamp', 'trigger_event', 'metadata'],
+        'user_interactions': ['id', 'user_address', 'nft_id', 'interaction_type', 'frequency_resonance',
+                              'timestamp', 'interaction_data']
+    }.items():
+        backend.add_table(name, columns)
+
+    backend.add_table(
+        'nft_with_frequencies_mat',
+        ['id', 'token_id', 'name', 'primary_frequency', 'evolution_stage', 'resonance_level',
+         'frequency_layers', 'refreshed_at']
+    )
+    # The schema queues every sample NFT so the materialization starts complete
+    backend.add_table(
+        'nft_frequencies_dirty',
+        ['nft_id', 'queued_at'],
+        [{'nft_id': r['id'], 'queued_at': created} for r in backend.tables['nft_metadata']['rows']]
+    )
+    backend.add_table(
+        'nft_state_snapshots',
+        ['nft_id', 'events', 'event_id', 'as_of', 'stage', 'frequency', 'resonance_level', 'created_at']
+    )
+
+    def list_tables(params):
+        sizes = {name: f"{max(8, len(t['rows']) * 8)} kB" for name, t in backend.tables.items()}
+        return ['table_schema', 'table_name', 'size'], [
+            (params[0] if params else 'public', name, sizes[name]) for name in sorted(backend.tables)
+        ]
+
+    backend.on(r'from information_schema\.tables', list_tables)
@@ -0,0 +1,333 @@
+"""
+Query Instrumentation for ScrollVerse
+Per-statement latency histograms, slow-query log and metrics export
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import json
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    from .statement_cache import normalize_sql
+except ImportError:
+    from statement_cache import normalize_sql
+
+# Prometheus default buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OTHER_STATEMENTS = '<other>'
+
+
+class QueryEvent:
+    """One instrumented statement execution, as passed to hooks"""
+
+    __slots__ = ('statement', 'query', 'duration', 'pool_wait', 'rowcount', 'error', 'finished_at', 'slow')
+
+    def __init__(
+        self,
+        statement: str,
+        query: str,
+        duration: float,
+        pool_wait: float,
+        rowcount: int,
+        error: Optional[BaseException],
+        slow: bool
+    ):
+        """Capture the measurements of a finished statement"""
+        self.statement = statement
+        self.query = query
+        self.duration = duration
+        self.pool_wait = pool_wait
+        self.rowcount = rowcount
+        self.error = error
+        self.finished_at = time.time()
+        self.slow = slow
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view of the event"""
+        return {
+            'statement': self.statement,
+            'duration_ms': round(self.duration * 1000.0, 3),
+            'pool_wait_ms': round(self.pool_wait * 1000.0, 3),
+            'rowcount': self.rowcount,
+            'error': f"{type(self.error).__name__}: {self.error}" if self.error else None,
+            'finished_at': datetime.fromtimestamp(self.finished_at).isoformat()
+        }
+
+
+QueryHook = Callable[[QueryEvent], None]
+
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        """Initialize empty buckets; the last bucket is +Inf"""
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        """Bucket counts as Prometheus cumulative le= counts"""
+        running, result = 0, []
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        running, lower = 0, 0.0
+        for upper, count in zip(self.bounds, self.counts):
+            if count and running + count >= rank:
+                return lower + (upper - lower) * (rank - running) / count
+            running += count
+            lower = upper
+        return self.bounds[-1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view with bucket counts and percentile estimates"""
+        return {
+            'count': self.count,
+            'sum_ms': round(self.total * 1000.0, 3),
+            'mean_ms': round(self.total * 1000.0 / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5) * 1000.0, 3),
+            'p95_ms': round(self.quantile(0.95) * 1000.0, 3),
+            'p99_ms': round(self.quantile(0.99) * 1000.0, 3),
+            'buckets': {
+                ('+Inf' if i == len(self.bounds) else repr(self.bounds[i])): count
+                for i, count in enumerate(self.cumulative())
+            }
+        }
+
+
+class _StatementStats:
+    """Counters for one normalized statement"""
+
+    __slots__ = ('calls', 'errors', 'rows', 'slow', 'latency')
+
+    def __init__(self, bounds: Sequence[float]):
+        """Initialize zeroed counters"""
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.slow = 0
+        self.latency = LatencyHistogram(bounds)
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class QueryInstrumentation:
+    """
+    Low-overhead recorder for every statement the client runs
+    Calls, rows, errors and slow queries are always counted; latency
+    observations and hooks are sampled at sample_rate. Hooks run on the
+    querying thread and must be quick; their exceptions are counted, not raised
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold: float = 0.5,
+        sample_rate: float = 1.0,
+        slow_log_size: int = 100,
+        max_statements: int = 500,
+        statement_length: int = 200,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        enabled: bool = True
+    ):
+        """Initialize empty metrics"""
+        self.slow_query_threshold = slow_query_threshold
+        self.sample_rate = sample_rate
+        self.max_statements = max_statements
+        self.statement_length = statement_length
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        self._hooks: List[QueryHook] = []
+        self._statements: Dict[str, _StatementStats] = {}
+        self._statement_keys: Dict[str, str] = {}
+        self._pool_wait = LatencyHistogram(self.buckets)
+        self._slow_log = deque(maxlen=slow_log_size)
+        self._hook_errors = 0
+        self._started_at = time.time()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'QueryInstrumentation':
+        """Build instrumentation from client config (slow_query_threshold in milliseconds)"""
+        return cls(
+            slow_query_threshold=config.get('slow_query_threshold', 500) / 1000.0,
+            sample_rate=config.get('metrics_sample_rate', 1.0),
+            slow_log_size=config.get('slow_query_log_size', 100),
+            enabled=config.get('metrics_enabled', True)
+        )
+
+    def add_hook(self, hook: QueryHook) -> QueryHook:
+        """Register a callable that receives each sampled or slow QueryEvent"""
+        with self._lock:
+            self._hooks = [*self._hooks, hook]
+        return hook
+
+    def remove_hook(self, hook: QueryHook):
+        """Unregister a hook"""
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def _statement_key(self, query: str) -> str:
+        """Normalized, length-capped statement label; caller holds the lock"""
+        key = self._statement_keys.get(query)
+        if key is None:
+            key = normalize_sql(query)[:self.statement_length]
+            if key not in self._statements and len(self._statements) >= self.max_statements:
+                key = OTHER_STATEMENTS
+            if len(self._statement_keys) < self.max_statements * 4:
+                self._statement_keys[query] = key
+        return key
+
+    def record(
+        self,
+        query: str,
+        duration: float,
+        rowcount: int = 0,
+        pool_wait: float = 0.0,
+        error: Optional[BaseException] = None
+    ):
+        """Record one finished statement; durations are in seconds"""
+        if not self.enabled:
+            return
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        slow = duration >= self.slow_query_threshold
+
+        with self._lock:
+            statement = self._statement_key(query)
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = _StatementStats(self.buckets)
+            stats.calls += 1
+            stats.rows += max(rowcount, 0)
+            if error is not None:
+                stats.errors += 1
+            if sampled:
+                stats.latency.observe(duration)
+                self._pool_wait.observe(pool_wait)
+            hooks = self._hooks
+
+        if not (sampled or slow):
+            return
+        event = QueryEvent(statement, query, duration, pool_wait, rowcount, error, slow)
+        if slow:
+            with self._lock:
+                stats.slow += 1
+                self._slow_log.append(event)
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                with self._lock:
+                    self._hook_errors += 1
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Most recent slow statements, oldest first"""
+        with self._lock:
+            return [event.as_dict() for event in self._slow_log]
+
+    def reset(self):
+        """Drop all recorded metrics, keeping hooks and settings"""
+        with self._lock:
+            self._statements.clear()
+            self._statement_keys.clear()
+            self._pool_wait = LatencyHistogram(self.buckets)
+            self._slow_log.clear()
+            self._hook_errors = 0
+            self._started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a JSON-friendly dict"""
+        with self._lock:
+            statements = {
+                statement: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'slow': stats.slow,
+                    'latency': stats.latency.as_dict()
+                }
+                for statement, stats in self._statements.items()
+            }
+            return {
+                'since': datetime.fromtimestamp(self._started_at).isoformat(),
+                'sample_rate': self.sample_rate,
+                'slow_query_threshold_ms': self.slow_query_threshold * 1000.0,
+                'calls': sum(s['calls'] for s in statements.values()),
+                'errors': sum(s['errors'] for s in statements.values()),
+                'hook_errors': self._hook_errors,
+                'pool_wait': self._pool_wait.as_dict(),
+                'statements': statements,
+                'slow_queries': [event.as_dict() for event in self._slow_log]
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Export the snapshot as JSON"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = 'scrollverse') -> str:
+        """Export metrics in the Prometheus text exposition format"""
+        with self._lock:
+            items = [
+                (_escape_label(statement), stats.calls, stats.errors, stats.rows, stats.slow,
+                 stats.latency.cumulative(), stats.latency.total, stats.latency.count)
+                for statement, stats in self._statements.items()
+            ]
+            wait_buckets = self._pool_wait.cumulative()
+            wait_total, wait_count = self._pool_wait.total, self._pool_wait.count
+        bounds = [repr(bound) for bound in self.buckets] + ['+Inf']
+
+        lines = []
+        for name, index, kind, help_text in (
+            ('queries_total', 1, 'counter', 'Statements executed'),
+            ('query_errors_total', 2, 'counter', 'Statements that raised an error'),
+            ('query_rows_total', 3, 'counter', 'Rows returned or affected'),
+            ('slow_queries_total', 4, 'counter', 'Statements slower than the slow-query threshold')
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f'{prefix}_{name}{{statement="{item[0]}"}} {item[index]}' for item in items)
+
+        name = f"{prefix}_query_duration_seconds"
+        lines.append(f"# HELP {name} Statement latency (sampled)")
+        lines.append(f"# TYPE {name} histogram")
+        for statement, _, _, _, _, cumulative, total, count in items:
+            lines.extend(
+                f'{name}_bucket{{statement="{statement}",le="{bound}"}} {value}'
+                for bound, value in zip(bounds, cumulative)
+            )
+            lines.append(f'{name}_sum{{statement="{statement}"}} {total!r}')
+            lines.append(f'{name}_count{{statement="{statement}"}} {count}')
+
+        name = f"{prefix}_pool_wait_seconds"
+        lines.append(f"# HELP {name} Time spent waiting for a pooled connection (sampled)")
+        lines.append(f"# TYPE {name} histogram")
+        lines.extend(f'{name}_bucket{{le="{bound}"}} {value}' for bound, value in zip(bounds, wait_buckets))
+        lines.append(f"{name}_sum {wait_total!r}")
+        lines.append(f"{name}_count {wait_count}")
+        return '\n'.join(lines) + '\n'
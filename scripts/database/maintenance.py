@@ -0,0 +1,282 @@
+"""
+Maintenance Planner for ScrollVerse
+Bloat-driven VACUUM, ANALYZE and REINDEX CONCURRENTLY scheduling
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+MAINTENANCE_CANDIDATES_QUERY = """
+    SELECT
+        s.schemaname,
+        s.relname AS tablename,
+        s.n_live_tup,
+        s.n_dead_tup,
+        s.n_mod_since_analyze,
+        pg_total_relation_size(s.relid) AS total_bytes,
+        pg_indexes_size(s.relid) AS index_bytes,
+        GREATEST(s.last_vacuum, s.last_autovacuum) AS last_vacuum,
+        GREATEST(s.last_analyze, s.last_autoanalyze) AS last_analyze
+    FROM pg_stat_user_tables s
+    WHERE s.schemaname = %s
+    ORDER BY s.n_dead_tup DESC
+"""
+
+RELATION_SIZES_QUERY = """
+    SELECT
+        s.relname AS tablename,
+        pg_total_relation_size(s.relid) AS total_bytes,
+        s.n_dead_tup
+    FROM pg_stat_user_tables s
+    WHERE s.schemaname = %s AND s.relname = ANY(%s)
+"""
+
+VACUUM = 'VACUUM'
+ANALYZE = 'ANALYZE'
+REINDEX = 'REINDEX'
+
+
+def quote_ident(name: str) -> str:
+    """Quote an identifier the way PostgreSQL's quote_ident does"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class MaintenanceTask:
+    """One maintenance statement planned for a table"""
+
+    __slots__ = ('schema', 'table', 'action', 'reason', 'priority', 'estimated_bytes')
+
+    def __init__(self, schema: str, table: str, action: str, reason: str, priority: float, estimated_bytes: int = 0):
+        """Describe the action and why it was chosen"""
+        self.schema = schema
+        self.table = table
+        self.action = action
+        self.reason = reason
+        self.priority = priority
+        self.estimated_bytes = estimated_bytes
+
+    @property
+    def sql(self) -> str:
+        """Statement that carries out the task"""
+        target = f"{quote_ident(self.schema)}.{quote_ident(self.table)}"
+        if self.action == VACUUM:
+            return f"VACUUM (ANALYZE) {target}"
+        if self.action == ANALYZE:
+            return f"ANALYZE {target}"
+        # CONCURRENTLY builds the new indexes without blocking writers
+        return f"REINDEX TABLE CONCURRENTLY {target}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view of the task"""
+        return {
+            'table': self.table,
+            'action': self.action,
+            'task': self.sql,
+            'reason': self.reason,
+            'estimated_bytes': self.estimated_bytes
+        }
+
+
+class MaintenancePlanner:
+    """
+    Chooses maintenance per table from pg_stat_user_tables
+    Tables with enough dead tuples are vacuumed, tables whose statistics are
+    stale are analyzed, and heavily churned tables with sizeable indexes are
+    reindexed concurrently after their VACUUM
+    """
+
+    def __init__(
+        self,
+        vacuum_threshold: float = 0.10,
+        reindex_threshold: float = 0.30,
+        analyze_threshold: float = 0.10,
+        min_dead_tuples: int = 1000,
+        min_table_bytes: int = 1024 * 1024,
+        min_index_bytes: int = 1024 * 1024,
+        max_tables: Optional[int] = None
+    ):
+        """Initialize planning thresholds (ratios are fractions of live plus dead tuples)"""
+        self.vacuum_threshold = vacuum_threshold
+        self.reindex_threshold = reindex_threshold
+        self.analyze_threshold = analyze_threshold
+        self.min_dead_tuples = min_dead_tuples
+        self.min_table_bytes = min_table_bytes
+        self.min_index_bytes = min_index_bytes
+        self.max_tables = max_tables
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'MaintenancePlanner':
+        """Build a planner from client config"""
+        return cls(
+            vacuum_threshold=config.get('maintenance_vacuum_threshold', 0.10),
+            reindex_threshold=config.get('maintenance_reindex_threshold', 0.30),
+            max_tables=config.get('maintenance_max_tables')
+        )
+
+    def plan_table(self, candidate: Dict[str, Any]) -> List[MaintenanceTask]:
+        """Tasks for one pg_stat_user_tables row, in execution order"""
+        schema, table = candidate['schemaname'], candidate['tablename']
+        live, dead = candidate['n_live_tup'] or 0, candidate['n_dead_tup'] or 0
+        modified = candidate['n_mod_since_analyze'] or 0
+        total_bytes, index_bytes = candidate['total_bytes'] or 0, candidate['index_bytes'] or 0
+        dead_ratio = dead / (live + dead) if live + dead else 0.0
+
+        if total_bytes < self.min_table_bytes:
+            return []
+
+        tasks = []
+        if dead >= self.min_dead_tuples and dead_ratio >= self.vacuum_threshold:
+            tasks.append(MaintenanceTask(
+                schema, table, VACUUM,
+                f"{dead_ratio:.0%} dead tuples ({dead} of {live + dead})",
+                priority=(total_bytes - index_bytes) * dead_ratio,
+                estimated_bytes=int((total_bytes - index_bytes) * dead_ratio)
+            ))
+            if dead_ratio >= self.reindex_threshold and index_bytes >= self.min_index_bytes:
+                tasks.append(MaintenanceTask(
+                    schema, table, REINDEX,
+                    f"{dead_ratio:.0%} churn on {index_bytes} bytes of indexes",
+                    priority=index_bytes * dead_ratio,
+                    estimated_bytes=int(index_bytes * dead_ratio)
+                ))
+        elif modified >= max(self.min_dead_tuples, self.analyze_threshold * live):
+            tasks.append(MaintenanceTask(
+                schema, table, ANALYZE,
+                f"{modified} rows modified since last analyze",
+                priority=modified
+            ))
+        return tasks
+
+    def plan(self, candidates: Sequence[Dict[str, Any]]) -> List[List[MaintenanceTask]]:
+        """Per-table task chains, most valuable first"""
+        chains = [chain for chain in (self.plan_table(c) for c in candidates) if chain]
+        chains.sort(key=lambda chain: sum(task.priority for task in chain), reverse=True)
+        return chains[:self.max_tables] if self.max_tables else chains
+
+
+def build_report(
+    results: List[Dict[str, Any]],
+    before: Dict[str, Dict[str, Any]],
+    after: Dict[str, Dict[str, Any]],
+    elapsed: float,
+    concurrency: int,
+    time_budget: float
+) -> Dict[str, Any]:
+    """Summarize time spent and space reclaimed by a maintenance run"""
+    tables = {}
+    for table, sizes in before.items():
+        final = after.get(table, sizes)
+        tables[table] = {
+            'bytes_before': sizes['total_bytes'],
+            'bytes_after': final['total_bytes'],
+            'bytes_reclaimed': sizes['total_bytes'] - final['total_bytes'],
+            'dead_tuples_before': sizes['n_dead_tup'],
+            'dead_tuples_after': final['n_dead_tup']
+        }
+
+    counts = {status: sum(1 for r in results if r['status'] == status) for status in ('success', 'failed', 'skipped')}
+    return {
+        'optimizations': results,
+        'tables': tables,
+        'summary': {
+            'planned': len(results),
+            'succeeded': counts['success'],
+            'failed': counts['failed'],
+            'skipped': counts['skipped'],
+            'elapsed_seconds': round(elapsed, 3),
+            'task_seconds': round(sum(r.get('seconds', 0.0) for r in results), 3),
+            'bytes_reclaimed': sum(t['bytes_reclaimed'] for t in tables.values()),
+            'dead_tuples_removed': sum(t['dead_tuples_before'] - t['dead_tuples_after'] for t in tables.values()),
+            'concurrency': concurrency,
+            'time_budget_seconds': time_budget
+        },
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def sizes_by_table(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Index RELATION_SIZES_QUERY rows by table name"""
+    return {row['tablename']: row for row in rows}
+
+
+class MaintenanceScheduler:
+    """
+    Runs planned maintenance on the client's pool
+    Table chains run in parallel up to concurrency; tasks within a chain run
+    in order. No task starts once time_budget seconds have passed, and running
+    statements are left to finish, because cancelling REINDEX CONCURRENTLY
+    leaves invalid indexes behind
+    """
+
+    def __init__(
+        self,
+        client,
+        planner: Optional[MaintenancePlanner] = None,
+        concurrency: int = 2,
+        time_budget: float = 600.0,
+        schema: str = 'public'
+    ):
+        """Initialize against a connected PostgreSQLClient"""
+        self.client = client
+        self.planner = planner or MaintenancePlanner()
+        self.concurrency = max(1, concurrency)
+        self.time_budget = time_budget
+        self.schema = schema
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Current per-table statistics"""
+        result = self.client.execute_query(MAINTENANCE_CANDIDATES_QUERY, (self.schema,))
+        return [dict(zip(result['columns'], row)) for row in result['rows']]
+
+    def plan(self) -> List[List[MaintenanceTask]]:
+        """Plan maintenance from current statistics"""
+        return self.planner.plan(self.candidates())
+
+    def _sizes(self, tables: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Total size and dead tuples for the given tables"""
+        result = self.client.execute_query(RELATION_SIZES_QUERY, (self.schema, tables))
+        return sizes_by_table([dict(zip(result['columns'], row)) for row in result['rows']])
+
+    def _run_chain(self, chain: List[MaintenanceTask], deadline: float) -> List[Dict[str, Any]]:
+        """Run one table's tasks in order, skipping what the budget no longer allows"""
+        results = []
+        for task in chain:
+            result = task.as_dict()
+            if time.monotonic() >= deadline:
+                result.update(status='skipped', error='time budget exhausted')
+            elif results and results[-1]['status'] != 'success':
+                result.update(status='skipped', error=f"previous {results[-1]['action']} did not succeed")
+            else:
+                started = time.monotonic()
+                try:
+                    self.client.execute_utility(task.sql)
+                    result['status'] = 'success'
+                except Exception as e:
+                    result.update(status='failed', error=str(e))
+                result['seconds'] = round(time.monotonic() - started, 3)
+            results.append(result)
+        return results
+
+    def run(self, chains: Optional[List[List[MaintenanceTask]]] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Plan if needed, run every chain and report time spent and space reclaimed"""
+        started = time.monotonic()
+        chains = self.plan() if chains is None else chains
+        tables = [chain[0].table for chain in chains]
+
+        if dry_run or not chains:
+            results = [dict(task.as_dict(), status='skipped', error='dry run') for chain in chains for task in chain]
+            return build_report(results, {}, {}, time.monotonic() - started, self.concurrency, self.time_budget)
+
+        before = self._sizes(tables)
+        deadline = started + self.time_budget
+        # Every worker holds a pooled connection, so never ask for more than the pool allows
+        workers = min(self.concurrency, len(chains), getattr(self.client.pool, 'max_size', self.concurrency))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scrollverse-maintenance') as executor:
+            chain_results = list(executor.map(lambda chain: self._run_chain(chain, deadline), chains))
+        after = self._sizes(tables)
+
+        results = [result for chain in chain_results for result in chain]
+        return build_report(results, before, after, time.monotonic() - started, workers, self.time_budget)
@@ -0,0 +1,499 @@
+"""
+Partition Manager for ScrollVerse
+Time-range partitioning, pre-creation and retention for append-only tables
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .maintenance import quote_ident
+except ImportError:
+    from maintenance import quote_ident
+
+TABLE_KINDS_QUERY = """
+    SELECT c.relname AS table_name, c.relkind AS kind
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %s AND c.relname = ANY(%s)
+"""
+
+PARTITIONS_QUERY = """
+    SELECT
+        parent.relname AS table_name,
+        child.relname AS partition_name,
+        pg_get_expr(child.relpartbound, child.oid) AS bound,
+        i.inhdetachpending AS detach_pending,
+        pg_total_relation_size(child.oid) AS total_bytes
+    FROM pg_inherits i
+    JOIN pg_class parent ON parent.oid = i.inhparent
+    JOIN pg_class child ON child.oid = i.inhrelid
+    JOIN pg_namespace n ON n.oid = parent.relnamespace
+    WHERE n.nspname = %s AND parent.relname = ANY(%s) AND parent.relkind = 'p'
+    ORDER BY parent.relname, child.relname
+"""
+
+TABLE_INDEXES_QUERY = """
+    SELECT
+        ic.relname AS index_name,
+        i.indisprimary AS is_primary,
+        pg_get_indexdef(i.indexrelid) AS definition,
+        ARRAY(
+            SELECT a.attname
+            FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, position)
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            ORDER BY k.position
+        ) AS columns
+    FROM pg_index i
+    JOIN pg_class ic ON ic.oid = i.indexrelid
+    WHERE i.indrelid = %s::regclass
+    ORDER BY ic.relname
+"""
+
+TABLE_FOREIGN_KEYS_QUERY = """
+    SELECT conname AS constraint_name, pg_get_constraintdef(oid) AS definition
+    FROM pg_constraint
+    WHERE conrelid = %s::regclass AND contype = 'f'
+    ORDER BY conname
+"""
+
+TABLE_SEQUENCES_QUERY = """
+    SELECT a.attname AS column_name, pg_get_serial_sequence(%s, a.attname) AS sequence_name
+    FROM pg_attribute a
+    WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        AND pg_get_serial_sequence(%s, a.attname) IS NOT NULL
+"""
+
+CREATE = 'CREATE'
+DETACH = 'DETACH'
+DROP = 'DROP'
+CONVERT = 'CONVERT'
+SPLIT = 'SPLIT'
+
+INTERVALS = ('day', 'month')
+
+_BOUND_RE = re.compile(r"FROM \('(?P<start>[^']+)'\) TO \('(?P<end>[^']+)'\)", re.IGNORECASE)
+
+
+def floor_bound(moment: datetime, interval: str) -> datetime:
+    """Start of the partition range containing moment"""
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start.replace(day=1) if interval == 'month' else start
+
+
+def next_bound(start: datetime, interval: str) -> datetime:
+    """Start of the partition range after the one starting at start"""
+    if interval == 'month':
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    return start + timedelta(days=1)
+
+
+def shift_bound(start: datetime, interval: str, count: int) -> datetime:
+    """Range start count intervals away (negative counts go back in time)"""
+    if interval == 'month':
+        months = start.year * 12 + start.month - 1 + count
+        return start.replace(year=months // 12, month=months % 12 + 1)
+    return start + timedelta(days=count)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    """Partition table name for the range starting at start"""
+    return f"{table}_p{start:%Y_%m}" if interval == 'month' else f"{table}_p{start:%Y_%m_%d}"
+
+
+def default_partition_name(table: str) -> str:
+    """Name of the DEFAULT partition that catches rows outside every range"""
+    return f"{table}_default"
+
+
+def parse_bound(expression: Optional[str]) -> Optional[Tuple[datetime, datetime]]:
+    """Range of a pg_get_expr(relpartbound) expression, or None for DEFAULT and MINVALUE/MAXVALUE bounds"""
+    match = _BOUND_RE.search(expression or '')
+    if not match:
+        return None
+    return datetime.fromisoformat(match.group('start')), datetime.fromisoformat(match.group('end'))
+
+
+def bound_literal(moment: datetime) -> str:
+    """SQL literal for a partition bound"""
+    return f"'{moment.isoformat(sep=' ')}'"
+
+
+def time_range_query(
+    table: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    column: str = 'timestamp',
+    **equals: Any
+) -> Tuple[str, tuple]:
+    """
+    SELECT over [start, end) with the range written as plain comparisons on the
+    partition key, which is what lets the planner prune partitions
+    """
+    conditions, params = [], []
+    for name, value in equals.items():
+        if value is not None:
+            conditions.append(f"{name} = %s")
+            params.append(value)
+    if start is not None:
+        conditions.append(f"{column} >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append(f"{column} < %s")
+        params.append(end)
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+    return f"SELECT * FROM {table}{where} ORDER BY {column}", tuple(params)
+
+
+class PartitionSpec:
+    """How one table is partitioned and how long its partitions are kept"""
+
+    __slots__ = ('table', 'column', 'interval', 'premake', 'retention')
+
+    def __init__(
+        self,
+        table: str,
+        interval: str = 'month',
+        premake: int = 3,
+        retention: Optional[int] = None,
+        column: str = 'timestamp'
+    ):
+        """Partition by interval on column; keep retention intervals (None keeps everything)"""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown partition interval '{interval}' (available: {', '.join(INTERVALS)})")
+        self.table = table
+        self.column = column
+        self.interval = interval
+        self.premake = premake
+        self.retention = retention
+
+    def ranges(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Consecutive partition ranges covering [start, end)"""
+        ranges, lower = [], floor_bound(start, self.interval)
+        while lower < end:
+            upper = next_bound(lower, self.interval)
+            ranges.append((lower, upper))
+            lower = upper
+        return ranges
+
+    def wanted(self, now: datetime) -> List[Tuple[datetime, datetime]]:
+        """The current range plus premake ranges ahead"""
+        current = floor_bound(now, self.interval)
+        return self.ranges(current, shift_bound(current, self.interval, self.premake + 1))
+
+    def cutoff(self, now: datetime) -> Optional[datetime]:
+        """Partitions ending at or before this are past retention"""
+        if not self.retention:
+            return None
+        return shift_bound(floor_bound(now, self.interval), self.interval, -self.retention)
+
+
+class PartitionTask:
+    """One partition DDL step planned for a table"""
+
+    __slots__ = ('schema', 'table', 'partition', 'action', 'reason', 'statements', 'utility')
+
+    def __init__(
+        self,
+        schema: str,
+        table: str,
+        partition: str,
+        action: str,
+        reason: str,
+        statements: Sequence[str],
+        utility: bool = False
+    ):
+        """Describe the step; utility steps cannot run inside a transaction block"""
+        self.schema = schema
+        self.table = table
+        self.partition = partition
+        self.action = action
+        self.reason = reason
+        self.statements = list(statements)
+        self.utility = utility
+
+    @property
+    def sql(self) -> str:
+        """Statements that carry out the task, run as one transaction unless utility"""
+        return ';\n'.join(self.statements)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view of the task"""
+        return {
+            'table': self.table,
+            'partition': self.partition,
+            'action': self.action,
+            'reason': self.reason,
+            'statements': len(self.statements)
+        }
+
+
+class PartitionManager:
+    """
+    Keeps time-partitioned tables ahead of their writers and within retention
+    Heap tables are converted in one transaction. Future partitions are created
+    standalone and attached, which locks the parent only in SHARE UPDATE
+    EXCLUSIVE mode. Expired partitions are detached CONCURRENTLY and dropped, so
+    old rows leave without a DELETE and without the bloat one would leave behind
+    """
+
+    def __init__(self, client, specs: Sequence[PartitionSpec], schema: str = 'public'):
+        """Initialize against a connected PostgreSQLClient"""
+        self.client = client
+        self.specs = {spec.table: spec for spec in specs}
+        self.schema = schema
+
+    @classmethod
+    def from_config(cls, client, config: Dict[str, Any]) -> 'PartitionManager':
+        """Manage resonance_data and user_interactions with the client config's settings"""
+        retention = config.get('partition_retention', 0) or None
+        return cls(client, [
+            PartitionSpec(
+                table,
+                interval=config.get('partition_interval', 'month'),
+                premake=config.get('partition_premake', 3),
+                retention=retention
+            )
+            for table in ('resonance_data', 'user_interactions')
+        ])
+
+    def _rows(self, query: str, params: tuple) -> List[Dict[str, Any]]:
+        """Run a catalog query and return its rows as dicts"""
+        result = self.client.execute_query(query, params)
+        return [dict(zip(result['columns'], row)) for row in result['rows']]
+
+    def _qualified(self, name: str) -> str:
+        """Schema-qualified, quoted relation name"""
+        return f"{quote_ident(self.schema)}.{quote_ident(name)}"
+
+    def partitions(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Attached partitions of each managed table, with their ranges"""
+        partitions: Dict[str, List[Dict[str, Any]]] = {table: [] for table in self.specs}
+        for row in self._rows(PARTITIONS_QUERY, (self.schema, list(self.specs))):
+            bounds = parse_bound(row['bound'])
+            partitions[row['table_name']].append({
+                'name': row['partition_name'],
+                'start': bounds[0] if bounds else None,
+                'end': bounds[1] if bounds else None,
+                'default': (row['bound'] or '').upper() == 'DEFAULT',
+                'detach_pending': bool(row['detach_pending']),
+                'total_bytes': row['total_bytes']
+            })
+        return partitions
+
+    def create_task(self, spec: PartitionSpec, start: datetime, end: datetime, reason: str) -> PartitionTask:
+        """Create a partition standalone, then attach it; attaching builds its indexes"""
+        name = partition_name(spec.table, start, spec.interval)
+        parent, partition = self._qualified(spec.table), self._qualified(name)
+        return PartitionTask(self.schema, spec.table, name, CREATE, reason, [
+            f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)",
+            f"ALTER TABLE {parent} ATTACH PARTITION {partition} "
+            f"FOR VALUES FROM ({bound_literal(start)}) TO ({bound_literal(end)})"
+        ])
+
+    def default_task(self, spec: PartitionSpec) -> PartitionTask:
+        """Create the DEFAULT partition standalone, then attach it"""
+        name = default_partition_name(spec.table)
+        parent, partition = self._qualified(spec.table), self._qualified(name)
+        return PartitionTask(self.schema, spec.table, name, CREATE, 'keep rows outside every range', [
+            f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)",
+            f"ALTER TABLE {parent} ATTACH PARTITION {partition} DEFAULT"
+        ])
+
+    def default_ranges(self, spec: PartitionSpec, default: Dict[str, Any]) -> List[Tuple[datetime, datetime]]:
+        """Ranges of the rows that landed in the DEFAULT partition"""
+        result = self.client.execute_query(
+            f"SELECT DISTINCT date_trunc(%s, {quote_ident(spec.column)}) AS start "
+            f"FROM {self._qualified(default['name'])} ORDER BY start",
+            (spec.interval,)
+        )
+        return [(start, next_bound(start, spec.interval)) for start, in result['rows']]
+
+    def split_task(self, spec: PartitionSpec, default: Dict[str, Any], start: datetime, end: datetime) -> PartitionTask:
+        """
+        Move one range's rows out of the DEFAULT partition into a new partition
+        of their own, in one transaction. Attaching checks the DEFAULT partition
+        holds no rows of the new range, so they are deleted from it first
+        """
+        name = partition_name(spec.table, start, spec.interval)
+        parent, partition, source = self._qualified(spec.table), self._qualified(name), self._qualified(default['name'])
+        column = quote_ident(spec.column)
+        within = f"{column} >= {bound_literal(start)} AND {column} < {bound_literal(end)}"
+        return PartitionTask(self.schema, spec.table, name, SPLIT, f"rows in {default['name']}", [
+            f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE)",
+            f"INSERT INTO {partition} SELECT * FROM {source} WHERE {within}",
+            f"DELETE FROM {source} WHERE {within}",
+            f"ALTER TABLE {parent} ATTACH PARTITION {partition} "
+            f"FOR VALUES FROM ({bound_literal(start)}) TO ({bound_literal(end)})"
+        ])
+
+    def retire_tasks(self, spec: PartitionSpec, partition: Dict[str, Any], expired: bool) -> List[PartitionTask]:
+        """Detach a partition without blocking readers, then drop it if it is past retention"""
+        parent, target = self._qualified(spec.table), self._qualified(partition['name'])
+        if partition['detach_pending']:
+            # An interrupted DETACH ... CONCURRENTLY has to be finalized before anything else
+            detach = f"ALTER TABLE {parent} DETACH PARTITION {target} FINALIZE"
+            reason = 'interrupted concurrent detach'
+        else:
+            detach = f"ALTER TABLE {parent} DETACH PARTITION {target} CONCURRENTLY"
+            reason = f"ends {partition['end']:%Y-%m-%d}, past {spec.retention} {spec.interval} retention"
+        tasks = [PartitionTask(self.schema, spec.table, partition['name'], DETACH, reason, [detach], utility=True)]
+        if expired:
+            tasks.append(PartitionTask(
+                self.schema, spec.table, partition['name'], DROP, reason, [f"DROP TABLE {target}"], utility=True
+            ))
+        return tasks
+
+    def convert_task(self, spec: PartitionSpec, now: datetime) -> PartitionTask:
+        """Rebuild a heap table as a partitioned table in a single transaction"""
+        column = quote_ident(spec.column)
+        target = self._qualified(spec.table)
+        staging = self._qualified(f"{spec.table}_partitioned")
+
+        oldest, newest, missing = self.client.execute_query(
+            f"SELECT MIN({column}) AS oldest, MAX({column}) AS newest, "
+            f"COUNT(*) FILTER (WHERE {column} IS NULL) AS missing FROM {target}"
+        )['rows'][0]
+        if missing:
+            raise ValueError(f"{spec.table} has {missing} rows with a NULL {spec.column}; "
+                             f"set them before partitioning")
+
+        indexes = self._rows(TABLE_INDEXES_QUERY, (target,))
+        foreign_keys = self._rows(TABLE_FOREIGN_KEYS_QUERY, (target,))
+        sequences = self._rows(TABLE_SEQUENCES_QUERY, (target, target, target))
+
+        # Cover every existing row as well as the premake ranges; expired ones go on the next run
+        current = floor_bound(now, spec.interval)
+        upper = shift_bound(current, spec.interval, spec.premake + 1)
+        if newest is not None and newest >= upper:
+            upper = next_bound(floor_bound(newest, spec.interval), spec.interval)
+        ranges = spec.ranges(min(oldest or current, current), upper)
+
+        primary = next((index['columns'] for index in indexes if index['is_primary']), None)
+        statements = [
+            # Readers keep going while rows are copied; writers wait for the swap
+            f"LOCK TABLE {target} IN EXCLUSIVE MODE",
+            f"CREATE TABLE {staging} (LIKE {target} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+            f"INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ({column})",
+            f"ALTER TABLE {staging} ALTER COLUMN {column} SET NOT NULL"
+        ]
+        statements.extend(
+            f"CREATE TABLE {self._qualified(partition_name(spec.table, start, spec.interval))} PARTITION OF {staging} "
+            f"FOR VALUES FROM ({bound_literal(start)}) TO ({bound_literal(end)})"
+            for start, end in ranges
+        )
+        statements.append(
+            f"CREATE TABLE {self._qualified(default_partition_name(spec.table))} PARTITION OF {staging} DEFAULT"
+        )
+        # Loading before indexing is much faster than maintaining the indexes row by row
+        statements.append(f"INSERT INTO {staging} SELECT * FROM {target}")
+        statements.extend(f"ALTER SEQUENCE {s['sequence_name']} OWNED BY NONE" for s in sequences)
+        statements.extend([f"DROP TABLE {target}", f"ALTER TABLE {staging} RENAME TO {quote_ident(spec.table)}"])
+        statements.extend(
+            f"ALTER SEQUENCE {s['sequence_name']} OWNED BY {target}.{quote_ident(s['column_name'])}" for s in sequences
+        )
+        if primary:
+            # A partitioned table's primary key must include the partition key
+            key = list(primary) + ([spec.column] if spec.column not in primary else [])
+            statements.append(f"ALTER TABLE {target} ADD PRIMARY KEY ({', '.join(quote_ident(c) for c in key)})")
+        statements.extend(index['definition'] for index in indexes if not index['is_primary'])
+        statements.extend(
+            f"ALTER TABLE {target} ADD CONSTRAINT {quote_ident(fk['constraint_name'])} {fk['definition']}"
+            for fk in foreign_keys
+        )
+        statements.append(f"ANALYZE {target}")
+
+        return PartitionTask(
+            self.schema, spec.table, spec.table, CONVERT,
+            f"heap table into {len(ranges)} {spec.interval} partitions", statements
+        )
+
+    def plan(self, now: Optional[datetime] = None) -> List[PartitionTask]:
+        """Tasks that bring every managed table to its wanted partitions, in execution order"""
+        now = now or datetime.now()
+        kinds = {row['table_name']: row['kind'] for row in self._rows(TABLE_KINDS_QUERY, (self.schema, list(self.specs)))}
+        existing = self.partitions()
+
+        tasks = []
+        for table, spec in self.specs.items():
+            if table not in kinds:
+                continue
+            if kinds[table] != 'p':
+                tasks.append(self.convert_task(spec, now))
+                continue
+
+            covered = {(p['start'], p['end']) for p in existing[table] if p['start'] is not None}
+            default = next((p for p in existing[table] if p['default']), None)
+            if default is None:
+                tasks.append(self.default_task(spec))
+            else:
+                # Rows written past the last range wait in the DEFAULT partition until split out here
+                for start, end in self.default_ranges(spec, default):
+                    if (start, end) not in covered:
+                        tasks.append(self.split_task(spec, default, start, end))
+                        covered.add((start, end))
+            tasks.extend(
+                self.create_task(spec, start, end, f"{spec.premake} {spec.interval} ahead")
+                for start, end in spec.wanted(now) if (start, end) not in covered
+            )
+
+            cutoff = spec.cutoff(now)
+            for partition in existing[table]:
+                expired = cutoff is not None and partition['end'] is not None and partition['end'] <= cutoff
+                if expired or partition['detach_pending']:
+                    tasks.extend(self.retire_tasks(spec, partition, expired))
+        return tasks
+
+    def run(self, tasks: Optional[List[PartitionTask]] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Plan if needed and run every task in order, skipping steps whose predecessor failed"""
+        started = time.monotonic()
+        tasks = self.plan() if tasks is None else tasks
+
+        results, failed = [], set()
+        for task in tasks:
+            result = task.as_dict()
+            if dry_run:
+                result.update(status='skipped', error='dry run')
+            elif (task.table, task.partition) in failed or task.table in failed:
+                result.update(status='skipped', error='an earlier step on this partition did not succeed')
+            else:
+                task_started = time.monotonic()
+                try:
+                    if task.utility:
+                        for statement in task.statements:
+                            self.client.execute_utility(statement)
+                    else:
+                        self.client.execute_query(task.sql)
+                    result['status'] = 'success'
+                except Exception as e:
+                    result.update(status='failed', error=str(e))
+                    failed.add(task.table if task.action == CONVERT else (task.table, task.partition))
+                result['seconds'] = round(time.monotonic() - task_started, 3)
+            results.append(result)
+
+        if any(r['action'] == CONVERT and r['status'] == 'success' for r in results):
+            # The converted tables are new relations; drop plans and cached rows that named the old ones
+            self.client.invalidate_statement_cache()
+            if self.client.result_cache is not None:
+                self.client.result_cache.clear()
+
+        counts = {status: sum(1 for r in results if r['status'] == status) for status in ('success', 'failed', 'skipped')}
+        return {
+            'tasks': results,
+            'summary': {
+                'planned': len(results),
+                'succeeded': counts['success'],
+                'failed': counts['failed'],
+                'skipped': counts['skipped'],
+                'created': sum(1 for r in results if r['action'] == CREATE and r['status'] == 'success'),
+                'split': sum(1 for r in results if r['action'] == SPLIT and r['status'] == 'success'),
+                'dropped': sum(1 for r in results if r['action'] == DROP and r['status'] == 'success'),
+                'converted': sum(1 for r in results if r['action'] == CONVERT and r['status'] == 'success'),
+                'elapsed_seconds': round(time.monotonic() - started, 3)
+            },
+            'timestamp': datetime.now().isoformat()
+        }
@@ -0,0 +1,600 @@
+"""
+Plan Advisor for ScrollVerse
+Plan capture with regression baselines and index recommendations for the client's known statements
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from .maintenance import quote_ident
+except ImportError:
+    from maintenance import quote_ident
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, VERBOSE, FORMAT JSON) "
+
+# Key columns and sort directions of every index, with scans and size summed over partitions
+INDEX_CATALOG_QUERY = """
+    SELECT
+        t.relname AS tablename,
+        i.relname AS indexname,
+        ix.indisunique AS is_unique,
+        ix.indisprimary AS is_primary,
+        am.amname AS method,
+        ARRAY(
+            SELECT a.attname
+            FROM unnest(ix.indkey[0:ix.indnkeyatts - 1]) WITH ORDINALITY AS k(attnum, n)
+            JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+            ORDER BY k.n
+        ) AS columns,
+        ARRAY(
+            SELECT (o.option & 1) = 1
+            FROM unnest(ix.indoption) WITH ORDINALITY AS o(option, n)
+            ORDER BY o.n
+        ) AS descending,
+        ix.indpred IS NOT NULL OR ix.indexprs IS NOT NULL AS is_partial,
+        pg_relation_size(ix.indexrelid) + COALESCE(p.bytes, 0) AS index_bytes,
+        COALESCE(s.idx_scan, 0) + COALESCE(p.scans, 0) AS idx_scan,
+        pg_get_indexdef(ix.indexrelid) AS definition
+    FROM pg_index ix
+    JOIN pg_class i ON i.oid = ix.indexrelid
+    JOIN pg_class t ON t.oid = ix.indrelid
+    JOIN pg_namespace n ON n.oid = t.relnamespace
+    JOIN pg_am am ON am.oid = i.relam
+    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid
+    LEFT JOIN LATERAL (
+        SELECT sum(pg_relation_size(inh.inhrelid)) AS bytes, sum(ps.idx_scan) AS scans
+        FROM pg_inherits inh
+        LEFT JOIN pg_stat_user_indexes ps ON ps.indexrelid = inh.inhrelid
+        WHERE inh.inhparent = ix.indexrelid
+    ) p ON true
+    WHERE n.nspname = %s AND NOT t.relispartition
+    ORDER BY t.relname, i.relname
+"""
+
+# Plans name the partitions they scan; recommendations belong to the parent
+PARTITION_PARENTS_QUERY = """
+    SELECT c.relname AS partition_name, p.relname AS table_name
+    FROM pg_inherits inh
+    JOIN pg_class c ON c.oid = inh.inhrelid
+    JOIN pg_class p ON p.oid = inh.inhparent
+    JOIN pg_namespace n ON n.oid = p.relnamespace
+    WHERE n.nspname = %s AND p.relkind = 'p'
+"""
+
+STATEMENT_STATS_AVAILABLE_QUERY = "SELECT count(*) FROM pg_extension WHERE extname = 'pg_stat_statements'"
+
+STATEMENT_STATS_QUERY = """
+    SELECT query, calls, total_exec_time, mean_exec_time, rows, shared_blks_hit, shared_blks_read
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    ORDER BY total_exec_time DESC
+    LIMIT %s
+"""
+
+BASELINE_VERSION = 1
+
+# Nodes between a Sort and the scan whose order it could take over from an index
+_PASS_THROUGH = {'Append', 'Merge Append', 'Gather', 'Gather Merge', 'Result', 'Materialize', 'Subquery Scan'}
+_SCANS = {'Seq Scan', 'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan'}
+
+# "(alias.)column (::type) <op>"; the right-hand side is a constant, parameter or outer column
+_CONDITION_RE = re.compile(
+    r'\(*(?:"?(?P<qualifier>\w+)"?\.)?"?(?P<column>[a-z_][a-z0-9_]*)"?\)?(?:::[a-z ]+?)?\s*(?P<op><=|>=|=|<|>)(?!>)',
+    re.IGNORECASE
+)
+_SORT_KEY_RE = re.compile(r'^(?:"?(?P<qualifier>\w+)"?\.)?"?(?P<column>[a-z_][a-z0-9_]*)"?(?P<desc>\s+DESC)?', re.IGNORECASE)
+_OUTPUT_RE = re.compile(r'^(?:"?(?P<qualifier>\w+)"?\.)?"?(?P<column>[a-z_][a-z0-9_]*)"?$', re.IGNORECASE)
+_FINGERPRINT_RE = re.compile(r"\$\d+|%s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PREPARE_RE = re.compile(r'^prepare \w+(?: \([^)]*\))? as ', re.IGNORECASE)
+
+
+def fingerprint(sql: str) -> str:
+    """Statement text with parameters and literals blanked, for matching pg_stat_statements entries"""
+    text = _PREPARE_RE.sub('', ' '.join(sql.split()))
+    return _FINGERPRINT_RE.sub('?', text.lower()).rstrip(';').strip()
+
+
+def walk(node: Dict[str, Any], ancestors: Tuple[Dict[str, Any], ...] = ()) -> Iterator[Tuple[Dict[str, Any], Tuple]]:
+    """Every plan node with the chain of nodes above it, nearest last"""
+    yield node, ancestors
+    for child in node.get('Plans', []):
+        yield from walk(child, ancestors + (node,))
+
+
+def plan_shape(node: Dict[str, Any], parents: Dict[str, str]) -> str:
+    """Node types, relations and indexes of a plan tree; partitions count as their parent table"""
+    label = node['Node Type']
+    relation = node.get('Relation Name')
+    if relation:
+        label += f"[{parents.get(relation, relation)}"
+        label += f" using {node['Index Name']}]" if node.get('Index Name') else ']'
+    if node.get('Join Type') and node['Node Type'].endswith(('Join', 'Loop')):
+        label = f"{node['Join Type']} {label}"
+    children = node.get('Plans', [])
+    if node['Node Type'] in ('Append', 'Merge Append'):
+        # Partition pruning changes the child count from one window to the next; the shape does not
+        children = list({plan_shape(child, parents): child for child in children}.values())
+    if children:
+        label += '(' + ', '.join(plan_shape(child, parents) for child in children) + ')'
+    return label
+
+
+def summarize_plan(explained: Dict[str, Any], parents: Dict[str, str]) -> Dict[str, Any]:
+    """Cost, timing, buffer and shape summary of one EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) result"""
+    plan = explained['Plan']
+    nodes = [node for node, _ in walk(plan)]
+    return {
+        'shape': plan_shape(plan, parents),
+        'total_cost': plan.get('Total Cost', 0.0),
+        'planning_ms': round(explained.get('Planning Time', 0.0), 3),
+        'execution_ms': round(explained.get('Execution Time', 0.0), 3),
+        'rows': plan.get('Actual Rows', 0),
+        'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+        'seq_scans': sorted({parents.get(n['Relation Name'], n['Relation Name']) for n in nodes
+                             if n['Node Type'] == 'Seq Scan' and n.get('Relation Name')}),
+        'sorts': sum(1 for n in nodes if n['Node Type'] in ('Sort', 'Incremental Sort'))
+    }
+
+
+def index_covers(index: Dict[str, Any], columns: Sequence[Tuple[str, bool]]) -> bool:
+    """
+    True when a btree index's leading keys serve columns in order, read
+    forwards or backwards; a direction of None (equality or range) matches either
+    """
+    if index['method'] != 'btree' or index['is_partial'] or len(index['columns']) < len(columns):
+        return False
+    keys = list(zip(index['columns'], index['descending']))[:len(columns)]
+    if [name for name, _ in keys] != [name for name, _ in columns]:
+        return False
+    if len(columns) == 1:
+        return True
+    same = all(wanted is None or desc == wanted for (_, desc), (_, wanted) in zip(keys, columns))
+    flipped = all(wanted is None or desc != wanted for (_, desc), (_, wanted) in zip(keys, columns))
+    return same or flipped
+
+
+class IndexCandidate:
+    """An index the captured plans would have used, with the statements it serves"""
+
+    __slots__ = ('table', 'columns', 'include', 'reasons', 'statements', 'benefit_ms')
+
+    def __init__(self, table: str, columns: List[Tuple[str, Optional[bool]]], include: List[str]):
+        """Key columns as (name, descending) pairs, descending None where order does not matter"""
+        self.table = table
+        self.columns = columns
+        self.include = include
+        self.reasons: List[str] = []
+        self.statements: List[str] = []
+        self.benefit_ms = 0.0
+
+    def as_index(self) -> Dict[str, Any]:
+        """The candidate in INDEX_CATALOG_QUERY row form"""
+        return {
+            'method': 'btree',
+            'is_partial': False,
+            'columns': [name for name, _ in self.columns],
+            'descending': [bool(desc) for _, desc in self.columns]
+        }
+
+    @property
+    def name(self) -> str:
+        """Index name in the schema's idx_<table>_<columns> style"""
+        return f"idx_{self.table}_{'_'.join(name for name, _ in self.columns)}"[:63]
+
+    def sql(self, partitioned: bool) -> str:
+        """CREATE INDEX for the candidate; CONCURRENTLY is not available on partitioned parents"""
+        keys = ', '.join(quote_ident(name) + (' DESC' if desc else '') for name, desc in self.columns)
+        include = f" INCLUDE ({', '.join(quote_ident(name) for name in self.include)})" if self.include else ''
+        concurrently = '' if partitioned else ' CONCURRENTLY'
+        return f"CREATE INDEX{concurrently} {quote_ident(self.name)} ON {quote_ident(self.table)} ({keys}){include}"
+
+
+class PlanAdvisor:
+    """
+    Captures plans for the client's known statements and recommends indexes
+    Every read the client and the generated {Model}Query helpers issue is run
+    under EXPLAIN (ANALYZE, BUFFERS) with parameters sampled from the tables.
+    Plans are compared with the saved baseline to flag regressions, scans that
+    filter or sort many rows become index candidates, and the index catalog is
+    checked for indexes that duplicate another's leading keys or are never used
+    """
+
+    def __init__(
+        self,
+        client,
+        workload: Callable[[Callable[[str, str], Any]], List[Tuple[str, Callable[[], Tuple[str, Optional[tuple]]]]]],
+        baseline_path: Optional[str] = None,
+        schema: str = 'public',
+        min_rows: int = 1000,
+        max_include_columns: int = 2,
+        min_unused_bytes: int = 1024 * 1024,
+        regression_ratio: float = 2.0,
+        min_regression_ms: float = 5.0,
+        min_regression_blocks: int = 100,
+        top_statements: int = 20
+    ):
+        """Initialize against a connected PostgreSQLClient; workload(sample) lists (name, build) pairs"""
+        self.client = client
+        self.workload = workload
+        self.baseline_path = baseline_path
+        self.schema = schema
+        self.min_rows = min_rows
+        self.max_include_columns = max_include_columns
+        self.min_unused_bytes = min_unused_bytes
+        self.regression_ratio = regression_ratio
+        self.min_regression_ms = min_regression_ms
+        self.min_regression_blocks = min_regression_blocks
+        self.top_statements = top_statements
+
+    @classmethod
+    def from_config(cls, client, config: Dict[str, Any], workload, schema: str = 'public') -> 'PlanAdvisor':
+        """Build an advisor from client config"""
+        return cls(
+            client,
+            workload,
+            baseline_path=config.get('plan_baseline_path', './plan_baselines.json'),
+            schema=schema,
+            min_rows=config.get('plan_advisor_min_rows', 1000)
+        )
+
+    def _rows(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Run a catalog query and return its rows as dicts"""
+        result = self.client.execute_query(query, params)
+        return [dict(zip(result['columns'], row)) for row in result['rows']]
+
+    def statements(self, schemas: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Client and generated-helper statements bound to sampled values; unbindable ones are marked skipped"""
+        samples: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        def sample(table: str, column: str) -> Any:
+            if table not in samples:
+                rows = self._rows(f"SELECT * FROM {quote_ident(table)} LIMIT 1") if table in schemas else []
+                samples[table] = rows[0] if rows else None
+            if samples[table] is None:
+                raise LookupError(f"no sample row in {table}")
+            return samples[table][column]
+
+        statements = []
+
+        def add(name: str, source: str, build: Callable[[], Tuple[str, Optional[tuple]]]):
+            try:
+                sql, params = build()
+                statements.append({'name': name, 'source': source, 'sql': sql, 'params': params})
+            except LookupError as e:
+                statements.append({'name': name, 'source': source, 'sql': None, 'params': None, 'skipped': str(e)})
+
+        for name, build in self.workload(sample):
+            add(name, 'client', build)
+
+        # Imported here because the generator module imports the client, which imports this module
+        try:
+            from .dataclass_generator import DataclassGenerator
+        except ImportError:
+            from dataclass_generator import DataclassGenerator
+        generator = DataclassGenerator()
+        for table, table_schema in sorted(schemas.items()):
+            model = generator._to_pascal_case(table)
+            for helper, statement in generator.query_helper_statements(table, table_schema).items():
+                def build(table=table, statement=statement):
+                    values = []
+                    for kind, value in statement['params']:
+                        if kind == 'value':
+                            values.append(value)
+                        elif kind == 'array':
+                            values.append([sample(table, value)])
+                        else:
+                            values.append(sample(table, value))
+                    return statement['sql'], tuple(values)
+                add(f"{model}Query.{helper}", 'generated', build)
+        return statements
+
+    def capture(self, statement: Dict[str, Any], parents: Dict[str, str]) -> Dict[str, Any]:
+        """EXPLAIN ANALYZE one statement and summarize its plan"""
+        captured = {'name': statement['name'], 'source': statement['source'], 'fingerprint': None}
+        if statement.get('skipped'):
+            captured.update(status='skipped', error=statement['skipped'])
+            return captured
+
+        captured['fingerprint'] = fingerprint(statement['sql'])
+        try:
+            result = self.client.execute_query(EXPLAIN_PREFIX + statement['sql'], statement['params'])
+            explained = result['rows'][0][0]
+            explained = json.loads(explained) if isinstance(explained, str) else explained
+            captured['plan'] = explained[0]
+            captured.update(summarize_plan(explained[0], parents), status='success')
+        except Exception as e:
+            captured.update(status='failed', error=str(e))
+        return captured
+
+    def load_baseline(self) -> Dict[str, Dict[str, Any]]:
+        """Saved plan summaries by statement name, empty when there is no usable baseline"""
+        if not self.baseline_path or not os.path.exists(self.baseline_path):
+            return {}
+        with open(self.baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        return baseline.get('statements', {}) if baseline.get('version') == BASELINE_VERSION else {}
+
+    def save_baseline(self, statements: Dict[str, Dict[str, Any]]):
+        """Write the baseline atomically, so an interrupted run leaves the previous one intact"""
+        directory = os.path.dirname(os.path.abspath(self.baseline_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.baseline_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': BASELINE_VERSION,
+                'captured_at': datetime.now().isoformat(),
+                'statements': statements
+            }, f, indent=2, sort_keys=True, default=str)
+        os.replace(temporary, self.baseline_path)
+
+    def compare(self, captured: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Regression of a captured plan against its baseline, or None"""
+        if captured['status'] != 'success' or not baseline or baseline.get('fingerprint') != captured['fingerprint']:
+            return None
+
+        reasons = []
+        blocks = captured['shared_hit_blocks'] + captured['shared_read_blocks']
+        baseline_blocks = baseline['shared_hit_blocks'] + baseline['shared_read_blocks']
+        if captured['total_cost'] >= self.regression_ratio * max(baseline['total_cost'], 1.0):
+            reasons.append(f"cost {baseline['total_cost']:.0f} -> {captured['total_cost']:.0f}")
+        if (captured['execution_ms'] >= self.regression_ratio * baseline['execution_ms']
+                and captured['execution_ms'] - baseline['execution_ms'] >= self.min_regression_ms):
+            reasons.append(f"execution {baseline['execution_ms']:.1f} ms -> {captured['execution_ms']:.1f} ms")
+        if blocks >= self.regression_ratio * baseline_blocks and blocks - baseline_blocks >= self.min_regression_blocks:
+            reasons.append(f"buffers {baseline_blocks} -> {blocks} blocks")
+        if not reasons:
+            return None
+
+        return {
+            'name': captured['name'],
+            'plan_changed': captured['shape'] != baseline['shape'],
+            'baseline_shape': baseline['shape'],
+            'shape': captured['shape'],
+            'new_seq_scans': sorted(set(captured['seq_scans']) - set(baseline['seq_scans'])),
+            'reasons': reasons
+        }
+
+    def candidates(
+        self,
+        captured: Dict[str, Any],
+        schemas: Dict[str, Dict[str, Any]],
+        parents: Dict[str, str]
+    ) -> List[IndexCandidate]:
+        """Index candidates for scans in one plan that filter or sort at least min_rows rows"""
+        found = []
+        for node, ancestors in walk(captured['plan']['Plan']):
+            if node['Node Type'] not in _SCANS or not node.get('Relation Name'):
+                continue
+            table = parents.get(node['Relation Name'], node['Relation Name'])
+            if table not in schemas:
+                continue
+            names = {col['name'] for col in schemas[table]['columns']}
+            aliases = {node['Relation Name'], node.get('Alias'), table}
+
+            def own(match) -> bool:
+                return match.group('column') in names and match.group('qualifier') in aliases | {None}
+
+            equality, ranges = [], []
+            for key in ('Index Cond', 'Recheck Cond', 'Filter'):
+                for match in _CONDITION_RE.finditer(node.get(key, '')):
+                    if own(match):
+                        target = equality if match.group('op') == '=' else ranges
+                        if match.group('column') not in target:
+                            target.append(match.group('column'))
+            ranges = [name for name in ranges if name not in equality]
+
+            loops = node.get('Actual Loops', 1) or 1
+            removed = node.get('Rows Removed by Filter', 0) * loops
+            ordering, sorted_rows = [], 0
+            for ancestor in reversed(ancestors):
+                if ancestor['Node Type'] in ('Sort', 'Incremental Sort'):
+                    keys = [_SORT_KEY_RE.match(key.strip()) for key in ancestor.get('Sort Key', [])]
+                    if keys and all(key and own(key) for key in keys):
+                        ordering = [(key.group('column'), bool(key.group('desc'))) for key in keys]
+                        sorted_rows = ancestor.get('Actual Rows', 0) * (ancestor.get('Actual Loops', 1) or 1)
+                    break
+                if ancestor['Node Type'] not in _PASS_THROUGH:
+                    break
+
+            if removed < self.min_rows and sorted_rows < self.min_rows:
+                continue
+            # Equality columns first, then the sort order, then one range column
+            columns = [(name, None) for name in equality]
+            columns += [key for key in ordering if key[0] not in equality]
+            columns += [(name, None) for name in ranges if name not in {key[0] for key in columns}][:1]
+            if not columns:
+                continue
+
+            include = []
+            outputs = [_OUTPUT_RE.match(out.strip()) for out in node.get('Output', [])]
+            if outputs and all(out and own(out) for out in outputs):
+                keys = {name for name, _ in columns}
+                include = [out.group('column') for out in outputs if out.group('column') not in keys]
+                if len(include) > self.max_include_columns:
+                    include = []
+
+            candidate = IndexCandidate(table, columns, include)
+            if removed >= self.min_rows:
+                candidate.reasons.append(f"{node['Node Type']} removed {removed} rows by filter")
+            if sorted_rows >= self.min_rows:
+                candidate.reasons.append(f"sorted {sorted_rows} rows")
+            found.append(candidate)
+        return found
+
+    def recommend(
+        self,
+        captures: List[Dict[str, Any]],
+        schemas: Dict[str, Dict[str, Any]],
+        indexes: List[Dict[str, Any]],
+        parents: Dict[str, str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Missing, redundant and unused index recommendations"""
+        by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for index in indexes:
+            by_table.setdefault(index['tablename'], []).append(index)
+        partitioned = set(parents.values())
+
+        merged: Dict[tuple, IndexCandidate] = {}
+        for captured in captures:
+            if captured['status'] != 'success':
+                continue
+            for candidate in self.candidates(captured, schemas, parents):
+                if any(index_covers(index, candidate.columns) for index in by_table.get(candidate.table, [])):
+                    continue
+                key = (candidate.table, tuple(candidate.columns), tuple(candidate.include))
+                target = merged.setdefault(key, candidate)
+                target.statements.append(captured['name'])
+                target.benefit_ms += captured['execution_ms']
+                target.reasons.extend(r for r in candidate.reasons if r not in target.reasons)
+
+        # A candidate on a prefix of a longer candidate's keys is served by the longer one
+        kept: List[IndexCandidate] = []
+        for candidate in sorted(merged.values(), key=lambda c: len(c.columns), reverse=True):
+            wider = next((k for k in kept if k.table == candidate.table and index_covers(k.as_index(), candidate.columns)), None)
+            if wider is None:
+                kept.append(candidate)
+                continue
+            wider.statements.extend(name for name in candidate.statements if name not in wider.statements)
+            wider.benefit_ms += candidate.benefit_ms
+            wider.reasons.extend(r for r in candidate.reasons if r not in wider.reasons)
+
+        missing = []
+        for candidate in sorted(kept, key=lambda c: c.benefit_ms, reverse=True):
+            # Plain indexes on a prefix of the new keys become redundant once it exists
+            replaces = [
+                index['indexname'] for index in by_table.get(candidate.table, [])
+                if not index['is_unique'] and not index['is_partial'] and len(index['columns']) < len(candidate.columns)
+                and index_covers(candidate.as_index(), list(zip(index['columns'], index['descending'])))
+            ]
+            missing.append({
+                'action': 'create',
+                'table': candidate.table,
+                'index': candidate.name,
+                'columns': [name + (' DESC' if desc else '') for name, desc in candidate.columns],
+                'include': candidate.include,
+                'sql': candidate.sql(candidate.table in partitioned),
+                'statements': candidate.statements,
+                'execution_ms': round(candidate.benefit_ms, 3),
+                'replaces': replaces,
+                'reason': '; '.join(candidate.reasons)
+            })
+
+        redundant = []
+        for table, table_indexes in sorted(by_table.items()):
+            for index in table_indexes:
+                if index['is_unique'] or index['is_primary'] or index['is_partial'] or index['method'] != 'btree':
+                    continue
+                keys = list(zip(index['columns'], index['descending']))
+                for other in table_indexes:
+                    if other is index or not index_covers(other, keys):
+                        continue
+                    # Of two identical plain indexes, keep the one that sorts first
+                    if (len(other['columns']) == len(keys) and not other['is_unique']
+                            and not other['is_primary'] and other['indexname'] > index['indexname']):
+                        continue
+                    redundant.append({
+                        'action': 'drop',
+                        'table': table,
+                        'index': index['indexname'],
+                        'sql': f"DROP INDEX CONCURRENTLY {quote_ident(self.schema)}.{quote_ident(index['indexname'])}"
+                               if table not in partitioned else
+                               f"DROP INDEX {quote_ident(self.schema)}.{quote_ident(index['indexname'])}",
+                        'index_bytes': index['index_bytes'],
+                        'reason': f"leading keys duplicated by {other['indexname']} ({', '.join(other['columns'])})"
+                    })
+                    break
+
+        flagged = {item['index'] for item in redundant}
+        unused = [
+            {
+                'action': 'review',
+                'table': index['tablename'],
+                'index': index['indexname'],
+                'index_bytes': index['index_bytes'],
+                'reason': f"0 scans since statistics were last reset, {index['index_bytes']} bytes"
+            }
+            for index in indexes
+            if index['idx_scan'] == 0 and not index['is_unique'] and not index['is_primary']
+            and index['index_bytes'] >= self.min_unused_bytes and index['indexname'] not in flagged
+        ]
+        return {'missing': missing, 'redundant': redundant, 'unused': unused}
+
+    def statement_stats(self, captures: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Top pg_stat_statements entries matched to captured statements; None without the extension"""
+        try:
+            if not self.client.execute_query(STATEMENT_STATS_AVAILABLE_QUERY)['rows'][0][0]:
+                return None
+            rows = self._rows(STATEMENT_STATS_QUERY, (self.top_statements,))
+        except Exception:
+            # Installed but not in shared_preload_libraries, or not readable by this role
+            return None
+
+        names = {}
+        for captured in captures:
+            if captured['fingerprint']:
+                names.setdefault(captured['fingerprint'], []).append(captured['name'])
+        return [
+            {
+                'query': ' '.join(row['query'].split())[:200],
+                'calls': row['calls'],
+                'total_exec_ms': round(float(row['total_exec_time']), 3),
+                'mean_exec_ms': round(float(row['mean_exec_time']), 3),
+                'rows': row['rows'],
+                'shared_blocks': row['shared_blks_hit'] + row['shared_blks_read'],
+                'statements': names.get(fingerprint(row['query']), [])
+            }
+            for row in rows
+            # EXPLAIN runs, including this advisor's own, are not part of the workload
+            if not row['query'].lstrip().lower().startswith('explain')
+        ]
+
+    def run(self, update_baseline: bool = True, accept_regressions: bool = False) -> Dict[str, Any]:
+        """Capture every plan, compare with the baseline, recommend indexes and save the new baseline"""
+        started = time.monotonic()
+        schemas = self.client.introspect_schema(self.schema)
+        parents = {row['partition_name']: row['table_name'] for row in self._rows(PARTITION_PARENTS_QUERY, (self.schema,))}
+        indexes = self._rows(INDEX_CATALOG_QUERY, (self.schema,))
+        baseline = self.load_baseline()
+
+        captures = [self.capture(statement, parents) for statement in self.statements(schemas)]
+        regressions = [r for r in (self.compare(c, baseline.get(c['name'])) for c in captures) if r]
+        recommendations = self.recommend(captures, schemas, indexes, parents)
+        top_statements = self.statement_stats(captures)
+
+        if update_baseline and self.baseline_path:
+            regressed = {r['name'] for r in regressions}
+            updated = dict(baseline)
+            for captured in captures:
+                # A regressed plan keeps its old baseline, so it stays flagged until accepted
+                if captured['status'] == 'success' and (accept_regressions or captured['name'] not in regressed):
+                    updated[captured['name']] = {k: v for k, v in captured.items() if k not in ('plan', 'status')}
+            self.save_baseline(updated)
+
+        for captured in captures:
+            captured.pop('plan', None)
+        counts = {status: sum(1 for c in captures if c['status'] == status) for status in ('success', 'failed', 'skipped')}
+        return {
+            'statements': captures,
+            'regressions': regressions,
+            'recommendations': recommendations,
+            'top_statements': top_statements,
+            'summary': {
+                'captured': counts['success'],
+                'failed': counts['failed'],
+                'skipped': counts['skipped'],
+                'regressions': len(regressions),
+                'missing_indexes': len(recommendations['missing']),
+                'redundant_indexes': len(recommendations['redundant']),
+                'unused_indexes': len(recommendations['unused']),
+                'baseline': self.baseline_path if update_baseline else None,
+                'elapsed_seconds': round(time.monotonic() - started, 3)
+            },
+            'timestamp': datetime.now().isoformat()
+        }
@@ -3,10 +3,358 @@ PostgreSQL Client for ScrollVerse
 Real-time database interaction with 528Hz resonance alignment
 """
 
+import io
 import os
 import json
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import itertools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Any, Callable, Iterator
+
+try:
+    from .arrays import arrays_from_rows, copy_query, decode_copy, import_numpy, probe_query
+    from .bulk_writer import ResonanceBulkWriter
+    from .connection_pool import ConnectionPool
+    from .drivers import Driver, get_driver, to_numbered_placeholders
+    from .evolution import EvolutionReplayer
+    from .export import ShardExporter
+    from .instrumentation import QueryInstrumentation
+    from .maintenance import MaintenancePlanner, MaintenanceScheduler
+    from .partitions import PartitionManager, time_range_query
+    from .plan_advisor import PlanAdvisor
+    from .replicas import ReplicaRouter, parse_endpoints
+    from .resonance_scoring import summarize_layers
+    from .result_cache import ChangeNotifier, FakeNotifier, PostgresNotifier, ResultCache, written_table
+    from .rollups import (
+        REFRESH_ROLLUPS_QUERY,
+        RESONANCE_WINDOW_QUERY,
+        ROLLUP_BOUND_QUERY,
+        choose_resolution,
+        shape_window,
+        window_params
+    )
+    from .schema_introspection import SCHEMA_INTROSPECTION_QUERY, shape_schema
+    from .statement_cache import (
+        StatementCache,
+        is_preparable,
+        is_schema_change,
+        is_unpreparable_error,
+        next_statement_name,
+        normalize_sql
+    )
+    from .write_behind import InteractionWriteBehind
+except ImportError:
+    from arrays import arrays_from_rows, copy_query, decode_copy, import_numpy, probe_query
+    from bulk_writer import ResonanceBulkWriter
+    from connection_pool import ConnectionPool
+    from drivers import Driver, get_driver, to_numbered_placeholders
+    from evolution import EvolutionReplayer
+    from export import ShardExporter
+    from instrumentation import QueryInstrumentation
+    from maintenance import MaintenancePlanner, MaintenanceScheduler
+    from partitions import PartitionManager, time_range_query
+    from plan_advisor import PlanAdvisor
+    from replicas import ReplicaRouter, parse_endpoints
+    from resonance_scoring import summarize_layers
+    from result_cache import ChangeNotifier, FakeNotifier, PostgresNotifier, ResultCache, written_table
+    from rollups import (
+        REFRESH_ROLLUPS_QUERY,
+        RESONANCE_WINDOW_QUERY,
+        ROLLUP_BOUND_QUERY,
+        choose_resolution,
+        shape_window,
+        window_params
+    )
+    from schema_introspection import SCHEMA_INTROSPECTION_QUERY, shape_schema
+    from statement_cache import (
+        StatementCache,
+        is_preparable,
+        is_schema_change,
+        is_unpreparable_error,
+        next_statement_name,
+        normalize_sql
+    )
+    from write_behind import InteractionWriteBehind
+
+
+LIST_TABLES_QUERY = """
+    SELECT 
+        table_schema,
+        table_name,
+        pg_size_pretty(pg_total_relation_size(quote_ident(table_schema) || '.' || quote_ident(table_name))) AS size
+    FROM information_schema.tables
+    WHERE table_schema = %s
+    ORDER BY table_name
+"""
+
+TABLE_BLOAT_QUERY = """
+    SELECT 
+        schemaname,
+        tablename,
+        pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) AS size,
+        n_dead_tup,
+        n_live_tup,
+        ROUND(100.0 * n_dead_tup / NULLIF(n_live_tup + n_dead_tup, 0), 2) AS bloat_percent
+    FROM pg_stat_user_tables
+    WHERE n_dead_tup > 0
+    ORDER BY n_dead_tup DESC
+    LIMIT 10
+"""
+
+AUTOVACUUM_SETTINGS_QUERY = """
+    SELECT 
+        name,
+        setting,
+        unit,
+        category
+    FROM pg_settings
+    WHERE name LIKE 'autovacuum%'
+    ORDER BY name
+"""
+
+NFT_BY_TOKEN_QUERY = "SELECT * FROM nft_metadata WHERE token_id = %s"
+RECENT_NFTS_QUERY = "SELECT * FROM nft_metadata ORDER BY created_at DESC LIMIT 10"
+FREQUENCY_BY_VALUE_QUERY = "SELECT * FROM akashic_frequencies WHERE frequency = %s"
+FREQUENCIES_BY_RESONANCE_QUERY = "SELECT * FROM akashic_frequencies ORDER BY resonance DESC"
+ALL_NFTS_QUERY = "SELECT * FROM nft_metadata ORDER BY id"
+RESONANCE_DATA_QUERY = "SELECT * FROM resonance_data ORDER BY timestamp"
+RESONANCE_DATA_BY_NFT_QUERY = "SELECT * FROM resonance_data WHERE nft_id = %s ORDER BY timestamp"
+USER_INTERACTIONS_QUERY = "SELECT * FROM user_interactions ORDER BY timestamp"
+USER_INTERACTIONS_BY_USER_QUERY = "SELECT * FROM user_interactions WHERE user_address = %s ORDER BY timestamp"
+
+NFT_RESONANCE_QUERY = """
+    SELECT 
+        nm.token_id,
+        nm.name,
+        nm.frequency as nft_frequency,
+        af.frequency as akashic_frequency,
+        af.resonance,
+        fl.layer_depth
+    FROM nft_metadata nm
+    JOIN frequency_layers fl ON nm.id = fl.nft_id
+    JOIN akashic_frequencies af ON fl.frequency_id = af.id
+    WHERE nm.token_id = %s
+"""
+
+NFT_RESONANCE_BATCH_QUERY = """
+    SELECT 
+        nm.token_id,
+        nm.frequency as nft_frequency,
+        nm.resonance_level as base_resonance,
+        af.frequency as akashic_frequency,
+        af.resonance
+    FROM nft_metadata nm
+    LEFT JOIN (frequency_layers fl
+        JOIN akashic_frequencies af ON fl.frequency_id = af.id) ON nm.id = fl.nft_id
+    WHERE nm.token_id = ANY(%s)
+"""
+
+RESONANCE_SCORES_QUERY = """
+    SELECT * FROM calculate_resonance_scores(
+        ARRAY(SELECT id FROM nft_metadata WHERE token_id = ANY(%s))
+    )
+"""
+
+NFT_RESONANCE_TABLES = ('nft_metadata', 'frequency_layers', 'akashic_frequencies')
+
+NFT_FREQUENCIES_BY_TOKEN_QUERY = "SELECT * FROM nft_with_frequencies_mat WHERE token_id = %s"
+ALL_NFT_FREQUENCIES_QUERY = "SELECT * FROM nft_with_frequencies_mat ORDER BY id"
+REFRESH_NFT_FREQUENCIES_QUERY = "SELECT * FROM refresh_nft_with_frequencies(%s)"
+
+NFT_FREQUENCIES_LAG_QUERY = """
+    SELECT
+        COUNT(*) AS pending,
+        MIN(queued_at) AS oldest_queued_at,
+        COALESCE(EXTRACT(EPOCH FROM LOCALTIMESTAMP - MIN(queued_at)), 0) AS lag_seconds
+    FROM nft_frequencies_dirty
+"""
+
+
+def load_env_config() -> Dict[str, Any]:
+    """Load configuration from environment variables"""
+    return {
+        'host': os.getenv('POSTGRES_HOST', 'localhost'),
+        'port': int(os.getenv('POSTGRES_PORT', 5432)),
+        'database': os.getenv('POSTGRES_DATABASE', 'scrollverse'),
+        'user': os.getenv('POSTGRES_USER', 'postgres'),
+        'password': os.getenv('POSTGRES_PASSWORD', ''),
+        'ssl': os.getenv('POSTGRES_SSL', 'false').lower() == 'true',
+        'driver': os.getenv('POSTGRES_DRIVER', 'psycopg2'),
+        'min_connections': int(os.getenv('POSTGRES_MIN_CONNECTIONS', 1)),
+        'max_connections': int(os.getenv('POSTGRES_MAX_CONNECTIONS', 10)),
+        'idle_timeout': int(os.getenv('POSTGRES_IDLE_TIMEOUT', 30000)),
+        'checkout_timeout': int(os.getenv('POSTGRES_CHECKOUT_TIMEOUT', 30000)),
+        'fetch_batch_size': int(os.getenv('POSTGRES_FETCH_BATCH_SIZE', 2000)),
+        'statement_cache_size': int(os.getenv('POSTGRES_STATEMENT_CACHE_SIZE', 100)),
+        'result_cache_size': int(os.getenv('POSTGRES_RESULT_CACHE_SIZE', 1024)),
+        'result_cache_ttl': int(os.getenv('POSTGRES_RESULT_CACHE_TTL', 60000)),
+        'slow_query_threshold': int(os.getenv('POSTGRES_SLOW_QUERY_MS', 500)),
+        'metrics_sample_rate': float(os.getenv('POSTGRES_METRICS_SAMPLE_RATE', 1.0)),
+        'maintenance_concurrency': int(os.getenv('POSTGRES_MAINTENANCE_CONCURRENCY', 2)),
+        'maintenance_time_budget': int(os.getenv('POSTGRES_MAINTENANCE_TIME_BUDGET', 600000)),
+        'partition_interval': os.getenv('POSTGRES_PARTITION_INTERVAL', 'month'),
+        'partition_premake': int(os.getenv('POSTGRES_PARTITION_PREMAKE', 3)),
+        'partition_retention': int(os.getenv('POSTGRES_PARTITION_RETENTION', 0)),
+        'spill_dir': os.getenv('POSTGRES_SPILL_DIR', './spill'),
+        'plan_baseline_path': os.getenv('POSTGRES_PLAN_BASELINE', './plan_baselines.json'),
+        'evolution_snapshot_interval': int(os.getenv('POSTGRES_EVOLUTION_SNAPSHOT_INTERVAL', 100)),
+        'export_dir': os.getenv('POSTGRES_EXPORT_DIR', './exports'),
+        'export_workers': int(os.getenv('POSTGRES_EXPORT_WORKERS', 0)),
+        'export_shard_rows': int(os.getenv('POSTGRES_EXPORT_SHARD_ROWS', 1000000)),
+        'replicas': parse_endpoints(os.getenv('POSTGRES_REPLICAS', ''), int(os.getenv('POSTGRES_PORT', 5432))),
+        'replica_max_lag': int(os.getenv('POSTGRES_REPLICA_MAX_LAG', 5000)),
+        'replica_check_interval': int(os.getenv('POSTGRES_REPLICA_CHECK_INTERVAL', 1000)),
+        'frequency': int(os.getenv('SCROLLVERSE_FREQUENCY', 528))
+    }
+
+
+def config_from_argv(argv: List[str]) -> Dict[str, Any]:
+    """Environment configuration, with the driver overridden by a --driver NAME argument"""
+    config = load_env_config()
+    if '--driver' in argv[:-1]:
+        config['driver'] = argv[argv.index('--driver') + 1]
+    return config
+
+
+_cursor_ids = itertools.count(1)
+
+
+def row_converter(model: Optional[type]) -> Optional[Callable[[tuple], Any]]:
+    """Pick the tuple-to-object constructor for a generated model class"""
+    if model is None:
+        return None
+    from_row = getattr(model, 'from_row', None)
+    return from_row if from_row else (lambda row: model(*row))
+
+
+def rows_as_dicts(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert an execute_query result into a list of column dicts"""
+    columns = result['columns']
+    return [dict(zip(columns, row)) for row in result['rows']]
+
+
+def shape_tables(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Shape information_schema rows for list_tables"""
+    return [
+        {'schema': row['table_schema'], 'name': row['table_name'], 'size': row['size']}
+        for row in rows_as_dicts(result)
+    ]
+
+
+def shape_table_bloat(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Shape pg_stat_user_tables rows for analyze_table_bloat"""
+    return [
+        {
+            'schema': row['schemaname'],
+            'table': row['tablename'],
+            'size': row['size'],
+            'dead_tuples': row['n_dead_tup'],
+            'bloat_percent': float(row['bloat_percent'] or 0),
+            'recommendation': 'VACUUM FULL' if (row['bloat_percent'] or 0) >= 20 else 'VACUUM ANALYZE'
+        }
+        for row in rows_as_dicts(result)
+    ]
+
+
+def shape_autovacuum_settings(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape pg_settings rows for get_autovacuum_settings"""
+    settings = {
+        row['name']: f"{row['setting']}{row['unit'] or ''}"
+        for row in rows_as_dicts(result)
+    }
+    settings['optimized_for'] = 'ScrollVerse Operations'
+    return settings
+
+
+def shape_resonance_validation(token_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the validate_nft_resonance report from its layer join rows"""
+    layers = rows_as_dicts(result)
+    frequency_match = any(row['nft_frequency'] == row['akashic_frequency'] for row in layers)
+    
+    return {
+        'token_id': token_id,
+        'aligned': bool(layers) and frequency_match,
+        'resonance_level': float(max((row['resonance'] for row in layers), default=0)),
+        'frequency_match': frequency_match,
+        'akashic_layers': len(layers),
+        'validated_at': datetime.now().isoformat()
+    }
+
+
+def shape_resonance_batch(token_ids: List[str], result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Build per-token validate_nft_resonance reports, plus resonance_score, from the batch join"""
+    validated_at = datetime.now().isoformat()
+    
+    return {
+        token_id: {
+            'token_id': token_id,
+            'aligned': summary['akashic_layers'] > 0 and summary['frequency_match'],
+            'resonance_level': float(summary['max_resonance'] or 0),
+            'frequency_match': summary['frequency_match'],
+            'akashic_layers': summary['akashic_layers'],
+            'resonance_score': summary['resonance_score'],
+            'found': summary['found'],
+            'validated_at': validated_at
+        }
+        for token_id, summary in summarize_layers(rows_as_dicts(result), token_ids).items()
+    }
+
+
+def shape_nft_frequencies_lag(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape the dirty-queue summary for get_nft_frequencies_lag"""
+    row = rows_as_dicts(result)[0]
+    
+    return {
+        'pending': row['pending'],
+        'lag_seconds': float(row['lag_seconds']),
+        'oldest_queued_at': row['oldest_queued_at'].isoformat() if row['oldest_queued_at'] else None
+    }
+
+
+def plan_workload(sample: Callable[[str, str], Any]) -> List[tuple]:
+    """
+    Reads the client issues, as (method, build) pairs for the plan advisor;
+    build() binds parameters from sample(table, column). Unfiltered full-table
+    streams are left out, since EXPLAIN ANALYZE would read every row
+    """
+    def window(table: str):
+        end = sample(table, 'timestamp')
+        return sample(table, 'nft_id'), end - timedelta(days=1), end
+    
+    def resonance_window():
+        nft_id, start, end = window('resonance_data')
+        return RESONANCE_WINDOW_QUERY, window_params(nft_id, start, end, choose_resolution(start, end, 500)[0])
+    
+    def resonance_range():
+        nft_id, start, end = window('resonance_data')
+        return time_range_query('resonance_data', start, end, nft_id=nft_id)
+    
+    def interactions_range():
+        end = sample('user_interactions', 'timestamp')
+        return time_range_query('user_interactions', end - timedelta(days=1), end,
+                                user_address=sample('user_interactions', 'user_address'))
+    
+    return [
+        ('query_nft_metadata', lambda: (NFT_BY_TOKEN_QUERY, (sample('nft_metadata', 'token_id'),))),
+        ('query_nft_metadata_recent', lambda: (RECENT_NFTS_QUERY, None)),
+        ('query_akashic_frequencies', lambda: (FREQUENCY_BY_VALUE_QUERY, (sample('akashic_frequencies', 'frequency'),))),
+        ('query_akashic_frequencies_all', lambda: (FREQUENCIES_BY_RESONANCE_QUERY, None)),
+        ('validate_nft_resonance', lambda: (NFT_RESONANCE_QUERY, (sample('nft_metadata', 'token_id'),))),
+        ('validate_nft_resonance_batch', lambda: (NFT_RESONANCE_BATCH_QUERY, ([sample('nft_metadata', 'token_id')],))),
+        ('calculate_resonance_scores', lambda: (RESONANCE_SCORES_QUERY, ([sample('nft_metadata', 'token_id')],))),
+        ('query_nft_with_frequencies', lambda: (
+            NFT_FREQUENCIES_BY_TOKEN_QUERY, (sample('nft_with_frequencies_mat', 'token_id'),))),
+        ('query_nft_with_frequencies_all', lambda: (ALL_NFT_FREQUENCIES_QUERY, None)),
+        ('query_resonance_window', resonance_window),
+        ('iter_resonance_data', lambda: (RESONANCE_DATA_BY_NFT_QUERY, (sample('resonance_data', 'nft_id'),))),
+        ('iter_resonance_data_range', resonance_range),
+        ('iter_user_interactions', lambda: (
+            USER_INTERACTIONS_BY_USER_QUERY, (sample('user_interactions', 'user_address'),))),
+        ('iter_user_interactions_range', interactions_range)
+    ]
 
 
 class PostgreSQLClient:
@@ -15,244 +363,755 @@ class PostgreSQLClient:
     Provides real-time data insights and NFT metadata validation
     """
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        driver: Optional[Driver] = None,
+        notifier: Optional[ChangeNotifier] = None
+    ):
         """Initialize PostgreSQL client with configuration"""
         self.config = config or self._load_env_config()
         self.frequency = self.config.get('frequency', 528)
-        self.connection = None
+        self.driver = driver or get_driver(self.config.get('driver', 'psycopg2'))
+        self.pool: Optional[ConnectionPool] = None
+        self.router: Optional[ReplicaRouter] = None
         self.resonance_field = 'active'
+        self.statement_cache_size = self.config.get('statement_cache_size', 100)
+        self._statement_generation = 0
+        self._unpreparable = set()
+        self._statement_lock = threading.Lock()
+        self._statement_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'fallbacks': 0}
+        self.notifier = notifier
+        self.result_cache: Optional[ResultCache] = None
+        if self.config.get('result_cache_size', 1024):
+            self.result_cache = ResultCache(
+                max_entries=self.config.get('result_cache_size', 1024),
+                ttl=self.config.get('result_cache_ttl', 60000) / 1000.0
+            )
+        self.instrumentation = QueryInstrumentation.from_config(self.config)
         
     def _load_env_config(self) -> Dict[str, Any]:
         """Load configuration from environment variables"""
-        return {
-            'host': os.getenv('POSTGRES_HOST', 'localhost'),
-            'port': int(os.getenv('POSTGRES_PORT', 5432)),
-            'database': os.getenv('POSTGRES_DATABASE', 'scrollverse'),
-            'user': os.getenv('POSTGRES_USER', 'postgres'),
-            'password': os.getenv('POSTGRES_PASSWORD', ''),
-            'ssl': os.getenv('POSTGRES_SSL', 'false').lower() == 'true',
-            'frequency': int(os.getenv('SCROLLVERSE_FREQUENCY', 528))
-        }
+        return load_env_config()
     
     def connect(self) -> bool:
-        """Establish connection to PostgreSQL database"""
+        """Open the connection pool to PostgreSQL"""
         print(f"🔮 Connecting to PostgreSQL at {self.config['host']}:{self.config['port']}...")
-        # In production, use psycopg2 or asyncpg for actual connection
-        # import psycopg2
-        # self.connection = psycopg2.connect(**self.config)
-        
-        self.connection = {
-            'connected': True,
-            'timestamp': datetime.now().isoformat(),
-            'database': self.config['database']
-        }
-        print(f"✓ Connected to {self.config['database']} at {self.frequency}Hz")
+        
+        self.pool = ConnectionPool.from_config(self.config, self.driver)
+        self.pool.open()
+        
+        if self.config.get('replicas'):
+            self.router = ReplicaRouter.from_config(self.config, self.driver, self.pool)
+            self.router.open()
+            print(f"🪞 Routing read-only queries across {len(self.router.replicas)} replicas")
+        
+        if self.result_cache is not None:
+            if self.notifier is None:
+                self.notifier = PostgresNotifier(self.driver, self.config) if self.driver.name == 'psycopg2' else FakeNotifier()
+            self.notifier.start(self.result_cache.invalidate_table)
+        
+        print(f"✓ Connected to {self.config['database']} at {self.frequency}Hz "
+              f"(pool {self.pool.min_size}-{self.pool.max_size}, driver: {self.driver.name})")
         return True
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> Dict[str, Any]:
-        """Execute SQL query with parameters"""
-        if not self.connection:
+    @contextmanager
+    def _connection(self, read_only: bool = False) -> Iterator[tuple]:
+        """Check out (pool, connection); read-only work may go to a replica, everything else to the primary"""
+        if self.router is None:
+            with self.pool.connection() as conn:
+                yield self.pool, conn
+        else:
+            with self.router.connection(read_only) as (pool, conn):
+                yield pool, conn
+    
+    def execute_query(self, query: str, params: Optional[tuple] = None, read_only: bool = False) -> Dict[str, Any]:
+        """Execute SQL query with parameters on a pooled connection, on a replica if read_only"""
+        if not self.pool:
             raise Exception("Not connected to database")
         
         print(f"⚡ Executing query at {self.frequency}Hz...")
-        # In production: cursor.execute(query, params)
+        
+        executed_at = datetime.now()
+        started = time.perf_counter()
+        pool_wait, rowcount, error = 0.0, 0, None
+        try:
+            with self._connection(read_only) as (pool, conn):
+                pool_wait = time.perf_counter() - started
+                cursor = conn.cursor()
+                try:
+                    if self.statement_cache_size and is_preparable(query):
+                        self._execute_prepared(pool, conn, cursor, query, params)
+                    else:
+                        cursor.execute(query, params)
+                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                    rows = cursor.fetchall() if cursor.description else []
+                    rowcount = cursor.rowcount
+                finally:
+                    cursor.close()
+                conn.commit()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.instrumentation.record(query, elapsed - pool_wait, rowcount, pool_wait, error)
+        
+        if is_schema_change(query):
+            self.invalidate_statement_cache()
+            if self.result_cache is not None:
+                self.result_cache.clear()
+        elif self.result_cache is not None and written_table(query):
+            # Our own committed writes invalidate immediately, ahead of the NOTIFY round trip
+            self.result_cache.invalidate_table(written_table(query))
         
         return {
             'query': query,
             'status': 'success',
-            'executed_at': datetime.now().isoformat(),
+            'columns': columns,
+            'rows': rows,
+            'rowcount': rowcount,
+            'executed_at': executed_at.isoformat(),
+            'duration_ms': round((elapsed - pool_wait) * 1000.0, 3),
             'resonance_frequency': f"{self.frequency}Hz"
         }
     
+    def cached_query(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        tables: tuple = (),
+        ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Read-through execute_query on a replica, invalidated when any of tables changes"""
+        key = (normalize_sql(query), params)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        if self.result_cache is None or key is None:
+            return self.execute_query(query, params, read_only=True)
+        
+        result = self.result_cache.get(key)
+        if result is not None:
+            return result
+        
+        # Versions are read before the query so a change committed meanwhile leaves the entry stale
+        versions = self.result_cache.versions_for(tables)
+        if self.router is None:
+            result = self.execute_query(query, params, read_only=True)
+        else:
+            # A shared entry must not be filled from a replica behind any write this client made
+            with self.router.reads_after(self.router.last_write_at):
+                result = self.execute_query(query, params, read_only=True)
+        self.result_cache.put(key, result, versions, ttl)
+        return result
+    
+    def get_result_cache_stats(self) -> Dict[str, Any]:
+        """Get read-through result cache counters"""
+        if self.result_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.result_cache.stats()}
+    
+    def _execute_prepared(self, pool: ConnectionPool, conn, cursor, query: str, params: Optional[tuple]):
+        """Execute through this connection's prepared statement cache"""
+        key = normalize_sql(query)
+        if key in self._unpreparable:
+            cursor.execute(query, params)
+            return
+        
+        state = pool.connection_state(conn)
+        cache = state.get('statements')
+        if cache is None or cache.generation != self._statement_generation:
+            if cache is not None and len(cache):
+                cursor.execute("DEALLOCATE ALL")
+            cache = state['statements'] = StatementCache(self.statement_cache_size, self._statement_generation)
+        
+        name = cache.get(key)
+        if name is None:
+            name = next_statement_name()
+            try:
+                # The original text: the key is only for lookups
+                cursor.execute(f"PREPARE {name} AS {to_numbered_placeholders(query)}")
+            except Exception as e:
+                if not is_unpreparable_error(e):
+                    # Not the statement's fault: release() rolls the connection back, or drops it if dead
+                    raise
+                # Statements whose parameter types cannot be inferred run unprepared from now on
+                conn.rollback()
+                with self._statement_lock:
+                    self._unpreparable.add(key)
+                    self._statement_stats['fallbacks'] += 1
+                cursor.execute(query, params)
+                return
+            evicted = cache.put(key, name)
+            if evicted:
+                cursor.execute(f"DEALLOCATE {evicted}")
+            with self._statement_lock:
+                self._statement_stats['misses'] += 1
+                self._statement_stats['evictions'] += 1 if evicted else 0
+        else:
+            with self._statement_lock:
+                self._statement_stats['hits'] += 1
+        
+        if params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+    
+    def invalidate_statement_cache(self):
+        """Drop every connection's prepared statements, e.g. after a schema change"""
+        with self._statement_lock:
+            self._statement_generation += 1
+            self._unpreparable.clear()
+            self._statement_stats['invalidations'] += 1
+    
+    def get_statement_cache_stats(self) -> Dict[str, Any]:
+        """Get prepared statement cache hit/miss counters"""
+        with self._statement_lock:
+            lookups = self._statement_stats['hits'] + self._statement_stats['misses']
+            return {
+                **self._statement_stats,
+                'capacity': self.statement_cache_size,
+                'hit_ratio': self._statement_stats['hits'] / lookups if lookups else 0.0
+            }
+    
+    def get_query_stats(self) -> Dict[str, Any]:
+        """Get per-statement latency histograms, error counts and the slow-query log"""
+        return self.instrumentation.snapshot()
+    
+    def export_metrics(self, format: str = 'prometheus') -> str:
+        """Export query metrics as Prometheus text or JSON"""
+        if format == 'prometheus':
+            return self.instrumentation.to_prometheus()
+        if format == 'json':
+            return self.instrumentation.to_json()
+        raise ValueError(f"Unknown metrics format '{format}' (available: json, prometheus)")
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool occupancy and wait-time statistics"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        return self.pool.stats()
+    
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """Get per-endpoint health, replay lag, in-flight load and latency"""
+        if self.router is None:
+            return {'enabled': False}
+        return self.router.stats()
+    
     def list_tables(self, schema: str = 'public') -> List[Dict[str, Any]]:
         """List all tables in specified schema"""
-        query = """
-            SELECT 
-                table_schema,
-                table_name,
-                pg_size_pretty(pg_total_relation_size(quote_ident(table_schema) || '.' || quote_ident(table_name))) AS size
-            FROM information_schema.tables
-            WHERE table_schema = %s
-            ORDER BY table_name
-        """
-        
-        result = self.execute_query(query, (schema,))
+        result = self.execute_query(LIST_TABLES_QUERY, (schema,), read_only=True)
         print(f"📊 Listed tables in schema '{schema}'")
         
-        return [
-            {'schema': schema, 'name': 'nft_metadata', 'size': '2.5 MB'},
-            {'schema': schema, 'name': 'akashic_frequencies', 'size': '8.3 MB'},
-            {'schema': schema, 'name': 'frequency_layers', 'size': '3.8 MB'}
-        ]
+        return shape_tables(result)
+    
+    def introspect_schema(self, schema: str = 'public') -> Dict[str, Dict[str, Any]]:
+        """Read every table's columns, keys and foreign keys in one query"""
+        result = self.execute_query(SCHEMA_INTROSPECTION_QUERY, (schema,), read_only=True)
+        schemas = shape_schema(result)
+        print(f"🧬 Introspected {len(schemas)} tables in schema '{schema}'")
+        
+        return schemas
     
     def analyze_table_bloat(self) -> List[Dict[str, Any]]:
         """Analyze table bloat for optimization"""
-        query = """
-            SELECT 
-                schemaname,
-                tablename,
-                pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) AS size,
-                n_dead_tup,
-                n_live_tup,
-                ROUND(100.0 * n_dead_tup / NULLIF(n_live_tup + n_dead_tup, 0), 2) AS bloat_percent
-            FROM pg_stat_user_tables
-            WHERE n_dead_tup > 0
-            ORDER BY n_dead_tup DESC
-            LIMIT 10
-        """
-        
-        result = self.execute_query(query)
+        result = self.execute_query(TABLE_BLOAT_QUERY)
         print("🔍 Analyzed table bloat")
         
-        return [
-            {
-                'schema': 'public',
-                'table': 'nft_metadata',
-                'size': '2.5 MB',
-                'dead_tuples': 1250,
-                'bloat_percent': 32.0,
-                'recommendation': 'VACUUM FULL'
-            }
-        ]
+        return shape_table_bloat(result)
     
     def get_autovacuum_settings(self) -> Dict[str, Any]:
         """Get current autovacuum configuration"""
-        query = """
-            SELECT 
-                name,
-                setting,
-                unit,
-                category
-            FROM pg_settings
-            WHERE name LIKE 'autovacuum%'
-            ORDER BY name
-        """
-        
-        result = self.execute_query(query)
+        result = self.execute_query(AUTOVACUUM_SETTINGS_QUERY)
         print("🔧 Retrieved autovacuum settings")
         
-        return {
-            'autovacuum': 'on',
-            'autovacuum_naptime': '1min',
-            'autovacuum_vacuum_threshold': 50,
-            'autovacuum_analyze_threshold': 50,
-            'optimized_for': 'ScrollVerse Operations'
-        }
+        return shape_autovacuum_settings(result)
     
     def query_nft_metadata(self, token_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Query NFT metadata with frequency alignment"""
         if token_id:
-            query = "SELECT * FROM nft_metadata WHERE token_id = %s"
-            params = (token_id,)
+            query, params = NFT_BY_TOKEN_QUERY, (token_id,)
         else:
-            query = "SELECT * FROM nft_metadata ORDER BY created_at DESC LIMIT 10"
-            params = None
+            query, params = RECENT_NFTS_QUERY, None
         
-        result = self.execute_query(query, params)
+        result = self.execute_query(query, params, read_only=True)
         print(f"🎨 Queried NFT metadata (resonance: {self.frequency}Hz)")
         
-        return [
-            {
-                'id': 1,
-                'token_id': 'NFT-001',
-                'name': 'Sovereign Genesis',
-                'frequency': 528,
-                'metadata_uri': 'ipfs://QmExample1'
-            }
-        ]
+        return rows_as_dicts(result)
     
     def query_akashic_frequencies(self, frequency: Optional[int] = None) -> List[Dict[str, Any]]:
         """Query Akashic frequency data"""
         if frequency:
-            query = "SELECT * FROM akashic_frequencies WHERE frequency = %s"
-            params = (frequency,)
+            query, params = FREQUENCY_BY_VALUE_QUERY, (frequency,)
         else:
-            query = "SELECT * FROM akashic_frequencies ORDER BY resonance DESC"
-            params = None
+            query, params = FREQUENCIES_BY_RESONANCE_QUERY, None
         
-        result = self.execute_query(query, params)
+        result = self.cached_query(query, params, tables=('akashic_frequencies',))
         print(f"🌟 Queried Akashic frequencies")
         
-        return [
-            {
-                'id': 1,
-                'frequency': 528,
-                'type': 'Miracle Tone',
-                'resonance': 1.0,
-                'description': 'DNA Repair & Transformation'
-            },
-            {
-                'id': 2,
-                'frequency': 963,
-                'type': 'Divine Connection',
-                'resonance': 0.95,
-                'description': 'Pineal Gland Activation'
-            }
-        ]
+        return rows_as_dicts(result)
     
     def validate_nft_resonance(self, token_id: str) -> Dict[str, Any]:
         """Validate NFT resonance alignment with Akashic frequencies"""
-        query = """
-            SELECT 
-                nm.token_id,
-                nm.name,
-                nm.frequency as nft_frequency,
-                af.frequency as akashic_frequency,
-                af.resonance,
-                fl.layer_depth
-            FROM nft_metadata nm
-            JOIN frequency_layers fl ON nm.id = fl.nft_id
-            JOIN akashic_frequencies af ON fl.frequency_id = af.id
-            WHERE nm.token_id = %s
-        """
-        
-        result = self.execute_query(query, (token_id,))
-        
-        validation = {
-            'token_id': token_id,
-            'aligned': True,
-            'resonance_level': 1.0,
-            'frequency_match': True,
-            'akashic_layers': 3,
-            'validated_at': datetime.now().isoformat()
-        }
+        result = self.cached_query(NFT_RESONANCE_QUERY, (token_id,), tables=NFT_RESONANCE_TABLES)
+        validation = shape_resonance_validation(token_id, result)
         
         print(f"✓ Validated NFT resonance for {token_id}")
         return validation
     
-    def optimize_database(self) -> Dict[str, Any]:
-        """Run database optimization tasks"""
-        print("⚙️  Running database optimization...")
+    def validate_nft_resonance_batch(self, token_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Validate many NFTs with one set-based join, scoring them client-side in bulk"""
+        token_ids = list(token_ids)
+        result = self.execute_query(NFT_RESONANCE_BATCH_QUERY, (token_ids,), read_only=True)
+        validations = shape_resonance_batch(token_ids, result)
+        
+        print(f"✓ Validated NFT resonance for {len(validations)} tokens")
+        return validations
+    
+    def calculate_resonance_scores(self, token_ids: List[str]) -> Dict[str, Any]:
+        """Score many NFTs server-side with the set-returning calculate_resonance_scores()"""
+        result = self.execute_query(RESONANCE_SCORES_QUERY, (list(token_ids),), read_only=True)
+        print(f"🌟 Calculated resonance scores server-side for {len(result['rows'])} tokens")
         
-        tasks = [
-            'VACUUM ANALYZE nft_metadata',
-            'VACUUM ANALYZE akashic_frequencies',
-            'VACUUM ANALYZE frequency_layers',
-            'REINDEX TABLE nft_metadata'
-        ]
+        return {row['token_id']: row['resonance_score'] for row in rows_as_dicts(result)}
+    
+    def query_nft_with_frequencies(self, token_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read NFTs with their frequency layers from the incrementally refreshed materialization"""
+        if token_id:
+            query, params = NFT_FREQUENCIES_BY_TOKEN_QUERY, (token_id,)
+        else:
+            query, params = ALL_NFT_FREQUENCIES_QUERY, None
         
-        results = []
-        for task in tasks:
-            try:
-                self.execute_query(task)
-                results.append({'task': task, 'status': 'success'})
-            except Exception as e:
-                results.append({'task': task, 'status': 'failed', 'error': str(e)})
+        result = self.execute_query(query, params, read_only=True)
+        print(f"🎼 Queried {len(result['rows'])} NFTs with frequency layers")
+        
+        return rows_as_dicts(result)
+    
+    def refresh_nft_with_frequencies(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Recompute materialized rows for NFTs queued by the change-tracking triggers"""
+        refreshed, pending = self.execute_query(REFRESH_NFT_FREQUENCIES_QUERY, (limit,))['rows'][0]
+        print(f"🎼 Refreshed {refreshed} NFTs with frequency layers ({pending} still queued)")
+        
+        return {'refreshed': refreshed, 'pending': pending}
+    
+    def get_nft_frequencies_lag(self) -> Dict[str, Any]:
+        """How many NFTs are awaiting refresh and how long the oldest change has waited"""
+        return shape_nft_frequencies_lag(self.execute_query(NFT_FREQUENCIES_LAG_QUERY))
+    
+    def query_nft_state_at(self, nft_id: int, at: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """An NFT's stage, frequency and resonance as of at, replayed from its nearest snapshot"""
+        state = EvolutionReplayer.from_config(self, self.config).state_at(nft_id, at)
+        return state.as_dict() if state else None
+    
+    def query_nft_states_at(self, nft_ids: List[int], at: Optional[datetime] = None) -> Dict[int, Dict[str, Any]]:
+        """Point-in-time state of many NFTs in one batched replay; NFTs that did not exist yet are left out"""
+        states = EvolutionReplayer.from_config(self, self.config).states_at(nft_ids, at)
+        print(f"🧬 Replayed {len(states)} NFT states as of {at.isoformat() if at else 'now'}")
+        
+        return {nft_id: state.as_dict() for nft_id, state in states.items()}
+    
+    def refresh_evolution_snapshots(self, nft_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Snapshot replayed NFT state every evolution_snapshot_interval events"""
+        report = EvolutionReplayer.from_config(self, self.config).refresh_snapshots(nft_ids)
+        print(f"🧬 Stored {report['genesis_snapshots'] + report['snapshots_created']} evolution snapshots "
+              f"({report['events_replayed']} events replayed)")
+        
+        return report
+    
+    def copy_from_stdin(self, table: str, columns: List[str], data: str) -> int:
+        """Bulk load COPY text-format data into a table in one round trip"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+        started = time.perf_counter()
+        pool_wait, rowcount, error = 0.0, 0, None
+        try:
+            with self._connection() as (_, conn):
+                pool_wait = time.perf_counter() - started
+                cursor = conn.cursor()
+                try:
+                    cursor.copy_expert(sql, io.StringIO(data))
+                    rowcount = cursor.rowcount
+                finally:
+                    cursor.close()
+                conn.commit()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.instrumentation.record(sql, time.perf_counter() - started - pool_wait, rowcount, pool_wait, error)
+        
+        if self.result_cache is not None:
+            self.result_cache.invalidate_table(table)
+        return rowcount
+    
+    def resonance_writer(self, **options) -> ResonanceBulkWriter:
+        """Create a started COPY-based bulk writer for resonance_data"""
+        return ResonanceBulkWriter(self, **options).start()
+    
+    def insert_rows(self, table: str, columns: List[str], rows: List[tuple]) -> int:
+        """Insert rows with one multi-row INSERT in a single transaction"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        if not rows:
+            return 0
         
-        print(f"✓ Optimization complete ({len([r for r in results if r['status'] == 'success'])}/{len(results)} tasks)")
+        placeholders = f"({', '.join(['%s'] * len(columns))})"
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ', '.join([placeholders] * len(rows))
+        params = tuple(value for row in rows for value in row)
+        started = time.perf_counter()
+        pool_wait, rowcount, error = 0.0, 0, None
+        try:
+            with self._connection() as (_, conn):
+                pool_wait = time.perf_counter() - started
+                cursor = conn.cursor()
+                try:
+                    # Not prepared: each batch size is a different statement and would churn the cache
+                    cursor.execute(sql, params)
+                    rowcount = cursor.rowcount
+                finally:
+                    cursor.close()
+                conn.commit()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Every batch size is recorded under one statement label
+            label = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {placeholders}, ..."
+            self.instrumentation.record(label, time.perf_counter() - started - pool_wait, rowcount, pool_wait, error)
+        
+        if self.result_cache is not None:
+            self.result_cache.invalidate_table(table)
+        return rowcount
+    
+    def interaction_writer(self, **options) -> InteractionWriteBehind:
+        """Create a started write-behind writer for user_interactions, spilling under spill_dir"""
+        options.setdefault('spill_dir', os.path.join(self.config.get('spill_dir', './spill'), 'user_interactions'))
+        return InteractionWriteBehind(self, **options).start()
+    
+    def refresh_resonance_rollups(self, max_ids: Optional[int] = None) -> Dict[str, Any]:
+        """Fold resonance_data rows added since the watermark into the minute, hour and day rollups"""
+        started = time.perf_counter()
+        upper_id = self.execute_query(ROLLUP_BOUND_QUERY)['rows'][0][0]
+        
+        # Each call commits its own slice, so max_ids bounds how long the watermark row stays locked
+        totals = {'rows_rolled_up': 0, 'buckets_updated': 0, 'batches': 0}
+        while True:
+            rows, buckets, watermark = self.execute_query(REFRESH_ROLLUPS_QUERY, (upper_id, max_ids))['rows'][0]
+            totals['rows_rolled_up'] += rows
+            totals['buckets_updated'] += buckets
+            totals['batches'] += 1
+            if watermark >= upper_id:
+                break
+        
+        totals.update(watermark=watermark, elapsed_seconds=round(time.perf_counter() - started, 3))
+        print(f"📈 Rolled up {totals['rows_rolled_up']} resonance rows into {totals['buckets_updated']} buckets")
+        return totals
+    
+    def query_resonance_window(
+        self,
+        nft_id: int,
+        start: datetime,
+        end: datetime,
+        max_points: int = 500,
+        frequency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Resonance over [start, end) at the finest rollup resolution that fits in max_points"""
+        resolution, _ = choose_resolution(start, end, max_points)
+        params = window_params(nft_id, start, end, resolution, frequency)
+        result = self.execute_query(RESONANCE_WINDOW_QUERY, params, read_only=True)
+        window = shape_window(nft_id, start, end, max_points, frequency, resolution, result)
+        
+        print(f"📈 Queried {len(window['points'])} {resolution} resonance points for NFT {nft_id}")
+        return window
+    
+    def fetch_arrays(self, query: str, params: Optional[tuple] = None, read_only: bool = False) -> Dict[str, Any]:
+        """Fetch a numeric result set as one NumPy array per column, with a null mask per column"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        import_numpy()
+        
+        executed_at = datetime.now()
+        started = time.perf_counter()
+        pool_wait, rowcount, error = 0.0, 0, None
+        try:
+            with self._connection(read_only) as (_, conn):
+                pool_wait = time.perf_counter() - started
+                cursor = conn.cursor()
+                try:
+                    if self.driver.binary_copy:
+                        cursor.execute(probe_query(query), params)
+                        columns = [desc[0] for desc in cursor.description]
+                        type_oids = [desc[1] for desc in cursor.description]
+                        bound = cursor.mogrify(query, params).decode('utf-8')
+                        buffer = io.BytesIO()
+                        cursor.copy_expert(copy_query(bound, type_oids, columns), buffer)
+                        arrays, nulls = decode_copy(buffer.getbuffer(), columns, type_oids)
+                        method = 'copy_binary'
+                    else:
+                        cursor.execute(query, params)
+                        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                        type_oids = [desc[1] for desc in cursor.description] if cursor.description else []
+                        arrays, nulls = arrays_from_rows(columns, cursor.fetchall(), type_oids)
+                        method = 'rows'
+                finally:
+                    cursor.close()
+                conn.commit()
+            rowcount = len(arrays[columns[0]]) if columns else 0
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.instrumentation.record(query, elapsed - pool_wait, rowcount, pool_wait, error)
         
         return {
-            'optimizations': results,
-            'timestamp': datetime.now().isoformat(),
+            'query': query,
+            'status': 'success',
+            'method': method,
+            'columns': columns,
+            'arrays': arrays,
+            'nulls': nulls,
+            'rowcount': rowcount,
+            'executed_at': executed_at.isoformat(),
+            'duration_ms': round((elapsed - pool_wait) * 1000.0, 3),
+            'resonance_frequency': f"{self.frequency}Hz"
+        }
+    
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        batch_size: Optional[int] = None,
+        model: Optional[type] = None,
+        read_only: bool = False
+    ) -> Iterator[Any]:
+        """Stream rows through a named server-side cursor, one fetchmany batch at a time"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        
+        batch_size = batch_size or self.config.get('fetch_batch_size', 2000)
+        convert = row_converter(model)
+        
+        # The pooled connection stays checked out until the generator is exhausted or closed
+        started = time.perf_counter()
+        pool_wait, database_time, streamed, error = 0.0, 0.0, 0, None
+        try:
+            with self._connection(read_only) as (_, conn):
+                pool_wait = time.perf_counter() - started
+                cursor = conn.cursor(name=f"scrollverse_stream_{next(_cursor_ids)}")
+                cursor.itersize = batch_size
+                try:
+                    fetch_started = time.perf_counter()
+                    cursor.execute(query, params)
+                    while True:
+                        batch = cursor.fetchmany(batch_size)
+                        # Only time spent in the database counts, not time spent in the consumer
+                        database_time += time.perf_counter() - fetch_started
+                        if not batch:
+                            break
+                        streamed += len(batch)
+                        if convert:
+                            for row in batch:
+                                yield convert(row)
+                        else:
+                            yield from batch
+                        fetch_started = time.perf_counter()
+                finally:
+                    cursor.close()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.instrumentation.record(query, database_time, streamed, pool_wait, error)
+    
+    def iter_nft_metadata(
+        self,
+        token_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        model: Optional[type] = None
+    ) -> Iterator[Any]:
+        """Stream NFT metadata rows as tuples or model instances"""
+        if token_id:
+            return self.iter_query(NFT_BY_TOKEN_QUERY, (token_id,), batch_size, model, read_only=True)
+        return self.iter_query(ALL_NFTS_QUERY, None, batch_size, model, read_only=True)
+    
+    def iter_akashic_frequencies(
+        self,
+        frequency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        model: Optional[type] = None
+    ) -> Iterator[Any]:
+        """Stream Akashic frequency rows as tuples or model instances"""
+        if frequency:
+            return self.iter_query(FREQUENCY_BY_VALUE_QUERY, (frequency,), batch_size, model, read_only=True)
+        return self.iter_query(FREQUENCIES_BY_RESONANCE_QUERY, None, batch_size, model, read_only=True)
+    
+    def iter_resonance_data(
+        self,
+        nft_id: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        model: Optional[type] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Any]:
+        """Stream time-series resonance measurements in timestamp order, optionally within [start, end)"""
+        if start is not None or end is not None:
+            query, params = time_range_query('resonance_data', start, end, nft_id=nft_id)
+            return self.iter_query(query, params, batch_size, model, read_only=True)
+        if nft_id is not None:
+            return self.iter_query(RESONANCE_DATA_BY_NFT_QUERY, (nft_id,), batch_size, model, read_only=True)
+        return self.iter_query(RESONANCE_DATA_QUERY, None, batch_size, model, read_only=True)
+    
+    def iter_user_interactions(
+        self,
+        user_address: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        model: Optional[type] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Any]:
+        """Stream user interaction rows in timestamp order, optionally within [start, end)"""
+        if start is not None or end is not None:
+            query, params = time_range_query('user_interactions', start, end, user_address=user_address or None)
+            return self.iter_query(query, params, batch_size, model, read_only=True)
+        if user_address:
+            return self.iter_query(USER_INTERACTIONS_BY_USER_QUERY, (user_address,), batch_size, model, read_only=True)
+        return self.iter_query(USER_INTERACTIONS_QUERY, None, batch_size, model, read_only=True)
+    
+    def execute_utility(self, query: str) -> Dict[str, Any]:
+        """Run a statement that cannot run inside a transaction block, such as VACUUM"""
+        if not self.pool:
+            raise Exception("Not connected to database")
+        
+        started = time.perf_counter()
+        pool_wait, error = 0.0, None
+        try:
+            with self._connection() as (_, conn):
+                pool_wait = time.perf_counter() - started
+                conn.autocommit = True
+                try:
+                    cursor = conn.cursor()
+                    try:
+                        cursor.execute(query)
+                    finally:
+                        cursor.close()
+                finally:
+                    conn.autocommit = False
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.instrumentation.record(query, elapsed - pool_wait, 0, pool_wait, error)
+        
+        return {
+            'query': query,
+            'status': 'success',
+            'duration_ms': round((elapsed - pool_wait) * 1000.0, 3),
             'resonance_frequency': f"{self.frequency}Hz"
         }
     
+    def plan_maintenance(self, schema: str = 'public') -> List[Dict[str, Any]]:
+        """Plan VACUUM, ANALYZE and REINDEX CONCURRENTLY tasks from current table statistics"""
+        scheduler = MaintenanceScheduler(self, MaintenancePlanner.from_config(self.config), schema=schema)
+        return [task.as_dict() for chain in scheduler.plan() for task in chain]
+    
+    def optimize_database(
+        self,
+        concurrency: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        schema: str = 'public',
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Run bloat-driven maintenance in parallel within a time budget (seconds)"""
+        print("⚙️  Running database optimization...")
+        
+        scheduler = MaintenanceScheduler(
+            self,
+            MaintenancePlanner.from_config(self.config),
+            concurrency=concurrency or self.config.get('maintenance_concurrency', 2),
+            time_budget=time_budget if time_budget is not None else self.config.get('maintenance_time_budget', 600000) / 1000.0,
+            schema=schema
+        )
+        report = scheduler.run(dry_run=dry_run)
+        report['resonance_frequency'] = f"{self.frequency}Hz"
+        
+        summary = report['summary']
+        print(f"✓ Optimization complete ({summary['succeeded']}/{summary['planned']} tasks, "
+              f"{summary['elapsed_seconds']:.2f}s, {summary['bytes_reclaimed']} bytes reclaimed)")
+        
+        return report
+    
+    def advise_indexes(
+        self,
+        update_baseline: bool = True,
+        accept_regressions: bool = False,
+        schema: str = 'public'
+    ) -> Dict[str, Any]:
+        """Capture plans for every known read, flag regressions against the baseline and recommend indexes"""
+        print("🧭 Capturing query plans...")
+        
+        advisor = PlanAdvisor.from_config(self, self.config, plan_workload, schema=schema)
+        report = advisor.run(update_baseline=update_baseline, accept_regressions=accept_regressions)
+        report['resonance_frequency'] = f"{self.frequency}Hz"
+        
+        summary = report['summary']
+        print(f"✓ Captured {summary['captured']} plans ({summary['regressions']} regressions, "
+              f"{summary['missing_indexes']} missing, {summary['redundant_indexes']} redundant, "
+              f"{summary['unused_indexes']} unused indexes)")
+        
+        return report
+    
+    def list_partitions(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Attached time partitions of resonance_data and user_interactions"""
+        return PartitionManager.from_config(self, self.config).partitions()
+    
+    def manage_partitions(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Partition heap tables, create partitions ahead of time and retire those past retention"""
+        print("🗂️  Managing time partitions...")
+        
+        report = PartitionManager.from_config(self, self.config).run(dry_run=dry_run)
+        report['resonance_frequency'] = f"{self.frequency}Hz"
+        
+        summary = report['summary']
+        print(f"✓ Partitions managed ({summary['created']} created, {summary['split']} split out of DEFAULT, "
+              f"{summary['dropped']} dropped, {summary['converted']} tables converted, {summary['failed']} failed)")
+        
+        return report
+    
+    def export_tables(
+        self,
+        output_dir: Optional[str] = None,
+        tables: Optional[Dict[str, str]] = None,
+        resume: bool = True
+    ) -> Dict[str, Any]:
+        """Export tables ({table: shard key}) as compressed column shards, resuming an earlier run into output_dir"""
+        print("📦 Exporting tables to column shards...")
+        
+        report = ShardExporter.from_config(self, self.config, output_dir=output_dir, tables=tables).run(resume=resume)
+        report['resonance_frequency'] = f"{self.frequency}Hz"
+        
+        summary = report['summary']
+        print(f"✓ Exported {summary['rows']} rows in {summary['shards']} shards to {report['output_dir']} "
+              f"({summary['exported']} written, {summary['resumed']} resumed, {summary['failed']} failed)")
+        
+        return report
+    
     def close(self):
         """Close database connection"""
-        if self.connection:
-            # In production: self.connection.close()
-            self.connection = None
-            print("🔌 PostgreSQL connection closed")
+        if self.notifier is not None:
+            self.notifier.stop()
+        if self.router is not None:
+            self.router.close()
+            self.router = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            print("🔌 PostgreSQL connection pool closed")
 
 
 def main():
@@ -261,7 +1120,8 @@ def main():
     print("ScrollVerse PostgreSQL Client - 528Hz Resonance")
     print("=" * 60)
     
-    client = PostgreSQLClient()
+    # --driver fake runs against the in-process backend instead of POSTGRES_HOST
+    client = PostgreSQLClient(config_from_argv(sys.argv))
     
     try:
         # Connect to database
@@ -285,6 +1145,14 @@ def main():
         for nft in nfts:
             print(f"  - {nft['token_id']}: {nft['name']} ({nft['frequency']}Hz)")
         
+        # Read NFTs with their layers from the materialization
+        print("\n🎼 NFT Frequency Layers:")
+        client.refresh_nft_with_frequencies()
+        for nft in client.query_nft_with_frequencies():
+            print(f"  - {nft['token_id']}: {len(nft['frequency_layers'] or [])} layers")
+        lag = client.get_nft_frequencies_lag()
+        print(f"  (lag: {lag['pending']} queued, {lag['lag_seconds']:.1f}s)")
+        
         # Query Akashic frequencies
         print("\n🌟 Akashic Frequencies:")
         frequencies = client.query_akashic_frequencies()
@@ -294,6 +1162,22 @@ def main():
         # Optimize database
         print("\n⚙️  Database Optimization:")
         optimization = client.optimize_database()
+        for task in optimization['optimizations']:
+            print(f"  - {task['task']}: {task['status']} ({task['reason']})")
+        
+        # Premake time partitions and split stray rows out of DEFAULT; run this entry point daily
+        print("\n🗂️  Time Partitions:")
+        client.manage_partitions()
+        
+        # Connection pool statistics
+        stats = client.get_pool_stats()
+        print(f"\n🔌 Pool: {stats['in_use']} in use, {stats['idle']} idle, "
+              f"{stats['checkouts']} checkouts, avg wait {stats['wait_time_avg'] * 1000:.2f}ms")
+        
+        # Query latency by statement
+        query_stats = client.get_query_stats()
+        print(f"📈 Queries: {query_stats['calls']} executed, {query_stats['errors']} errors, "
+              f"{len(query_stats['slow_queries'])} slow")
         
     finally:
         client.close()
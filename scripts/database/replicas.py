@@ -0,0 +1,295 @@
+"""
+Replica Routing for ScrollVerse
+Lag-aware routing of read-only statements across streaming replicas
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .connection_pool import ConnectionPool
+    from .instrumentation import LatencyHistogram
+except ImportError:
+    from connection_pool import ConnectionPool
+    from instrumentation import LatencyHistogram
+
+PRIMARY_LSN_QUERY = "SELECT pg_current_wal_lsn()::text AS lsn"
+
+# A standby that has replayed everything it received is caught up, however
+# old its last replayed transaction is; otherwise lag is the replay delay
+REPLICA_STATUS_QUERY = """
+    SELECT
+        pg_last_wal_replay_lsn()::text AS replay_lsn,
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END AS lag_seconds
+"""
+
+
+def parse_lsn(text: Optional[str]) -> int:
+    """WAL position 'X/Y' as a comparable integer"""
+    if not text:
+        return 0
+    high, low = text.split('/')
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+def parse_endpoints(value: str, default_port: int = 5432) -> List[Dict[str, Any]]:
+    """Replica list from POSTGRES_REPLICAS, e.g. 'replica1:5432,replica2'"""
+    endpoints = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(':')
+        endpoints.append({'host': host, 'port': int(port) if port else default_port})
+    return endpoints
+
+
+class Endpoint:
+    """One database node with its pool, measured lag and routing counters"""
+
+    __slots__ = ('name', 'role', 'pool', 'healthy', 'replay_lsn', 'lag_seconds', 'checked_at',
+                 'in_flight', 'routed', 'errors', 'last_error', 'latency')
+
+    def __init__(self, name: str, role: str, pool: ConnectionPool):
+        """Track a node; replicas start unhealthy until their first status check"""
+        self.name = name
+        self.role = role
+        self.pool = pool
+        self.healthy = role == 'primary'
+        self.replay_lsn = 0
+        self.lag_seconds = 0.0
+        self.checked_at: Optional[float] = None
+        self.in_flight = 0
+        self.routed = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view of the endpoint"""
+        return {
+            'name': self.name,
+            'role': self.role,
+            'healthy': self.healthy,
+            'lag_seconds': round(self.lag_seconds, 3),
+            'in_flight': self.in_flight,
+            'routed': self.routed,
+            'errors': self.errors,
+            'last_error': self.last_error,
+            'checked_seconds_ago': round(time.monotonic() - self.checked_at, 3) if self.checked_at else None,
+            'latency': self.latency.as_dict()
+        }
+
+
+class ReplicaRouter:
+    """
+    Routes read-only work to streaming replicas and everything else to the primary
+    A monitor thread samples the primary's WAL position and each replica's
+    replay position and lag. A read goes to the eligible replica with the
+    fewest in-flight statements, weighted by lag. Eligible means healthy,
+    within max_lag, and caught up to this thread's own writes. Otherwise the
+    read goes to the primary
+    """
+
+    def __init__(
+        self,
+        primary_pool: ConnectionPool,
+        replica_pools: Dict[str, ConnectionPool],
+        max_lag: float = 5.0,
+        check_interval: float = 1.0,
+        check_timeout: float = 1.0
+    ):
+        """Initialize endpoints without checking them"""
+        self.primary = Endpoint('primary', 'primary', primary_pool)
+        self.replicas = [Endpoint(name, 'replica', pool) for name, pool in replica_pools.items()]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        # (monotonic time the sample was started, primary WAL position)
+        self._samples: deque = deque(maxlen=64)
+        self._session = threading.local()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self.last_write_at = 0.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], driver, primary_pool: ConnectionPool) -> 'ReplicaRouter':
+        """Build a router with one pool per configured replica (replica_max_lag and intervals in milliseconds)"""
+        pools = {}
+        for replica in config.get('replicas', []):
+            replica_config = {**config, **replica}
+            pools[f"{replica['host']}:{replica.get('port', config.get('port', 5432))}"] = \
+                ConnectionPool.from_config(replica_config, driver)
+        return cls(
+            primary_pool,
+            pools,
+            max_lag=config.get('replica_max_lag', 5000) / 1000.0,
+            check_interval=config.get('replica_check_interval', 1000) / 1000.0,
+            check_timeout=config.get('replica_check_timeout', 1000) / 1000.0
+        )
+
+    def open(self):
+        """Open replica pools, measure them once and start the lag monitor"""
+        for replica in self.replicas:
+            try:
+                replica.pool.open()
+            except Exception as e:
+                # An unreachable replica is retried by the monitor; reads use the others meanwhile
+                replica.last_error = f"{type(e).__name__}: {e}"
+        self.check()
+        if self.check_interval and self._monitor is None:
+            self._monitor = threading.Thread(target=self._monitor_loop, name='scrollverse-replica-monitor', daemon=True)
+            self._monitor.start()
+
+    def _monitor_loop(self):
+        """Re-check every endpoint until close()"""
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+    def _fetch_one(self, pool: ConnectionPool, query: str) -> tuple:
+        """Run a status query on a pool and return its only row"""
+        with pool.connection(timeout=self.check_timeout) as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query)
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+            conn.commit()
+        return row
+
+    def check(self):
+        """Sample the primary's WAL position, then each replica's replay position and lag"""
+        started = time.monotonic()
+        try:
+            lsn = parse_lsn(self._fetch_one(self.primary.pool, PRIMARY_LSN_QUERY)[0])
+            with self._lock:
+                self._samples.append((started, lsn))
+        except Exception as e:
+            with self._lock:
+                self.primary.last_error = f"{type(e).__name__}: {e}"
+
+        for replica in self.replicas:
+            try:
+                replay_lsn, lag_seconds = self._fetch_one(replica.pool, REPLICA_STATUS_QUERY)
+                healthy, error = True, None
+            except Exception as e:
+                replay_lsn, lag_seconds = None, replica.lag_seconds
+                healthy, error = False, f"{type(e).__name__}: {e}"
+            with self._lock:
+                replica.healthy = healthy
+                replica.checked_at = time.monotonic()
+                if healthy:
+                    replica.replay_lsn = parse_lsn(replay_lsn)
+                    replica.lag_seconds = float(lag_seconds or 0)
+                else:
+                    replica.last_error = error
+
+    def _required_lsn(self, since: float) -> Optional[int]:
+        """Primary WAL position a replica must reach to show writes committed before since; caller holds the lock"""
+        if not since:
+            return 0
+        for sampled_at, lsn in self._samples:
+            if sampled_at >= since:
+                return lsn
+        # No sample taken after the write yet: only the primary is known to have it
+        return None
+
+    def choose(self, read_only: bool) -> Endpoint:
+        """Endpoint for the next statement"""
+        if not read_only or not self.replicas:
+            return self.primary
+        since = max(getattr(self._session, 'written_at', 0.0), getattr(self._session, 'reads_after', 0.0))
+        with self._lock:
+            required = self._required_lsn(since)
+            if required is None:
+                return self.primary
+            eligible = [
+                r for r in self.replicas
+                if r.healthy and r.lag_seconds <= self.max_lag and r.replay_lsn >= required
+            ]
+            if not eligible:
+                return self.primary
+            # Fewest statements in flight wins; a lagging replica counts as busier
+            return min(eligible, key=lambda r: ((r.in_flight + 1) * (1.0 + r.lag_seconds / (self.max_lag or 1.0)),
+                                                r.latency.total / r.latency.count if r.latency.count else 0.0))
+
+    def _mark_failed(self, endpoint: Endpoint, error: BaseException):
+        """Count an error; a replica that cannot be reached is skipped until the monitor sees it answer"""
+        with self._lock:
+            endpoint.errors += 1
+            endpoint.last_error = f"{type(error).__name__}: {error}"
+            if endpoint.role == 'replica' and type(error).__name__.endswith(('OperationalError', 'PoolTimeoutError')):
+                endpoint.healthy = False
+
+    @contextmanager
+    def connection(self, read_only: bool = False) -> Iterator[Tuple[ConnectionPool, Any]]:
+        """Check out a connection on the chosen endpoint, yielding (pool, connection)"""
+        endpoint = self.choose(read_only)
+        try:
+            conn = endpoint.pool.acquire()
+        except Exception as e:
+            if endpoint.role != 'replica':
+                raise
+            # Nothing has run yet, so the read can move to the primary
+            self._mark_failed(endpoint, e)
+            endpoint = self.primary
+            conn = endpoint.pool.acquire()
+
+        with self._lock:
+            endpoint.in_flight += 1
+            endpoint.routed += 1
+        started = time.perf_counter()
+        try:
+            yield endpoint.pool, conn
+        except Exception as e:
+            self._mark_failed(endpoint, e)
+            raise
+        finally:
+            # release() rolls back and discards connections that fail to reset
+            endpoint.pool.release(conn)
+            with self._lock:
+                endpoint.in_flight -= 1
+                endpoint.latency.observe(time.perf_counter() - started)
+            if endpoint.role == 'primary' and not read_only:
+                # The session's next reads must see this statement, whether or not it wrote
+                self._session.written_at = time.monotonic()
+                self.last_write_at = self._session.written_at
+
+    @contextmanager
+    def reads_after(self, since: float):
+        """Within the block, route reads only to replicas that have replayed the primary as of since"""
+        previous = getattr(self._session, 'reads_after', 0.0)
+        self._session.reads_after = max(previous, since)
+        try:
+            yield
+        finally:
+            self._session.reads_after = previous
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint health, lag, load and latency"""
+        with self._lock:
+            primary_lsn = self._samples[-1][1] if self._samples else None
+            endpoints = [self.primary.as_dict()]
+            for replica in self.replicas:
+                view = replica.as_dict()
+                view['lag_bytes'] = max(0, primary_lsn - replica.replay_lsn) if primary_lsn is not None else None
+                endpoints.append(view)
+        return {'enabled': True, 'max_lag_seconds': self.max_lag, 'endpoints': endpoints}
+
+    def close(self):
+        """Stop the monitor and close replica pools; the primary pool belongs to the client"""
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=self.check_timeout + 1.0)
+            self._monitor = None
+        for replica in self.replicas:
+            replica.pool.close()
@@ -0,0 +1,175 @@
+"""
+Resonance Scoring for ScrollVerse
+Vectorized client-side port of calculate_resonance_score()
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python path gives identical results
+    np = None
+
+# Above this many layers per NFT the int64 numerator could overflow, and the
+# tie argument in calculate_resonance_scores() is no longer checked to hold
+_INT64_SAFE_LAYERS = 2000
+
+
+def _hundredths(value: Any) -> int:
+    """DECIMAL(5,2) value as an integer count of hundredths"""
+    return int((Decimal(value) * 100).to_integral_value())
+
+
+def _base_10000(value: int) -> Tuple[int, int]:
+    """Weight and leading digit of a positive integer in PostgreSQL's base-10000 numeric layout"""
+    weight = (len(str(value)) - 1) // 4
+    return weight, value // 10000 ** weight
+
+
+def numeric_avg(total: Any, count: int) -> Decimal:
+    """
+    AVG() over numeric values with the given sum, as PostgreSQL computes it
+    numeric_avg divides sum by count at select_div_scale()'s result scale, at
+    least 16 significant digits and never fewer than the sum's own scale, and
+    rounds half away from zero
+    """
+    total = Decimal(total)
+    sign, digits, exponent = total.as_tuple()
+    sum_scale = max(0, -exponent)
+    mantissa = int(''.join(map(str, digits))) * 10 ** max(0, exponent)
+    if mantissa:
+        # Base-10000 digits are aligned on the decimal point, so pad the scale to a whole group
+        groups = (sum_scale + 3) // 4
+        sum_weight, sum_first = _base_10000(mantissa * 10 ** (4 * groups - sum_scale))
+        sum_weight -= groups
+    else:
+        sum_weight, sum_first = 0, 0
+    count_weight, count_first = _base_10000(count)
+
+    quotient_weight = sum_weight - count_weight - (1 if sum_first <= count_first else 0)
+    scale = min(max(16 - 4 * quotient_weight, sum_scale, 0), 1000)
+
+    numerator = mantissa * 10 ** (scale - sum_scale)
+    magnitude = (2 * numerator + count) // (2 * count)
+    return Decimal((sign, tuple(map(int, str(magnitude))), -scale))
+
+
+def resonance_score(base: Any, count: int, total: Any) -> Decimal:
+    """ROUND(base * (1 + count * 0.1) * COALESCE(AVG(resonance), 1.0), 2) in exact numeric arithmetic"""
+    average = numeric_avg(total, count) if count else Decimal('1.0')
+    with localcontext() as context:
+        context.prec = 2000
+        product = Decimal(base) * (1 + count * Decimal('0.1')) * average
+        return product.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def calculate_resonance_scores(
+    base_resonance: Sequence[Optional[Any]],
+    layer_counts: Sequence[int],
+    resonance_sums: Sequence[Any]
+) -> List[Optional[Decimal]]:
+    """
+    Score many NFTs the way calculate_resonance_score() does
+    ROUND(base * (1 + count * 0.1) * COALESCE(avg, 1.0), 2) is first computed in
+    integer hundredths: base and resonances are DECIMAL(5,2), so the unrounded
+    score * 100 = B * (10 + n) * S / (1000 * n) with B, S in hundredths.
+    PostgreSQL rounds AVG() to at least 16 significant digits before
+    multiplying, which moves the product far less than the gap between a
+    half-cent tie and any other value of that fraction, so only exact ties can
+    round differently; those are recomputed with the server's arithmetic
+    """
+    count = len(base_resonance)
+    present = [b is not None for b in base_resonance]
+    bases = [_hundredths(b) if b is not None else 0 for b in base_resonance]
+    sums = [_hundredths(s) if s is not None else 0 for s in resonance_sums]
+
+    if np is not None and count and max(layer_counts, default=0) <= _INT64_SAFE_LAYERS:
+        b = np.asarray(bases, dtype=np.int64)
+        n = np.asarray(layer_counts, dtype=np.int64)
+        s = np.asarray(sums, dtype=np.int64)
+        no_layers = n == 0
+        # COALESCE(avg, 1.0): with no layers the score is just the base resonance
+        numerator = np.where(no_layers, b * 1000, b * (10 + n) * s)
+        denominator = np.where(no_layers, 1000, 1000 * n)
+        magnitude = (2 * np.abs(numerator) + denominator) // (2 * denominator)
+        scaled = (np.sign(numerator) * magnitude).tolist()
+    else:
+        scaled = []
+        for b, n, s in zip(bases, layer_counts, sums):
+            numerator, denominator = (b * 1000, 1000) if n == 0 else (b * (10 + n) * s, 1000 * n)
+            magnitude = (2 * abs(numerator) + denominator) // (2 * denominator)
+            scaled.append(magnitude if numerator >= 0 else -magnitude)
+
+    scores = []
+    for i, (value, is_present) in enumerate(zip(scaled, present)):
+        if not is_present:
+            scores.append(None)
+            continue
+        n = layer_counts[i]
+        if n > _INT64_SAFE_LAYERS or n and (2 * bases[i] * (10 + n) * sums[i]) % (2000 * n) == 1000 * n:
+            scores.append(resonance_score(base_resonance[i], n, resonance_sums[i]))
+        else:
+            scores.append(Decimal(value).scaleb(-2))
+    return scores
+
+
+def summarize_layers(rows: List[Dict[str, Any]], token_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate set-based join rows into per-token layer statistics
+    Rows with a NULL akashic_frequency are NFTs without layers
+    """
+    index = {token_id: i for i, token_id in enumerate(dict.fromkeys(token_ids))}
+    size = len(index)
+    found = [False] * size
+    base = [None] * size
+    nft_frequency = [None] * size
+    row_index, resonance, matches = [], [], []
+
+    for row in rows:
+        i = index.get(row['token_id'])
+        if i is None:
+            continue
+        found[i] = True
+        base[i] = row['base_resonance']
+        nft_frequency[i] = row['nft_frequency']
+        if row['akashic_frequency'] is not None:
+            row_index.append(i)
+            resonance.append(_hundredths(row['resonance']))
+            matches.append(row['nft_frequency'] == row['akashic_frequency'])
+
+    if np is not None and row_index:
+        idx = np.asarray(row_index, dtype=np.int64)
+        res = np.asarray(resonance, dtype=np.int64)
+        counts = np.bincount(idx, minlength=size).tolist()
+        sums = np.bincount(idx, weights=res, minlength=size).astype(np.int64).tolist()
+        maxima_array = np.full(size, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(maxima_array, idx, res)
+        maxima = [m if c else None for m, c in zip(maxima_array.tolist(), counts)]
+        matched = (np.bincount(idx, weights=np.asarray(matches, dtype=np.int64), minlength=size) > 0).tolist()
+    else:
+        counts, sums, maxima, matched = [0] * size, [0] * size, [None] * size, [False] * size
+        for i, r, m in zip(row_index, resonance, matches):
+            counts[i] += 1
+            sums[i] += r
+            maxima[i] = r if maxima[i] is None else max(maxima[i], r)
+            matched[i] = matched[i] or m
+
+    scores = calculate_resonance_scores(
+        base,
+        counts,
+        [Decimal(s).scaleb(-2) for s in sums]
+    )
+
+    return {
+        token_id: {
+            'found': found[i],
+            'nft_frequency': nft_frequency[i],
+            'akashic_layers': counts[i],
+            'max_resonance': Decimal(maxima[i]).scaleb(-2) if maxima[i] is not None else None,
+            'frequency_match': matched[i],
+            'resonance_score': scores[i] if found[i] else None
+        }
+        for token_id, i in index.items()
+    }
@@ -0,0 +1,218 @@
+"""
+Result Cache for ScrollVerse
+Table-versioned read-through cache invalidated by LISTEN/NOTIFY
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import re
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+CHANGE_CHANNEL = 'scrollverse_table_changes'
+
+_WRITE_RE = re.compile(
+    r'^\s*(?:insert\s+into|update|delete\s+from|truncate(?:\s+table)?|copy)\s+(?:only\s+)?(?:\w+\.)?(?P<table>\w+)',
+    re.IGNORECASE
+)
+
+ChangeCallback = Callable[[Optional[str]], None]
+
+
+def written_table(query: str) -> Optional[str]:
+    """Name of the table a write statement targets, if any"""
+    match = _WRITE_RE.match(query)
+    return match.group('table').lower() if match else None
+
+
+class _CacheEntry:
+    """Cached result with the table versions it was read at"""
+
+    __slots__ = ('result', 'versions', 'expires_at')
+
+    def __init__(self, result: Dict[str, Any], versions: Tuple[Tuple[str, int], ...], expires_at: float):
+        self.result = result
+        self.versions = versions
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    """
+    Read-through cache of query results keyed by statement and params
+    Every entry records the version of each table it depends on; bumping a
+    table's version makes all dependent entries stale, including entries
+    whose query was still running when the change arrived
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        """Initialize an empty cache"""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Any, _CacheEntry]' = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0}
+
+    def versions_for(self, tables: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        """Snapshot current versions before running the query that fills an entry"""
+        with self._lock:
+            # '*' is bumped by full invalidations, so it covers tables never seen before
+            return tuple((table, self._versions.get(table, 0)) for table in [*sorted(tables), '*'])
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            if any(self._versions.get(table, 0) != version for table, version in entry.versions):
+                del self._entries[key]
+                self._stats['stale'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry.result
+
+    def put(
+        self,
+        key: Any,
+        result: Dict[str, Any],
+        versions: Tuple[Tuple[str, int], ...],
+        ttl: Optional[float] = None
+    ):
+        """Store a result read at the given table versions"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = _CacheEntry(result, versions, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate_table(self, table: Optional[str]):
+        """Bump a table's version; None invalidates every table"""
+        with self._lock:
+            self._stats['invalidations'] += 1
+            if table is None:
+                self._entries.clear()
+                table = '*'
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        """Drop every entry"""
+        self.invalidate_table(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and invalidation counters"""
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_ratio': self._stats['hits'] / lookups if lookups else 0.0
+            }
+
+
+class ChangeNotifier:
+    """Base interface for table change notification sources"""
+
+    def start(self, callback: ChangeCallback):
+        """Begin delivering changed table names to callback"""
+        raise NotImplementedError
+
+    def stop(self):
+        """Stop delivering notifications"""
+
+
+class FakeNotifier(ChangeNotifier):
+    """In-process notifier for tests; notify() delivers synchronously, as at commit"""
+
+    def __init__(self):
+        """Initialize without a subscriber"""
+        self._callback: Optional[ChangeCallback] = None
+        self.delivered = 0
+
+    def start(self, callback: ChangeCallback):
+        """Register the invalidation callback"""
+        self._callback = callback
+
+    def notify(self, table: Optional[str]):
+        """Simulate a committed write to table"""
+        if self._callback is not None:
+            self.delivered += 1
+            self._callback(table)
+
+    def stop(self):
+        """Drop the callback"""
+        self._callback = None
+
+
+class PostgresNotifier(ChangeNotifier):
+    """
+    LISTEN on a dedicated psycopg2 connection
+    notify_table_change() triggers in scrollverse_schema.sql publish the table
+    name on commit; on connection loss everything is invalidated and the
+    listener reconnects
+    """
+
+    def __init__(self, driver, config: Dict[str, Any], channel: str = CHANGE_CHANNEL, poll_interval: float = 1.0):
+        """Initialize the listener without connecting"""
+        self.driver = driver
+        self.config = config
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, callback: ChangeCallback):
+        """Start the listener thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, args=(callback,), name='scrollverse-cache-listener', daemon=True)
+        self._thread.start()
+
+    def _listen(self, callback: ChangeCallback):
+        """Receive notifications until stop(), reconnecting with backoff"""
+        backoff = self.poll_interval
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self.driver.connect(self.config)
+                connection.autocommit = True
+                cursor = connection.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+                cursor.close()
+                # Changes made while disconnected were missed
+                callback(None)
+                backoff = self.poll_interval
+
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([connection], [], [], self.poll_interval)
+                    if not readable:
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        callback(connection.notifies.pop(0).payload or None)
+            except Exception:
+                callback(None)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if connection is not None:
+                    self.driver.close(connection)
+
+    def stop(self):
+        """Stop the listener thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+            self._thread = None
@@ -0,0 +1,148 @@
+"""
+Resonance Rollups for ScrollVerse
+Minute, hour and day resonance_data aggregates with resolution-aware window reads
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Finest first; each name is also the date_trunc() field for the resolution
+ROLLUP_RESOLUTIONS: Tuple[Tuple[str, int], ...] = (
+    ('minute', 60),
+    ('hour', 3600),
+    ('day', 86400)
+)
+
+# Run in its own transaction: it briefly takes a SHARE lock on resonance_data
+ROLLUP_BOUND_QUERY = "SELECT resonance_rollup_bound() AS upper_id"
+
+REFRESH_ROLLUPS_QUERY = "SELECT * FROM refresh_resonance_rollups(%s, %s)"
+
+# Rollup buckets for the window plus the raw rows not yet folded into them.
+# Both branches read the watermark from the same snapshot, so no row is
+# counted twice or missed while a refresh commits
+RESONANCE_WINDOW_QUERY = """
+    WITH samples AS (
+        SELECT r.bucket, r.sample_count, r.resonance_sum, r.resonance_min, r.resonance_max
+        FROM resonance_rollups r
+        WHERE r.resolution = %s AND r.nft_id = %s AND r.bucket >= %s AND r.bucket < %s
+            AND (%s::integer IS NULL OR r.frequency = %s)
+        UNION ALL
+        SELECT date_trunc(%s, rd.timestamp), 1, rd.resonance_level, rd.resonance_level, rd.resonance_level
+        FROM resonance_data rd
+        WHERE rd.id > (SELECT w.last_id FROM resonance_rollup_watermark w WHERE w.name = 'resonance_data')
+            AND rd.nft_id = %s AND rd.timestamp >= %s AND rd.timestamp < %s
+            AND (%s::integer IS NULL OR rd.frequency = %s)
+    )
+    SELECT
+        bucket,
+        SUM(sample_count) AS sample_count,
+        SUM(resonance_sum) AS resonance_sum,
+        MIN(resonance_min) AS resonance_min,
+        MAX(resonance_max) AS resonance_max
+    FROM samples
+    GROUP BY bucket
+    ORDER BY bucket
+"""
+
+_BUCKET_WIDTHS = dict(ROLLUP_RESOLUTIONS)
+
+
+def truncate(moment: datetime, resolution: str) -> datetime:
+    """Start of the bucket containing moment, as date_trunc() computes it"""
+    if resolution == 'minute':
+        return moment.replace(second=0, microsecond=0)
+    if resolution == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_range(start: datetime, end: datetime, resolution: str) -> Tuple[datetime, datetime]:
+    """Bucket-aligned bounds covering every bucket that overlaps [start, end)"""
+    aligned_end = truncate(end, resolution)
+    if aligned_end < end:
+        aligned_end += timedelta(seconds=_BUCKET_WIDTHS[resolution])
+    return truncate(start, resolution), aligned_end
+
+
+def choose_resolution(start: datetime, end: datetime, max_points: int) -> Tuple[str, int]:
+    """Finest resolution whose buckets over the window fit in max_points, else the coarsest"""
+    if end <= start:
+        raise ValueError("end must be after start")
+    if max_points < 1:
+        raise ValueError("max_points must be at least 1")
+
+    for resolution, width in ROLLUP_RESOLUTIONS:
+        aligned_start, aligned_end = bucket_range(start, end, resolution)
+        if (aligned_end - aligned_start).total_seconds() / width <= max_points:
+            return resolution, width
+    return ROLLUP_RESOLUTIONS[-1]
+
+
+def window_params(
+    nft_id: int,
+    start: datetime,
+    end: datetime,
+    resolution: str,
+    frequency: Optional[int] = None
+) -> tuple:
+    """Positional parameters for RESONANCE_WINDOW_QUERY"""
+    aligned_start, aligned_end = bucket_range(start, end, resolution)
+    return (
+        resolution, nft_id, aligned_start, aligned_end, frequency, frequency,
+        resolution, nft_id, aligned_start, aligned_end, frequency, frequency
+    )
+
+
+def shape_window(
+    nft_id: int,
+    start: datetime,
+    end: datetime,
+    max_points: int,
+    frequency: Optional[int],
+    resolution: str,
+    result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build the query_resonance_window report, merging adjacent buckets when a
+    window longer than max_points days still has too many; merging sum, count,
+    min and max keeps every point exact
+    """
+    width = _BUCKET_WIDTHS[resolution]
+    aligned_start, aligned_end = bucket_range(start, end, resolution)
+    factor = max(1, math.ceil((aligned_end - aligned_start).total_seconds() / width / max_points))
+    span = width * factor
+
+    merged: Dict[datetime, List[Any]] = {}
+    for bucket, count, total, low, high in result['rows']:
+        if factor > 1:
+            bucket = aligned_start + timedelta(seconds=(bucket - aligned_start).total_seconds() // span * span)
+        point = merged.get(bucket)
+        if point is None:
+            merged[bucket] = [int(count), total, low, high]
+        else:
+            point[0] += int(count)
+            point[1] += total
+            point[2] = min(point[2], low)
+            point[3] = max(point[3], high)
+
+    return {
+        'nft_id': nft_id,
+        'frequency': frequency,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'resolution': resolution,
+        'bucket_seconds': span,
+        'points': [
+            {
+                'bucket': bucket.isoformat(),
+                'samples': count,
+                'avg': float(total) / count,
+                'min': float(low),
+                'max': float(high)
+            }
+            for bucket, (count, total, low, high) in sorted(merged.items())
+        ]
+    }
@@ -0,0 +1,112 @@
+"""
+Schema Introspection for ScrollVerse
+Reads table columns, keys and foreign keys from pg_catalog in one round trip
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+# One row per column of every ordinary or partitioned table in the schema.
+# Partitions are skipped; they share their parent's model
+SCHEMA_INTROSPECTION_QUERY = """
+    SELECT
+        c.relname AS table_name,
+        a.attname AS column_name,
+        format_type(a.atttypid, a.atttypmod) AS data_type,
+        NOT a.attnotnull AS nullable,
+        pg_get_expr(d.adbin, d.adrelid) AS column_default,
+        COALESCE(k.is_primary_key, false) AS primary_key,
+        COALESCE(k.is_unique, false) AS is_unique,
+        fk.foreign_table,
+        fk.foreign_column,
+        col_description(c.oid, a.attnum) AS description
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+    LEFT JOIN LATERAL (
+        SELECT
+            bool_or(con.contype = 'p') AS is_primary_key,
+            bool_or(con.contype = 'u' AND cardinality(con.conkey) = 1) AS is_unique
+        FROM pg_constraint con
+        WHERE con.conrelid = c.oid AND con.contype IN ('p', 'u') AND a.attnum = ANY(con.conkey)
+    ) k ON true
+    LEFT JOIN LATERAL (
+        SELECT fc.relname AS foreign_table, fa.attname AS foreign_column
+        FROM pg_constraint con
+        JOIN pg_class fc ON fc.oid = con.confrelid
+        JOIN pg_attribute fa ON fa.attrelid = con.confrelid
+            AND fa.attnum = con.confkey[array_position(con.conkey, a.attnum)]
+        WHERE con.conrelid = c.oid AND con.contype = 'f' AND a.attnum = ANY(con.conkey)
+        ORDER BY con.conname
+        LIMIT 1
+    ) fk ON true
+    WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+    ORDER BY c.relname, a.attnum
+"""
+
+# format_type() spellings mapped to the generator's TYPE_MAPPING keys
+_TYPE_ALIASES = (
+    (re.compile(r'^character varying'), 'varchar'),
+    (re.compile(r'^character\b'), 'char'),
+    (re.compile(r'^timestamp(\(\d+\))? with time zone$'), 'timestamptz'),
+    (re.compile(r'^timestamp(\(\d+\))? without time zone$'), 'timestamp'),
+    (re.compile(r'^time(\(\d+\))? with(out)? time zone$'), 'time'),
+    (re.compile(r'^double precision$'), 'double')
+)
+
+
+def normalize_type(data_type: str, column_default: Optional[str] = None) -> str:
+    """Translate a format_type() name into the generator's type vocabulary"""
+    for pattern, alias in _TYPE_ALIASES:
+        if pattern.search(data_type):
+            data_type = pattern.sub(alias, data_type)
+            break
+    if column_default and column_default.startswith('nextval('):
+        return {'integer': 'serial', 'bigint': 'bigserial'}.get(data_type, data_type)
+    return data_type
+
+
+def shape_schema(result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Group introspection rows into generator schema dicts keyed by table"""
+    schemas: Dict[str, Dict[str, Any]] = {}
+    children: Dict[str, List[Dict[str, str]]] = {}
+
+    for row in (dict(zip(result['columns'], values)) for values in result['rows']):
+        schema = schemas.setdefault(row['table_name'], {'columns': [], 'relationships': []})
+        column = {
+            'name': row['column_name'],
+            'type': normalize_type(row['data_type'], row['column_default']),
+            'nullable': bool(row['nullable']),
+            'primary_key': bool(row['primary_key'])
+        }
+        if row['is_unique']:
+            column['unique'] = True
+        if row['column_default'] is not None:
+            column['default'] = row['column_default']
+        if row['description']:
+            column['description'] = row['description']
+        if row['foreign_table']:
+            column['references'] = {'table': row['foreign_table'], 'column': row['foreign_column']}
+            schema['relationships'].append(
+                {'type': 'belongsTo', 'table': row['foreign_table'], 'foreign_key': row['column_name']}
+            )
+            children.setdefault(row['foreign_table'], []).append(
+                {'type': 'hasMany', 'table': row['table_name'], 'foreign_key': row['column_name']}
+            )
+        schema['columns'].append(column)
+
+    for table_name, relationships in children.items():
+        if table_name in schemas:
+            schemas[table_name]['relationships'].extend(
+                sorted(relationships, key=lambda rel: (rel['table'], rel['foreign_key']))
+            )
+    return schemas
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable digest of one table's schema dict"""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode('utf-8')).hexdigest()
@@ -0,0 +1,80 @@
+"""
+Prepared Statement Cache for ScrollVerse
+Per-connection LRU of server-side prepared statements
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import itertools
+import re
+from collections import OrderedDict
+from typing import Optional
+
+PREPARABLE_STATEMENTS = ('select', 'insert', 'update', 'delete', 'with', 'values')
+# indeterminate_datatype and ambiguous_parameter: PREPARE cannot infer a parameter's type from the text
+UNPREPARABLE_SQLSTATES = ('42P18', '42P08')
+
+_SCHEMA_CHANGE_RE = re.compile(r'^\s*(create|alter|drop|truncate|comment|reindex)\b', re.IGNORECASE)
+_statement_ids = itertools.count(1)
+# Quoted literals and identifiers, whose whitespace is significant, or a run of whitespace
+_WHITESPACE_RE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace outside quotes so formatting differences share one cache entry"""
+    if "'" not in query and '"' not in query:
+        return ' '.join(query.split())
+    return _WHITESPACE_RE.sub(lambda match: match.group(1) or ' ', query).strip()
+
+
+def is_preparable(query: str) -> bool:
+    """Only plannable DML and queries can be PREPAREd"""
+    return query.lstrip().lower().startswith(PREPARABLE_STATEMENTS)
+
+
+def is_unpreparable_error(error: Exception) -> bool:
+    """PREPARE failed because of the statement text, so it will fail the same way every time"""
+    return getattr(error, 'pgcode', None) in UNPREPARABLE_SQLSTATES
+
+
+def is_schema_change(query: str) -> bool:
+    """DDL that can change the result types of cached plans"""
+    return bool(_SCHEMA_CHANGE_RE.match(query))
+
+
+def next_statement_name() -> str:
+    """Unique server-side statement name"""
+    return f"scrollverse_stmt_{next(_statement_ids)}"
+
+
+class StatementCache:
+    """
+    Bounded LRU mapping normalized SQL to prepared statement names
+    One instance lives on each pooled connection, because PostgreSQL prepared
+    statements are scoped to the session that created them
+    """
+
+    def __init__(self, capacity: int, generation: int = 0):
+        """Initialize an empty cache"""
+        self.capacity = capacity
+        self.generation = generation
+        self._statements: 'OrderedDict[str, str]' = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of statements currently prepared on the connection"""
+        return len(self._statements)
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a statement name and mark it most recently used"""
+        name = self._statements.get(key)
+        if name is not None:
+            self._statements.move_to_end(key)
+        return name
+
+    def put(self, key: str, name: str) -> Optional[str]:
+        """Remember a prepared statement, returning the evicted name if the cache was full"""
+        self._statements[key] = name
+        self._statements.move_to_end(key)
+        if len(self._statements) > self.capacity:
+            _, evicted = self._statements.popitem(last=False)
+            return evicted
+        return None
@@ -0,0 +1,10 @@
+"""
+Test configuration for the ScrollVerse database scripts
+Puts scripts/database on sys.path so tests import its modules the way the scripts do
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+"""
+Tests for columnar fetching
+The binary COPY decoder and the row fallback must agree on dtypes and NULL fill values
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import struct
+from datetime import date, datetime
+
+import pytest
+
+from arrays import COPY_SIGNATURE, PG_EPOCH_DAYS, PG_EPOCH_MICROSECONDS, arrays_from_rows, copy_query, decode_copy
+
+np = pytest.importorskip('numpy')
+
+# integer, date, timestamp
+TYPE_OIDS = [23, 1082, 1114]
+NAMES = ['frequency', 'day', 'at']
+ROWS = [
+    (528, date(2025, 12, 7), datetime(2025, 12, 7, 13, 0, 0)),
+    (None, None, None)
+]
+# What COPY sends for the second row: the COALESCE targets copy_query selects
+UNIX_EPOCH = (-PG_EPOCH_DAYS, -PG_EPOCH_MICROSECONDS)
+
+
+def wire(frequency: int, day: int, micros: int, null: bool) -> bytes:
+    """One copy_query tuple: every column as (value, IS NULL)"""
+    return (
+        struct.pack('>h', 6)
+        + struct.pack('>ii', 4, frequency) + struct.pack('>i?', 1, null)
+        + struct.pack('>ii', 4, day) + struct.pack('>i?', 1, null)
+        + struct.pack('>iq', 8, micros) + struct.pack('>i?', 1, null)
+    )
+
+
+def copy_buffer() -> bytes:
+    """Binary COPY output of ROWS as the server sends it for copy_query"""
+    day = (date(2025, 12, 7) - date(2000, 1, 1)).days
+    micros = int((datetime(2025, 12, 7, 13, 0, 0) - datetime(2000, 1, 1)).total_seconds() * 1000000)
+    header = COPY_SIGNATURE + struct.pack('>ii', 0, 0)
+    return header + wire(528, day, micros, False) + wire(0, *UNIX_EPOCH, True) + struct.pack('>h', -1)
+
+
+def test_copy_query_fills_nulls_with_the_unix_epoch():
+    query = copy_query('SELECT frequency, day, at FROM t', TYPE_OIDS, NAMES)
+    assert "'1970-01-01'::date" in query
+    assert "'1970-01-01'::timestamp" in query
+
+
+def test_copy_and_row_fallback_agree():
+    copied, copied_nulls = decode_copy(copy_buffer(), NAMES, TYPE_OIDS)
+    fetched, fetched_nulls = arrays_from_rows(NAMES, ROWS, TYPE_OIDS)
+
+    for name in NAMES:
+        assert copied[name].dtype == fetched[name].dtype
+        assert copied[name].tolist() == fetched[name].tolist()
+        assert copied_nulls[name].tolist() == fetched_nulls[name].tolist() == [False, True]
+    assert fetched['frequency'].dtype == np.int32
+    assert fetched['day'][1] == np.datetime64('1970-01-01')
@@ -0,0 +1,80 @@
+"""
+Tests for AsyncPostgreSQLClient
+Concurrent fan-out over the async pool against the fake latency backend
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import asyncio
+import time
+
+from async_client import AsyncPostgreSQLClient
+from drivers import AsyncFakeDriver
+from fakes import scrollverse_sample_backend
+from postgresql_client import AUTOVACUUM_SETTINGS_QUERY, load_env_config
+
+SLOW, FAST = 0.2, 0.05
+
+
+def latency(sql: str) -> float:
+    """One slow dashboard read, the rest fast"""
+    return SLOW if sql == AUTOVACUUM_SETTINGS_QUERY else FAST
+
+
+class ConcurrencyCounter(AsyncFakeDriver):
+    """Fake driver that records how many statements were in flight at once"""
+
+    def __init__(self, backend):
+        """Start with nothing in flight"""
+        super().__init__(backend)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute(self, connection, query, params=None):
+        """Count the statement while its simulated latency runs"""
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().execute(connection, query, params)
+        finally:
+            self.in_flight -= 1
+
+
+def timed_dashboard(max_connections: int):
+    """Fetch the dashboard on a fresh client and return (dashboard, seconds, peak concurrency)"""
+    config = {**load_env_config(), 'driver': 'fake', 'min_connections': 1, 'max_connections': max_connections}
+    driver = ConcurrencyCounter(scrollverse_sample_backend(latency=latency))
+
+    async def run():
+        async with AsyncPostgreSQLClient(config, driver=driver) as client:
+            started = time.perf_counter()
+            dashboard = await client.dashboard()
+            return dashboard, time.perf_counter() - started, driver.peak
+
+    return asyncio.run(run())
+
+
+def test_dashboard_takes_the_slowest_read_not_the_sum():
+    dashboard, elapsed, peak = timed_dashboard(max_connections=10)
+    assert [nft['token_id'] for nft in dashboard['nfts']]
+    assert dashboard['frequencies']
+    # All five reads overlap; the wall clock only bounds from below, since loaded hosts run slow
+    assert peak == 5
+    assert elapsed >= SLOW
+
+
+def test_single_connection_pool_serializes_the_reads():
+    _, elapsed, peak = timed_dashboard(max_connections=1)
+    assert peak == 1
+    assert elapsed >= SLOW + 4 * FAST
+
+
+def test_gather_returns_results_in_argument_order():
+    config = {**load_env_config(), 'driver': 'fake'}
+    driver = AsyncFakeDriver(scrollverse_sample_backend(latency=lambda sql: FAST))
+
+    async def run():
+        async with AsyncPostgreSQLClient(config, driver=driver) as client:
+            return await client.gather(*(client.query_nft_metadata(token) for token in ('NFT-003', 'NFT-001', 'NFT-002')))
+
+    results = asyncio.run(run())
+    assert [rows[0]['token_id'] for rows in results] == ['NFT-003', 'NFT-001', 'NFT-002']
@@ -0,0 +1,140 @@
+"""
+Tests for the COPY bulk writer
+Size and interval flushes, backpressure and failed batches handed back to the caller
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from bulk_writer import BackpressureTimeout, BulkWriterError, ResonanceBulkWriter
+
+COLUMNS = ('nft_id', 'frequency', 'timestamp')
+AT = datetime(2025, 12, 7, 13, 0, 0)
+
+
+class CopyRecorder:
+    """Client stand-in that records each COPY, and can fail or hold them"""
+
+    def __init__(self):
+        """Start healthy and unblocked"""
+        self.copies = []
+        self.failures = 0
+        self.released = threading.Event()
+        self.released.set()
+
+    def copy_from_stdin(self, table, columns, data):
+        """Wait until released, then fail or record the COPY lines"""
+        self.released.wait(5.0)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('could not extend file')
+        self.copies.append(data.splitlines())
+
+
+def reading(nft_id: int) -> dict:
+    """One measurement for the test columns"""
+    return {'nft_id': nft_id, 'frequency': 528, 'timestamp': AT}
+
+
+def line(nft_id: int) -> str:
+    """The COPY text line reading(nft_id) encodes to"""
+    return f"{nft_id}\t528\t{AT.isoformat()}"
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    """Poll until predicate() holds or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_full_batches_flush_without_waiting_for_the_interval():
+    client = CopyRecorder()
+    writer = ResonanceBulkWriter(client, batch_size=3, flush_interval=60.0, columns=COLUMNS).start()
+    try:
+        writer.add_many(reading(i) for i in range(7))
+        assert wait_until(lambda: len(client.copies) == 2)
+        assert client.copies == [[line(0), line(1), line(2)], [line(3), line(4), line(5)]]
+        assert writer.stats()['buffered'] == 1
+    finally:
+        writer.close()
+    assert client.copies[-1] == [line(6)]
+    assert writer.stats()['rows_written'] == 7
+
+
+def test_partial_batch_flushes_after_the_interval():
+    client = CopyRecorder()
+    writer = ResonanceBulkWriter(client, batch_size=1000, flush_interval=0.05, columns=COLUMNS).start()
+    try:
+        writer.add(reading(1))
+        writer.add(reading(2))
+        assert wait_until(lambda: len(client.copies) == 1)
+        assert client.copies == [[line(1), line(2)]]
+        assert writer.stats()['buffered'] == 0
+    finally:
+        writer.close()
+
+
+def test_full_queue_raises_backpressure_timeout():
+    client = CopyRecorder()
+    client.released.clear()
+    writer = ResonanceBulkWriter(
+        client, batch_size=1, flush_interval=60.0, max_pending_batches=1, put_timeout=0.05, columns=COLUMNS
+    ).start()
+    try:
+        # One batch held in COPY, one queued: the next has nowhere to go
+        writer.add(reading(1))
+        writer.add(reading(2))
+        with pytest.raises(BackpressureTimeout):
+            writer.add(reading(3))
+        stats = writer.stats()
+        assert stats['backpressure_waits'] >= 1
+        assert stats['backpressure_seconds'] >= 0.05
+    finally:
+        client.released.set()
+        writer.close()
+    assert client.copies == [[line(1)], [line(2)]]
+
+
+def test_failed_batches_are_handed_back_and_can_be_retried():
+    client = CopyRecorder()
+    client.failures = 2
+    writer = ResonanceBulkWriter(client, batch_size=2, flush_interval=60.0, columns=COLUMNS).start()
+    try:
+        writer.add_many(reading(i) for i in range(5))
+        with pytest.raises(BulkWriterError) as raised:
+            writer.flush()
+        error = raised.value
+        assert error.batches == [[line(0), line(1)], [line(2), line(3)]]
+        assert [str(e) for e in error.errors] == ['could not extend file'] * 2
+        assert isinstance(error.__cause__, RuntimeError)
+        assert writer.stats()['rows_failed'] == 4
+
+        writer.retry(error)
+        writer.flush()
+    finally:
+        writer.close()
+    assert sorted(sum(client.copies, [])) == [line(i) for i in range(5)]
+    assert writer.stats()['rows_written'] == 5
+
+
+def test_failure_surfaces_on_the_next_add():
+    client = CopyRecorder()
+    client.failures = 1
+    writer = ResonanceBulkWriter(client, batch_size=1, flush_interval=60.0, columns=COLUMNS).start()
+    try:
+        writer.add(reading(1))
+        assert wait_until(lambda: writer.stats()['rows_failed'] == 1)
+        with pytest.raises(BulkWriterError) as raised:
+            writer.add(reading(2))
+        assert raised.value.batches == [[line(1)]]
+    finally:
+        writer.close()
+    assert client.copies == []
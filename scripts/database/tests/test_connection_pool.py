@@ -0,0 +1,144 @@
+"""
+Tests for the connection pool
+Sizing under concurrency, checkout timeouts, idle reaping, liveness checks and stats
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import threading
+import time
+
+import pytest
+
+from connection_pool import ConnectionPool, PoolTimeoutError
+from drivers import FakeBackend, FakeDriver
+
+
+def make_pool(backend: FakeBackend, **settings) -> ConnectionPool:
+    """An open pool over the backend with no background reaper unless asked for"""
+    pool = ConnectionPool(FakeDriver(backend), {}, **{'reap_interval': None, **settings})
+    pool.open()
+    return pool
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    """Poll until predicate() holds or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_concurrent_checkouts_never_exceed_max_size():
+    backend = FakeBackend(max_connections=3)
+    pool = make_pool(backend, min_size=0, max_size=3)
+    # Holders wait for each other, so every round fills the pool before anyone returns
+    full = threading.Barrier(3, timeout=5.0)
+    lock = threading.Lock()
+    in_use = [0, 0]
+    errors = []
+
+    def worker():
+        try:
+            with pool.connection(timeout=5.0):
+                with lock:
+                    in_use[0] += 1
+                    in_use[1] = max(in_use[1], in_use[0])
+                full.wait()
+                with lock:
+                    in_use[0] -= 1
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = pool.stats()
+    pool.close()
+
+    assert errors == []
+    assert in_use[1] == 3
+    assert stats['created'] == 3
+    assert stats['checkouts'] == 12
+    assert backend.stats['connections_opened'] == 3
+
+
+def test_checkout_times_out_when_the_pool_is_exhausted():
+    pool = make_pool(FakeBackend(), min_size=0, max_size=1)
+    held = pool.acquire()
+    try:
+        started = time.monotonic()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(timeout=0.05)
+        assert time.monotonic() - started >= 0.05
+        assert pool.stats()['timeouts'] == 1
+    finally:
+        pool.release(held)
+        pool.close()
+
+
+def test_reaper_shrinks_idle_connections_to_min_size():
+    backend = FakeBackend()
+    pool = make_pool(backend, min_size=1, max_size=4, idle_timeout=0.05, reap_interval=0.02)
+    try:
+        connections = [pool.acquire() for _ in range(4)]
+        for connection in connections:
+            pool.release(connection)
+        assert pool.stats()['idle'] == 4
+
+        assert wait_until(lambda: pool.stats()['size'] == 1)
+        stats = pool.stats()
+        assert stats['reaped'] == 3
+        assert stats['idle'] == 1
+        assert backend.open_connections == 1
+    finally:
+        pool.close()
+
+
+def test_killed_connections_are_replaced_on_checkout():
+    backend = FakeBackend()
+    pool = make_pool(backend, min_size=2, max_size=2, ping_interval=0)
+    try:
+        backend.kill_connections()
+        with pool.connection() as connection:
+            assert connection.ping()
+            assert not connection.broken
+        stats = pool.stats()
+        # Both idle connections fail the ping and are closed before a fresh one is opened
+        assert stats['liveness_failures'] == 2
+        assert stats['closed'] == 2
+        assert stats['created'] == 3
+        assert stats['size'] == 1
+        assert backend.open_connections == 1
+    finally:
+        pool.close()
+
+
+def test_stats_report_in_use_waiting_and_wait_time():
+    pool = make_pool(FakeBackend(), min_size=0, max_size=1)
+    held = pool.acquire()
+    waited = []
+    waiter = threading.Thread(target=lambda: waited.append(pool.acquire(timeout=2.0)))
+    try:
+        waiter.start()
+        assert wait_until(lambda: pool.stats()['waiting'] == 1)
+        stats = pool.stats()
+        assert stats['in_use'] == 1
+        assert stats['idle'] == 0
+
+        time.sleep(0.05)
+        pool.release(held)
+        waiter.join()
+        stats = pool.stats()
+        assert stats['waiting'] == 0
+        assert stats['in_use'] == 1
+        assert stats['checkouts'] == 2
+        assert stats['wait_time_max'] >= 0.05
+        assert stats['wait_time_avg'] == pytest.approx(stats['wait_time_total'] / 2)
+    finally:
+        for connection in waited:
+            pool.release(connection)
+        pool.close()
@@ -0,0 +1,391 @@
+"""
+Tests for the generated dataclass models
+Codecs, validators, batches, query helpers and incremental generation, run from the generated source
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import copy
+import importlib.util
+import json
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from dataclass_generator import DataclassGenerator, schema_hash
+from drivers import FakeDriver
+from fakes import scrollverse_sample_backend
+from postgresql_client import PostgreSQLClient, load_env_config
+
+READINGS = {
+    'columns': [
+        {'name': 'id', 'type': 'integer', 'nullable': False, 'primary_key': True},
+        {'name': 'level', 'type': 'double precision', 'nullable': True, 'primary_key': False},
+        {'name': 'gain', 'type': 'real', 'nullable': True, 'primary_key': False}
+    ]
+}
+AT = datetime(2025, 12, 7, 13, 0, 0)
+
+
+def load_model(tmp_path, table_name: str, schema: dict, **options):
+    """Generate a table's model into tmp_path and import it"""
+    filepath = DataclassGenerator(output_dir=str(tmp_path), **options).generate_and_save(table_name, schema)
+    name = f"{table_name}_model_{len(sys.modules)}"
+    spec = importlib.util.spec_from_file_location(name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    # dataclass() resolves the class's module through sys.modules
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf')])
+def test_non_finite_floats_encode_as_valid_json(tmp_path, value):
+    model = load_model(tmp_path, 'readings', READINGS)
+    reading = model.Readings(id=1, level=value, gain=2.5)
+
+    text = reading.to_json()
+    data = json.loads(text, parse_constant=lambda constant: pytest.fail(f"bare {constant} in {text}"))
+    assert isinstance(data['level'], str)
+    assert data['gain'] == 2.5
+
+    restored = model.Readings.from_json(text)
+    assert math.isnan(restored.level) if math.isnan(value) else restored.level == value
+    assert restored.gain == 2.5
+    assert model.Readings.decode(reading.encode()).to_json() == text
+
+
+def fake_schemas() -> dict:
+    """Introspected schemas of every table in the fake catalog"""
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(scrollverse_sample_backend()))
+    client.connect()
+    try:
+        return client.introspect_schema()
+    finally:
+        client.close()
+
+
+def test_incremental_generation_skips_unchanged_tables(tmp_path):
+    schemas = fake_schemas()
+    generator = DataclassGenerator(output_dir=str(tmp_path))
+    first = generator.generate_incremental(schemas)
+    assert len(first['generated']) == len(schemas)
+    written = {path: os.path.getmtime(path) for path in first['generated']}
+
+    second = generator.generate_incremental(copy.deepcopy(schemas))
+    assert second['generated'] == []
+    assert sorted(second['unchanged']) == sorted(schemas)
+    assert {path: os.path.getmtime(path) for path in written} == written
+
+
+def test_incremental_generation_regenerates_a_changed_table(tmp_path):
+    schemas = fake_schemas()
+    generator = DataclassGenerator(output_dir=str(tmp_path))
+    generator.generate_incremental(schemas)
+
+    schemas['scroll_souls']['columns'].append(
+        {'name': 'aura_color', 'type': 'varchar(20)', 'nullable': True, 'primary_key': False}
+    )
+    result = generator.generate_incremental(schemas)
+    assert [os.path.basename(path) for path in result['generated']] == ['scroll_souls_model.py']
+    assert len(result['unchanged']) == len(schemas) - 1
+    assert 'aura_color: Optional[str]' in (tmp_path / 'scroll_souls_model.py').read_text()
+
+    with open(tmp_path / DataclassGenerator.MANIFEST_FILENAME) as handle:
+        manifest = json.load(handle)
+    assert manifest['tables']['scroll_souls']['hash'] == schema_hash(schemas['scroll_souls'])
+
+
+def test_incremental_generation_prunes_dropped_tables(tmp_path):
+    schemas = fake_schemas()
+    generator = DataclassGenerator(output_dir=str(tmp_path))
+    generator.generate_incremental(schemas)
+
+    del schemas['nft_frequencies_dirty']
+    result = generator.generate_incremental(schemas)
+    assert result['generated'] == []
+    assert result['removed'] == [str(tmp_path / 'nft_frequencies_dirty_model.py')]
+    assert not (tmp_path / 'nft_frequencies_dirty_model.py').exists()
+
+    with open(tmp_path / DataclassGenerator.MANIFEST_FILENAME) as handle:
+        assert 'nft_frequencies_dirty' not in json.load(handle)['tables']
+
+
+def add_nfts(backend, count: int):
+    """Extra nft_metadata rows after the sample ones"""
+    rows = backend.tables['nft_metadata']['rows']
+    for _ in range(count):
+        backend.tables['nft_metadata']['last_id'] += 1
+        nft_id = backend.tables['nft_metadata']['last_id']
+        rows.append({'id': nft_id, 'token_id': f"NFT-{nft_id:03d}", 'name': f"Sovereign {nft_id}", 'frequency': 528})
+
+
+@pytest.fixture(params=['client', 'dbapi'])
+def fake_connection(request):
+    """(backend, connection) as a PostgreSQLClient or a bare DB-API connection, which the helpers both accept"""
+    backend = scrollverse_sample_backend()
+    if request.param == 'dbapi':
+        connection = FakeDriver(backend).connect({})
+        yield backend, connection
+        connection.close()
+        return
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    yield backend, client
+    client.close()
+
+
+def test_get_all_pages_by_key_across_page_boundaries(tmp_path, fake_connection):
+    backend, connection = fake_connection
+    add_nfts(backend, 4)
+    model = load_model(tmp_path, 'nft_metadata', fake_schemas()['nft_metadata'])
+    query = model.NftMetadataQuery
+
+    pages, after = [], None
+    while True:
+        page = query.get_all(connection, limit=3, after=after)
+        pages.append([nft.id for nft in page])
+        if len(page) < 3:
+            break
+        after = page[-1].id
+    assert pages == [[1, 2, 3], [4, 5, 6], [7]]
+
+    # A last page that is exactly full is followed by one empty page
+    assert [nft.id for nft in query.get_all(connection, limit=3, after=4)] == [5, 6, 7]
+    assert query.get_all(connection, limit=3, after=7) == []
+    assert [nft.id for nft in query.iter_all(connection, page_size=7)] == list(range(1, 8))
+    assert [nft.token_id for nft in query.iter_all(connection, page_size=2)][-2:] == ['NFT-006', 'NFT-007']
+
+
+def test_get_all_pages_by_composite_key(tmp_path, fake_connection):
+    backend, connection = fake_connection
+    backend.tables['nft_state_snapshots']['rows'].extend(
+        {'nft_id': nft_id, 'events': events, 'event_id': events, 'created_at': AT}
+        for nft_id in (2, 1) for events in (10, 0, 5)
+    )
+    model = load_model(tmp_path, 'nft_state_snapshots', fake_schemas()['nft_state_snapshots'])
+    query = model.NftStateSnapshotsQuery
+
+    page = query.get_all(connection, limit=4, after=(1, 5))
+    assert [(s.nft_id, s.events) for s in page] == [(1, 10), (2, 0), (2, 5), (2, 10)]
+    assert [(s.nft_id, s.events) for s in query.iter_all(connection, page_size=4)] == [
+        (1, 0), (1, 5), (1, 10), (2, 0), (2, 5), (2, 10)
+    ]
+    assert query.get_by_id(connection, (2, 5)).event_id == 5
+
+
+def test_load_relation_groups_children_from_one_query(tmp_path, fake_connection):
+    backend, connection = fake_connection
+    schemas = fake_schemas()
+    nfts = load_model(tmp_path, 'nft_metadata', schemas['nft_metadata'])
+    layers = load_model(tmp_path, 'frequency_layers', schemas['frequency_layers'])
+
+    queries = backend.stats['queries']
+    grouped = nfts.NftMetadataQuery.load_frequency_layers(connection, [3, 1, 1, None, 99])
+    assert backend.stats['queries'] == queries + 1
+    sql, params = backend.executed[-1]
+    assert sql == 'SELECT * FROM "frequency_layers" WHERE "nft_id" = ANY(%s)'
+    assert params == ([3, 1, 99],)
+
+    assert list(grouped) == [3, 1, 99]
+    assert grouped[99] == []
+    assert [row['layer_depth'] for row in grouped[1]] == [1, 2, 3]
+    assert {row['nft_id'] for row in grouped[3]} == {3}
+
+    typed = nfts.NftMetadataQuery.load_frequency_layers(connection, [1], model=layers.FrequencyLayers)
+    assert all(isinstance(layer, layers.FrequencyLayers) for layer in typed[1])
+    assert [layer.id for layer in typed[1]] == [row['id'] for row in grouped[1]]
+
+    parents = layers.FrequencyLayersQuery.load_nft_metadata(connection, [1, 3])
+    assert {nft_id: row['token_id'] for nft_id, row in parents.items()} == {1: 'NFT-001', 3: 'NFT-003'}
+
+
+def frequency(model, id: int, frequency: int, **fields):
+    """An akashic_frequencies row that passes every check unless fields override it"""
+    values = {'type': 'Miracle Tone', 'resonance': Decimal('1.00'), 'chakra_alignment': 'Solar Plexus', **fields}
+    return model.AkashicFrequencies(id=id, frequency=frequency, **values)
+
+
+@pytest.fixture
+def frequencies_model(tmp_path):
+    """Slotted akashic_frequencies model with its batch, from the fake catalog"""
+    return load_model(tmp_path, 'akashic_frequencies', fake_schemas()['akashic_frequencies'], slots=True, batches=True)
+
+
+def test_varchar_length_counts_only_non_space_overflow(frequencies_model):
+    assert frequency(frequencies_model, 1, 528, chakra_alignment='x' * 50).validate()
+    # PostgreSQL truncates trailing spaces past the limit instead of rejecting them
+    assert frequency(frequencies_model, 1, 528, chakra_alignment='x' * 50 + '   ').validate()
+    assert frequency(frequencies_model, 1, 528, chakra_alignment='x' * 51).violations() == [
+        ('chakra_alignment', 'value too long for varchar(50)')
+    ]
+
+
+def test_not_null_columns_without_defaults_are_required(frequencies_model):
+    row = frequency(frequencies_model, 1, 528, type=None, created_at=None)
+    # created_at has a default and the serial id comes from its sequence
+    assert row.violations() == [('type', 'null value violates not-null constraint')]
+    assert frequency(frequencies_model, None, 528).validate()
+
+
+@pytest.mark.parametrize('resonance, valid', [
+    (Decimal('999.99'), True),
+    (Decimal('999.994'), True),
+    (Decimal('999.995'), False),
+    (Decimal('-1000'), False),
+    (Decimal('0.001'), True)
+])
+def test_decimal_overflow_after_rounding_to_scale(frequencies_model, resonance, valid):
+    row = frequency(frequencies_model, 1, 528, resonance=resonance)
+    assert row.violations() == ([] if valid else [('resonance', 'numeric field overflow for numeric(5,2)')])
+
+
+def test_validate_many_reports_duplicate_keys_by_index(frequencies_model):
+    rows = [
+        frequency(frequencies_model, 1, 528),
+        frequency(frequencies_model, 2, 639),
+        frequency(frequencies_model, 1, 528, type=None),
+        frequency(frequencies_model, 3, 639),
+        frequency(frequencies_model, 4, 963)
+    ]
+    assert frequencies_model.AkashicFrequencies.validate_many(rows) == {
+        2: [
+            ('type', 'null value violates not-null constraint'),
+            ('id', 'duplicate key, first at row 0'),
+            ('frequency', 'duplicate key, first at row 0')
+        ],
+        3: [('frequency', 'duplicate key, first at row 1')]
+    }
+    # Tuples in column order and column mappings are checked the same way
+    assert frequencies_model.AkashicFrequencies.validate_many([row.to_tuple() for row in rows]) == (
+        frequencies_model.AkashicFrequencies.validate_many(rows)
+    )
+    columns = {'id': [1, 2, 2], 'frequency': [528, 639, 741], 'type': ['a', 'b', 'c'], 'resonance': [Decimal(1)] * 3}
+    assert frequencies_model.AkashicFrequencies.validate_many(columns) == {2: [('id', 'duplicate key, first at row 1')]}
+
+
+def test_validate_many_checks_a_batch(frequencies_model):
+    rows = [
+        frequency(frequencies_model, 1, 528).to_tuple(),
+        frequency(frequencies_model, 2, 528, chakra_alignment='x' * 51).to_tuple(),
+        frequency(frequencies_model, 3, 639, resonance=Decimal('999.995')).to_tuple()
+    ]
+    batch = frequencies_model.AkashicFrequenciesBatch.from_rows(rows)
+    assert frequencies_model.AkashicFrequencies.validate_many(batch) == {
+        1: [('chakra_alignment', 'value too long for varchar(50)'), ('frequency', 'duplicate key, first at row 0')],
+        2: [('resonance', 'numeric field overflow for numeric(5,2)')]
+    }
+    assert frequencies_model.AkashicFrequencies.validate_many(batch[:1]) == {}
+
+
+def nft_row(id: int, **fields) -> tuple:
+    """An nft_metadata row tuple in column order"""
+    values = {
+        'token_id': f"NFT-{id:03d}", 'name': 'Sovereign Genesis', 'frequency': 528, 'metadata_uri': None,
+        'description': None, 'image_uri': None, 'attributes': {'element': 'aether'}, 'created_at': AT,
+        'updated_at': AT, 'creator_address': None, 'owner_address': '0x' + 'ab' * 20,
+        'evolution_stage': 'Genesis', 'resonance_level': Decimal('1.25'), **fields
+    }
+    return (id, *values.values())
+
+
+@pytest.fixture
+def nft_model(tmp_path):
+    """Slotted nft_metadata model with its batch, from the fake catalog"""
+    return load_model(tmp_path, 'nft_metadata', fake_schemas()['nft_metadata'], slots=True, batches=True)
+
+
+def test_slotted_rows_round_trip_through_tuples(nft_model):
+    row = nft_row(1, frequency=None, resonance_level=Decimal('-0.50'))
+    nft = nft_model.NftMetadata.from_row(row)
+    assert nft.frequency is None and nft.resonance_level == Decimal('-0.50')
+    assert nft.to_tuple() == row
+    assert nft_model.NftMetadata.from_row(nft.to_tuple()) == nft
+    assert nft_model.NftMetadata.COLUMNS == tuple(col['name'] for col in fake_schemas()['nft_metadata']['columns'])
+
+    # Slots: no per-instance dict, and unknown attributes are refused
+    assert not hasattr(nft, '__dict__')
+    with pytest.raises(AttributeError):
+        nft.aura = 'gold'
+
+
+def test_slotted_rows_load_from_the_generated_select(nft_model):
+    backend = scrollverse_sample_backend()
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    try:
+        rows = client.execute_query(nft_model.NftMetadataQuery.SELECT)['rows']
+        nfts = [nft_model.NftMetadata.from_row(row) for row in rows]
+        assert [nft.to_tuple() for nft in nfts] == rows
+        assert nfts[0] == nft_model.NftMetadataQuery.get_by_id(client, 1)
+    finally:
+        client.close()
+
+
+def test_batch_stores_decimals_scaled_and_timestamps_as_epoch_microseconds(nft_model):
+    later = datetime(2026, 3, 1, 8, 30, 15, 250)
+    rows = [nft_row(1), nft_row(2, resonance_level=Decimal('-3.07'), created_at=later)]
+    batch = nft_model.NftMetadataBatch.from_rows(rows)
+
+    assert nft_model.NftMetadataBatch.SCALES == {'resonance_level': 2}
+    assert list(batch.resonance_level) == [125, -307]
+    assert batch.resonance_level.typecode == 'q'
+    assert list(batch.created_at) == [
+        (AT - datetime(1970, 1, 1)) // timedelta(microseconds=1),
+        (later - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+    ]
+    assert list(batch.rows()) == rows
+
+    appended = nft_model.NftMetadataBatch()
+    appended.extend(rows)
+    assert list(appended.rows()) == rows
+    assert list(appended.created_at) == list(batch.created_at)
+
+
+def test_batch_tracks_nulls_in_typed_columns(nft_model):
+    rows = [nft_row(1), nft_row(2, frequency=None, resonance_level=None, created_at=None), nft_row(3)]
+    batch = nft_model.NftMetadataBatch.from_rows(rows)
+
+    assert batch._nulls['frequency'] == bytearray([0, 1, 0])
+    assert batch._nulls['resonance_level'] == bytearray([0, 1, 0])
+    assert batch._nulls['created_at'] == bytearray([0, 1, 0])
+    # The array keeps a placeholder; the mask decides what row() returns
+    assert batch.frequency[1] == 0
+    assert batch.row(1) == rows[1]
+    assert batch[1].frequency is None
+
+
+def test_batch_take_filter_and_slices_carry_nulls(nft_model):
+    rows = [nft_row(i, frequency=None if i % 2 else 528) for i in range(1, 6)]
+    batch = nft_model.NftMetadataBatch.from_rows(rows)
+
+    taken = batch.take([4, 0, 1])
+    assert list(taken.rows()) == [rows[4], rows[0], rows[1]]
+    assert taken._nulls['frequency'] == bytearray([1, 1, 0])
+
+    kept = batch.filter([row[3] is not None for row in rows])
+    assert [nft.id for nft in kept] == [2, 4]
+    assert kept._nulls['frequency'] == bytearray([0, 0])
+
+    sliced = batch[1:4]
+    assert len(sliced) == 3
+    assert list(sliced.rows()) == rows[1:4]
+    assert isinstance(batch[2], nft_model.NftMetadata)
+    assert batch[-1].to_tuple() == rows[-1]
+    assert len(batch.take([])) == 0
+
+
+def test_batch_columns_become_masked_numpy_arrays(nft_model):
+    np = pytest.importorskip('numpy')
+    rows = [nft_row(1), nft_row(2, frequency=None), nft_row(3, frequency=963)]
+    batch = nft_model.NftMetadataBatch.from_rows(rows)
+
+    frequencies = batch.column('frequency')
+    assert isinstance(frequencies, np.ma.MaskedArray)
+    assert frequencies.mask.tolist() == [False, True, False]
+    assert int(frequencies.sum()) == 528 + 963
+    assert batch.column('resonance_level').tolist() == [125, 125, 125]
+    assert [nft.id for nft in batch.filter(batch.column('id') > 1)] == [2, 3]
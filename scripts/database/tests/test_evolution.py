@@ -0,0 +1,108 @@
+"""
+Tests for the evolution replayer
+Snapshot-accelerated point-in-time reads against a full replay, and periodic snapshot refreshes
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from drivers import FakeDriver
+from evolution import EvolutionReplayer
+from fakes import scrollverse_sample_backend
+from fakes.tables import CREATED_AT
+from postgresql_client import PostgreSQLClient, load_env_config
+
+# (id, hours after creation, to_stage, frequency_shift, resonance_change); ids 11-13 share a moment
+EVENTS = [
+    (10, 1, 'Awakened', 3, Decimal('0.10')),
+    (13, 2, None, 5, Decimal('0.05')),
+    (11, 2, 'Ascended', -2, Decimal('0.20')),
+    (12, 2, None, 7, None),
+    (14, 3, 'Sovereign', 1, Decimal('-0.15')),
+    (16, 4, None, 4, Decimal('0.30')),
+    (15, 4, 'Transcendent', None, Decimal('0.01'))
+]
+
+
+def hours(n: float):
+    """The moment n hours after the sample NFTs were created"""
+    return CREATED_AT + timedelta(hours=n)
+
+
+def add_events(backend, nft_id: int, events):
+    """Record evolutions of an NFT and move its metadata to the state they end in"""
+    nft = next(row for row in backend.tables['nft_metadata']['rows'] if row['id'] == nft_id)
+    stage = nft['evolution_stage']
+    for event_id, at, to_stage, frequency_shift, resonance_change in sorted(events, key=lambda e: (e[1], e[0])):
+        backend.tables['nft_evolution_history']['rows'].append({
+            'id': event_id, 'nft_id': nft_id, 'from_stage': stage, 'to_stage': to_stage,
+            'frequency_shift': frequency_shift, 'resonance_change': resonance_change,
+            'evolution_timestamp': hours(at)
+        })
+        stage = to_stage or stage
+        nft['frequency'] += frequency_shift or 0
+        nft['resonance_level'] += resonance_change or 0
+    nft['evolution_stage'] = stage
+
+
+def make_replayer(backend, **settings) -> EvolutionReplayer:
+    """Replayer on a connected fake client"""
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    return EvolutionReplayer(client, **settings)
+
+
+def snapshots(backend, nft_id: int) -> list:
+    """(events, event_id) of each stored snapshot of an NFT"""
+    return sorted(
+        (int(row['events']), int(row['event_id']))
+        for row in backend.tables['nft_state_snapshots']['rows'] if int(row['nft_id']) == nft_id
+    )
+
+
+def test_states_from_snapshots_match_a_full_replay_from_genesis():
+    backend = scrollverse_sample_backend()
+    add_events(backend, 1, EVENTS)
+    replayer = make_replayer(backend, snapshot_interval=3)
+    moments = [None, hours(0), hours(1.5), hours(2), hours(3), hours(4), hours(5)]
+
+    replayed = [{i: s.as_dict() for i, s in replayer.states_at([1, 2], at).items()} for at in moments]
+    replayer.refresh_snapshots()
+    # The snapshot after three events sits between events 12 and 13, which share a timestamp
+    assert snapshots(backend, 1) == [(0, 0), (3, 12), (6, 15)]
+
+    from_snapshots = [{i: s.as_dict() for i, s in replayer.states_at([1, 2], at).items()} for at in moments]
+    assert from_snapshots == replayed
+
+    at_two = replayed[3][1]
+    assert (at_two['evolutions'], at_two['last_event_id'], at_two['evolution_stage']) == (4, 13, 'Ascended')
+    assert (at_two['frequency'], at_two['resonance_level']) == (541, 1.35)
+    assert replayed[0][1] == {
+        'nft_id': 1, 'evolution_stage': 'Transcendent', 'frequency': 546, 'resonance_level': 1.51,
+        'evolutions': 7, 'last_event_id': 16, 'as_of': hours(4).isoformat()
+    }
+    assert replayed[1][1]['evolutions'] == 0
+    assert replayed[1][1]['evolution_stage'] == 'Genesis'
+
+
+def test_refresh_writes_a_snapshot_every_interval_events():
+    backend = scrollverse_sample_backend()
+    add_events(backend, 1, EVENTS[:4])
+    replayer = make_replayer(backend, snapshot_interval=2)
+
+    first = replayer.refresh_snapshots()
+    assert (first['genesis_snapshots'], first['snapshots_created'], first['events_replayed']) == (3, 2, 4)
+    assert snapshots(backend, 1) == [(0, 0), (2, 11), (4, 13)]
+    assert snapshots(backend, 2) == [(0, 0)]
+
+    # One event past the latest snapshot is not enough for another
+    add_events(backend, 1, EVENTS[4:5])
+    second = replayer.refresh_snapshots()
+    assert (second['genesis_snapshots'], second['snapshots_created'], second['events_replayed']) == (0, 0, 0)
+
+    add_events(backend, 1, EVENTS[5:])
+    third = replayer.refresh_snapshots()
+    assert (third['snapshots_created'], third['events_replayed']) == (1, 3)
+    assert snapshots(backend, 1) == [(0, 0), (2, 11), (4, 13), (6, 15)]
+    assert replayer.state_at(1).as_dict() == make_replayer(backend).state_at(1).as_dict()
@@ -0,0 +1,81 @@
+"""
+Tests for the sharded exporter
+Key-range shards against the fake backend, resuming from the manifest and reading shards back
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import json
+import os
+
+from bulk_writer import encode_copy_value
+from drivers import FakeDriver
+from export import MANIFEST_NAME, ShardExporter, decode_copy_text, read_shard
+from fakes import scrollverse_sample_backend
+from postgresql_client import PostgreSQLClient, load_env_config
+
+TABLES = {'frequency_layers': 'id', 'nft_metadata': 'id'}
+
+
+def make_exporter(backend, output_dir) -> ShardExporter:
+    """Exporter of two sample tables in shards of two rows, on a connected fake client"""
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    return ShardExporter(client, str(output_dir), tables=TABLES, shard_rows=2, workers=2)
+
+
+def shard_files(output_dir) -> dict:
+    """{relative path: contents} of every shard file under output_dir"""
+    files = {}
+    for table in TABLES:
+        for name in sorted(os.listdir(output_dir / table)):
+            files[f"{table}/{name}"] = (output_dir / table / name).read_bytes()
+    return files
+
+
+def test_export_shards_by_key_range_and_read_shard_round_trips(tmp_path):
+    backend = scrollverse_sample_backend()
+    outcome = make_exporter(backend, tmp_path).run()
+
+    assert outcome['failures'] == []
+    layers = outcome['tables']['frequency_layers']
+    assert (layers['shards'], layers['complete'], layers['rows']) == (3, 3, 6)
+    assert outcome['summary']['exported'] == 5
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    shards = manifest['tables']['frequency_layers']['shards']
+    assert [(s['lower'], s['upper'], s['rows']) for s in shards] == [(None, 3, 2), (3, 5, 2), (5, None, 2)]
+
+    table = backend.tables['frequency_layers']
+    for shard, start in zip(shards, (0, 2, 4)):
+        fields = read_shard(str(tmp_path / shard['file']))
+        assert list(fields) == table['columns']
+        expected = table['rows'][start:start + 2]
+        for name, values in fields.items():
+            assert values == [decode_copy_text(encode_copy_value(row.get(name))) for row in expected], name
+
+    assert read_shard(str(tmp_path / shards[1]['file']), columns=['layer_depth']) == {'layer_depth': ['3', '1']}
+
+
+def test_resume_rewrites_only_the_shard_missing_from_the_manifest(tmp_path):
+    backend = scrollverse_sample_backend()
+    make_exporter(backend, tmp_path).run()
+    exported = shard_files(tmp_path)
+
+    # As if the run had died before recording the second frequency_layers shard
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    lost = manifest['tables']['frequency_layers']['shards'][1]
+    for field in ('rows', 'bytes', 'seconds'):
+        lost.pop(field)
+    lost['status'] = 'pending'
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest))
+    (tmp_path / lost['file']).write_bytes(b'partial')
+    before = shard_files(tmp_path)
+
+    outcome = make_exporter(backend, tmp_path).run(resume=True)
+
+    assert (outcome['summary']['exported'], outcome['summary']['resumed']) == (1, 4)
+    assert outcome['tables']['frequency_layers']['rows'] == 6
+    after = shard_files(tmp_path)
+    assert [name for name in after if after[name] != before[name]] == [lost['file']]
+    assert after == exported
+    assert read_shard(str(tmp_path / lost['file']), columns=['id']) == {'id': ['3', '4']}
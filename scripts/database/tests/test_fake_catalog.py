@@ -0,0 +1,89 @@
+"""
+Tests for the fake column catalog
+The catalog must describe the same tables scrollverse_schema.sql creates
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import re
+from pathlib import Path
+
+from fakes.catalog import CATALOG, SERIAL_DEFAULT
+
+SCHEMA_SQL = Path(__file__).resolve().parents[3] / 'database' / 'schemas' / 'scrollverse_schema.sql'
+
+_TABLE_RE = re.compile(r'^CREATE TABLE IF NOT EXISTS (?P<table>\w+) \((?P<body>.*?)^\)', re.MULTILINE | re.DOTALL)
+_COLUMN_RE = re.compile(r'^(?P<name>\w+) (?P<type>[A-Z]+)(?:\((?P<size>\d+(?:,\d+)?)\))?(?P<rest>.*)$')
+_KEY_RE = re.compile(r'^(?P<kind>PRIMARY KEY|UNIQUE) ?\((?P<columns>[^)]*)\)$')
+_DEFAULT_RE = re.compile(r"DEFAULT ('[^']*'|\S+)")
+_REFERENCES_RE = re.compile(r'REFERENCES (\w+)\((\w+)\)')
+
+# How format_type() spells each declared type
+_TYPES = {
+    'SERIAL': 'integer',
+    'INTEGER': 'integer',
+    'BIGINT': 'bigint',
+    'TEXT': 'text',
+    'JSON': 'json',
+    'JSONB': 'jsonb',
+    'BOOLEAN': 'boolean',
+    'TIMESTAMP': 'timestamp without time zone',
+    'VARCHAR': 'character varying',
+    'DECIMAL': 'numeric',
+    'NUMERIC': 'numeric'
+}
+
+
+def column_default(declared: str, data_type: str) -> str:
+    """A DEFAULT clause as pg_get_expr() prints it back"""
+    if declared in ('TRUE', 'FALSE'):
+        return declared.lower()
+    if declared.startswith("'") and data_type.startswith('character varying'):
+        return f"{declared}::character varying"
+    return declared
+
+
+def parse_schema(sql: str) -> dict:
+    """Every CREATE TABLE in the schema, as catalog entries"""
+    tables = {}
+    for match in _TABLE_RE.finditer(sql):
+        columns, keys = [], {}
+        for line in match.group('body').splitlines():
+            definition = line.strip().rstrip(',')
+            key = _KEY_RE.match(definition)
+            if key:
+                names = [name.strip() for name in key.group('columns').split(',')]
+                # Only single-column UNIQUE constraints mark a column unique
+                if key.group('kind') == 'PRIMARY KEY' or len(names) == 1:
+                    keys.update((name, 'p' if key.group('kind') == 'PRIMARY KEY' else 'u') for name in names)
+                continue
+            column = _COLUMN_RE.match(definition)
+            if not column:
+                continue
+            rest = column.group('rest')
+            data_type = _TYPES[column.group('type')]
+            if column.group('size'):
+                data_type = f"{data_type}({column.group('size')})"
+            default = _DEFAULT_RE.search(rest)
+            references = _REFERENCES_RE.search(rest)
+            serial = column.group('type') == 'SERIAL'
+            columns.append([
+                column.group('name'),
+                data_type,
+                serial or 'NOT NULL' in rest or 'PRIMARY KEY' in rest,
+                SERIAL_DEFAULT if serial else default and column_default(default.group(1), data_type),
+                'p' if 'PRIMARY KEY' in rest else 'u' if 'UNIQUE' in rest else None,
+                references.groups() if references else None
+            ])
+        for column in columns:
+            if column[0] in keys:
+                column[2] = column[2] or keys[column[0]] == 'p'
+                column[4] = keys[column[0]]
+        tables[match.group('table')] = [tuple(column) for column in columns]
+    return tables
+
+
+def test_catalog_matches_the_schema_file():
+    tables = parse_schema(SCHEMA_SQL.read_text())
+    assert sorted(tables) == sorted(CATALOG)
+    for table, columns in tables.items():
+        assert columns == CATALOG[table], table
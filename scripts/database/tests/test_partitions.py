@@ -0,0 +1,180 @@
+"""
+Tests for the partition manager
+Planned creates, retirements, DEFAULT partition splits and heap conversion
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import datetime
+
+from drivers import FakeDriver
+from fakes import scrollverse_sample_backend
+from partitions import (
+    CONVERT, CREATE, DETACH, DROP, SPLIT, PartitionManager, PartitionSpec, bound_literal, shift_bound
+)
+from postgresql_client import PostgreSQLClient, load_env_config
+
+# The fake partitions the current month and the three after it, plus a DEFAULT partition
+MONTH = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def month(offset: int) -> datetime:
+    """Start of the month offset months from the current one"""
+    return shift_bound(MONTH, 'month', offset)
+
+
+def make_manager(backend, **settings) -> PartitionManager:
+    """Manager for resonance_data on a connected fake client"""
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    return PartitionManager(client, [PartitionSpec('resonance_data', **settings)])
+
+
+def reading(id: int, timestamp: datetime) -> dict:
+    """One resonance_data row"""
+    return {'id': id, 'nft_id': 1, 'frequency': 528, 'resonance_data': None, 'timestamp': timestamp}
+
+
+def test_plan_creates_the_ranges_ahead_that_are_missing():
+    backend = scrollverse_sample_backend()
+    manager = make_manager(backend, premake=3)
+    assert manager.plan(MONTH) == []
+
+    tasks = manager.plan(month(2))
+    assert [(t.action, t.partition) for t in tasks] == [
+        (CREATE, f"resonance_data_p{month(4):%Y_%m}"),
+        (CREATE, f"resonance_data_p{month(5):%Y_%m}")
+    ]
+    assert tasks[0].statements[-1] == (
+        f'ALTER TABLE "public"."resonance_data" ATTACH PARTITION "public"."resonance_data_p{month(4):%Y_%m}" '
+        f"FOR VALUES FROM ({bound_literal(month(4))}) TO ({bound_literal(month(5))})"
+    )
+
+    summary = manager.run(tasks)['summary']
+    assert summary['created'] == 2
+    assert manager.plan(month(2)) == []
+
+
+def test_plan_detaches_and_drops_partitions_past_retention():
+    backend = scrollverse_sample_backend()
+    manager = make_manager(backend, premake=0, retention=1)
+    expired = [f"resonance_data_p{month(i):%Y_%m}" for i in range(2)]
+
+    tasks = manager.plan(month(3))
+    assert [(t.action, t.partition) for t in tasks] == [
+        (DETACH, expired[0]), (DROP, expired[0]), (DETACH, expired[1]), (DROP, expired[1])
+    ]
+    assert all(t.utility for t in tasks)
+    assert tasks[0].statements == [
+        f'ALTER TABLE "public"."resonance_data" DETACH PARTITION "public"."{expired[0]}" CONCURRENTLY'
+    ]
+    assert tasks[1].statements == [f'DROP TABLE "public"."{expired[0]}"']
+
+    summary = manager.run(tasks)['summary']
+    assert summary['dropped'] == 2
+    assert not set(expired) & set(backend.partitions['resonance_data'])
+    assert backend.detached == {}
+
+
+def test_plan_finalizes_an_interrupted_concurrent_detach():
+    backend = scrollverse_sample_backend()
+    pending = f"resonance_data_p{month(1):%Y_%m}"
+    backend.partitions['resonance_data'][pending][2] = True
+    manager = make_manager(backend)
+
+    tasks = manager.plan(MONTH)
+    assert [(t.action, t.partition) for t in tasks] == [(DETACH, pending)]
+    assert tasks[0].reason == 'interrupted concurrent detach'
+    assert tasks[0].statements == [
+        f'ALTER TABLE "public"."resonance_data" DETACH PARTITION "public"."{pending}" FINALIZE'
+    ]
+
+
+def test_plan_attaches_a_default_partition_when_there_is_none():
+    backend = scrollverse_sample_backend()
+    del backend.partitions['resonance_data']['resonance_data_default']
+    manager = make_manager(backend)
+
+    tasks = manager.plan(MONTH)
+    assert [(t.action, t.partition) for t in tasks] == [(CREATE, 'resonance_data_default')]
+    assert tasks[0].statements[-1] == (
+        'ALTER TABLE "public"."resonance_data" ATTACH PARTITION "public"."resonance_data_default" DEFAULT'
+    )
+
+    manager.run(tasks)
+    assert backend.partitions['resonance_data']['resonance_data_default'] == [None, None, False]
+    assert manager.plan(MONTH) == []
+
+
+def test_rows_in_the_default_partition_are_split_into_their_own_range():
+    backend = scrollverse_sample_backend()
+    stray = datetime(month(6).year, month(6).month, 17, 9, 30)
+    backend.tables['resonance_data']['rows'].append(reading(1, stray))
+    manager = make_manager(backend, premake=6)
+    name = f"resonance_data_p{month(6):%Y_%m}"
+
+    tasks = manager.plan(MONTH)
+    # The stray row's month is split out first, so creating the premake ranges skips it
+    assert [(t.action, t.partition) for t in tasks] == [
+        (SPLIT, name),
+        (CREATE, f"resonance_data_p{month(4):%Y_%m}"),
+        (CREATE, f"resonance_data_p{month(5):%Y_%m}")
+    ]
+    within = f""""timestamp" >= {bound_literal(month(6))} AND "timestamp" < {bound_literal(month(7))}"""
+    assert tasks[0].statements[1:3] == [
+        f'INSERT INTO "public"."{name}" SELECT * FROM "public"."resonance_data_default" WHERE {within}',
+        f'DELETE FROM "public"."resonance_data_default" WHERE {within}'
+    ]
+
+    summary = manager.run(tasks)['summary']
+    assert (summary['split'], summary['created'], summary['failed']) == (1, 2, 0)
+    assert backend.partitions['resonance_data'][name][:2] == [month(6), month(7)]
+    assert manager.plan(MONTH) == []
+
+
+def test_attaching_over_rows_held_in_the_default_partition_fails():
+    backend = scrollverse_sample_backend()
+    backend.tables['resonance_data']['rows'].append(reading(1, month(4)))
+    manager = make_manager(backend)
+
+    # Without the split, the premade range would strand the row in the DEFAULT partition
+    outcome = manager.run([manager.create_task(manager.specs['resonance_data'], month(4), month(5), 'ahead')])
+    assert outcome['summary']['failed'] == 1
+    assert 'default partition "resonance_data_default"' in outcome['tasks'][0]['error']
+
+
+def test_convert_task_rebuilds_a_heap_table_as_partitions():
+    backend = scrollverse_sample_backend()
+    del backend.partitions['resonance_data']
+    backend.tables['resonance_data']['rows'].append(reading(1, month(-1)))
+    manager = make_manager(backend, premake=1)
+
+    tasks = manager.plan(MONTH)
+    assert [(t.action, t.partition) for t in tasks] == [(CONVERT, 'resonance_data')]
+    target, staging = '"public"."resonance_data"', '"public"."resonance_data_partitioned"'
+    assert tasks[0].statements == [
+        f'LOCK TABLE {target} IN EXCLUSIVE MODE',
+        f'CREATE TABLE {staging} (LIKE {target} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+        f'INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ("timestamp")',
+        f'ALTER TABLE {staging} ALTER COLUMN "timestamp" SET NOT NULL',
+        *(
+            f'CREATE TABLE "public"."resonance_data_p{month(i):%Y_%m}" PARTITION OF {staging} '
+            f"FOR VALUES FROM ({bound_literal(month(i))}) TO ({bound_literal(month(i + 1))})"
+            for i in (-1, 0, 1)
+        ),
+        f'CREATE TABLE "public"."resonance_data_default" PARTITION OF {staging} DEFAULT',
+        f'INSERT INTO {staging} SELECT * FROM {target}',
+        'ALTER SEQUENCE public.resonance_data_id_seq OWNED BY NONE',
+        f'DROP TABLE {target}',
+        f'ALTER TABLE {staging} RENAME TO "resonance_data"',
+        f'ALTER SEQUENCE public.resonance_data_id_seq OWNED BY {target}."id"',
+        f'ALTER TABLE {target} ADD PRIMARY KEY ("id", "timestamp")',
+        f'ALTER TABLE {target} ADD CONSTRAINT "resonance_data_nft_id_fkey" '
+        f'FOREIGN KEY (nft_id) REFERENCES nft_metadata(id) ON DELETE CASCADE',
+        f'ANALYZE {target}'
+    ]
+
+    summary = manager.run(tasks)['summary']
+    assert summary['converted'] == 1
+    assert set(backend.partitions['resonance_data']) == {
+        *(f"resonance_data_p{month(i):%Y_%m}" for i in (-1, 0, 1)), 'resonance_data_default'
+    }
@@ -0,0 +1,100 @@
+"""
+Tests for read routing across streaming replicas
+Lagging replicas are skipped and a session reads its own writes from the primary
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import threading
+import time
+
+from drivers import FakeCluster, FakeDriver
+from postgresql_client import ALL_NFTS_QUERY, PostgreSQLClient, load_env_config
+
+MAX_LAG_MS = 100
+WRITE_QUERY = "INSERT INTO user_interactions (user_address, interaction_type) VALUES (%s, %s)"
+
+
+def connected_client(cluster: FakeCluster) -> PostgreSQLClient:
+    """Client over the cluster with two replicas, checked only when the test calls router.check()"""
+    config = {
+        **load_env_config(),
+        'driver': 'fake',
+        'replicas': [{'host': 'replica1'}, {'host': 'replica2'}],
+        'replica_max_lag': MAX_LAG_MS,
+        'replica_check_interval': 0
+    }
+    client = PostgreSQLClient(config, driver=FakeDriver(cluster=cluster))
+    client.connect()
+    return client
+
+
+def routed(client: PostgreSQLClient) -> dict:
+    """Statements routed so far, by endpoint name"""
+    return {endpoint['name']: endpoint['routed'] for endpoint in client.get_replica_stats()['endpoints']}
+
+
+def read_in_other_thread(client: PostgreSQLClient):
+    """A read from a session that has not written anything"""
+    reader = threading.Thread(target=client.execute_query, args=(ALL_NFTS_QUERY,), kwargs={'read_only': True})
+    reader.start()
+    reader.join()
+
+
+def test_read_after_write_goes_to_the_primary():
+    cluster = FakeCluster()
+    client = connected_client(cluster)
+    try:
+        client.execute_query(WRITE_QUERY, ('0xabc', 'resonate'))
+        before = routed(client)
+        client.execute_query(ALL_NFTS_QUERY, read_only=True)
+        after = routed(client)
+    finally:
+        client.close()
+
+    assert after['primary'] == before['primary'] + 1
+    assert after['replica1:5432'] == before['replica1:5432']
+    assert after['replica2:5432'] == before['replica2:5432']
+
+
+def test_replicas_past_max_lag_are_skipped():
+    cluster = FakeCluster()
+    client = connected_client(cluster)
+    try:
+        client.execute_query(WRITE_QUERY, ('0xabc', 'resonate'))
+        time.sleep(2 * MAX_LAG_MS / 1000.0)
+        client.router.check()
+
+        before = routed(client)
+        read_in_other_thread(client)
+        after = routed(client)
+    finally:
+        client.close()
+
+    assert after['primary'] == before['primary'] + 1
+    assert after['replica1:5432'] == before['replica1:5432']
+    assert after['replica2:5432'] == before['replica2:5432']
+
+
+def test_lagging_replica_is_skipped_for_one_that_caught_up():
+    cluster = FakeCluster()
+    client = connected_client(cluster)
+    try:
+        client.execute_query(WRITE_QUERY, ('0xabc', 'resonate'))
+        cluster.replicate('replica2')
+        time.sleep(2 * MAX_LAG_MS / 1000.0)
+        client.router.check()
+
+        lag = {endpoint['name']: endpoint['lag_seconds'] for endpoint in client.get_replica_stats()['endpoints']}
+        assert lag['replica1:5432'] > MAX_LAG_MS / 1000.0
+        assert lag['replica2:5432'] == 0
+
+        before = routed(client)
+        read_in_other_thread(client)
+        client.execute_query(ALL_NFTS_QUERY, read_only=True)
+        after = routed(client)
+    finally:
+        client.close()
+
+    assert after['replica2:5432'] == before['replica2:5432'] + 2
+    assert after['replica1:5432'] == before['replica1:5432']
+    assert after['primary'] == before['primary']
@@ -0,0 +1,72 @@
+"""
+Tests for client-side resonance scoring
+Batch scores must equal calculate_resonance_scores() on the server, half-cent ties included
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from drivers import FakeDriver
+from fakes import scrollverse_sample_backend
+from fakes.resonance import sql_avg, sql_resonance_score
+from postgresql_client import PostgreSQLClient, load_env_config
+from resonance_scoring import calculate_resonance_scores, numeric_avg, resonance_score
+
+# SELECT AVG(x) on PostgreSQL: (sum, count, result)
+SERVER_AVERAGES = [
+    ('1.00', 3, '0.33333333333333333333'),
+    ('12.00', 3, '4.0000000000000000'),
+    ('2.00', 3, '0.66666666666666666667'),
+    ('-2.00', 3, '-0.66666666666666666667'),
+    ('1.50', 1, '1.50000000000000000000')
+]
+
+
+@pytest.mark.parametrize('average', [numeric_avg, sql_avg], ids=['client', 'fake_server'])
+def test_avg_uses_postgresql_result_scale(average):
+    for total, count, result in SERVER_AVERAGES:
+        assert str(average(Decimal(total), count)) == result
+
+
+def test_half_cent_tie_rounds_like_the_server():
+    # Exactly 0.065 before AVG is rounded to 20 digits, just below it after
+    assert sql_resonance_score(Decimal('0.15'), 3, sql_avg(Decimal('1.00'), 3)) == Decimal('0.06')
+    assert resonance_score(Decimal('0.15'), 3, Decimal('1.00')) == Decimal('0.06')
+    assert calculate_resonance_scores([Decimal('0.15')], [3], [Decimal('1.00')]) == [Decimal('0.06')]
+
+
+def test_batch_scores_match_the_server_function():
+    randomizer = random.Random(528)
+    bases, counts, sums, expected = [], [], [], []
+    for _ in range(5000):
+        count = randomizer.randint(0, 6)
+        base = Decimal(randomizer.randint(0, 300)).scaleb(-2)
+        total = sum((Decimal(randomizer.randint(0, 100)).scaleb(-2) for _ in range(count)), Decimal('0.00'))
+        bases.append(base)
+        counts.append(count)
+        sums.append(total)
+        expected.append(sql_resonance_score(base, count, sql_avg(total, count)))
+    assert calculate_resonance_scores(bases, counts, sums) == expected
+
+
+def test_validate_batch_agrees_with_calculate_resonance_scores():
+    backend = scrollverse_sample_backend()
+    backend.tables['nft_metadata']['rows'][0]['resonance_level'] = Decimal('0.15')
+    # NFT-001 has layers on frequencies 1, 8 and 2
+    for row in backend.tables['akashic_frequencies']['rows']:
+        row['resonance'] = {1: Decimal('0.33'), 8: Decimal('0.33'), 2: Decimal('0.34')}.get(row['id'], row['resonance'])
+
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    try:
+        token_ids = ['NFT-001', 'NFT-002', 'NFT-003']
+        validations = client.validate_nft_resonance_batch(token_ids)
+        server = client.calculate_resonance_scores(token_ids)
+    finally:
+        client.close()
+
+    assert server['NFT-001'] == Decimal('0.06')
+    assert {token_id: validations[token_id]['resonance_score'] for token_id in token_ids} == server
@@ -0,0 +1,78 @@
+"""
+Tests for the read-through result cache
+NOTIFY invalidations, including one that lands while the entry is being filled
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import threading
+from decimal import Decimal
+
+from drivers import FakeDriver
+from fakes import scrollverse_sample_backend
+from postgresql_client import PostgreSQLClient, load_env_config
+
+
+def connected_client(backend) -> PostgreSQLClient:
+    """Client on the fake driver, whose notifier delivers synchronously"""
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    return client
+
+
+def set_resonance(backend, frequency: int, resonance: str):
+    """Commit a change to one frequency row, as another session would"""
+    for row in backend.tables['akashic_frequencies']['rows']:
+        if row['frequency'] == frequency:
+            row['resonance'] = Decimal(resonance)
+
+
+def test_notify_invalidates_a_cached_entry():
+    backend = scrollverse_sample_backend()
+    client = connected_client(backend)
+    try:
+        assert client.query_akashic_frequencies(528)[0]['resonance'] == Decimal('1.00')
+        assert client.query_akashic_frequencies(528)[0]['resonance'] == Decimal('1.00')
+        assert client.get_result_cache_stats()['hits'] == 1
+
+        set_resonance(backend, 528, '0.97')
+        client.notifier.notify('akashic_frequencies')
+
+        assert client.query_akashic_frequencies(528)[0]['resonance'] == Decimal('0.97')
+        assert client.get_result_cache_stats()['stale'] == 1
+    finally:
+        client.close()
+
+
+def test_notify_during_fill_leaves_the_entry_stale():
+    backend = scrollverse_sample_backend()
+    client = connected_client(backend)
+    changed = []
+
+    def read_then_race(params):
+        # The query has read its snapshot when another session commits and notifies
+        columns = backend.tables['akashic_frequencies']['columns']
+        snapshot = [
+            tuple(row.get(column) for column in columns)
+            for row in backend.tables['akashic_frequencies']['rows'] if row['frequency'] == params[0]
+        ]
+        if not changed:
+            changed.append(params[0])
+
+            def commit():
+                set_resonance(backend, params[0], '0.97')
+                client.notifier.notify('akashic_frequencies')
+
+            writer = threading.Thread(target=commit)
+            writer.start()
+            writer.join()
+        return columns, snapshot
+
+    backend.on(r'^select \* from akashic_frequencies where frequency = ', read_then_race)
+    try:
+        assert client.query_akashic_frequencies(528)[0]['resonance'] == Decimal('1.00')
+        assert client.query_akashic_frequencies(528)[0]['resonance'] == Decimal('0.97')
+        stats = client.get_result_cache_stats()
+        assert stats['stale'] == 1
+        assert stats['hits'] == 0
+    finally:
+        client.close()
@@ -0,0 +1,96 @@
+"""
+Tests for the resonance rollups
+Watermarked refreshes and windowed reads at the finest resolution that fits max_points
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from drivers import FakeDriver
+from fakes import scrollverse_sample_backend
+from postgresql_client import PostgreSQLClient, load_env_config
+from rollups import choose_resolution
+
+AT = datetime(2025, 12, 7, 13, 0, 0)
+
+
+def make_client(backend) -> PostgreSQLClient:
+    """Connected fake client"""
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    return client
+
+
+def add_readings(backend, *readings):
+    """Append (nft_id, resonance_level, moment) rows to resonance_data with the next ids"""
+    table = backend.tables['resonance_data']
+    for nft_id, level, moment in readings:
+        table['last_id'] += 1
+        table['rows'].append({
+            'id': table['last_id'], 'nft_id': nft_id, 'frequency': 528,
+            'resonance_level': Decimal(level), 'timestamp': moment
+        })
+
+
+def test_refresh_advances_the_watermark_in_bounded_slices():
+    backend = scrollverse_sample_backend()
+    client = make_client(backend)
+    add_readings(backend, *((1, '1.0', AT + timedelta(seconds=i)) for i in range(5)))
+
+    first = client.refresh_resonance_rollups(max_ids=2)
+    assert (first['rows_rolled_up'], first['batches'], first['watermark']) == (5, 3, 5)
+    # One NFT, one frequency, one bucket per resolution
+    assert first['buckets_updated'] == 3 * 3
+
+    idle = client.refresh_resonance_rollups()
+    assert (idle['rows_rolled_up'], idle['batches'], idle['watermark']) == (0, 1, 5)
+
+    add_readings(backend, (1, '2.0', AT + timedelta(minutes=1)), (2, '3.0', AT))
+    second = client.refresh_resonance_rollups()
+    assert (second['rows_rolled_up'], second['watermark']) == (2, 7)
+
+
+def test_window_counts_rows_past_the_watermark_exactly_once():
+    backend = scrollverse_sample_backend()
+    client = make_client(backend)
+    add_readings(backend, (1, '1.0', AT), (1, '3.0', AT + timedelta(seconds=30)))
+    client.refresh_resonance_rollups()
+    add_readings(backend, (1, '5.0', AT + timedelta(seconds=45)), (1, '7.0', AT + timedelta(minutes=1)))
+
+    before = client.query_resonance_window(1, AT, AT + timedelta(minutes=2))
+    assert [(p['bucket'], p['samples'], p['avg'], p['min'], p['max']) for p in before['points']] == [
+        (AT.isoformat(), 3, 3.0, 1.0, 5.0),
+        ((AT + timedelta(minutes=1)).isoformat(), 1, 7.0, 7.0, 7.0)
+    ]
+
+    client.refresh_resonance_rollups()
+    assert client.query_resonance_window(1, AT, AT + timedelta(minutes=2)) == before
+
+
+@pytest.mark.parametrize('span, max_points, resolution', [
+    (timedelta(hours=2), 500, 'minute'),
+    (timedelta(hours=2), 120, 'minute'),
+    (timedelta(hours=2), 119, 'hour'),
+    (timedelta(days=3), 72, 'hour'),
+    (timedelta(days=3), 71, 'day'),
+    (timedelta(days=30), 1, 'day')
+])
+def test_choose_resolution_picks_the_finest_that_fits(span, max_points, resolution):
+    assert choose_resolution(AT, AT + span, max_points)[0] == resolution
+
+
+def test_window_longer_than_max_points_days_merges_day_buckets():
+    backend = scrollverse_sample_backend()
+    client = make_client(backend)
+    add_readings(backend, *((1, str(day), AT + timedelta(days=day)) for day in range(6)))
+    client.refresh_resonance_rollups()
+
+    start = AT.replace(hour=0)
+    window = client.query_resonance_window(1, start, start + timedelta(days=6), max_points=3)
+    assert (window['resolution'], window['bucket_seconds']) == ('day', 2 * 86400)
+    assert [(p['samples'], p['min'], p['max'], p['avg']) for p in window['points']] == [
+        (2, 0.0, 1.0, 0.5), (2, 2.0, 3.0, 2.5), (2, 4.0, 5.0, 4.5)
+    ]
@@ -0,0 +1,108 @@
+"""
+Tests for the prepared statement cache
+Cache keys ignore formatting, but never the contents of quoted literals; LRU eviction and PREPARE fallbacks
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import pytest
+
+import postgresql_client
+from drivers import FakeDriver, FakeError
+from fakes import scrollverse_sample_backend
+from postgresql_client import PostgreSQLClient, load_env_config
+from statement_cache import normalize_sql
+
+
+def test_normalize_sql_keeps_whitespace_inside_quotes():
+    query = "SELECT  *\n  FROM nft_metadata WHERE name = 'Sovereign  Genesis' AND \"owner  address\" = 'it''s  x'"
+    assert normalize_sql(query) == (
+        "SELECT * FROM nft_metadata WHERE name = 'Sovereign  Genesis' AND \"owner  address\" = 'it''s  x'"
+    )
+    assert normalize_sql("SELECT   1\n") == 'SELECT 1'
+
+
+def test_literals_differing_in_whitespace_prepare_separately():
+    backend = scrollverse_sample_backend()
+    client = PostgreSQLClient({**load_env_config(), 'driver': 'fake'}, driver=FakeDriver(backend))
+    client.connect()
+    try:
+        client.execute_query("SELECT * FROM nft_metadata WHERE name = 'a  b'")
+        client.execute_query("SELECT *   FROM nft_metadata WHERE name = 'a b'")
+        client.execute_query("SELECT * FROM nft_metadata\n WHERE name = 'a b'")
+    finally:
+        client.close()
+
+    prepared = sorted(body for connection in backend._connections for body in connection.prepared.values())
+    assert prepared == [
+        "SELECT *   FROM nft_metadata WHERE name = 'a b'",
+        "SELECT * FROM nft_metadata WHERE name = 'a  b'"
+    ]
+    assert client.get_statement_cache_stats()['hits'] == 1
+
+
+def single_connection_client(backend, capacity: int) -> PostgreSQLClient:
+    """Client whose queries all run on one pooled connection"""
+    config = {**load_env_config(), 'driver': 'fake', 'max_connections': 1, 'statement_cache_size': capacity}
+    client = PostgreSQLClient(config, driver=FakeDriver(backend))
+    client.connect()
+    return client
+
+
+def test_least_recently_used_statement_is_deallocated_when_full():
+    backend = scrollverse_sample_backend()
+    client = single_connection_client(backend, capacity=2)
+    queries = [f"SELECT * FROM akashic_frequencies WHERE frequency = {frequency}" for frequency in (528, 639, 963)]
+    try:
+        client.execute_query(queries[0])
+        client.execute_query(queries[1])
+        client.execute_query(queries[0])
+        client.execute_query(queries[2])
+        connection, = backend._connections
+        # queries[1] was the least recently used, so its statement went
+        assert sorted(connection.prepared.values()) == [queries[0], queries[2]]
+
+        client.execute_query(queries[1])
+        assert sorted(connection.prepared.values()) == [queries[1], queries[2]]
+    finally:
+        client.close()
+
+    stats = client.get_statement_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 4, 2)
+    assert backend.stats['prepares'] == 4
+
+
+def test_statement_with_untyped_parameters_runs_unprepared():
+    backend = scrollverse_sample_backend()
+    backend.on(r'^select %s as probe$', lambda params: (['probe'], [(params[0],)]))
+    client = single_connection_client(backend, capacity=2)
+    try:
+        assert client.execute_query("SELECT %s AS probe", (528,))['rows'] == [(528,)]
+        assert client.execute_query("SELECT  %s AS probe", (639,))['rows'] == [(639,)]
+    finally:
+        client.close()
+
+    # The second call skips PREPARE instead of failing it again
+    assert client.get_statement_cache_stats()['fallbacks'] == 1
+    assert backend.stats['prepares'] == 0
+
+
+def test_other_prepare_errors_are_raised_and_not_remembered(monkeypatch):
+    backend = scrollverse_sample_backend()
+    client = single_connection_client(backend, capacity=2)
+    query = "SELECT * FROM akashic_frequencies WHERE frequency = 528"
+    try:
+        with client.pool.connection() as connection:
+            connection.prepared['scrollverse_stmt_taken'] = 'SELECT 1'
+        monkeypatch.setattr(postgresql_client, 'next_statement_name', lambda: 'scrollverse_stmt_taken')
+        with pytest.raises(FakeError) as raised:
+            client.execute_query(query)
+        assert raised.value.pgcode == '42P05'
+
+        monkeypatch.undo()
+        assert len(client.execute_query(query)['rows']) == 1
+    finally:
+        client.close()
+
+    stats = client.get_statement_cache_stats()
+    assert stats['fallbacks'] == 0
+    assert backend.stats['prepares'] == 1
@@ -0,0 +1,167 @@
+"""
+Tests for the write-behind interaction writer
+Spilling while the database is down, ordered replay, restarts and draining on close
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import os
+import threading
+import time
+
+from write_behind import SEGMENT_SUFFIX, InteractionWriteBehind, SpillLog
+
+COLUMNS = ('user_address', 'nft_id', 'interaction_type')
+
+
+class OperationalError(Exception):
+    """Named like the driver's connection failure, so the writer treats it as transient"""
+
+
+class InsertRecorder:
+    """Client stand-in that records each multi-row INSERT, and can be down or hold them"""
+
+    def __init__(self):
+        """Start up and unblocked"""
+        self.inserts = []
+        self.down = False
+        self.released = threading.Event()
+        self.released.set()
+
+    def insert_rows(self, table, columns, rows):
+        """Wait until released, then fail or record the rows"""
+        self.released.wait(5.0)
+        if self.down:
+            raise OperationalError('server closed the connection unexpectedly')
+        self.inserts.append([list(row) for row in rows])
+
+    def rows(self) -> list:
+        """Every inserted row, in insert order"""
+        return [row for batch in self.inserts for row in batch]
+
+
+def interaction(n: int) -> list:
+    """One row for the test columns"""
+    return [f"0x{n:040x}", n, 'view']
+
+
+def make_writer(client, spill_dir, **settings) -> InteractionWriteBehind:
+    """Started writer on the test columns that retries quickly"""
+    options = {
+        'batch_size': 2, 'flush_interval': 60.0, 'retry_interval': 0.01, 'drain_timeout': 1.0, 'columns': COLUMNS,
+        **settings
+    }
+    return InteractionWriteBehind(client, str(spill_dir), **options).start()
+
+
+def wait_until(predicate, timeout: float = 2.0) -> bool:
+    """Poll until predicate() holds or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def spill_batches(spill_dir, batches) -> SpillLog:
+    """Spill log holding the batches, numbered from 1, as a stopped writer would leave it"""
+    spill = SpillLog(str(spill_dir))
+    for seq, rows in enumerate(batches, 1):
+        spill.append(seq, time.time(), rows)
+    spill.close()
+    return spill
+
+
+def test_batches_spill_while_the_database_is_down_and_replay_in_order(tmp_path):
+    client = InsertRecorder()
+    client.down = True
+    writer = make_writer(client, tmp_path, max_pending_batches=1)
+    try:
+        writer.add_many(interaction(n) for n in range(7))
+        # Every full batch goes to disk, whether its own insert failed or a replay ahead of it did
+        assert wait_until(lambda: writer.stats()['rows_spilled'] == 6 and writer.stats()['insert_failures'] >= 1)
+        stats = writer.stats()
+        assert stats['buffered'] == 1
+        assert stats['spill_segments'] >= 1
+        assert stats['last_error'] == 'OperationalError: server closed the connection unexpectedly'
+
+        client.down = False
+        assert writer.flush(timeout=5.0)
+    finally:
+        writer.close()
+
+    assert client.rows() == [interaction(n) for n in range(7)]
+    stats = writer.stats()
+    # The last row was flushed behind the backlog, so it went through the spill log too
+    assert stats['rows_replayed'] == 7
+    assert stats['rows_written'] == 7
+    assert stats['spill_segments'] == 0
+    assert [name for name in os.listdir(tmp_path) if name.endswith(SEGMENT_SUFFIX)] == []
+
+
+def test_restart_resumes_replay_from_the_position_file(tmp_path):
+    spill = spill_batches(tmp_path, [[interaction(1), interaction(2)], [interaction(3)], [interaction(4)]])
+    # A writer that replayed the first batch and then died
+    name, offset, record = spill.next_batch()
+    assert record['seq'] == 1
+    spill.advance(name, offset)
+    with open(tmp_path / f"{name}.pos") as handle:
+        assert int(handle.read()) == offset
+
+    client = InsertRecorder()
+    writer = make_writer(client, tmp_path)
+    try:
+        # New batches are numbered after the spilled ones, and written behind them
+        writer.add(interaction(5))
+        assert writer.flush(timeout=5.0)
+    finally:
+        writer.close()
+
+    assert client.inserts == [[interaction(3)], [interaction(4)], [interaction(5)]]
+    assert os.listdir(tmp_path) == []
+
+
+def test_torn_final_line_is_skipped(tmp_path):
+    spill_batches(tmp_path, [[interaction(1)], [interaction(2)]])
+    segment, = os.listdir(tmp_path)
+    # The process died part way through appending the third batch
+    with open(tmp_path / segment, 'ab') as handle:
+        handle.write(b'{"seq":3,"created":1765112400.0,"rows":[["0x')
+
+    client = InsertRecorder()
+    writer = make_writer(client, tmp_path)
+    try:
+        assert writer.flush(timeout=5.0)
+        assert writer.stats()['torn_batches'] == 1
+    finally:
+        writer.close()
+
+    assert client.inserts == [[interaction(1)], [interaction(2)]]
+    assert os.listdir(tmp_path) == []
+
+
+def test_close_spills_rows_still_in_memory_after_the_drain_timeout(tmp_path):
+    client = InsertRecorder()
+    client.released.clear()
+    writer = make_writer(client, tmp_path, max_pending_batches=4)
+    writer.add_many(interaction(n) for n in range(5))
+    # One batch held in the INSERT, one queued behind it and one row buffered
+    assert wait_until(lambda: writer.stats()['pending_batches'] == 1 and writer.stats()['buffered'] == 3)
+
+    started = time.monotonic()
+    threading.Timer(0.1, client.released.set).start()
+    writer.close(drain_timeout=0.05)
+    assert time.monotonic() - started >= 0.1
+
+    # The batch in flight still committed; the rest went to disk
+    assert client.inserts == [[interaction(0), interaction(1)]]
+    stats = writer.stats()
+    assert stats['rows_spilled'] == 3
+    assert stats['spill_segments'] == 1
+
+    restarted = make_writer(client, tmp_path)
+    try:
+        assert restarted.flush(timeout=5.0)
+    finally:
+        restarted.close()
+    assert client.rows() == [interaction(n) for n in range(5)]
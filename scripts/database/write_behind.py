@@ -0,0 +1,522 @@
+"""
+Write-Behind Writer for ScrollVerse
+Buffered multi-row INSERT ingest for user_interactions with a local spill log
+Frequency: 528Hz | Akashic Schema Alignment
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .connection_pool import PoolError
+    from .instrumentation import LatencyHistogram
+except ImportError:
+    from connection_pool import PoolError
+    from instrumentation import LatencyHistogram
+
+SEGMENT_SUFFIX = '.seg'
+REJECTED_LOG = 'rejected.log'
+
+# Time from an interaction being buffered to its row committing; replayed rows can lag for hours
+WRITE_LAG_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0, 14400.0)
+
+# Driver error class name endings that mean "try again later" rather than "this batch is bad"
+TRANSIENT_ERRORS = ('OperationalError', 'InterfaceError')
+
+_encode_json = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str).encode
+
+
+class WriteBehindError(Exception):
+    """Raised when the write-behind writer cannot accept rows"""
+
+
+def encode_value(value: Any) -> Any:
+    """JSON-safe form of one column value; PostgreSQL casts the text forms on INSERT"""
+    kind = type(value)
+    if kind is datetime or kind is date:
+        return value.isoformat()
+    if kind is Decimal:
+        return str(value)
+    if kind is dict or kind is list:
+        return _encode_json(value)
+    return value
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for connection-level failures worth retrying"""
+    if isinstance(error, PoolError):
+        return True
+    return any(cls.__name__.endswith(TRANSIENT_ERRORS) for cls in type(error).__mro__)
+
+
+class _Batch:
+    """Rows cut from the buffer together, numbered in the order they were cut"""
+
+    __slots__ = ('seq', 'created', 'rows')
+
+    def __init__(self, seq: int, created: float, rows: List[list]):
+        """Wrap rows; created is the wall-clock time the first row was buffered"""
+        self.seq = seq
+        self.created = created
+        self.rows = rows
+
+
+class _Segment:
+    """The spill segment currently open for appends"""
+
+    __slots__ = ('name', 'file', 'last_seq', 'size')
+
+    def __init__(self, name: str, file, last_seq: int):
+        """Track an open segment file"""
+        self.name = name
+        self.file = file
+        self.last_seq = last_seq
+        self.size = 0
+
+
+class SpillLog:
+    """
+    Append-only segment files of spilled batches, one JSON line per batch
+    Segments are named by the sequence number of their first batch and are
+    replayed in name order. A .pos file beside a segment holds the byte offset
+    of the next batch to replay, so a restart resumes where replay stopped
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 1024 * 1024, fsync: bool = False):
+        """Open the spill directory, picking up segments left by an earlier process"""
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._segments = sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+        self._positions: Dict[str, int] = {}
+        self._open: Optional[_Segment] = None
+        self._lock = threading.Lock()
+        self.torn_batches = 0
+
+    @property
+    def backlog(self) -> int:
+        """Number of segments not yet fully replayed"""
+        return len(self._segments)
+
+    def last_seq(self) -> int:
+        """Highest segment number on disk, so new batches sort after everything already spilled"""
+        return max((int(name[:-len(SEGMENT_SUFFIX)]) for name in self._segments), default=0)
+
+    def _path(self, name: str) -> str:
+        """Absolute path of a file in the spill directory"""
+        return os.path.join(self.directory, name)
+
+    def _write(self, handle, data: bytes):
+        """Append and push the bytes to the OS, and to disk when fsync is on"""
+        handle.write(data)
+        handle.flush()
+        if self.fsync:
+            os.fsync(handle.fileno())
+
+    def append(self, seq: int, created: float, rows: List[list]):
+        """Spill one batch"""
+        data = (_encode_json({'seq': seq, 'created': created, 'rows': rows}) + '\n').encode('utf-8')
+        with self._lock:
+            current = self._open
+            if current is not None and seq < current.last_seq:
+                # The batch that was in flight when spilling began sorts ahead in a segment of its own
+                name = f"{seq:020d}{SEGMENT_SUFFIX}"
+                with open(self._path(name), 'ab') as handle:
+                    self._write(handle, data)
+                self._segments = sorted([*self._segments, name])
+                return
+
+            if current is None or current.size >= self.segment_bytes:
+                self._seal_locked()
+                name = f"{seq:020d}{SEGMENT_SUFFIX}"
+                current = self._open = _Segment(name, open(self._path(name), 'ab'), seq)
+                self._segments = sorted([*self._segments, name])
+            self._write(current.file, data)
+            current.last_seq = seq
+            current.size += len(data)
+
+    def _seal_locked(self):
+        """Close the open segment; caller holds the lock"""
+        if self._open is not None:
+            self._open.file.close()
+            self._open = None
+
+    def _position(self, name: str) -> int:
+        """Replay offset of a segment, read from its .pos file on first use"""
+        position = self._positions.get(name)
+        if position is None:
+            try:
+                with open(self._path(name + '.pos')) as handle:
+                    position = int(handle.read().strip() or 0)
+            except FileNotFoundError:
+                position = 0
+            self._positions[name] = position
+        return position
+
+    def next_batch(self) -> Optional[Tuple[str, int, Dict[str, Any]]]:
+        """Oldest unreplayed batch as (segment, end offset, record), removing finished segments"""
+        with self._lock:
+            while self._segments:
+                name = self._segments[0]
+                if self._open is not None and self._open.name == name:
+                    self._seal_locked()
+                offset = self._position(name)
+                with open(self._path(name), 'rb') as handle:
+                    handle.seek(offset)
+                    line = handle.readline()
+                if line.endswith(b'\n'):
+                    try:
+                        return name, offset + len(line), json.loads(line)
+                    except ValueError:
+                        pass
+                if line:
+                    # A torn final line: the process died mid-append, before the batch was acknowledged
+                    self.torn_batches += 1
+                self._remove_locked(name)
+            return None
+
+    def advance(self, name: str, offset: int):
+        """Record that every batch before offset has been written"""
+        with self._lock:
+            if name not in self._segments:
+                return
+            self._positions[name] = offset
+            temporary = self._path(name + '.pos.tmp')
+            with open(temporary, 'w') as handle:
+                handle.write(str(offset))
+            os.replace(temporary, self._path(name + '.pos'))
+
+    def _remove_locked(self, name: str):
+        """Delete a replayed segment and its position file; caller holds the lock"""
+        for path in (self._path(name), self._path(name + '.pos')):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._positions.pop(name, None)
+        self._segments = [s for s in self._segments if s != name]
+
+    def pending_bytes(self) -> int:
+        """Bytes of spilled batches still waiting for replay"""
+        with self._lock:
+            total = 0
+            for name in self._segments:
+                try:
+                    total += os.path.getsize(self._path(name)) - self._position(name)
+                except FileNotFoundError:
+                    pass
+            return total
+
+    def reject(self, record: Dict[str, Any]):
+        """Keep a batch the database refused, with its error, for manual repair"""
+        with self._lock:
+            with open(self._path(REJECTED_LOG), 'ab') as handle:
+                self._write(handle, (_encode_json(record) + '\n').encode('utf-8'))
+
+    def close(self):
+        """Close the open segment; unreplayed segments stay on disk for the next writer"""
+        with self._lock:
+            self._seal_locked()
+
+
+class InteractionWriteBehind:
+    """
+    Write-behind queue for user_interactions
+    add() only buffers. A background flusher coalesces rows into one multi-row
+    INSERT per batch of batch_size rows, or every flush_interval seconds.
+    When an insert fails, or max_pending_batches batches are already waiting,
+    batches go to the spill log instead. They are replayed in order once
+    inserts succeed again. Memory is bounded by one partial buffer,
+    max_pending_batches batches and the batch in flight
+    """
+
+    COLUMNS = (
+        'user_address',
+        'nft_id',
+        'interaction_type',
+        'frequency_resonance',
+        'timestamp',
+        'interaction_data'
+    )
+
+    def __init__(
+        self,
+        client,
+        spill_dir: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_pending_batches: int = 8,
+        retry_interval: float = 1.0,
+        drain_timeout: float = 30.0,
+        segment_bytes: int = 16 * 1024 * 1024,
+        fsync: bool = False,
+        table: str = 'user_interactions',
+        columns: Sequence[str] = COLUMNS
+    ):
+        """Initialize the writer and open its spill log; call start() before adding rows"""
+        if batch_size < 1 or max_pending_batches < 1:
+            raise ValueError("batch_size and max_pending_batches must be at least 1")
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending_batches = max_pending_batches
+        self.retry_interval = retry_interval
+        self.drain_timeout = drain_timeout
+        self.table = table
+        self.columns = list(columns)
+        self.spill = SpillLog(spill_dir, segment_bytes, fsync)
+
+        self._buffer: List[list] = []
+        self._buffer_started = 0.0
+        self._pending: Deque[_Batch] = deque()
+        self._in_flight = 0
+        self._seq = self.spill.last_seq()
+        self._wakeup = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopping = False
+        self._abandon = False
+        self._closed = False
+        self._flush_latency = LatencyHistogram()
+        self._write_lag = LatencyHistogram(WRITE_LAG_BUCKETS)
+        self._last_error: Optional[str] = None
+        self._stats = {
+            'rows_added': 0,
+            'rows_written': 0,
+            'batches': 0,
+            'rows_spilled': 0,
+            'batches_spilled': 0,
+            'rows_replayed': 0,
+            'rows_rejected': 0,
+            'insert_failures': 0
+        }
+
+    def __enter__(self) -> 'InteractionWriteBehind':
+        """Start the writer when entering a with block"""
+        return self.start() if self._flusher is None else self
+
+    def __exit__(self, exc_type, exc, tb):
+        """Drain and stop the writer when leaving a with block"""
+        self.close()
+
+    def start(self) -> 'InteractionWriteBehind':
+        """Start the background flusher thread"""
+        self._flusher = threading.Thread(target=self._flush_loop, name='scrollverse-interaction-writer', daemon=True)
+        self._flusher.start()
+        return self
+
+    def _encode(self, interaction: Union[Dict[str, Any], Sequence[Any]]) -> list:
+        """One row in column order, stamped now if it has no timestamp"""
+        if isinstance(interaction, dict):
+            values = [interaction.get(column) for column in self.columns]
+        else:
+            values = list(interaction)
+        if 'timestamp' in self.columns:
+            index = self.columns.index('timestamp')
+            # The row may commit long after the interaction; the column default would record the commit time
+            if values[index] is None:
+                values[index] = datetime.now()
+        return [encode_value(value) for value in values]
+
+    def add(self, interaction: Union[Dict[str, Any], Sequence[Any]]):
+        """Buffer one interaction without waiting on the database"""
+        row = self._encode(interaction)
+        with self._wakeup:
+            if self._closed:
+                raise WriteBehindError(f"Writer for {self.table} is closed")
+            if not self._buffer:
+                self._buffer_started = time.time()
+                self._wakeup.notify_all()
+            self._buffer.append(row)
+            self._stats['rows_added'] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._route(self._cut())
+                self._wakeup.notify_all()
+
+    def add_many(self, interactions: Iterable[Union[Dict[str, Any], Sequence[Any]]]):
+        """Buffer many interactions"""
+        for interaction in interactions:
+            self.add(interaction)
+
+    def _cut(self) -> _Batch:
+        """Swap out the buffer as the next numbered batch; caller holds the lock"""
+        self._seq += 1
+        batch = _Batch(self._seq, self._buffer_started, self._buffer)
+        self._buffer = []
+        return batch
+
+    def _route(self, batch: _Batch):
+        """Queue a batch for the database, or spill it; caller holds the lock"""
+        if self.spill.backlog or len(self._pending) >= self.max_pending_batches:
+            # Pending batches are older, so they go to disk first to keep the log in order
+            self._spill_locked([*self._pending, batch])
+            self._pending.clear()
+        else:
+            self._pending.append(batch)
+
+    def _spill_locked(self, batches: List[_Batch]):
+        """Append batches to the spill log in order; caller holds the lock"""
+        for batch in batches:
+            self.spill.append(batch.seq, batch.created, batch.rows)
+            self._stats['rows_spilled'] += len(batch.rows)
+            self._stats['batches_spilled'] += 1
+
+    def _take(self) -> Optional[_Batch]:
+        """Next batch to insert directly, cutting a due buffer; caller holds the lock"""
+        if self._buffer and (self._stopping or time.time() - self._buffer_started >= self.flush_interval):
+            self._route(self._cut())
+        if self._pending and not self.spill.backlog:
+            self._in_flight += 1
+            return self._pending.popleft()
+        return None
+
+    def _flush_loop(self):
+        """Insert pending batches, replay the spill log, and drain on close()"""
+        while True:
+            with self._wakeup:
+                batch = self._take()
+                while batch is None and not self.spill.backlog:
+                    if self._stopping:
+                        return
+                    timeout = None
+                    if self._buffer:
+                        timeout = max(0.0, self._buffer_started + self.flush_interval - time.time())
+                    # Idle: wake flush() callers waiting for the queue and spill log to empty
+                    self._wakeup.notify_all()
+                    self._wakeup.wait(timeout)
+                    batch = self._take()
+                if batch is None and self._abandon:
+                    return
+
+            if batch is not None:
+                self._write(batch)
+            elif not self._replay_one():
+                with self._wakeup:
+                    if not self._abandon:
+                        self._wakeup.wait(self.retry_interval)
+
+    def _write(self, batch: _Batch):
+        """Insert a batch taken from the queue, spilling it if the database is unavailable"""
+        error = self._insert(batch.rows, batch.created)
+        with self._wakeup:
+            self._in_flight -= 1
+            if error is not None and is_transient(error):
+                self._spill_locked([batch, *self._pending])
+                self._pending.clear()
+            elif error is not None:
+                self._reject(batch.rows, batch.created, error)
+            self._wakeup.notify_all()
+
+    def _replay_one(self) -> bool:
+        """Insert the oldest spilled batch; False when the database is still unavailable"""
+        entry = self.spill.next_batch()
+        if entry is None:
+            return True
+        name, offset, record = entry
+        error = self._insert(record['rows'], record['created'])
+        if error is not None and is_transient(error):
+            return False
+        with self._wakeup:
+            if error is not None:
+                self._reject(record['rows'], record['created'], error)
+            else:
+                self._stats['rows_replayed'] += len(record['rows'])
+        self.spill.advance(name, offset)
+        return True
+
+    def _reject(self, rows: List[list], created: float, error: BaseException):
+        """Set aside a batch the database refused so it cannot block the rows behind it; caller holds the lock"""
+        self.spill.reject({
+            'created': created,
+            'error': f"{type(error).__name__}: {error}",
+            'columns': self.columns,
+            'rows': rows
+        })
+        self._stats['rows_rejected'] += len(rows)
+
+    def _insert(self, rows: List[list], created: float) -> Optional[BaseException]:
+        """Run one multi-row INSERT, recording latency; returns the error instead of raising"""
+        started = time.perf_counter()
+        try:
+            self.client.insert_rows(self.table, self.columns, rows)
+        except Exception as e:
+            with self._wakeup:
+                self._stats['insert_failures'] += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+            return e
+        with self._wakeup:
+            self._flush_latency.observe(time.perf_counter() - started)
+            self._write_lag.observe(max(0.0, time.time() - created))
+            self._stats['rows_written'] += len(rows)
+            self._stats['batches'] += 1
+        return None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Hand the partial buffer to the flusher and wait until it and the spill log are written"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._wakeup:
+            if self._buffer:
+                self._route(self._cut())
+                self._wakeup.notify_all()
+            while self._pending or self._in_flight or self.spill.backlog:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if self._flusher is None or not self._flusher.is_alive() or (remaining is not None and remaining <= 0):
+                    return False
+                self._wakeup.wait(remaining)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput, spill backlog and flush latency statistics"""
+        with self._wakeup:
+            counters = dict(self._stats)
+            buffered = len(self._buffer) + sum(len(batch.rows) for batch in self._pending)
+            pending = len(self._pending)
+        return {
+            **counters,
+            'buffered': buffered,
+            'pending_batches': pending,
+            'spill_segments': self.spill.backlog,
+            'spill_bytes': self.spill.pending_bytes(),
+            'torn_batches': self.spill.torn_batches,
+            'last_error': self._last_error,
+            'flush_latency': self._flush_latency.as_dict(),
+            'write_lag': self._write_lag.as_dict()
+        }
+
+    def close(self, drain_timeout: Optional[float] = None):
+        """
+        Write everything buffered and replay the spill log, then stop the flusher
+        After drain_timeout seconds rows still in memory are spilled instead,
+        and the next writer on the same spill directory replays them
+        """
+        if self._flusher is None:
+            return
+        timeout = self.drain_timeout if drain_timeout is None else drain_timeout
+        with self._wakeup:
+            self._closed = True
+            self._stopping = True
+            self._wakeup.notify_all()
+        self._flusher.join(timeout)
+
+        if self._flusher.is_alive():
+            with self._wakeup:
+                self._abandon = True
+                if self._buffer:
+                    self._pending.append(self._cut())
+                self._spill_locked(list(self._pending))
+                self._pending.clear()
+                self._wakeup.notify_all()
+            # An insert already in flight finishes, or fails and spills, before the thread exits
+            self._flusher.join()
+        self._flusher = None
+        self.spill.close()
+
+        stats = self.stats()
+        print(f"✓ Wrote {stats['rows_written']} interactions to {self.table} in {stats['batches']} batches "
+              f"({stats['rows_spilled']} spilled, {stats['spill_segments']} segments left to replay)")